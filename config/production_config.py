@@ -122,6 +122,10 @@ ARC_ESCAPE_CONFIG = {
 
     # Balle
     "ball_size": 14,
+
+    # Rendu (voir scripts/benchmark_antialiasing.py)
+    "antialiasing": "ssaa",       # "ssaa", "dirty_ssaa" ou "gfxdraw" (le plus rapide)
+    "supersampling": 3,           # Facteur SSAA (2 = ~2x plus rapide)
 }
 
 
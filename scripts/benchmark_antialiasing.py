@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark - ArcEscape anti-aliasing modes: speed and quality
+
+Simulates the video once, then draws the same frames with every
+anti-aliasing mode. Quality is measured against a high supersampling
+reference (PSNR and mean absolute error over sampled frames).
+
+Usage:
+  python scripts/benchmark_antialiasing.py
+  python scripts/benchmark_antialiasing.py --duration 20 --reference-scale 4 --save-frames benchmark_outputs
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import numpy as np
+import pygame
+
+from src.video_generators.arc_escape_simulator import ArcEscapeSimulator, AntialiasMode
+
+
+MODES = [
+    ("ssaa x3 (default)", AntialiasMode.SSAA, 3),
+    ("ssaa x2", AntialiasMode.SSAA, 2),
+    ("dirty_ssaa x3", AntialiasMode.DIRTY_SSAA, 3),
+    ("dirty_ssaa x2", AntialiasMode.DIRTY_SSAA, 2),
+    ("gfxdraw", AntialiasMode.GFXDRAW, 1),
+]
+
+
+def pixels(surface):
+    return pygame.surfarray.array3d(surface).astype(np.float64)
+
+
+def draw(sim, log, surface, frames, mode, scale):
+    """Draw the given frames in one mode; returns (ms per frame, sampled images)"""
+    sim.set_antialiasing(mode, scale)
+    images = {}
+    elapsed = 0.0
+    for frame in frames:
+        sim.restore_log_frame(log, frame)
+        start = time.perf_counter()
+        sim.draw_frame(surface)
+        elapsed += time.perf_counter() - start
+        images[frame] = pixels(surface)
+    return elapsed / len(frames) * 1000, images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anti-aliasing modes benchmark")
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=1920)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--samples", type=int, default=40, help="Frames drawn per mode")
+    parser.add_argument("--reference-scale", type=int, default=4)
+    parser.add_argument("--save-frames", default=None, help="Directory for one PNG per mode")
+    args = parser.parse_args()
+
+    pygame.init()
+    random.seed(42)
+    sim = ArcEscapeSimulator(width=args.width, height=args.height, fps=args.fps, duration=args.duration)
+    log = sim.simulate()
+    surface = pygame.Surface((args.width, args.height))
+
+    step = max(1, sim.total_frames // args.samples)
+    frames = list(range(0, sim.total_frames, step))[:args.samples]
+    print(f"{len(frames)} frames at {args.width}x{args.height}, reference ssaa x{args.reference_scale}")
+
+    _, reference = draw(sim, log, surface, frames, AntialiasMode.SSAA, args.reference_scale)
+
+    print(f"  {'mode':<20} {'ms/frame':>9} {'speedup':>8} {'PSNR dB':>8} {'MAE':>6}")
+    baseline_ms = None
+    for name, mode, scale in MODES:
+        ms, images = draw(sim, log, surface, frames, mode, scale)
+        baseline_ms = baseline_ms or ms
+        mse = np.mean([np.mean((images[f] - reference[f]) ** 2) for f in frames])
+        mae = np.mean([np.mean(np.abs(images[f] - reference[f])) for f in frames])
+        psnr = 10 * np.log10(255 ** 2 / mse) if mse else float("inf")
+        print(f"  {name:<20} {ms:9.1f} {baseline_ms / ms:7.2f}x {psnr:8.2f} {mae:6.3f}")
+
+        if args.save_frames:
+            os.makedirs(args.save_frames, exist_ok=True)
+            frame = frames[len(frames) // 2]
+            sim.restore_log_frame(log, frame)
+            sim.draw_frame(surface)
+            path = os.path.join(args.save_frames, f"aa_{mode.value}_x{scale}.png")
+            pygame.image.save(surface, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark - PhysicsEngine broadphases
+
+Builds scenes of N dynamic circles (random positions and velocities in a
+1080x1920 world, radii scaled so that the circles cover about --coverage of
+its area) plus four static wall segments, and times one collision
+detection pass (_detect_collisions) with each EngineConfig.broadphase:
+"none" (every pair), "grid", "sap" and "quadtree". Reports the time, the
+pairs handed to the narrowphase and the collisions found, and checks that
+every broadphase finds the same collisions as the all-pairs loop (when it
+runs: up to --all-pairs-limit bodies).
+
+Usage:
+  python scripts/benchmark_broadphase.py
+  python scripts/benchmark_broadphase.py --bodies 10 100 1000 10000 --repeat 5
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+from src.utils.physics_engine.core.engine import PhysicsEngine, EngineConfig
+from src.utils.physics_engine.core.vector import Vector2D
+from src.utils.physics_engine.physics.body import Circle, Segment
+from src.utils.physics_engine.collision.broadphase import BROADPHASES
+
+WIDTH, HEIGHT = 1080, 1920
+
+
+def make_engine(count: int, broadphase: str, coverage: float, seed: int = 5) -> PhysicsEngine:
+    engine = PhysicsEngine(EngineConfig(width=WIDTH, height=HEIGHT, batch_world=True,
+                                        broadphase=broadphase))
+    rng = random.Random(seed)
+    radius = math.sqrt(coverage * WIDTH * HEIGHT / (count * math.pi))
+    for _ in range(count):
+        body = Circle(Vector2D(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)),
+                      radius * rng.uniform(0.5, 1.2))
+        body.velocity = Vector2D(rng.uniform(-500, 500), rng.uniform(-500, 500))
+        engine.add_body(body)
+    corners = [Vector2D(0, 0), Vector2D(WIDTH, 0), Vector2D(WIDTH, HEIGHT), Vector2D(0, HEIGHT)]
+    for start, end in zip(corners, corners[1:] + corners[:1]):
+        engine.add_body(Segment(start, end))
+    return engine
+
+
+def detect(engine: PhysicsEngine, repeat: int):
+    """Best time (ms) of a detection pass, pair checks and collisions (body index pairs)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine._detect_collisions()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    index = {id(body): i for i, body in enumerate(engine.bodies)}
+    found = [(index[id(a)], index[id(b)]) for a, b, _ in engine.collision_pairs]
+    return best, engine.performance_stats['pair_checks'], found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broadphase benchmark")
+    parser.add_argument("--bodies", type=int, nargs="+", default=[10, 100, 1000, 5000, 10000])
+    parser.add_argument("--coverage", type=float, default=0.3,
+                        help="Share of the world area covered by the circles")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--all-pairs-limit", type=int, default=2000,
+                        help="Largest scene timed with the all-pairs loop")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"  {'bodies':>7} {'broadphase':<10} {'ms':>10} {'pair checks':>12} {'collisions':>11}")
+    for count in args.bodies:
+        reference = None
+        for name in BROADPHASES:
+            if name == "none" and count > args.all_pairs_limit:
+                continue
+            engine = make_engine(count, name, args.coverage)
+            ms, checks, found = detect(engine, args.repeat)
+            line = f"  {count:>7} {name:<10} {ms:>10.2f} {checks:>12} {len(found):>11}"
+            if reference is None:
+                reference = found
+            elif found != reference:
+                line += "  MISMATCH"
+                failed = True
+            print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
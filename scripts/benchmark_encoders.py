@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark - encoder configurations on this host
+
+Measures every candidate x264/x265 configuration (and hardware encoders
+with --gpu) on the synthetic clip, prints speed and SSIM, and stores the
+selected profile in the encoder cache used by the generators and the
+FFmpeg media combiner (which do not benchmark on their own unless
+$TIKSIMPRO_ENCODER_BENCHMARK=1).
+
+Usage:
+  python scripts/benchmark_encoders.py
+  python scripts/benchmark_encoders.py --gpu --min-ssim 0.985
+"""
+
+import os
+import sys
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.video.encoder_profile import EncoderProfiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encoder profile benchmark")
+    parser.add_argument("--gpu", action="store_true", help="Include hardware encoders")
+    parser.add_argument("--min-ssim", type=float, default=0.98)
+    parser.add_argument("--cache", default=None, help="Encoder cache file")
+    args = parser.parse_args()
+
+    profiler = EncoderProfiler(cache_path=args.cache, min_ssim=args.min_ssim)
+    if not profiler.ffmpeg_path:
+        print("FFmpeg not found")
+        return 1
+
+    print(profiler.ffmpeg_version())
+    measured = profiler.benchmark(use_gpu=args.gpu)
+    print(f"  {'configuration':<36} {'FPS':>8} {'SSIM':>8}")
+    for profile in sorted(measured, key=lambda p: -p.encode_fps):
+        flag = "" if profile.ssim >= args.min_ssim else "  (below target)"
+        print(f"  {profile.describe():<36} {profile.encode_fps:>8.1f} {profile.ssim:>8.4f}{flag}")
+
+    selected = profiler.select(measured)
+    if selected is None:
+        print("No configuration could be measured")
+        return 1
+    profiler.store(selected, use_gpu=args.gpu)
+    print(f"Selected: {selected.describe()} -> {profiler.cache_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
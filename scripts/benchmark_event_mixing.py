@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark - event mixing
+
+Mixes a collision soundtrack with the note generators' previous per-event
+loop (slice add into the buffer, auto volume measured on the buffer under
+every new note - kept below) and with the EventMixer, the notes coming
+from a warm note cache in both cases, and reports the mixing time.
+
+Without auto volume both mixes must match (--tolerance). With it the
+ducking level is estimated from an energy envelope rather than measured
+on the buffer, so the overall (RMS) level must match within
+--level-tolerance.
+
+Usage:
+  python scripts/benchmark_event_mixing.py
+  python scripts/benchmark_event_mixing.py --events 1000 3000 --seconds 60
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.core.data_pipeline import AudioEvent
+from src.audio_generators.simple_midi_audio_generator import SimpleMidiAudioGenerator
+
+
+class LegacyMidiAudioGenerator(SimpleMidiAudioGenerator):
+    """Previous per-event mixing loop"""
+
+    def _process_events(self):
+        note_index = 0
+        for event in self.events:
+            if event.event_type in ["collision", "passage", "particle_bounce", "circle_activation", "countdown_beep"]:
+                frequency = self.melody_notes[note_index % len(self.melody_notes)]
+                note_index += 1
+                start_sample = int(event.time * self.sample_rate)
+                sound, gain = self._generate_sound(frequency, event)
+                end_sample = min(start_sample + len(sound), len(self.audio_data))
+                if start_sample < len(self.audio_data):
+                    length = end_sample - start_sample
+                    if self.auto_volume_adjust:
+                        region_activity = np.mean(np.abs(self.audio_data[start_sample:end_sample]))
+                        gain *= 1.0 / (1.0 + region_activity * 2)
+                    self.audio_data[start_sample:end_sample] += sound[:length] * gain
+
+
+def make_events(count: int, seconds: float, seed: int = 5):
+    rng = random.Random(seed)
+    events = [AudioEvent("collision", rng.uniform(0, seconds - 0.5),
+                         params={"volume": rng.choice((0.4, 0.5, 0.6, 0.8)),
+                                 "intensity": rng.choice((0.7, 0.85, 1.0))})
+              for _ in range(count)]
+    return sorted(events, key=lambda e: e.time)
+
+
+def mix(generator_class, events, seconds: float, auto_volume: bool, repeat: int):
+    """Mixed buffer and best mixing time (ms) of `repeat` runs"""
+    generator = generator_class()
+    generator.melody_notes = generator.midi_extractor.get_default_melody()
+    generator.sound = "gentle_pluck"
+    generator.auto_volume_adjust = auto_volume
+    generator.add_events(events)
+    best = float("inf")
+    for _ in range(repeat + 1):  # First run fills the note cache
+        generator.audio_data = np.zeros(int(generator.sample_rate * seconds), dtype=np.float32)
+        start = time.perf_counter()
+        generator._process_events()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return generator.audio_data, best
+
+
+def rms(signal: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(signal, dtype=np.float64))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event mixing benchmark")
+    parser.add_argument("--events", type=int, nargs="+", default=[300, 1000, 3000])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mix (best time kept)")
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    parser.add_argument("--level-tolerance", type=float, default=0.02,
+                        help="Relative RMS difference allowed with auto volume")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    failed = False
+    print(f"{args.seconds:g}s timeline, mixing times in ms")
+    print(f"  {'events':>6} {'ducking':>8} {'legacy':>8} {'mixer':>7} {'speedup':>8} {'max diff':>9} {'RMS ratio':>10}")
+    for count in args.events:
+        events = make_events(count, args.seconds)
+        for auto_volume in (False, True):
+            expected, legacy_ms = mix(LegacyMidiAudioGenerator, events, args.seconds, auto_volume, args.repeat)
+            result, mixer_ms = mix(SimpleMidiAudioGenerator, events, args.seconds, auto_volume, args.repeat)
+            diff = float(np.max(np.abs(result - expected)))
+            ratio = rms(result) / max(rms(expected), 1e-12)
+            mismatch = abs(ratio - 1) > args.level_tolerance if auto_volume else diff > args.tolerance
+            failed |= mismatch
+            print(f"  {count:>6} {'on' if auto_volume else 'off':>8} {legacy_ms:>8.1f} {mixer_ms:>7.1f} "
+                  f"{legacy_ms / max(mixer_ms, 1e-6):>7.1f}x {diff:>9.2e} "
+                  f"{ratio:>10.3f}{'  MISMATCH' if mismatch else ''}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark - viral_audio master effects (Compressor + Limiter)
+
+Runs the vectorised Compressor/Limiter and the previous per-sample loops
+(kept below as the golden reference) on the same master buffers, checks
+that the outputs match and reports the time of each.
+
+Exits with status 1 if any output differs by more than --tolerance.
+
+Usage:
+  python scripts/benchmark_master_effects.py
+  python scripts/benchmark_master_effects.py --seconds 60 --tolerance 1e-5
+"""
+
+import os
+import sys
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.audio_generators.viral_audio.effects import Compressor, Limiter
+
+
+def legacy_compress(comp: Compressor, signal: np.ndarray) -> np.ndarray:
+    """Previous Compressor.process (per-sample envelope loop)"""
+    if len(signal) == 0:
+        return signal
+    abs_signal = np.abs(signal)
+    attack_coef = np.exp(-1.0 / (comp.attack_ms * comp.sample_rate / 1000))
+    release_coef = np.exp(-1.0 / (comp.release_ms * comp.sample_rate / 1000))
+    envelope = np.zeros_like(signal)
+    envelope[0] = abs_signal[0]
+    for i in range(1, len(signal)):
+        if abs_signal[i] > envelope[i - 1]:
+            envelope[i] = attack_coef * envelope[i - 1] + (1 - attack_coef) * abs_signal[i]
+        else:
+            envelope[i] = release_coef * envelope[i - 1] + (1 - release_coef) * abs_signal[i]
+    threshold_lin = 10 ** (comp.threshold_db / 20)
+    gain = np.ones_like(signal)
+    above_threshold = envelope > threshold_lin
+    if np.any(above_threshold):
+        over_db = 20 * np.log10(envelope[above_threshold] / threshold_lin + 1e-10)
+        gain[above_threshold] = 10 ** (-(over_db - over_db / comp.ratio) / 20)
+    makeup_gain = min(1.0 / (10 ** (comp.threshold_db / 20 / comp.ratio)), 2.0)
+    return signal * gain * makeup_gain
+
+
+def legacy_limit(limiter: Limiter, signal: np.ndarray) -> np.ndarray:
+    """Previous Limiter.process (per-sample peak hold loop)"""
+    if len(signal) == 0:
+        return signal
+    ceiling_lin = 10 ** (limiter.ceiling_db / 20)
+    release_coef = np.exp(-1.0 / (limiter.release_ms * limiter.sample_rate / 1000))
+    abs_signal = np.abs(signal)
+    gain = np.ones_like(signal)
+    peak_hold = 0.0
+    for i in range(len(signal)):
+        if abs_signal[i] > peak_hold:
+            peak_hold = abs_signal[i]
+        else:
+            peak_hold = peak_hold * release_coef
+        gain[i] = ceiling_lin / peak_hold if peak_hold > ceiling_lin else 1.0
+    return np.clip(signal * gain, -ceiling_lin, ceiling_lin)
+
+
+def make_master(seconds: float, sample_rate: int, hits_per_second: float,
+                peak: float, seed: int = 3) -> np.ndarray:
+    """Mix of decaying tonal hits and noise bursts, like a collision soundtrack"""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    audio = np.zeros(total, dtype=np.float32)
+    hit = int(0.4 * sample_rate)
+    t = np.arange(hit) / sample_rate
+    for start in rng.integers(0, total - hit, int(seconds * hits_per_second)):
+        freq = rng.uniform(80, 1200)
+        tone = np.sin(2 * np.pi * freq * t) * np.exp(-t * rng.uniform(6, 20))
+        noise = rng.standard_normal(hit) * np.exp(-t * 60) * 0.3
+        audio[start:start + hit] += (rng.uniform(0.1, 1.0) * (tone + noise)).astype(np.float32)
+    return audio * np.float32(peak / max(np.max(np.abs(audio)), 1e-9))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Master effects benchmark")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    sr = args.sample_rate
+    compressor, limiter = Compressor(sr), Limiter(sr)
+    cases = {
+        "quiet (-20 dBFS)": make_master(args.seconds, sr, 4, 0.1),
+        "typical": make_master(args.seconds, sr, 4, 0.8),
+        "hot (limiting)": make_master(args.seconds, sr, 8, 1.6),
+        "dense float64": make_master(args.seconds, sr, 30, 1.2).astype(np.float64),
+        "silence": np.zeros(sr, dtype=np.float32),
+        "single sample": np.array([0.9], dtype=np.float32),
+    }
+
+    failed = False
+    print(f"{args.seconds:g}s at {sr} Hz, times in ms")
+    print(f"  {'case':<18} {'stage':<11} {'legacy':>9} {'new':>8} {'speedup':>8} {'max diff':>10}")
+    for name, signal in cases.items():
+        stages = [("compressor", compressor.process, lambda s: legacy_compress(compressor, s)),
+                  ("limiter", limiter.process, lambda s: legacy_limit(limiter, s))]
+        for stage, new, legacy in stages:
+            expected, legacy_ms = timed(legacy, signal)
+            result, new_ms = timed(new, signal)
+            diff = float(np.max(np.abs(result - expected))) if len(signal) else 0.0
+            ok = diff <= args.tolerance and result.dtype == expected.dtype
+            failed |= not ok
+            print(f"  {name:<18} {stage:<11} {legacy_ms:>9.1f} {new_ms:>8.1f} "
+                  f"{legacy_ms / max(new_ms, 1e-6):>7.0f}x {diff:>10.2e}{'' if ok else '  MISMATCH'}")
+            signal = expected  # Chain: the limiter gets the compressed signal
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark - PhysicsEngine narrowphase, per-pair vs batched
+
+Builds ArcEscape-style scenes: --rings concentric rotating rings with gaps
+around the centre of a 1080x1920 world and N balls scattered over them, all
+in a batch-world PhysicsEngine with the grid broadphase. For the candidate
+pairs of the broadphase, times the per-pair test (_check_collision, one
+Ring.collision_with_circle / Vector2D computation per pair) against the
+batched narrowphase (batch_contacts on arrays), and checks that both find
+the same contacts with the same normals, penetrations and contact points.
+Finally runs --steps full steps with broadphase "none" and "grid" and
+reports the largest position difference between the two.
+
+Usage:
+  python scripts/benchmark_narrowphase.py
+  python scripts/benchmark_narrowphase.py --bodies 100 1000 10000 --rings 8
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import numpy as np
+
+from src.utils.physics_engine.core.engine import PhysicsEngine, EngineConfig
+from src.utils.physics_engine.core.vector import Vector2D
+from src.utils.physics_engine.physics.body import Circle, Ring
+from src.utils.physics_engine.collision.narrowphase import batch_contacts
+
+WIDTH, HEIGHT = 1080, 1920
+
+
+def make_engine(count: int, rings: int, broadphase: str, seed: int = 11) -> PhysicsEngine:
+    engine = PhysicsEngine(EngineConfig(width=WIDTH, height=HEIGHT, batch_world=True,
+                                        broadphase=broadphase))
+    rng = random.Random(seed)
+    centre = Vector2D(WIDTH / 2, HEIGHT / 2)
+    spacing = (WIDTH / 2 - 40) / rings
+    for index in range(rings):
+        outer = spacing * (index + 1)
+        ring = Ring(centre, outer - 8, outer, gap_angle=40, gap_start=rng.uniform(0, 360))
+        ring.rotation = rng.uniform(0, 360)
+        ring.rotation_speed = rng.uniform(-90, 90)
+        engine.add_body(ring)
+
+    radius = max(2.0, min(12.0, spacing * 0.3, 0.3 * math.sqrt(WIDTH * WIDTH / count)))
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        distance = rng.uniform(0, WIDTH / 2 - 20)
+        body = Circle(centre + Vector2D(math.cos(angle), math.sin(angle)) * distance, radius)
+        body.velocity = Vector2D(rng.uniform(-400, 400), rng.uniform(-400, 400))
+        engine.add_body(body)
+    engine.add_update_callback(lambda dt: [ring.update_rotation(dt) for ring in engine.bodies
+                                           if isinstance(ring, Ring)])
+    return engine
+
+
+def per_pair(engine: PhysicsEngine, first, second):
+    bodies = engine.bodies
+    found = []
+    for i, j in zip(first.tolist(), second.tolist()):
+        info = engine._check_collision(bodies[i], bodies[j])
+        if info:
+            found.append((i, j, info['normal'].tuple(), info['penetration'],
+                          info['contact_point'].tuple()))
+    return found
+
+
+def batched(engine: PhysicsEngine, first, second):
+    contacts, rest = batch_contacts(first, second, *engine._narrowphase_arrays())
+    return contacts, rest
+
+
+def best_of(repeat: int, function, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Narrowphase benchmark")
+    parser.add_argument("--bodies", type=int, nargs="+", default=[100, 1000, 5000, 10000])
+    parser.add_argument("--rings", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=60)
+    parser.add_argument("--steps-limit", type=int, default=1000,
+                        help="Largest scene stepped with the all-pairs loop")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"  {'bodies':>7} {'pairs':>8} {'contacts':>9} {'per-pair ms':>12} {'batched ms':>11} "
+          f"{'speedup':>8} {'same':>5}")
+    for count in args.bodies:
+        engine = make_engine(count, args.rings, "grid")
+        first, second = engine.broadphase.pairs(*engine._body_bounds())
+        scalar_ms, reference = best_of(args.repeat, per_pair, engine, first, second)
+        batch_ms, (contacts, rest) = best_of(args.repeat, batched, engine, first, second)
+
+        found = list(zip(contacts.first.tolist(), contacts.second.tolist(),
+                         map(tuple, contacts.normal.tolist()), contacts.penetration.tolist(),
+                         map(tuple, contacts.contact_point.tolist())))
+        same = found == reference and len(rest) == 0
+        failed |= not same
+        print(f"  {count:>7} {len(first):>8} {len(found):>9} {scalar_ms:>12.2f} {batch_ms:>11.2f} "
+              f"{scalar_ms / batch_ms:>7.1f}x {'yes' if same else 'NO':>5}")
+
+    print()
+    print(f"  {'bodies':>7} {'steps':>6} {'max diff px (none vs grid)':>27}")
+    for count in args.bodies:
+        if count > args.steps_limit:
+            continue
+        legacy, batch = make_engine(count, args.rings, "none"), make_engine(count, args.rings, "grid")
+        for _ in range(args.steps):
+            legacy.step()
+            batch.step()
+        diff = np.max(np.abs(np.array([body.position.tuple() for body in legacy.bodies]) -
+                             np.array([body.position.tuple() for body in batch.bodies])))
+        failed |= diff > 1e-9
+        print(f"  {count:>7} {args.steps:>6} {diff:>27.2e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark - synthesised-note cache
+
+Renders a collision soundtrack with each note-based generator, once
+synthesising every note at its event volume (as before the cache) and once
+through a fresh note cache, and reports the time, the cache statistics and
+how far the cached mix is from the uncached one (presets with noise differ:
+a cached note keeps the noise of its first rendering).
+
+Usage:
+  python scripts/benchmark_note_cache.py
+  python scripts/benchmark_note_cache.py --events 2000 --seconds 60
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from typing import Optional
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.core.data_pipeline import AudioEvent
+from src.audio_generators.note_cache import NoteCache
+from src.audio_generators.satisfying_audio_generator import SatisfyingAudioGenerator
+from src.audio_generators.simple_midi_audio_generator import SimpleMidiAudioGenerator
+from src.audio_generators.custom_sound_generator import CustomMidiAudioGenerator
+
+
+def make_events(count: int, seconds: float, seed: int = 5):
+    rng = random.Random(seed)
+    events = [AudioEvent("collision", rng.uniform(0, seconds - 1),
+                         params={"volume": rng.choice((0.4, 0.5, 0.6, 0.8)),
+                                 "intensity": rng.choice((0.7, 0.85, 1.0))})
+              for _ in range(count)]
+    return sorted(events, key=lambda e: e.time)
+
+
+def build(kind: str, cache: Optional[NoteCache], seconds: float, output: str):
+    """Generator using `cache`, or rendering every note directly when None"""
+    if kind == "satisfying":
+        generator = SatisfyingAudioGenerator()
+        engine = generator.sound_engine
+        engine.note_cache = cache
+        if cache is None:
+            engine.cached_sound = lambda preset, frequency=None, duration=None, volume=0.7: (
+                engine.generate_sound(preset, frequency, duration, volume), 1.0)
+        generator.melody_player._load_default_melody()
+    else:
+        generator = SimpleMidiAudioGenerator() if kind == "simple_midi" else CustomMidiAudioGenerator()
+        sound_gen = generator.sound_gen if kind == "simple_midi" else generator.custom_sound_gen.sound_generator
+        sound_gen.note_cache = cache
+        if cache is None:
+            sound_gen.cached_preset_sound = lambda sound_type, frequency, duration, volume: (
+                getattr(sound_gen, sound_type)(frequency, duration, volume), 1.0)
+        generator.melody_notes = generator.midi_extractor.get_default_melody()
+        if kind == "simple_midi":
+            generator.sound_types = ["gentle_pluck"]
+        else:
+            generator.current_preset = "Piano Doux Ultra"
+    generator.output_path = output
+    generator.duration = seconds
+    return generator
+
+
+def render(kind: str, cache: Optional[NoteCache], events, seconds: float, output: str):
+    generator = build(kind, cache, seconds, output)
+    generator.add_events(events)
+    # Same random choices (sound type, detune) and noise in both runs
+    random.seed(1)
+    np.random.seed(1)
+    start = time.perf_counter()
+    generator.generate()
+    return generator.audio_data, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Note cache benchmark")
+    parser.add_argument("--events", type=int, default=600)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    events = make_events(args.events, args.seconds)
+    output = os.path.join(tempfile.mkdtemp(prefix="tiksim_notes_"), "mix.wav")
+    print(f"{args.events} events over {args.seconds:g}s, times in ms")
+    print(f"  {'generator':<12} {'uncached':>9} {'cached':>8} {'speedup':>8} {'notes':>6} "
+          f"{'hits':>6} {'MB':>6} {'max diff':>9}")
+    for kind in ("satisfying", "simple_midi", "custom"):
+        expected, uncached_ms = render(kind, None, events, args.seconds, output)
+        cache = NoteCache()
+        result, cached_ms = render(kind, cache, events, args.seconds, output)
+        diff = float(np.max(np.abs(result - expected)))
+        print(f"  {kind:<12} {uncached_ms:>9.0f} {cached_ms:>8.0f} {uncached_ms / cached_ms:>7.1f}x "
+              f"{len(cache):>6} {cache.hits:>6} {cache.nbytes / 2**20:>6.1f} {diff:>9.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark - particle update + draw cost per frame
+
+Replays the same spawn bursts (ArcEscape collision/passage bursts) into the
+previous one-object-per-particle implementation and into ParticlePool, at
+1x, 10x and 50x the usual particle counts, and checks both draw the same
+pixels.
+
+Usage:
+  python scripts/benchmark_particles.py
+  python scripts/benchmark_particles.py --frames 600 --multipliers 1 10 50
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import numpy as np
+import pygame
+
+from src.utils.video.particles import ParticlePool
+
+
+class LegacyParticle:
+    """Previous behaviour: one Python object per particle"""
+
+    def __init__(self, x, y, vx, vy, color, size, life):
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.color, self.size, self.life, self.max_life = color, size, life, life
+        self.gravity = 800
+
+    def update(self, dt):
+        self.life -= dt
+        self.vy += self.gravity * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.size = max(0.5, self.size * (1 - dt * 2))
+        return self.life > 0
+
+    def render(self, surface, center, scale):
+        fade = self.life / self.max_life
+        col = (int(self.color[0] * fade), int(self.color[1] * fade), int(self.color[2] * fade))
+        px = int((center[0] + self.x) * scale)
+        py = int((center[1] + self.y) * scale)
+        pygame.draw.circle(surface, col, (px, py), int(max(1, self.size * scale)))
+
+
+def make_bursts(frames, fps, multiplier, seed=7):
+    """Spawn schedule: a collision burst every 0.25s and a passage burst every 2s"""
+    rng = np.random.default_rng(seed)
+    bursts = {}
+    for frame in range(frames):
+        spawned = []
+        if frame % (fps // 4) == 0:
+            n = int(rng.integers(8, 16) * multiplier)
+            angle = rng.uniform(-0.8, 0.8, n) + math.pi / 2
+            speed = rng.uniform(150, 400, n)
+            spawned.append((angle, speed, rng.uniform(2, 5, n), rng.uniform(0.3, 0.6, n)))
+        if frame % (fps * 2) == 0:
+            n = int(rng.integers(20, 36) * multiplier)
+            spawned.append((rng.uniform(0, math.pi * 2, n), rng.uniform(200, 600, n),
+                            rng.uniform(3, 7, n), rng.uniform(0.5, 1.0, n)))
+        if spawned:
+            bursts[frame] = [(np.cos(a) * s, np.sin(a) * s, size, life) for a, s, size, life in spawned]
+    return bursts
+
+
+def run(bursts, frames, dt, surface, center, use_pool):
+    color = np.array([200, 120, 60])
+    particles = ParticlePool(shrink_rate=2.0) if use_pool else []
+    times, peak = [], 0
+    for frame in range(frames):
+        surface.fill((0, 0, 0))
+        start = time.perf_counter()
+        for vx, vy, size, life in bursts.get(frame, []):
+            if use_pool:
+                particles.spawn(0.0, 0.0, vx, vy, color, size, life)
+            else:
+                for i in range(len(vx)):
+                    particles.append(LegacyParticle(0.0, 0.0, float(vx[i]), float(vy[i]),
+                                                    tuple(int(c) for c in color), float(size[i]), float(life[i])))
+        if use_pool:
+            particles.update(dt)
+            particles.render(surface, center, 1)
+        else:
+            particles = [p for p in particles if p.update(dt)]
+            for p in particles:
+                p.render(surface, center, 1)
+        times.append(time.perf_counter() - start)
+        peak = max(peak, len(particles))
+    return np.mean(times) * 1000, peak, pygame.surfarray.array3d(surface)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Particle system benchmark")
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=1920)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--multipliers", type=float, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    pygame.init()
+    surface = pygame.Surface((args.width, args.height))
+    center = (args.width // 2, args.height // 2)
+    dt = 1.0 / args.fps
+
+    print(f"{args.frames} frames, update + draw time per frame")
+    print(f"  {'multiplier':>10} {'peak alive':>10} {'legacy ms':>10} {'pool ms':>8} {'speedup':>8} {'same pixels':>12}")
+    for multiplier in args.multipliers:
+        bursts = make_bursts(args.frames, args.fps, multiplier)
+        legacy_ms, peak, legacy_pixels = run(bursts, args.frames, dt, surface, center, use_pool=False)
+        pool_ms, _, pool_pixels = run(bursts, args.frames, dt, surface, center, use_pool=True)
+        same = np.array_equal(legacy_pixels, pool_pixels)
+        print(f"  {multiplier:>10g} {peak:>10} {legacy_ms:>10.3f} {pool_ms:>8.3f} {legacy_ms / pool_ms:>7.1f}x {str(same):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark - AdvancedSoundGenerator presets (sound_presets/*.json)
+
+Renders every preset with the vectorised DSP core and with the previous
+per-sample filter/effect loops (kept below as the golden reference, in a
+subclass), from the same random seed, checks that the outputs match and
+reports the time of each.
+
+Dict presets render their "config"; list presets render their
+"advanced_config" merged with frequency/duration/volume/envelope, or the
+generator preset method named by "type" when they have none.
+
+Exits with status 1 if any output differs by more than --tolerance.
+
+Usage:
+  python scripts/benchmark_sound_presets.py
+  python scripts/benchmark_sound_presets.py --repeat 5 --tolerance 1e-6
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from src.audio_generators.simple_midi_audio_generator import AdvancedSoundGenerator
+
+
+class LegacySoundGenerator(AdvancedSoundGenerator):
+    """Previous per-sample implementations"""
+
+    def _generate_pink_noise(self, samples):
+        white = np.random.normal(0, 1, samples)
+        pink = np.zeros(samples)
+        pink[0] = white[0]
+        for i in range(1, samples):
+            pink[i] = white[i] * 0.5 + pink[i-1] * 0.3
+        return pink / (np.max(np.abs(pink)) + 1e-8)
+
+    def add_frequency_modulation(self, signal, mod_frequency, mod_depth, samples):
+        t = np.linspace(0, samples / self.sample_rate, samples)
+        modulation = np.sin(2 * self.pi * mod_frequency * t) * mod_depth
+        result = np.zeros_like(signal)
+        for i in range(samples):
+            mod_index = i + modulation[i]
+            if 0 <= mod_index < samples - 1:
+                floor_idx = int(mod_index)
+                frac = mod_index - floor_idx
+                result[i] = signal[floor_idx] * (1 - frac) + signal[floor_idx + 1] * frac
+            else:
+                result[i] = signal[i]
+        return result
+
+    def apply_lowpass_filter(self, signal, cutoff_freq, resonance=0.7):
+        alpha = np.exp(-2 * self.pi * cutoff_freq / self.sample_rate)
+        result = np.zeros_like(signal)
+        result[0] = signal[0] * (1 - alpha)
+        for i in range(1, len(signal)):
+            result[i] = alpha * result[i-1] + (1 - alpha) * signal[i]
+        if resonance > 0:
+            for i in range(2, len(signal)):
+                result[i] += resonance * 0.3 * (result[i-1] - result[i-2])
+        return result
+
+    def apply_highpass_filter(self, signal, cutoff_freq):
+        alpha = np.exp(-2 * self.pi * cutoff_freq / self.sample_rate)
+        result = np.zeros_like(signal)
+        result[0] = signal[0]
+        for i in range(1, len(signal)):
+            result[i] = alpha * (result[i-1] + signal[i] - signal[i-1])
+        return result
+
+    def apply_notch_filter(self, signal, notch_freq, q_factor=10):
+        samples = len(signal)
+        t = np.linspace(0, samples / self.sample_rate, samples)
+        notch_signal = np.sin(2 * self.pi * notch_freq * t)
+        correlation = np.correlate(signal, notch_signal, mode='same')
+        adjustment = correlation * notch_signal / (q_factor * len(signal))
+        return signal - adjustment[:len(signal)]
+
+    def apply_reverb(self, signal, room_size=0.5, damping=0.5, wet_level=0.3):
+        samples = len(signal)
+        delays = [int(0.03 * self.sample_rate), int(0.05 * self.sample_rate),
+                  int(0.08 * self.sample_rate), int(0.12 * self.sample_rate)]
+        gains = [0.7, 0.5, 0.3, 0.2]
+        reverb_signal = np.zeros(samples + max(delays))
+        reverb_signal[:samples] = signal
+        for delay, gain in zip(delays, gains):
+            gain *= room_size
+            for i in range(samples):
+                if i + delay < len(reverb_signal):
+                    reverb_signal[i + delay] += signal[i] * gain * (1 - damping)
+        return signal * (1 - wet_level) + reverb_signal[:samples] * wet_level
+
+    def apply_delay(self, signal, delay_ms, feedback=0.3, wet_level=0.3):
+        delay_samples = int(delay_ms * self.sample_rate / 1000)
+        samples = len(signal)
+        delayed_signal = np.zeros(samples + delay_samples)
+        delayed_signal[:samples] = signal
+        for i in range(samples):
+            if i + delay_samples < len(delayed_signal):
+                delayed_signal[i + delay_samples] += signal[i] * feedback
+                if i + 2 * delay_samples < len(delayed_signal):
+                    delayed_signal[i + 2 * delay_samples] += signal[i] * feedback * feedback
+        return signal * (1 - wet_level) + delayed_signal[:samples] * wet_level
+
+    def apply_chorus(self, signal, rate=2.0, depth=0.02, mix=0.5):
+        samples = len(signal)
+        t = np.linspace(0, samples / self.sample_rate, samples)
+        modulation = depth * np.sin(2 * self.pi * rate * t)
+        chorus_signal = np.zeros_like(signal)
+        for i in range(samples):
+            delayed_idx = i - modulation[i] * self.sample_rate
+            if 0 <= delayed_idx < samples - 1:
+                floor_idx = int(delayed_idx)
+                frac = delayed_idx - floor_idx
+                chorus_signal[i] = signal[floor_idx] * (1 - frac) + signal[floor_idx + 1] * frac
+            else:
+                chorus_signal[i] = signal[i]
+        return signal * (1 - mix) + chorus_signal * mix
+
+
+def load_presets():
+    """(label, render(generator)) for every preset in sound_presets/*.json"""
+    presets = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "sound_presets", "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        source = os.path.splitext(os.path.basename(path))[0]
+        entries = data.items() if isinstance(data, dict) else ((e.get("name", ""), e) for e in data)
+        for key, entry in entries:
+            label = f"{source}/{key}".encode("ascii", "ignore").decode().strip()
+            if "config" in entry:
+                config = entry["config"]
+            elif "advanced_config" in entry:
+                config = dict(entry["advanced_config"])
+                config.update(frequency=float(np.mean(entry["frequency_range"])),
+                              duration=entry["duration"], volume=entry["volume"],
+                              envelope={"type": "adsr", **entry.get("envelope", {})})
+            else:
+                method, args = entry["type"], (float(np.mean(entry["frequency_range"])),
+                                               entry["duration"], entry["volume"])
+                presets.append((label, lambda g, m=method, a=args: getattr(g, m)(*a)))
+                continue
+            presets.append((label, lambda g, c=config: g.generate_advanced_sound(c)))
+    return presets
+
+
+def timed(render, generator, seed, repeat):
+    """Output and best time (ms) of `repeat` renders from the same seed"""
+    best = float("inf")
+    for _ in range(repeat):
+        np.random.seed(seed)
+        start = time.perf_counter()
+        result = render(generator)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sound preset benchmark")
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    parser.add_argument("--repeat", type=int, default=3, help="Renders per preset (best time kept)")
+    args = parser.parse_args()
+
+    legacy, new = LegacySoundGenerator(args.sample_rate), AdvancedSoundGenerator(args.sample_rate)
+    failed = False
+    total_legacy = total_new = 0.0
+    print(f"  {'preset':<48} {'legacy':>9} {'new':>8} {'speedup':>8} {'max diff':>10}")
+    for seed, (label, render) in enumerate(load_presets()):
+        expected, legacy_ms = timed(render, legacy, seed, args.repeat)
+        result, new_ms = timed(render, new, seed, args.repeat)
+        diff = float(np.max(np.abs(result - expected)))
+        ok = diff <= args.tolerance and result.shape == expected.shape
+        failed |= not ok
+        total_legacy += legacy_ms
+        total_new += new_ms
+        print(f"  {label[:48]:<48} {legacy_ms:>9.1f} {new_ms:>8.1f} "
+              f"{legacy_ms / max(new_ms, 1e-6):>7.0f}x {diff:>10.2e}{'' if ok else '  MISMATCH'}")
+    print(f"  {'total':<48} {total_legacy:>9.1f} {total_new:>8.1f} "
+          f"{total_legacy / max(total_new, 1e-6):>7.0f}x")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark - GravityFalls trail rendering cost per frame across a video
+
+Compares the legacy full redraw of trail_history on every frame with the
+incremental trail layer used by GravityFallsSimulator. Writes a CSV of
+frame times and, when matplotlib is installed, a frame-time plot.
+
+Usage:
+  python scripts/benchmark_trail_render.py
+  python scripts/benchmark_trail_render.py --duration 60 --fps 60 --output benchmark_outputs
+"""
+
+import os
+import sys
+import csv
+import time
+import random
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import pygame
+
+from src.video_generators.gravity_falls_simulator import GravityFallsSimulator
+
+
+def legacy_trail(surface, trail_history):
+    """Previous behaviour: every stored point redrawn each frame"""
+    for point in trail_history[:-1]:
+        GravityFallsSimulator._draw_trail_point(surface, point)
+
+
+def summarize(name, times_ms):
+    """Mean frame time per tenth of the video"""
+    chunk = max(1, len(times_ms) // 10)
+    means = [sum(times_ms[i:i + chunk]) / len(times_ms[i:i + chunk]) for i in range(0, len(times_ms), chunk)]
+    print(f"  {name:<12} " + " ".join(f"{m:6.2f}" for m in means[:10]) + "  (ms, per 10% of video)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trail rendering benchmark")
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=1920)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--output", default="benchmark_outputs")
+    args = parser.parse_args()
+
+    pygame.init()
+    random.seed(42)
+    sim = GravityFallsSimulator(width=args.width, height=args.height, fps=args.fps, duration=args.duration)
+    sim.initialize_simulation()
+    surface = pygame.Surface((args.width, args.height))
+    dt = 1.0 / args.fps
+
+    incremental_ms, legacy_ms = [], []
+    for frame in range(sim.total_frames):
+        sim.current_frame = frame
+        sim.simulate_frame(dt)
+
+        start = time.perf_counter()
+        sim._render_trail(surface)
+        incremental_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        legacy_trail(surface, sim.trail_history)
+        legacy_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"Trail render time, {sim.total_frames} frames at {args.width}x{args.height}")
+    summarize("legacy", legacy_ms)
+    summarize("incremental", incremental_ms)
+    print(f"  total: legacy {sum(legacy_ms) / 1000:.1f}s, incremental {sum(incremental_ms) / 1000:.1f}s")
+
+    os.makedirs(args.output, exist_ok=True)
+    csv_path = os.path.join(args.output, "trail_frame_times.csv")
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "legacy_ms", "incremental_ms"])
+        for frame, (legacy, incremental) in enumerate(zip(legacy_ms, incremental_ms)):
+            writer.writerow([frame, f"{legacy:.4f}", f"{incremental:.4f}"])
+    print(f"CSV: {csv_path}")
+
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed - skipping plot")
+        return
+
+    plt.figure(figsize=(10, 4))
+    plt.plot(legacy_ms, label="legacy full redraw", linewidth=0.8)
+    plt.plot(incremental_ms, label="incremental layer", linewidth=0.8)
+    plt.xlabel("frame")
+    plt.ylabel("trail render time (ms)")
+    plt.legend()
+    plt.tight_layout()
+    plot_path = os.path.join(args.output, "trail_frame_times.png")
+    plt.savefig(plot_path, dpi=120)
+    print(f"Plot: {plot_path}")
+
+
+if __name__ == "__main__":
+    main()
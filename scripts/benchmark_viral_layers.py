@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark - batched viral collision layers
+
+Renders a collision soundtrack with the ViralSoundEngine's previous
+per-event path (every active layer generated per collision, tail reverb
+per collision with a per-sample damping loop - kept below) and with the
+batched layers (one render per layer for a batch of collisions, one
+reverb on the tail bus), before the master effects, and reports the time
+of each.
+
+Each layer is then rendered alone and compared: sub, body, presence and
+tail must match (--tolerance, relative to the layer's peak). The air
+layer is noise: both paths draw the same values only while the batches'
+rows keep the same length, so only its level is required to match.
+
+Usage:
+  python scripts/benchmark_viral_layers.py
+  python scripts/benchmark_viral_layers.py --events 600 2000 --seconds 90
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.core.data_pipeline import AudioEvent
+from src.audio_generators.viral_audio.viral_sound_engine import ViralSoundEngine
+from src.audio_generators.viral_audio.layers import TailLayer
+
+LAYERS = ["sub", "body", "presence", "air", "tail"]
+
+
+class LegacyTailLayer(TailLayer):
+    """Previous reverb: each tap damped separately, per-sample damping loop"""
+
+    def apply_reverb(self, signal, out=None):
+        samples = len(signal)
+        reverb = np.zeros(samples)
+        for delay_ms, decay in zip([23, 37, 53, 79, 97, 127], [0.7, 0.5, 0.35, 0.25, 0.18, 0.12]):
+            delay_samples = int(int(delay_ms * self.sample_rate / 1000) * self.room_size * 2)
+            if delay_samples < samples:
+                delayed = np.zeros(samples)
+                delayed[delay_samples:] = signal[:samples - delay_samples]
+                reverb += self._apply_damping(delayed) * decay
+        if out is not None:
+            out += reverb
+            return out
+        return reverb
+
+    def _apply_damping(self, signal):
+        damped = np.zeros_like(signal)
+        damped[0] = signal[0]
+        alpha = self.damping
+        for i in range(1, len(signal)):
+            damped[i] = alpha * signal[i] + (1 - alpha) * damped[i - 1]
+        return damped
+
+
+class BenchmarkEngine(ViralSoundEngine):
+    """Keeps the buffer before the master effects, writes nothing"""
+
+    solo = None   # Only this layer in the mix (all layers when None)
+
+    def _get_mix_ratios(self):
+        ratios = super()._get_mix_ratios()
+        if self.solo is None:
+            return ratios
+        return {name: (ratio if name == self.solo else 0.0) for name, ratio in ratios.items()}
+
+    def _apply_master_effects(self):
+        pass
+
+    def _normalize_and_save(self):
+        pass
+
+
+class LegacyEngine(BenchmarkEngine):
+    """Previous per-event collision path"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.layers['tail'] = LegacyTailLayer(self.sample_rate)
+
+    def _process_collision_standard(self, event):
+        velocity = event.params.get('velocity_magnitude', 800.0)
+        bounce_count = event.params.get('bounce_count', 1)
+        ball_size = event.params.get('ball_size', 30.0)
+        audio_params = self.humanizer.humanize(self.velocity_mapper.map(velocity))
+        self.progressive_builder.update(bounce_count)
+        active_layers = self.progressive_builder.get_active_layers()
+        harmonic_richness = self.progressive_builder.get_harmonic_richness()
+        if self.mode == 'midi_music' and self.midi_notes:
+            base_freq = self.midi_notes[self.current_note_index % len(self.midi_notes)]
+            self.current_note_index += 1
+        else:
+            base_freq = max(80, min(500, 200.0 * (30.0 / max(ball_size, 10.0))))
+        sound_duration = 0.15 + (audio_params['intensity'] * 0.15)
+
+        layer_signals = {}
+        for layer_name in active_layers:
+            if layer_name in self.layers:
+                signal = self.layers[layer_name].generate(
+                    frequency=base_freq, duration=sound_duration,
+                    intensity=audio_params['intensity'], richness=harmonic_richness)
+                layer_signals[layer_name] = signal * self.progressive_builder.get_layer_volume(layer_name)
+
+        if not layer_signals:
+            return
+        max_len = max(len(s) for s in layer_signals.values())
+        mixed = np.zeros(max_len, dtype=np.float32)
+        mix_ratios = self._get_mix_ratios()
+        for layer_name, signal in layer_signals.items():
+            mixed += np.pad(signal, (0, max_len - len(signal))) * mix_ratios.get(layer_name, 0.5)
+
+        start_sample = int(event.time * self.sample_rate)
+        end_sample = min(start_sample + len(mixed), len(self.audio_data))
+        if start_sample < len(self.audio_data):
+            self.audio_data[start_sample:end_sample] += mixed[:end_sample - start_sample] * audio_params['volume']
+
+
+def make_events(count: int, seconds: float, seed: int = 3):
+    rng = random.Random(seed)
+    times = sorted(rng.uniform(0, seconds) for _ in range(count))
+    return [AudioEvent("collision", t, params={"velocity_magnitude": rng.uniform(200, 2500),
+                                               "bounce_count": i + 1,
+                                               "ball_size": rng.uniform(10, 60)})
+            for i, t in enumerate(times)]
+
+
+def render(engine_class, events, seconds, sample_rate, solo=None):
+    """Buffer before the master effects, and the generation time (ms), from fixed seeds"""
+    engine = engine_class(sample_rate, mode='maximum_punch')
+    engine.solo = solo
+    engine.set_duration(seconds)
+    engine.add_events(events)
+    random.seed(0)
+    np.random.seed(0)
+    start = time.perf_counter()
+    engine.generate()
+    return engine.audio_data.astype(np.float64), (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched viral collision layers benchmark")
+    parser.add_argument("--events", type=int, nargs="+", default=[600, 1500])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--tolerance", type=float, default=1e-5,
+                        help="Largest difference allowed, relative to the peak of the layer")
+    args = parser.parse_args()
+    logging.getLogger("TikSimPro").setLevel(logging.WARNING)
+
+    failed = False
+    print(f"  {'events':>7} {'legacy ms':>10} {'batch ms':>9} {'speedup':>8}")
+    for count in args.events:
+        events = make_events(count, args.seconds)
+        _, legacy_ms = render(LegacyEngine, events, args.seconds, args.sample_rate)
+        _, batch_ms = render(BenchmarkEngine, events, args.seconds, args.sample_rate)
+        print(f"  {count:>7} {legacy_ms:>10.1f} {batch_ms:>9.1f} {legacy_ms / batch_ms:>7.1f}x")
+
+    events = make_events(args.events[0], args.seconds)
+    print()
+    print(f"  {'layer':<9} {'max diff':>10} {'level legacy':>13} {'level batch':>12}")
+    for layer in LAYERS:
+        expected, _ = render(LegacyEngine, events, args.seconds, args.sample_rate, solo=layer)
+        result, _ = render(BenchmarkEngine, events, args.seconds, args.sample_rate, solo=layer)
+        peak = max(np.max(np.abs(expected)), 1e-12)
+        diff = np.max(np.abs(result - expected)) / peak
+        line = (f"  {layer:<9} {diff:>10.2e} {np.sqrt(np.mean(expected ** 2)):>13.5f} "
+                f"{np.sqrt(np.mean(result ** 2)):>12.5f}")
+        if layer == "air":
+            line += "  (noise: level only)"
+        elif diff > args.tolerance:
+            line += "  MISMATCH"
+            failed = True
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
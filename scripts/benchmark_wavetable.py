@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark - wavetable oscillators
+
+1. Renders every preset of AdvancedSoundGenerator and SatisfyingSoundEngine
+   across a melody range with the previous np.sin/naive oscillators (kept
+   below, in subclasses) and with the band-limited wavetables, and reports
+   the time of each and the level of the difference (same noise). The
+   previous oscillators ran slightly sharp (a linspace of n - 1 steps over
+   n samples), a drift that dominates the difference on high notes.
+2. Measures the aliasing of the naive and table saw/square/triangle: the
+   share of the energy that is not at a harmonic of the note.
+
+Usage:
+  python scripts/benchmark_wavetable.py
+  python scripts/benchmark_wavetable.py --repeat 5
+"""
+
+import os
+import sys
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.audio_generators.note_cache import NoteCache
+from src.audio_generators.simple_midi_audio_generator import AdvancedSoundGenerator
+from src.audio_generators.satisfying_audio_generator import (
+    SatisfyingSoundEngine, SATISFYING_PRESETS)
+
+ADVANCED_PRESETS = ["satisfying_bounce", "asmr_pop", "soft_chime", "water_drop", "gentle_pluck",
+                    "crystal_ting", "ultra_satisfying_bounce", "deep_asmr_pop", "velvet_chime",
+                    "bubble_pop"]
+FREQUENCIES = [110.0, 261.63, 523.25, 1046.5, 2093.0]
+
+
+class LegacySoundGenerator(AdvancedSoundGenerator):
+    """Previous oscillators: np.sin over a linspace, naive square/saw/triangle"""
+
+    def generate_waveform(self, waveform_type, frequency, samples, phase=0.0):
+        t = np.linspace(0, samples / self.sample_rate, samples)
+        if waveform_type == "square":
+            return np.sign(np.sin(2 * self.pi * frequency * t + phase))
+        elif waveform_type == "sawtooth":
+            return 2 * (t * frequency - np.floor(t * frequency + 0.5))
+        elif waveform_type == "triangle":
+            saw = 2 * (t * frequency - np.floor(t * frequency + 0.5))
+            return 2 * np.abs(saw) - 1
+        elif waveform_type == "pulse":
+            return np.where(np.sin(2 * self.pi * frequency * t + phase) > 0, 1, -1)
+        elif waveform_type in self.NOISE_WAVEFORMS:
+            return super().generate_waveform(waveform_type, frequency, samples, phase)
+        return np.sin(2 * self.pi * frequency * t + phase)
+
+    def _render_partials(self, partials, noises, frequency, samples):
+        signal = np.zeros(samples)
+        for partial in partials:
+            signal += self.generate_waveform(partial.waveform, frequency * partial.ratio, samples,
+                                             partial.phase * 2 * self.pi) * partial.amplitude
+        for waveform, amplitude in noises:
+            signal += self.generate_waveform(waveform, frequency, samples) * amplitude
+        return signal
+
+
+class LegacySatisfyingEngine(SatisfyingSoundEngine):
+    """Previous generate_sound: one np.sin per partial"""
+
+    def generate_sound(self, preset, frequency=None, duration=None, volume=0.7):
+        freq = frequency if frequency else preset.base_freq
+        total_ms = preset.attack_ms + preset.decay_ms + preset.release_ms
+        dur = duration if duration else (total_ms / 1000.0)
+        dur = max(dur, total_ms / 1000.0)
+        samples = int(dur * self.sample_rate)
+        t = np.linspace(0, dur, samples)
+        pitch_env = self._create_pitch_envelope(samples, preset.pitch_drop)
+        signal = np.sin(self.pi2 * freq * t * pitch_env)
+        for i, harm_ratio in enumerate(preset.harmonics):
+            harm_freq = freq * harm_ratio
+            if harm_freq < self.sample_rate / 2:
+                signal += 0.5 / (i + 2) * np.sin(self.pi2 * harm_freq * t * pitch_env)
+        if preset.sub_bass_amount > 0:
+            signal += preset.sub_bass_amount * 0.5 * np.sin(self.pi2 * min(freq * 0.5, 80) * t)
+        if preset.noise_amount > 0:
+            signal += self._generate_filtered_noise(samples, freq, preset.brightness) * preset.noise_amount
+        signal *= self._create_adsr_envelope(samples, preset.attack_ms, preset.decay_ms, 0.3,
+                                             preset.release_ms)
+        if preset.brightness > 0.5:
+            signal = self._add_brightness(signal, preset.brightness)
+        return (np.tanh(signal * 1.5) * 0.7 * volume).astype(np.float32)
+
+
+def timed(render, repeat):
+    """Output and best time (ms) of `repeat` renders from the same random seed"""
+    best = float("inf")
+    for _ in range(repeat):
+        state = np.random.get_state()
+        np.random.seed(0)
+        start = time.perf_counter()
+        result = render()
+        best = min(best, (time.perf_counter() - start) * 1000)
+        np.random.set_state(state)
+    return np.asarray(result, dtype=np.float64), best
+
+
+def level_db(difference, reference):
+    rms = np.sqrt(np.mean(np.square(difference)))
+    return 20 * np.log10(max(rms, 1e-12) / max(np.sqrt(np.mean(np.square(reference))), 1e-12))
+
+
+def alias_db(signal, frequency, sample_rate):
+    """Energy outside the harmonics of `frequency` (+-2 bins), relative to the total (dB)"""
+    spectrum = np.abs(np.fft.rfft(signal * np.hanning(len(signal)))) ** 2
+    freqs = np.fft.rfftfreq(len(signal), 1 / sample_rate)
+    nearest = np.round(freqs / frequency) * frequency
+    harmonic = (np.abs(freqs - nearest) <= 2 * sample_rate / len(signal)) & (nearest > 0)
+    return 10 * np.log10(max(spectrum[~harmonic].sum(), 1e-30) / spectrum.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wavetable oscillator benchmark")
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--repeat", type=int, default=3, help="Renders per note (best time kept)")
+    args = parser.parse_args()
+    sr = args.sample_rate
+
+    legacy, new = LegacySoundGenerator(sr), AdvancedSoundGenerator(sr)
+    legacy_engine = LegacySatisfyingEngine(sr, note_cache=NoteCache())
+    new_engine = SatisfyingSoundEngine(sr, note_cache=NoteCache())
+    renders = [(name, lambda g, f, n=name: getattr(g, n)(f, 0.5, 0.5), legacy, new)
+               for name in ADVANCED_PRESETS]
+    renders += [(sound_type.value, lambda e, f, p=preset: e.generate_sound(p, f, None, 0.7),
+                 legacy_engine, new_engine) for sound_type, preset in SATISFYING_PRESETS.items()]
+
+    print(f"  {'preset':<26} {'legacy ms':>10} {'table ms':>9} {'speedup':>8} {'diff dB':>8}")
+    total_legacy = total_new = 0.0
+    for name, render, old_gen, new_gen in renders:
+        legacy_ms = new_ms = 0.0
+        worst = -np.inf
+        for frequency in FREQUENCIES:
+            # Warm the wavetables, as a run plays each note many times
+            render(new_gen, frequency)
+            expected, ms = timed(lambda: render(old_gen, frequency), args.repeat)
+            legacy_ms += ms
+            result, ms = timed(lambda: render(new_gen, frequency), args.repeat)
+            new_ms += ms
+            worst = max(worst, level_db(result - expected, expected))
+        total_legacy += legacy_ms
+        total_new += new_ms
+        print(f"  {name:<26} {legacy_ms:>10.2f} {new_ms:>9.2f} {legacy_ms / new_ms:>7.1f}x {worst:>8.1f}")
+    print(f"  {'total':<26} {total_legacy:>10.2f} {total_new:>9.2f} {total_legacy / total_new:>7.1f}x")
+
+    print()
+    print(f"  {'waveform':<10} {'Hz':>7} {'naive alias dB':>15} {'table alias dB':>15}")
+    for waveform in ("sawtooth", "square", "triangle"):
+        for frequency in (440.0, 1760.0, 3520.0):
+            naive = legacy.generate_waveform(waveform, frequency, sr)
+            table = new.generate_waveform(waveform, frequency, sr)
+            print(f"  {waveform:<10} {frequency:>7.0f} {alias_db(naive, frequency, sr):>15.1f} "
+                  f"{alias_db(table, frequency, sr):>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compile MIDI files - precompiles every .mid/.midi file of the music folder
+into the MIDI cache (notes, onsets, tempo map, melody track), so the audio
+generators never parse MIDI during a run.
+
+The artefacts go to ~/.tiksimpro/midi_cache, or $TIKSIMPRO_MIDI_CACHE_DIR.
+
+Usage:
+  python scripts/compile_midi.py
+  python scripts/compile_midi.py --folder music --timing
+"""
+
+import os
+import sys
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_generators.midi_cache import MidiCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile MIDI files into the MIDI cache")
+    parser.add_argument("--folder", default="music", help="Folder of MIDI files")
+    parser.add_argument("--timing", action="store_true", help="Also time a cached load per file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"Folder not found: {args.folder}")
+        return 1
+
+    cache = MidiCache()
+    start = time.perf_counter()
+    results = cache.compile_folder(args.folder)
+    elapsed = time.perf_counter() - start
+    print(f"{len(results)} MIDI files -> {cache.cache_dir} ({elapsed:.2f}s)")
+    for path, compiled in results.items():
+        name = os.path.basename(path)
+        if compiled is None:
+            print(f"  {name:<45} FAILED")
+            continue
+        line = (f"  {name:<45} {len(compiled.notes):>6} notes  melody track {compiled.melody_track:>2} "
+                f"({len(compiled.melody_notes()):>5} notes)  {compiled.bpm:6.1f} BPM")
+        if args.timing:
+            start = time.perf_counter()
+            MidiCache(cache.cache_dir).load(path)
+            disk_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            cache.load(path)
+            memory_us = (time.perf_counter() - start) * 1e6
+            line += f"  disk {disk_ms:.2f} ms, memory {memory_us:.0f} us"
+        print(line)
+    return 0 if all(c is not None for c in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Memory profile - audio renders
+
+Renders a soundtrack of --seconds with each audio generator (viral engine,
+simple MIDI, satisfying) in a fresh process, and reports:
+
+- peak RSS: peak resident memory of the process, and its growth during
+  the render (the interpreter and libraries are loaded before it)
+- traced peak: largest total of live allocations during the render, from
+  tracemalloc (which sees the NumPy buffers) - in a second process, as
+  tracing slows the render and holds memory of its own
+- allocated: total size of the large buffers the render allocated, the
+  freed temporaries included. The renders run with a fixed malloc mmap
+  threshold (64 KiB): every larger buffer is then a fresh mapping whose
+  pages fault in as it is first written, so minor page faults x page
+  size is the volume of those allocations. NumPy has no allocation
+  counter, this is the closest churn measure.
+
+Usage:
+  python scripts/profile_audio_memory.py
+  python scripts/profile_audio_memory.py --seconds 60 --events 600 --renders viral midi
+"""
+
+import os
+import sys
+import json
+import random
+import logging
+import argparse
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RENDERS = ["viral", "midi", "satisfying"]
+MMAP_THRESHOLD = 64 * 1024
+
+
+def make_events(count: int, seconds: float, seed: int = 11):
+    """Collisions, and a passage every 10 events"""
+    from src.core.data_pipeline import AudioEvent
+    rng = random.Random(seed)
+    events = []
+    for i, t in enumerate(sorted(rng.uniform(0, seconds - 0.5) for _ in range(count))):
+        if i % 10 == 9:
+            events.append(AudioEvent("passage", t, params={"layer_index": i // 10,
+                                                           "total_layers": count // 10}))
+        else:
+            events.append(AudioEvent("collision", t, params={"velocity_magnitude": rng.uniform(200, 2500),
+                                                             "bounce_count": i + 1,
+                                                             "ball_size": rng.uniform(10, 60),
+                                                             "volume": rng.choice((0.4, 0.6, 0.8))}))
+    return events
+
+
+def make_generator(name: str, seconds: float, output_path: str):
+    if name == "viral":
+        from src.audio_generators.viral_audio.viral_sound_engine import ViralSoundEngine
+        generator = ViralSoundEngine(mode="maximum_punch")
+    elif name == "midi":
+        from src.audio_generators.simple_midi_audio_generator import SimpleMidiAudioGenerator
+        generator = SimpleMidiAudioGenerator()
+        generator.melody_notes = generator.midi_extractor.get_default_melody()
+    else:
+        from src.audio_generators.satisfying_audio_generator import SatisfyingAudioGenerator
+        generator = SatisfyingAudioGenerator()
+    generator.duration = seconds
+    generator.output_path = output_path
+    return generator
+
+
+def measure(name: str, seconds: float, count: int, trace: bool) -> dict:
+    """Render in this process and measure it"""
+    import numpy as np
+    logging.getLogger("TikSimPro").setLevel(logging.WARNING)
+    random.seed(0)
+    np.random.seed(0)
+    with tempfile.TemporaryDirectory() as folder:
+        generator = make_generator(name, seconds, os.path.join(folder, "render.wav"))
+        generator.add_events(make_events(count, seconds))
+        if trace:
+            tracemalloc.start()
+            generator.generate()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return {"traced_peak": peak / 2 ** 20}
+
+        before = resource.getrusage(resource.RUSAGE_SELF)
+        generator.generate()
+        after = resource.getrusage(resource.RUSAGE_SELF)
+    return {"peak_rss": after.ru_maxrss / 1024,
+            "rss_growth": (after.ru_maxrss - before.ru_maxrss) / 1024,
+            "allocated": (after.ru_minflt - before.ru_minflt) * resource.getpagesize() / 2 ** 20}
+
+
+def run_child(name: str, args, trace: bool) -> dict:
+    command = [sys.executable, os.path.abspath(__file__), "--child", name,
+               "--seconds", str(args.seconds), "--events", str(args.events)]
+    if trace:
+        command.append("--trace")
+    env = dict(os.environ, MALLOC_MMAP_THRESHOLD_=str(MMAP_THRESHOLD))
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory and allocations of the audio renders")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--events", type=int, default=600)
+    parser.add_argument("--renders", nargs="+", choices=RENDERS, default=RENDERS)
+    parser.add_argument("--child", choices=RENDERS, help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.seconds, args.events, args.trace)))
+        return 0
+
+    print(f"{args.seconds:.0f}s, {args.events} events")
+    print(f"  {'render':<11} {'peak RSS MiB':>13} {'growth MiB':>11} {'traced peak MiB':>16} "
+          f"{'allocated MiB':>14}")
+    for name in args.renders:
+        result = run_child(name, args, trace=False)
+        result.update(run_child(name, args, trace=True))
+        print(f"  {name:<11} {result['peak_rss']:>13.1f} {result['rss_growth']:>11.1f} "
+              f"{result['traced_peak']:>16.1f} {result['allocated']:>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,70 @@ Base class interface for all audio generators.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 import os
+import wave
+
+import numpy as np
 
 from src.core.data_pipeline import TrendData, AudioEvent
 
+AUDIO_BLOCK_SIZE = 65536   # Samples per streamed PCM block
+
+
+@dataclass
+class AudioStream:
+    """
+    Audio track produced block by block: signed 16-bit little-endian PCM
+    (interleaved when several channels). The blocks are generated lazily,
+    while they are consumed, and can only be consumed once.
+    """
+    sample_rate: int
+    channels: int
+    blocks: Iterable[bytes]
+
+    def write_wav(self, path: str) -> str:
+        """Consume the stream into a WAV file"""
+        with wave.open(path, 'w') as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            for block in self.blocks:
+                wav_file.writeframes(block)
+        return path
+
+
+def buffer_blocks(samples: np.ndarray, block_size: int = AUDIO_BLOCK_SIZE) -> Iterator[np.ndarray]:
+    """Consecutive views of `block_size` samples of a buffer (the last one shorter)"""
+    for start in range(0, len(samples), block_size):
+        yield samples[start:start + block_size]
+
+
+def peak_level(samples: np.ndarray) -> float:
+    """max(|samples|), without the full-length |samples| temporary"""
+    if len(samples) == 0:
+        return 0.0
+    return max(float(np.max(samples)), -float(np.min(samples)))
+
+
+def pcm16(blocks: Iterable[np.ndarray]) -> Iterator[bytes]:
+    """
+    Float blocks in [-1, 1] as 16-bit PCM bytes, truncated like
+    (block * 32767).astype(np.int16) - through two scratch buffers reused
+    for every block instead of two temporaries per block.
+    """
+    scaled = pcm = None
+    for block in blocks:
+        if scaled is None or len(scaled) < len(block):
+            scaled = np.empty(len(block), dtype=np.float32)
+            pcm = np.empty(len(block), dtype=np.int16)
+        n = len(block)
+        np.multiply(block, 32767, out=scaled[:n], casting="unsafe")
+        np.copyto(pcm[:n], scaled[:n], casting="unsafe")
+        yield pcm[:n].tobytes()
+
+
 class IAudioGenerator(ABC):
     """Interface for audio generators"""
     
@@ -75,6 +134,21 @@ class IAudioGenerator(ABC):
         """
         pass
 
+    def stream(self, block_size: int = AUDIO_BLOCK_SIZE) -> Optional[AudioStream]:
+        """
+        Generate the audio track as a stream of PCM blocks instead of a
+        file, for a consumer (the media combiner) that encodes it as it
+        arrives. Same track as generate(), without the full-length buffer
+        and the WAV round-trip.
+        
+        Args:
+            block_size: Samples per block
+            
+        Returns:
+            The stream, or None if this generator only supports generate()
+        """
+        return None
+
     def set_output_path(self, path: str) -> None:
         self.output_path = path
         os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -8,12 +8,12 @@ import json
 import os
 import random
 import numpy as np
-import wave
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 from .simple_midi_audio_generator import SimpleSoundGenerator, SimpleMidiExtractor
-from .base_audio_generator import IAudioGenerator
+from .event_mixer import EventMixer
+from .base_audio_generator import IAudioGenerator, AudioStream, AUDIO_BLOCK_SIZE, buffer_blocks, peak_level, pcm16
 from ..core.data_pipeline import TrendData, AudioEvent
 
 logger = logging.getLogger(__name__)
@@ -21,6 +21,10 @@ logger = logging.getLogger(__name__)
 class CustomSoundGenerator:
     """Générateur de sons utilisant les configurations personnalisées"""
     
+    # Types de sons supportés (méthodes de preset du générateur avancé)
+    SOUND_TYPES = ("satisfying_bounce", "asmr_pop", "soft_chime",
+                   "water_drop", "gentle_pluck", "crystal_ting")
+    
     def __init__(self, sample_rate: int = 44100):
         self.sample_rate = sample_rate
         self.sound_generator = SimpleSoundGenerator(sample_rate=sample_rate)
@@ -115,32 +119,29 @@ class CustomSoundGenerator:
             
     def generate_sound_from_config(self, config: Dict[str, Any], frequency: Optional[float] = None) -> np.ndarray:
         """Génère un son à partir d'une configuration"""
+        sound, gain = self.cached_sound_from_config(config, frequency)
+        return sound * gain
+    
+    def cached_sound_from_config(self, config: Dict[str, Any],
+                                 frequency: Optional[float] = None) -> Tuple[np.ndarray, float]:
+        """
+        Son d'une configuration via le cache de notes partagé
+        
+        Returns:
+            (forme d'onde en lecture seule, gain à appliquer au mixage)
+        """
+        # Type inconnu : fallback vers satisfying_bounce
+        sound_type = config["type"] if config["type"] in self.SOUND_TYPES else "satisfying_bounce"
+        duration = config["duration"]
+        volume = config["volume"]
         
-        # Utilise une fréquence spécifique ou en génère une aléatoire dans la plage
+        # Fréquence aléatoire dans la plage : son unique, généré sans passer par le cache
         if frequency is None:
             freq_min, freq_max = config["frequency_range"]
             frequency = random.uniform(freq_min, freq_max)
+            return getattr(self.sound_generator, sound_type)(frequency, duration, volume), 1.0
         
-        sound_type = config["type"]
-        duration = config["duration"]
-        volume = config["volume"]
-        
-        # Génère le son selon le type
-        if sound_type == "satisfying_bounce":
-            return self.sound_generator.satisfying_bounce(frequency, duration, volume)
-        elif sound_type == "asmr_pop":
-            return self.sound_generator.asmr_pop(frequency, duration, volume)
-        elif sound_type == "soft_chime":
-            return self.sound_generator.soft_chime(frequency, duration, volume)
-        elif sound_type == "water_drop":
-            return self.sound_generator.water_drop(frequency, duration, volume)
-        elif sound_type == "gentle_pluck":
-            return self.sound_generator.gentle_pluck(frequency, duration, volume)
-        elif sound_type == "crystal_ting":
-            return self.sound_generator.crystal_ting(frequency, duration, volume)
-        else:
-            # Fallback vers satisfying_bounce
-            return self.sound_generator.satisfying_bounce(frequency, duration, volume)
+        return self.sound_generator.cached_preset_sound(sound_type, frequency, duration, volume)
             
     def generate_random_sound(self, frequency: Optional[float] = None) -> np.ndarray:
         """Génère un son aléatoire à partir des presets"""
@@ -168,6 +169,9 @@ class CustomSoundGenerator:
 class CustomMidiAudioGenerator(IAudioGenerator):
     """Générateur audio personnalisé basé sur SimpleMidiAudioGenerator avec les presets du Sound Designer"""
     
+    # Variations de fréquence organiques (en pas fixes pour que les notes restent en cache)
+    ORGANIC_DETUNE = (0.95, 0.9625, 0.975, 0.9875, 1.0, 1.0125, 1.025, 1.0375, 1.05)
+    
     def __init__(self, sample_rate: int = 44100):
         self.sample_rate = sample_rate
         self.output_path = "output/custom_audio.wav"
@@ -290,18 +294,57 @@ class CustomMidiAudioGenerator(IAudioGenerator):
             logger.error(f"Erreur lors de la génération: {e}")
             return None
     
+    def stream(self, block_size: int = AUDIO_BLOCK_SIZE) -> Optional[AudioStream]:
+        """Génère l'audio en blocs PCM 16-bit (même piste que generate(), sans WAV)"""
+        # Sélectionne un preset s'il n'y en a pas déjà un
+        if not self.current_preset and self.available_presets:
+            self.current_preset = random.choice(self.available_presets)
+        logger.info(f"Preset utilisé: {self.current_preset} (en flux)")
+        
+        total_samples = int(self.sample_rate * self.duration)
+        mixer = self._place_events(total_samples)
+        if mixer is None:
+            mixer = EventMixer(total_samples)  # Silence
+        duck_amount = 2.0 if self.auto_volume_adjust else 0.0
+
+        def blocks():
+            # Première passe pour le pic (normalisation), seconde pour la sortie
+            max_val = 0.0
+            for block in mixer.render_blocks(block_size, duck_amount):
+                max_val = max(max_val, peak_level(block))
+            gain = self._output_gain(max_val)
+
+            offset = 0
+            for block in mixer.render_blocks(block_size, duck_amount):
+                block *= gain
+                self._apply_fades(block, offset, total_samples)
+                offset += len(block)
+                yield block
+
+        return AudioStream(self.sample_rate, 1, pcm16(blocks()))
+
     def _process_events(self):
         """Traite les événements et joue les notes - identique à SimpleMidiAudioGenerator"""
-        if not self.melody_notes:
-            logger.warning("Mélodie indisponible")
-            return
-
         if self.audio_data is None or len(self.audio_data) == 0:
             logger.warning("Buffer audio indisponible")
             return
 
+        mixer = self._place_events(len(self.audio_data))
+        if mixer is not None:
+            # Les notes superposées sont réduites progressivement selon l'activité autour d'elles
+            mixer.render(duck_amount=2.0 if self.auto_volume_adjust else 0.0, out=self.audio_data)
+
+    def _place_events(self, total_samples: int) -> Optional[EventMixer]:
+        """Notes des événements placées sur la timeline (mixées par l'appelant)"""
+        if not self.melody_notes:
+            logger.warning("Mélodie indisponible")
+            return None
+
         note_index = 0
 
+        # Les notes sont collectées, puis mixées (et atténuées) en une seule passe
+        mixer = EventMixer(total_samples)
+
         for event in self.events:
             try:
                 # Joue une note sur tous les événements intéressants
@@ -311,32 +354,21 @@ class CustomMidiAudioGenerator(IAudioGenerator):
                     frequency = self.melody_notes[note_index % len(self.melody_notes)]
                     note_index += 1
                     
-                    # Calcul intelligent du volume
                     start_sample = int(event.time * self.sample_rate)
                     
-                    # Génère le son pour cette note
-                    sound = self._generate_sound(frequency, event)
+                    # Génère le son pour cette note (en cache, volume appliqué au mixage)
+                    sound, gain = self._generate_sound(frequency, event)
                     
-                    # Gère les sons superposés
-                    end_sample = min(start_sample + len(sound), len(self.audio_data))
-
-                    if start_sample < len(self.audio_data):
-                        length = end_sample - start_sample
-                        
-                        # Compte les notes actives simultanément
-                        if self.auto_volume_adjust:
-                            region_activity = np.mean(np.abs(self.audio_data[start_sample:end_sample]))
-                            volume_reduction = 1.0 / (1.0 + region_activity * 2)  # Réduction progressive
-                            sound = sound * volume_reduction
-                        
-                        # Superposition naturelle
-                        self.audio_data[start_sample:end_sample] += sound[:length]
+                    # Superposition naturelle
+                    mixer.add(sound, start_sample, gain)
 
             except Exception as e:
                 logger.warning(f"Erreur événement: {e}")
 
-    def _generate_sound(self, frequency: float, event: AudioEvent) -> np.ndarray:
-        """Génère un son personnalisé organique et ASMR"""
+        return mixer
+
+    def _generate_sound(self, frequency: float, event: AudioEvent) -> Tuple[np.ndarray, float]:
+        """Génère un son personnalisé organique et ASMR : (forme d'onde, gain de mixage)"""
         
         # Volume de base adaptatif selon l'événement
         base_volume = self.volume
@@ -350,7 +382,7 @@ class CustomMidiAudioGenerator(IAudioGenerator):
         base_volume = min(base_volume, 0.8)
         
         # Variation de fréquence organique pour plus de naturel
-        frequency_variation = random.uniform(0.95, 1.05)
+        frequency_variation = random.choice(self.ORGANIC_DETUNE)
         organic_frequency = frequency * frequency_variation
         
         # Génère le son selon le preset sélectionné ou aléatoire
@@ -360,11 +392,11 @@ class CustomMidiAudioGenerator(IAudioGenerator):
                 # Crée une copie pour ne pas modifier l'original
                 config_copy = config.copy()
                 config_copy["volume"] = base_volume
-                sound = self.custom_sound_gen.generate_sound_from_config(config_copy, organic_frequency)
-                return sound
+                return self.custom_sound_gen.cached_sound_from_config(config_copy, organic_frequency)
         
         # Fallback : génère un son aléatoire avec fréquence organique
-        return self.custom_sound_gen.generate_random_sound(organic_frequency)
+        return self.custom_sound_gen.cached_sound_from_config(
+            self.custom_sound_gen.get_random_config(), organic_frequency)
     
     def _normalize_and_save(self):
         """Normalise et sauvegarde la sortie audio - identique à SimpleMidiAudioGenerator"""
@@ -374,33 +406,45 @@ class CustomMidiAudioGenerator(IAudioGenerator):
             return
         
         # Étape 1: Normalisation
-        max_val = np.max(np.abs(self.audio_data))
+        self.audio_data *= self._output_gain(peak_level(self.audio_data))
+        
+        # Étape 2: Applique un fade in/out doux (50 ms)
+        self._apply_fades(self.audio_data, 0, len(self.audio_data))
+
+        # Étape 3: Exporte en fichier WAV
+        self._save_to_wav()
 
+    def _output_gain(self, max_val: float) -> float:
+        """Gain de normalisation d'un mix dont le pic vaut max_val"""
         if max_val > 1.0:
             # Compression douce pour éviter l'écrêtage
             compression_ratio = 0.8 / max_val
-            self.audio_data = self.audio_data * compression_ratio
             logger.info(f"Compression appliquée: {compression_ratio:.3f}")
-        else:
-            # Amplification douce si le signal est trop faible
-            if 0 < max_val < 0.3:
-                amplification = 0.7 / max_val
-                self.audio_data = self.audio_data * amplification
-                logger.info(f"Amplification appliquée: {amplification:.3f}")
-        
-        # Étape 2: Applique un fade in/out doux (50 ms)
-        fade_samples = int(0.05 * self.sample_rate)  # 50 ms de durée de fade
-        if len(self.audio_data) > fade_samples * 2:
+            return compression_ratio
+        # Amplification douce si le signal est trop faible
+        if 0 < max_val < 0.3:
+            amplification = 0.7 / max_val
+            logger.info(f"Amplification appliquée: {amplification:.3f}")
+            return amplification
+        return 1.0
+
+    def _apply_fades(self, samples: np.ndarray, offset: int, total_samples: int):
+        """Fade in/out doux de 50 ms sur `samples`, placé à `offset` dans une piste de total_samples"""
+        fade_samples = int(0.05 * self.sample_rate)
+        if total_samples <= fade_samples * 2:
+            return
+        end = offset + len(samples)
+        if offset < fade_samples:
             # Fade-in doux (sinusoïdal)
             fade_in = np.sin(np.linspace(0, np.pi / 2, fade_samples)) ** 2
-            self.audio_data[:fade_samples] *= fade_in
-
+            stop = min(end, fade_samples)
+            samples[:stop - offset] *= fade_in[offset:stop]
+        fade_start = total_samples - fade_samples
+        if end > fade_start:
             # Fade-out doux (basé sur cosinus)
             fade_out = np.cos(np.linspace(0, np.pi / 2, fade_samples)) ** 2
-            self.audio_data[-fade_samples:] *= fade_out
-
-        # Étape 3: Exporte en fichier WAV
-        self._save_to_wav()
+            first = max(offset, fade_start)
+            samples[first - offset:] *= fade_out[first - fade_start:end - fade_start]
 
     def _save_to_wav(self):
         """Sauvegarde le buffer audio dans un fichier WAV"""
@@ -410,14 +454,8 @@ class CustomMidiAudioGenerator(IAudioGenerator):
             return
         
         try:
-            # Convertit float32 en PCM 16-bit
-            audio_int16 = (self.audio_data * 32767).astype(np.int16)
-
-            with wave.open(self.output_path, 'w') as wav_file:
-                wav_file.setnchannels(1)         # Mono
-                wav_file.setsampwidth(2)         # échantillons 16-bit
-                wav_file.setframerate(self.sample_rate)
-                wav_file.writeframes(audio_int16.tobytes())
+            # Convertit float32 en PCM 16-bit (mono), bloc par bloc
+            AudioStream(self.sample_rate, 1, pcm16(buffer_blocks(self.audio_data))).write_wav(self.output_path)
             
             logger.info(f"Fichier WAV sauvegardé: {self.output_path}")
         
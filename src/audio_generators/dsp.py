@@ -0,0 +1,186 @@
+# src/audio_generators/dsp.py
+"""
+DSP core - vectorised filters, delay lines and convolution shared by the
+sound generators (pure NumPy, no per-sample Python loops).
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+BLOCK_SIZE = 2048      # Samples per row of the recursive filter solver
+
+
+def one_pole(drive: np.ndarray, coef: complex, initial: complex = 0.0) -> np.ndarray:
+    """
+    First-order recursion y[i] = coef * y[i-1] + drive[i], with y[-1] = initial.
+
+    The signal is cut into rows in which the recursion has the closed form
+    y[j] = coef**(j+1) * (y_in + sum(drive[k] / coef**(k+1), k <= j)), solved for
+    all rows at once; only the state carried from one row to the next is
+    chained in Python. Rows are kept short enough for coef**row to stay in
+    float64 range. `coef` may be complex (one pole of a higher-order filter).
+
+    Returns:
+        float64 (complex128 for a complex coef/drive) array, same length as drive
+    """
+    drive = np.asarray(drive)
+    dtype = np.result_type(drive, coef, initial, np.float64)
+    n = len(drive)
+    if n == 0:
+        return np.zeros(0, dtype=dtype)
+    if coef == 0:
+        return drive.astype(dtype)
+
+    log_magnitude = abs(np.log10(abs(coef)))
+    block = BLOCK_SIZE if log_magnitude * BLOCK_SIZE <= 200 else max(1, int(200 / log_magnitude))
+    rows = -(-n // block)
+    x = np.zeros(rows * block, dtype=dtype)
+    x[:n] = drive
+    x = x.reshape(rows, block)
+
+    decay = np.asarray(coef, dtype=dtype) ** np.arange(1, block + 1)
+    partial = np.cumsum(x * (1 / decay), axis=1)
+
+    # State entering each row, from the end of the previous one
+    starts = np.empty(rows, dtype=dtype)
+    start, row_decay = initial, decay[-1]
+    for k, last in enumerate(partial[:, -1].tolist()):
+        starts[k] = start
+        start = row_decay * (start + last)
+    partial += starts[:, None]
+    partial *= decay
+    return partial.ravel()[:n]
+
+
+def iir_filter(b: Sequence[float], a: Sequence[float], signal: np.ndarray) -> np.ndarray:
+    """
+    Linear IIR filter (difference equation, zero initial state):
+
+        a[0]*y[i] = b[0]*x[i] + b[1]*x[i-1] + ... - a[1]*y[i-1] - a[2]*y[i-2] - ...
+
+    The numerator is applied as a direct FIR. The denominator is split into
+    one first-order section per pole (partial fractions), run with
+    one_pole() and summed; a complex conjugate pair needs a single complex
+    section (twice its real part). Repeated or near-repeated poles fall back
+    to a cascade of sections. With three coefficients each this is a biquad.
+    """
+    b = np.asarray(b, dtype=np.float64)
+    a = np.asarray(a, dtype=np.float64)
+    b, a = b / a[0], a / a[0]
+    x = np.asarray(signal, dtype=np.float64)
+    n = len(x)
+
+    y = np.convolve(x, b)[:n] if len(b) > 1 else x * b[0]
+    poles = np.roots(a)
+    if len(poles) == 0:
+        return y
+    # 1 / prod(1 - p_j z^-1) = sum(A_k / (1 - p_k z^-1)), A_k = prod(p_k / (p_k - p_j), j != k)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gaps = poles[:, None] - poles[None, :]
+        np.fill_diagonal(gaps, 1)
+        ratios = poles[:, None] / gaps
+        np.fill_diagonal(ratios, 1)
+        residues = np.prod(ratios, axis=1)
+    if not np.all(np.isfinite(residues)) or np.max(np.abs(residues)) > 1e6:
+        for pole in poles:
+            y = one_pole(y, pole if pole.imag else pole.real)
+        return np.ascontiguousarray(y.real)
+
+    result = np.zeros(n)
+    for pole, residue in zip(poles, residues):
+        if pole.imag == 0:
+            result += residue.real * one_pole(y, pole.real)
+        elif pole.imag > 0:
+            result += 2 * (residue * one_pole(y, pole)).real
+    return result
+
+
+def one_pole_lowpass(signal: np.ndarray, alpha: float) -> np.ndarray:
+    """y[i] = alpha * y[i-1] + (1 - alpha) * x[i], y[-1] = 0"""
+    return one_pole((1 - alpha) * np.asarray(signal, dtype=np.float64), alpha)
+
+
+def one_pole_highpass(signal: np.ndarray, alpha: float) -> np.ndarray:
+    """y[i] = alpha * (y[i-1] + x[i] - x[i-1]), y[0] = x[0]"""
+    x = np.asarray(signal, dtype=np.float64)
+    if len(x) == 0:
+        return x.copy()
+    drive = np.empty_like(x)
+    drive[0] = x[0]
+    np.multiply(alpha, np.diff(x), out=drive[1:])
+    return one_pole(drive, alpha)
+
+
+def fractional_delay(signal: np.ndarray, delay: np.ndarray) -> np.ndarray:
+    """
+    Variable delay line: out[i] = signal[i - delay[i]], linearly interpolated.
+
+    Reads that fall outside [0, len - 1) return signal[i] unchanged.
+    A negative delay reads ahead (vibrato around the current sample).
+    """
+    n = len(signal)
+    if n < 2:
+        return np.array(signal, copy=True)
+    position = np.arange(n) - delay
+    valid = (position >= 0) & (position < n - 1)
+    # Out-of-range reads are clamped to stay indexable, then replaced by signal[i]
+    floor_idx = np.clip(position, 0, n - 2).astype(np.intp)
+    frac = position - floor_idx
+    interpolated = signal.take(floor_idx) * (1 - frac) + signal.take(floor_idx + 1) * frac
+    return np.where(valid, interpolated, signal).astype(signal.dtype, copy=False)
+
+
+def tapped_delay(signal: np.ndarray, delays: Sequence[int],
+                 gains: Sequence[float]) -> np.ndarray:
+    """
+    signal + sum(gain * signal delayed by `delay` samples), cut to the input
+    length - a sparse FIR, cheaper as shifted adds than as a convolution.
+    Keeps a float32 signal in float32 (float64 otherwise).
+    """
+    x = np.asarray(signal)
+    x = x.astype(np.result_type(x, np.float32), copy=False)
+    n = len(x)
+    result = x.copy()
+    for delay, gain in zip(delays, gains):
+        delay = int(delay)
+        if delay < n:
+            result[delay:] += x[:n - delay] * gain
+    return result
+
+
+def _fft_size(length: int) -> int:
+    """Smallest 2^a * 3^b * 5^c >= length (sizes the FFT handles fastest)"""
+    best = 1 << (length - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            size = power35
+            while size < length:
+                size *= 2
+            best = min(best, size)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def fft_convolve(signal: np.ndarray, kernel: np.ndarray, mode: str = "full") -> np.ndarray:
+    """
+    Linear convolution through the FFT, O(n log n) - same output as
+    np.convolve(signal, kernel, mode) for real inputs ("full" or "same").
+    """
+    x = np.asarray(signal, dtype=np.float64)
+    h = np.asarray(kernel, dtype=np.float64)
+    n, m = len(x), len(h)
+    if n == 0 or m == 0:
+        raise ValueError("fft_convolve: empty input")
+    length = n + m - 1
+    size = _fft_size(length)
+    full = np.fft.irfft(np.fft.rfft(x, size) * np.fft.rfft(h, size), size)[:length]
+    if mode == "full":
+        return full
+    if mode == "same":
+        start = (min(n, m) - 1) // 2
+        return full[start:start + max(n, m)]
+    raise ValueError(f"fft_convolve: unsupported mode {mode!r}")
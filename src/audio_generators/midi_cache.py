@@ -0,0 +1,234 @@
+# src/audio_generators/midi_cache.py
+"""
+Compiled MIDI cache.
+
+Each .mid file is parsed once with mido into a CompiledMidi: the notes
+of every track (MIDI number, velocity, onset time), the tempo map and the
+melody track. The result is stored as an .npz artefact keyed by the hash
+of the file contents, so later runs load melodies without mido, and kept
+in memory so repeated loads in a process take microseconds.
+
+Every generator takes its melody from the same artefact, and therefore
+from the same melody-track rule: the last track that contains notes.
+"""
+
+import io
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.atomic_write import atomic_write
+
+logger = logging.getLogger("TikSimPro")
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.tiksimpro/midi_cache")
+DEFAULT_TEMPO = 500000   # Microseconds per beat (120 BPM) until the first set_tempo
+
+# Bump when the compilation changes, so cached artefacts are compiled again
+MIDI_CACHE_VERSION = 1
+
+# Frequency of each MIDI note number (A4 = 69 = 440 Hz)
+MIDI_FREQUENCIES = np.array([440.0 * (2 ** ((note - 69) / 12)) for note in range(128)])
+
+
+@dataclass(frozen=True)
+class CompiledMidi:
+    """
+    Notes and tempo map of a MIDI file. Note arrays are ordered track by
+    track, each track in file order (note_on messages with velocity > 0).
+    """
+    notes: np.ndarray          # MIDI note numbers (uint8)
+    velocities: np.ndarray     # uint8
+    tracks: np.ndarray         # Track index of each note (int16)
+    onsets: np.ndarray         # Onset times in seconds (float64)
+    tempo_ticks: np.ndarray    # Tempo map: tick of each tempo change (int64)...
+    tempos: np.ndarray         # ...and its tempo in microseconds per beat (int64)
+    ticks_per_beat: int
+    melody_track: int          # -1 when the file has no notes
+
+    @property
+    def bpm(self) -> float:
+        """Tempo of the first set_tempo message (120 without one)"""
+        return 60_000_000 / float(self.tempos[0]) if len(self.tempos) else 120.0
+
+    def frequencies(self, track: Optional[int] = None) -> np.ndarray:
+        """Note frequencies (Hz) of one track, or of every track"""
+        notes = self.notes if track is None else self.notes[self.tracks == track]
+        return MIDI_FREQUENCIES[notes]
+
+    def melody_notes(self) -> List[float]:
+        """Frequencies of the melody track"""
+        return self.frequencies(self.melody_track).tolist()
+
+    def all_notes(self) -> List[float]:
+        """Frequencies of every track"""
+        return self.frequencies().tolist()
+
+    def melody_onsets(self) -> np.ndarray:
+        return self.onsets[self.tracks == self.melody_track]
+
+    # Artefact (.npz)
+    def save(self, path: str) -> None:
+        np.savez(path, notes=self.notes, velocities=self.velocities, tracks=self.tracks,
+                 onsets=self.onsets, tempo_ticks=self.tempo_ticks, tempos=self.tempos,
+                 header=np.array([self.ticks_per_beat, self.melody_track], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledMidi":
+        with np.load(path, allow_pickle=False) as data:
+            ticks_per_beat, melody_track = data["header"].tolist()
+            return cls(notes=data["notes"], velocities=data["velocities"], tracks=data["tracks"],
+                       onsets=data["onsets"], tempo_ticks=data["tempo_ticks"], tempos=data["tempos"],
+                       ticks_per_beat=ticks_per_beat, melody_track=melody_track)
+
+
+def compile_midi(data: bytes) -> CompiledMidi:
+    """Parse the contents of a MIDI file (requires mido)"""
+    import mido
+    midi = mido.MidiFile(file=io.BytesIO(data))
+
+    notes, velocities, tracks, ticks = [], [], [], []
+    tempo_events: List[Tuple[int, int, int]] = []   # (tick, track, tempo)
+    for track_index, track in enumerate(midi.tracks):
+        tick = 0
+        for msg in track:
+            tick += msg.time
+            if msg.type == 'note_on' and msg.velocity > 0:
+                notes.append(msg.note)
+                velocities.append(msg.velocity)
+                tracks.append(track_index)
+                ticks.append(tick)
+            elif msg.type == 'set_tempo':
+                tempo_events.append((tick, track_index, msg.tempo))
+
+    # The first tempo in file order comes first (it gives the BPM), the map is then sorted by tick
+    first = tempo_events[:1]
+    tempo_map = first + sorted(tempo_events[1:], key=lambda e: (e[0], e[1]))
+    tempo_ticks = np.array([e[0] for e in tempo_map], dtype=np.int64)
+    tempos = np.array([e[2] for e in tempo_map], dtype=np.int64)
+
+    tracks_array = np.array(tracks, dtype=np.int16)
+    return CompiledMidi(
+        notes=np.array(notes, dtype=np.uint8),
+        velocities=np.array(velocities, dtype=np.uint8),
+        tracks=tracks_array,
+        onsets=ticks_to_seconds(np.array(ticks, dtype=np.int64), tempo_ticks, tempos, midi.ticks_per_beat),
+        tempo_ticks=tempo_ticks,
+        tempos=tempos,
+        ticks_per_beat=midi.ticks_per_beat,
+        melody_track=int(tracks_array.max()) if len(tracks_array) else -1)
+
+
+def ticks_to_seconds(ticks: np.ndarray, tempo_ticks: np.ndarray, tempos: np.ndarray,
+                     ticks_per_beat: int) -> np.ndarray:
+    """Absolute ticks to seconds through a tempo map (120 BPM before the first change)"""
+    order = np.argsort(tempo_ticks, kind="stable")
+    change_ticks = np.concatenate(([0], tempo_ticks[order]))
+    change_tempos = np.concatenate(([DEFAULT_TEMPO], tempos[order]))
+    # Seconds elapsed at each tempo change
+    seconds_per_tick = change_tempos / 1e6 / ticks_per_beat
+    change_seconds = np.concatenate(([0.0], np.cumsum(np.diff(change_ticks) * seconds_per_tick[:-1])))
+    segment = np.searchsorted(change_ticks, ticks, side="right") - 1
+    return change_seconds[segment] + (ticks - change_ticks[segment]) * seconds_per_tick[segment]
+
+
+class MidiCache:
+    """
+    Compiled melodies by file contents: in memory (LRU), then on disk as
+    .npz artefacts, then compiled with mido.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 64):
+        """
+        Args:
+            cache_dir: Directory of the artefacts
+                (~/.tiksimpro/midi_cache or $TIKSIMPRO_MIDI_CACHE_DIR by default)
+            max_entries: Compiled files kept in memory
+        """
+        self.cache_dir = cache_dir or os.environ.get("TIKSIMPRO_MIDI_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        self._compiled: "OrderedDict[str, CompiledMidi]" = OrderedDict()   # digest -> melody
+        self._digests: Dict[Tuple[str, int, int], str] = {}                # (path, size, mtime) -> digest
+        self._lock = threading.RLock()
+
+    def load(self, midi_path: str) -> CompiledMidi:
+        """
+        Compiled MIDI file. Raises like mido when the file has to be
+        compiled and cannot be (missing mido, unreadable file).
+        """
+        stat = os.stat(midi_path)
+        file_key = (os.path.abspath(midi_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(file_key)
+            if digest is not None and digest in self._compiled:
+                self._compiled.move_to_end(digest)
+                return self._compiled[digest]
+
+        with open(midi_path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(repr(MIDI_CACHE_VERSION).encode("utf-8") + data).hexdigest()
+        with self._lock:
+            self._digests[file_key] = digest
+            compiled = self._compiled.get(digest)
+        if compiled is None:
+            compiled = self._load_artefact(digest)
+        if compiled is None:
+            compiled = compile_midi(data)
+            self._save_artefact(digest, compiled)
+            logger.info(f"Compiled MIDI {midi_path}: {len(compiled.notes)} notes, "
+                        f"melody track {compiled.melody_track}, {len(compiled.tempos)} tempo changes")
+
+        with self._lock:
+            self._compiled[digest] = compiled
+            self._compiled.move_to_end(digest)
+            while len(self._compiled) > self.max_entries:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def compile_folder(self, folder: str) -> Dict[str, Optional[CompiledMidi]]:
+        """Compile every .mid/.midi file of a folder (None for the files that fail)"""
+        results = {}
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(('.mid', '.midi')):
+                path = os.path.join(folder, name)
+                try:
+                    results[path] = self.load(path)
+                except Exception as e:
+                    logger.warning(f"Could not compile MIDI {path}: {e}")
+                    results[path] = None
+        return results
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.npz")
+
+    def _load_artefact(self, digest: str) -> Optional[CompiledMidi]:
+        try:
+            return CompiledMidi.load(self._path(digest))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_artefact(self, digest: str, compiled: CompiledMidi) -> None:
+        """Write the artefact"""
+        try:
+            atomic_write(self._path(digest), compiled.save)
+        except OSError as e:
+            logger.warning(f"Could not write MIDI cache {self.cache_dir}: {e}")
+
+
+_midi_cache: Optional[MidiCache] = None
+_midi_cache_lock = threading.Lock()
+
+
+def get_midi_cache() -> MidiCache:
+    """Process-wide compiled MIDI cache shared by the audio generators"""
+    global _midi_cache
+    with _midi_cache_lock:
+        if _midi_cache is None:
+            _midi_cache = MidiCache()
+        return _midi_cache
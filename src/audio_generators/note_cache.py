@@ -0,0 +1,163 @@
+# src/audio_generators/note_cache.py
+"""
+Synthesised-note cache.
+
+The generators render the same note (preset, pitch, duration) again for
+every event, while a melody only has a few dozen distinct pitches. Rendered
+waveforms are kept in an LRU cache capped in bytes, optionally persisted
+as .npy files. Notes are cached independently of the event volume: the
+generators render them at a reference volume and apply the event volume as
+a gain when mixing, so one waveform serves every event of that note.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+
+from src.utils.atomic_write import atomic_write
+
+logger = logging.getLogger("TikSimPro")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump when a synthesis path changes, so notes persisted on disk are rendered again
+CACHE_VERSION = 2
+
+
+class NoteCache:
+    """
+    LRU cache of rendered notes, bounded by the total size of the waveforms.
+
+    Keys are tuples of plain values (str/int/float/None/tuples) identifying
+    a note - including the sample rate. Cached waveforms are read-only:
+    callers scale them into their mix buffer.
+    Notes containing noise are frozen to the first rendering of their key.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: Optional[str] = None):
+        """
+        Args:
+            max_bytes: Memory cap (least recently used notes are dropped first)
+            cache_dir: Directory of persisted .npy notes (None = memory only)
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.nbytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self._notes: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._peaks: Dict[Hashable, float] = {}   # Peak of a cached note, dropped with it
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._notes
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Cached waveform for `key` (marked as recently used), or None"""
+        with self._lock:
+            waveform = self._notes.get(key)
+            if waveform is not None:
+                self._notes.move_to_end(key)
+            return waveform
+
+    def put(self, key: Hashable, waveform: np.ndarray) -> np.ndarray:
+        """Store a waveform (made read-only) and return it; larger than the cap = not kept"""
+        waveform = np.array(waveform, copy=True) if waveform.flags.writeable else waveform
+        waveform.flags.writeable = False
+        with self._lock:
+            previous = self._notes.pop(key, None)
+            self._peaks.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            if waveform.nbytes > self.max_bytes:
+                return waveform
+            self._notes[key] = waveform
+            self.nbytes += waveform.nbytes
+            while self.nbytes > self.max_bytes:
+                dropped_key, dropped = self._notes.popitem(last=False)
+                self._peaks.pop(dropped_key, None)
+                self.nbytes -= dropped.nbytes
+                self.evictions += 1
+        return waveform
+
+    def get_or_render(self, key: Hashable, render: Callable[[], np.ndarray]) -> np.ndarray:
+        """Cached waveform for `key`, else loaded from disk, else rendered (and stored)"""
+        waveform = self.get(key)
+        if waveform is not None:
+            self.hits += 1
+            return waveform
+        waveform = self._load(key)
+        if waveform is not None:
+            self.disk_hits += 1
+            return self.put(key, waveform)
+        self.misses += 1
+        waveform = self.put(key, render())
+        self._save(key, waveform)
+        return waveform
+
+    def peak(self, key: Hashable, waveform: np.ndarray) -> float:
+        """Peak (max |sample|) of the waveform cached for `key`, computed once per cached note"""
+        with self._lock:
+            if self._notes.get(key) is waveform and key in self._peaks:
+                return self._peaks[key]
+        peak = float(np.max(np.abs(waveform))) if len(waveform) else 0.0
+        with self._lock:
+            if self._notes.get(key) is waveform:
+                self._peaks[key] = peak
+        return peak
+
+    def clear(self) -> None:
+        """Drop the notes held in memory (persisted notes are kept)"""
+        with self._lock:
+            self._notes.clear()
+            self._peaks.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"notes": len(self._notes), "bytes": self.nbytes, "hits": self.hits,
+                "disk_hits": self.disk_hits, "misses": self.misses, "evictions": self.evictions}
+
+    # Disk persistence
+    def _path(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr((CACHE_VERSION, key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.npy")
+
+    def _load(self, key: Hashable) -> Optional[np.ndarray]:
+        if not self.cache_dir:
+            return None
+        try:
+            return np.load(self._path(key), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key: Hashable, waveform: np.ndarray) -> None:
+        """Write the note"""
+        if not self.cache_dir:
+            return
+        try:
+            atomic_write(self._path(key), lambda f: np.save(f, waveform, allow_pickle=False))
+        except OSError as e:
+            logger.warning(f"Could not write note cache {self.cache_dir}: {e}")
+
+
+_note_cache: Optional[NoteCache] = None
+_note_cache_lock = threading.Lock()
+
+
+def get_note_cache() -> NoteCache:
+    """
+    Process-wide note cache shared by the sound generators. Notes are also
+    persisted to $TIKSIMPRO_NOTE_CACHE_DIR when it is set.
+    """
+    global _note_cache
+    with _note_cache_lock:
+        if _note_cache is None:
+            _note_cache = NoteCache(cache_dir=os.environ.get("TIKSIMPRO_NOTE_CACHE_DIR") or None)
+        return _note_cache
@@ -12,15 +12,20 @@ Key principles:
 """
 
 import numpy as np
-import wave
 import logging
 import random
 import os
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, astuple
 from enum import Enum
 
-from src.audio_generators.base_audio_generator import IAudioGenerator
+from src.audio_generators.base_audio_generator import (
+    IAudioGenerator, AudioStream, AUDIO_BLOCK_SIZE, buffer_blocks, peak_level, pcm16)
+from src.audio_generators import dsp
+from src.audio_generators.event_mixer import EventMixer
+from src.audio_generators.midi_cache import get_midi_cache
+from src.audio_generators.note_cache import NoteCache, get_note_cache
+from src.audio_generators.wavetable import Partial, get_wavetable_bank
 from src.core.data_pipeline import TrendData, AudioEvent
 
 logger = logging.getLogger("TikSimPro")
@@ -105,9 +110,31 @@ SATISFYING_PRESETS = {
 class SatisfyingSoundEngine:
     """Moteur de génération de sons satisfaisants"""
 
-    def __init__(self, sample_rate: int = 44100):
+    def __init__(self, sample_rate: int = 44100, note_cache: Optional[NoteCache] = None):
         self.sample_rate = sample_rate
         self.pi2 = 2 * np.pi
+        # Cache de notes (partagé par défaut avec les autres générateurs)
+        self.note_cache = note_cache if note_cache is not None else get_note_cache()
+        # Oscillateurs à tables d'onde à bande limitée (partagés par défaut)
+        self.oscillators = get_wavetable_bank(sample_rate)
+
+    def cached_sound(self, preset: SoundPreset, frequency: float = None,
+                     duration: float = None, volume: float = 0.7) -> Tuple[np.ndarray, float]:
+        """
+        generate_sound() via le cache de notes
+
+        Le volume n'est qu'un facteur final : le son est généré une seule fois
+        à volume 1 et le volume est appliqué au mixage.
+
+        Returns:
+            (forme d'onde en lecture seule, gain à appliquer)
+        """
+        preset_key = tuple(tuple(v) if isinstance(v, list) else v for v in astuple(preset))
+        key = ("satisfying", self.sample_rate, preset_key,
+               round(frequency, 3) if frequency else None, duration)
+        sound = self.note_cache.get_or_render(
+            key, lambda: self.generate_sound(preset, frequency, duration, 1.0))
+        return sound, volume
 
     def generate_sound(self, preset: SoundPreset, frequency: float = None,
                        duration: float = None, volume: float = 0.7) -> np.ndarray:
@@ -128,30 +155,28 @@ class SatisfyingSoundEngine:
         dur = max(dur, total_ms / 1000.0)  # Au moins la durée de l'enveloppe
 
         samples = int(dur * self.sample_rate)
-        t = np.linspace(0, dur, samples)
+        t = np.arange(samples) / self.sample_rate
 
-        # 1. Générer la fondamentale avec pitch drop/rise
+        # 1-2. Fondamentale et harmoniques avec pitch drop/rise : une seule table
+        # d'onde, lue à la phase freq * t * pitch_env (en cycles), sans les
+        # harmoniques qui dépasseraient Nyquist au plus haut du pitch
         pitch_env = self._create_pitch_envelope(samples, preset.pitch_drop)
-        fundamental = np.sin(self.pi2 * freq * t * pitch_env)
-
-        # 2. Ajouter les harmoniques
-        signal = fundamental.copy()
-        for i, harm_ratio in enumerate(preset.harmonics):
-            harm_freq = freq * harm_ratio
-            if harm_freq < self.sample_rate / 2:  # Éviter aliasing
-                amplitude = 0.5 / (i + 2)  # Décroissance naturelle
-                signal += amplitude * np.sin(self.pi2 * harm_freq * t * pitch_env)
+        partials = [Partial(1.0)] + [Partial(harm_ratio, amplitude=0.5 / (i + 2))  # Décroissance naturelle
+                                     for i, harm_ratio in enumerate(preset.harmonics)]
+        signal = self.oscillators.render(partials, freq, samples, phase=freq * t * pitch_env,
+                                         max_frequency=freq * (1 + abs(preset.pitch_drop)))
 
         # 3. Ajouter sub-bass (50-100Hz)
         if preset.sub_bass_amount > 0:
             sub_freq = min(freq * 0.5, 80)  # Sub-bass
-            sub_bass = preset.sub_bass_amount * 0.5 * np.sin(self.pi2 * sub_freq * t)
-            signal += sub_bass
+            signal += self.oscillators.render(
+                [Partial(1.0, amplitude=preset.sub_bass_amount * 0.5)], sub_freq, samples)
 
         # 4. Ajouter texture/bruit filtré
         if preset.noise_amount > 0:
             noise = self._generate_filtered_noise(samples, freq, preset.brightness)
-            signal += noise * preset.noise_amount
+            noise *= preset.noise_amount
+            signal += noise
 
         # 5. Appliquer l'enveloppe ADSR
         envelope = self._create_adsr_envelope(
@@ -167,13 +192,15 @@ class SatisfyingSoundEngine:
         if preset.brightness > 0.5:
             signal = self._add_brightness(signal, preset.brightness)
 
-        # 7. Soft limiting pour éviter distorsion
-        signal = np.tanh(signal * 1.5) * 0.7
+        # 7. Soft limiting pour éviter distorsion (en place)
+        signal *= 1.5
+        np.tanh(signal, out=signal)
+        signal *= 0.7
 
         # 8. Appliquer volume
         signal *= volume
 
-        return signal.astype(np.float32)
+        return signal.astype(np.float32, copy=False)
 
     def _create_pitch_envelope(self, samples: int, pitch_drop: float) -> np.ndarray:
         """Crée une enveloppe de pitch (drop ou rise)"""
@@ -192,8 +219,8 @@ class SatisfyingSoundEngine:
     def _create_adsr_envelope(self, samples: int, attack_ms: float,
                               decay_ms: float, sustain: float,
                               release_ms: float) -> np.ndarray:
-        """Crée une enveloppe ADSR avec courbes exponentielles"""
-        envelope = np.zeros(samples)
+        """Crée une enveloppe ADSR avec courbes exponentielles (float32)"""
+        envelope = np.zeros(samples, dtype=np.float32)
 
         attack_samples = int(attack_ms * self.sample_rate / 1000)
         decay_samples = int(decay_ms * self.sample_rate / 1000)
@@ -226,7 +253,10 @@ class SatisfyingSoundEngine:
     def _generate_filtered_noise(self, samples: int, center_freq: float,
                                   brightness: float) -> np.ndarray:
         """Génère du bruit filtré autour de la fréquence centrale"""
-        noise = np.random.normal(0, 1, samples)
+        # Bruit généré sur une taille d'FFT rapide puis recoupé (même bruit filtré
+        # en statistique, sans FFT de taille quelconque, souvent lente)
+        size = dsp._fft_size(samples)
+        noise = np.random.normal(0, 1, size)
 
         # Filtre passe-bande simple autour de center_freq
         # Plus brightness est haut, plus on garde les hautes fréquences
@@ -235,7 +265,7 @@ class SatisfyingSoundEngine:
 
         # FFT filtering
         fft = np.fft.rfft(noise)
-        freqs = np.fft.rfftfreq(samples, 1/self.sample_rate)
+        freqs = np.fft.rfftfreq(size, 1/self.sample_rate)
 
         # Créer le filtre
         filter_mask = np.zeros_like(freqs)
@@ -243,7 +273,7 @@ class SatisfyingSoundEngine:
         filter_mask[mask] = 1.0
 
         # Appliquer et retourner
-        filtered = np.fft.irfft(fft * filter_mask, samples)
+        filtered = np.fft.irfft(fft * filter_mask, size)[:samples]
         return filtered / (np.max(np.abs(filtered)) + 1e-8)
 
     def _add_brightness(self, signal: np.ndarray, brightness: float) -> np.ndarray:
@@ -262,19 +292,10 @@ class MelodyPlayer:
         self.current_index = 0
 
     def load_midi(self, midi_path: str) -> bool:
-        """Charge les notes depuis le dernier track du MIDI (mélodie)"""
+        """Charge les notes depuis la piste mélodie du MIDI (dernière piste avec des notes)"""
         try:
-            import mido
-            midi = mido.MidiFile(midi_path)
-            self.notes = []
-
-            # Dernier track = mélodie
-            if len(midi.tracks) > 0:
-                last_track = midi.tracks[-1]
-                for msg in last_track:
-                    if msg.type == 'note_on' and msg.velocity > 0:
-                        freq = 440.0 * (2 ** ((msg.note - 69) / 12))
-                        self.notes.append(freq)
+            # MIDI compilé une fois par fichier, partagé par tous les générateurs
+            self.notes = get_midi_cache().load(midi_path).melody_notes()
 
             if not self.notes or len(self.notes) < 10:
                 self._load_default_melody()
@@ -442,15 +463,8 @@ class SatisfyingAudioGenerator(IAudioGenerator):
             total_samples = int(self.sample_rate * self.duration)
             self.audio_data = np.zeros(total_samples, dtype=np.float32)
 
-            # Réinitialiser la mélodie
-            self.melody_player.reset()
-
-            # Trier les events par temps
-            sorted_events = sorted(self.events, key=lambda e: e.time)
-
-            # Traiter chaque event
-            for event in sorted_events:
-                self._process_event(event)
+            # Placer chaque event, puis mixer le tout en une passe
+            self._place_events(total_samples).render(out=self.audio_data)
 
             # Normaliser
             self._normalize()
@@ -467,11 +481,40 @@ class SatisfyingAudioGenerator(IAudioGenerator):
             traceback.print_exc()
             return None
 
-    def _process_event(self, event: AudioEvent):
-        """Traite un événement audio"""
+    def stream(self, block_size: int = AUDIO_BLOCK_SIZE) -> Optional[AudioStream]:
+        """Génère l'audio en blocs PCM 16-bit (même piste que generate(), sans WAV)"""
+        logger.info(f"Streaming satisfying audio ({len(self.events)} events)...")
+        total_samples = int(self.sample_rate * self.duration)
+        mixer = self._place_events(total_samples)
+
+        def blocks():
+            # Première passe pour le pic (normalisation), seconde pour la sortie
+            raw_peak = 0.0
+            for block in mixer.render_blocks(block_size):
+                raw_peak = max(raw_peak, peak_level(block))
+
+            for block in mixer.render_blocks(block_size):
+                self._limit(block, raw_peak)
+                yield block
+
+        return AudioStream(self.sample_rate, 1, pcm16(blocks()))
+
+    def _place_events(self, total_samples: int) -> EventMixer:
+        """Sons des events placés sur la timeline (mixés par l'appelant)"""
+        # Réinitialiser la mélodie
+        self.melody_player.reset()
+
+        # Traiter les events dans l'ordre du temps
+        mixer = EventMixer(total_samples)
+        for event in sorted(self.events, key=lambda e: e.time):
+            self._process_event(event, mixer)
+        return mixer
+
+    def _process_event(self, event: AudioEvent, mixer: EventMixer):
+        """Traite un événement audio (placé dans le mixer)"""
         start_sample = int(event.time * self.sample_rate)
 
-        if start_sample >= len(self.audio_data):
+        if start_sample >= mixer.length:
             return
 
         # Déterminer le type de son et la fréquence
@@ -493,46 +536,42 @@ class SatisfyingAudioGenerator(IAudioGenerator):
             preset = self.bounce_preset
             volume = 0.5
 
-        # Générer le son
-        sound = self.sound_engine.generate_sound(
+        # Générer le son (depuis le cache de notes, volume appliqué au mixage)
+        sound, gain = self.sound_engine.cached_sound(
             preset,
             frequency=frequency,
             volume=volume * self.master_volume
         )
 
-        # Mixer dans le buffer
-        end_sample = min(start_sample + len(sound), len(self.audio_data))
-        length = end_sample - start_sample
-
-        if length > 0:
-            self.audio_data[start_sample:end_sample] += sound[:length]
+        # Placer dans le mix
+        mixer.add(sound, start_sample, gain)
 
     def _normalize(self):
         """Normalise l'audio avec soft limiting"""
         if self.audio_data is None:
             return
 
+        self._limit(self.audio_data, peak_level(self.audio_data))
+
+    def _limit(self, samples: np.ndarray, raw_peak: float):
+        """Soft limiting puis normalisation (sur place) d'un mix dont le pic brut vaut raw_peak"""
         # Soft limiting
-        self.audio_data = np.tanh(self.audio_data * 1.2) * 0.85
+        samples *= 1.2
+        np.tanh(samples, out=samples)
+        samples *= 0.85
 
-        # Normaliser si nécessaire
-        max_val = np.max(np.abs(self.audio_data))
+        # Normaliser si nécessaire (tanh est croissante : le pic suit le pic brut)
+        max_val = np.tanh(raw_peak * 1.2) * 0.85
         if max_val > 0.95:
-            self.audio_data = self.audio_data / max_val * 0.9
+            samples *= 0.9 / max_val
 
     def _save_wav(self):
         """Sauvegarde en fichier WAV"""
         if self.audio_data is None:
             return
 
-        # Convertir en 16-bit
-        audio_16bit = (self.audio_data * 32767).astype(np.int16)
-
-        with wave.open(self.output_path, 'w') as wav:
-            wav.setnchannels(1)
-            wav.setsampwidth(2)
-            wav.setframerate(self.sample_rate)
-            wav.writeframes(audio_16bit.tobytes())
+        # Convertir en 16-bit (mono), bloc par bloc
+        AudioStream(self.sample_rate, 1, pcm16(buffer_blocks(self.audio_data))).write_wav(self.output_path)
 
 
 # Fonction helper pour créer le générateur
@@ -4,13 +4,18 @@ Simple audi generator for midi files.
 """
 
 import numpy as np
-import wave
 import logging
 import random
 from typing import Dict, List, Any, Optional, Tuple
 import os
 
-from src.audio_generators.base_audio_generator import IAudioGenerator
+from src.audio_generators.base_audio_generator import (
+    IAudioGenerator, AudioStream, AUDIO_BLOCK_SIZE, buffer_blocks, peak_level, pcm16)
+from src.audio_generators import dsp
+from src.audio_generators.event_mixer import EventMixer
+from src.audio_generators.midi_cache import get_midi_cache
+from src.audio_generators.note_cache import NoteCache, get_note_cache
+from src.audio_generators.wavetable import Partial, get_wavetable_bank
 from src.core.data_pipeline import TrendData, AudioEvent
 
 logger = logging.getLogger("TikSimPro")
@@ -19,19 +24,10 @@ class SimpleMidiExtractor:
     """Extractor for midi files"""
     
     def extract_notes(self, midi_path: str) -> List[float]:
-        """Extract notes from last track (melody) in a midi file"""
+        """Extract notes from the melody track (last track with notes) of a midi file"""
         try:
-            import mido
-            midi = mido.MidiFile(midi_path)
-            notes = []
-
-            # Extract from last track only (contains melody)
-            last_track = midi.tracks[len(midi.tracks) - 1]
-            for msg in last_track:
-                if msg.type == 'note_on' and msg.velocity > 0:
-                    # Convert midi note to frequency
-                    freq = 440.0 * (2 ** ((msg.note - 69) / 12))
-                    notes.append(freq)
+            # Compiled once per file, shared by every generator
+            notes = get_midi_cache().load(midi_path).melody_notes()
 
             logger.info(f"{len(notes)} melody notes extracted from {midi_path}")
             return notes
@@ -48,45 +44,73 @@ class SimpleMidiExtractor:
 class AdvancedSoundGenerator:
     """Générateur de sons ultra-avancé pour créer tous types de sons"""
     
-    def __init__(self, sample_rate: int = 44100):
+    # Volume auquel les notes sont mises en cache (assez faible pour que la normalisation
+    # finale de generate_advanced_sound ne s'applique jamais)
+    NOTE_REFERENCE_VOLUME = 1e-6
+    
+    # Formes d'ondes non périodiques (les autres sont lues dans les tables d'onde)
+    NOISE_WAVEFORMS = ("noise", "pink_noise", "brown_noise")
+    
+    def __init__(self, sample_rate: int = 44100, note_cache: Optional[NoteCache] = None):
         self.sample_rate = sample_rate
         self.pi = np.pi
+        # Oscillateurs à tables d'onde à bande limitée (partagés par défaut)
+        self.oscillators = get_wavetable_bank(sample_rate)
+        # Cache de notes (partagé par défaut avec les autres générateurs)
+        self.note_cache = note_cache if note_cache is not None else get_note_cache()
+    
+    def cached_preset_sound(self, sound_type: str, frequency: float, duration: float,
+                            volume: float) -> Tuple[np.ndarray, float]:
+        """
+        Preset de son (satisfying_bounce, asmr_pop, ...) via le cache de notes
+        
+        Les presets n'utilisent le volume qu'à la fin de generate_advanced_sound :
+        signal * volume, puis ramené à un pic de 0.95 si le pic dépasse 1. La note
+        est mise en cache (en float32) au volume de référence, et le gain renvoyé
+        reproduit ces deux étapes pour le volume demandé.
+        
+        Returns:
+            (forme d'onde en lecture seule, gain à appliquer au mixage)
+        """
+        render = getattr(self, sound_type)
+        reference = self.NOTE_REFERENCE_VOLUME
+        key = ("advanced", self.sample_rate, sound_type, round(frequency, 3), round(duration, 4))
+        sound = self.note_cache.get_or_render(
+            key, lambda: np.asarray(render(frequency, duration, reference), dtype=np.float32))
+        
+        # Pic à volume 1, gardé dans le cache avec la note
+        peak = self.note_cache.peak(key, sound) / reference
+        if volume * peak > 1.0:
+            return sound, 0.95 / (peak * reference)
+        return sound, volume / reference
         
     # ===== FORMES D'ONDES DE BASE =====
     
     def generate_waveform(self, waveform_type: str, frequency: float, samples: int, 
                          phase: float = 0.0) -> np.ndarray:
-        """Génère différents types de formes d'ondes"""
-        t = np.linspace(0, samples / self.sample_rate, samples)
+        """
+        Génère différents types de formes d'ondes
         
-        if waveform_type == "sine":
-            return np.sin(2 * self.pi * frequency * t + phase)
-        elif waveform_type == "square":
-            return np.sign(np.sin(2 * self.pi * frequency * t + phase))
-        elif waveform_type == "sawtooth":
-            return 2 * (t * frequency - np.floor(t * frequency + 0.5)) 
-        elif waveform_type == "triangle":
-            saw = 2 * (t * frequency - np.floor(t * frequency + 0.5))
-            return 2 * np.abs(saw) - 1
-        elif waveform_type == "pulse":
-            return np.where(np.sin(2 * self.pi * frequency * t + phase) > 0, 1, -1)
-        elif waveform_type == "noise":
+        Les formes périodiques (sine, square, sawtooth, triangle, pulse ; sine pour
+        un type inconnu) sont lues dans une table d'onde à bande limitée : pas
+        d'aliasing sur les notes aiguës. La phase est en radians.
+        """
+        if waveform_type == "noise":
             return np.random.uniform(-1, 1, samples)
         elif waveform_type == "pink_noise":
             return self._generate_pink_noise(samples)
         elif waveform_type == "brown_noise":
             return self._generate_brown_noise(samples)
-        else:
-            return np.sin(2 * self.pi * frequency * t + phase)
+        return self.oscillators.render(
+            [Partial(1.0, waveform_type, 1.0, phase / (2 * self.pi))], frequency, samples)
     
     def _generate_pink_noise(self, samples: int) -> np.ndarray:
         """Génère du bruit rose (1/f noise)"""
         white = np.random.normal(0, 1, samples)
-        # Approximation simple du bruit rose
-        pink = np.zeros(samples)
-        pink[0] = white[0]
-        for i in range(1, samples):
-            pink[i] = white[i] * 0.5 + pink[i-1] * 0.3
+        # Approximation simple du bruit rose : pink[i] = 0.5 * white[i] + 0.3 * pink[i-1]
+        drive = white * 0.5
+        drive[:1] = white[:1]
+        pink = dsp.one_pole(drive, 0.3)
         return pink / (np.max(np.abs(pink)) + 1e-8)
     
     def _generate_brown_noise(self, samples: int) -> np.ndarray:
@@ -107,50 +131,58 @@ class AdvancedSoundGenerator:
             ...
         ]
         """
-        result = fundamental.copy()
-        
-        for harmonic_config in harmonics_config:
-            harmonic_number = harmonic_config.get("harmonic", 2)
-            amplitude = harmonic_config.get("amplitude", 0.5)
-            waveform = harmonic_config.get("waveform", "sine")
-            phase = harmonic_config.get("phase", 0.0)
-            
-            harmonic_freq = frequency * harmonic_number
-            if harmonic_freq < self.sample_rate / 2:  # Évite l'aliasing
-                harmonic_wave = self.generate_waveform(
-                    waveform, harmonic_freq, samples, phase * 2 * self.pi
-                )
-                result += harmonic_wave * amplitude
-        
-        return result
+        partials, noises = self._partials(frequency, harmonics_config, [])
+        return fundamental + self._render_partials(partials, noises, frequency, samples)
     
     def add_subharmonics(self, fundamental: np.ndarray, frequency: float, samples: int,
                         subharmonics_config: List[Dict[str, Any]]) -> np.ndarray:
         """Ajoute des sous-harmoniques"""
-        result = fundamental.copy()
-        
+        partials, noises = self._partials(frequency, [], subharmonics_config)
+        return fundamental + self._render_partials(partials, noises, frequency, samples)
+    
+    def _partials(self, frequency: float, harmonics_config: List[Dict[str, Any]],
+                  subharmonics_config: List[Dict[str, Any]]) -> Tuple[List[Partial], List[Tuple[str, float]]]:
+        """
+        Oscillateurs (Partial) des harmoniques et sous-harmoniques, et composantes
+        de bruit (forme d'onde, amplitude)
+        """
+        partials, noises = [], []
+        components = []
+        for harmonic_config in harmonics_config:
+            harmonic_number = harmonic_config.get("harmonic", 2)
+            if frequency * harmonic_number < self.sample_rate / 2:  # Évite l'aliasing
+                components.append((harmonic_number, harmonic_config, 0.5))
         for sub_config in subharmonics_config:
             divisor = sub_config.get("divisor", 2)
-            amplitude = sub_config.get("amplitude", 0.3)
-            waveform = sub_config.get("waveform", "sine")
-            phase = sub_config.get("phase", 0.0)
-            
-            sub_freq = frequency / divisor
-            if sub_freq >= 20:  # Fréquence audible minimum
-                sub_wave = self.generate_waveform(
-                    waveform, sub_freq, samples, phase * 2 * self.pi
-                )
-                result += sub_wave * amplitude
-        
-        return result
+            if frequency / divisor >= 20:  # Fréquence audible minimum
+                components.append((1.0 / divisor, sub_config, 0.3))
+        
+        for ratio, component, default_amplitude in components:
+            amplitude = component.get("amplitude", default_amplitude)
+            waveform = component.get("waveform", "sine")
+            if waveform in self.NOISE_WAVEFORMS:
+                noises.append((waveform, amplitude))
+            else:
+                partials.append(Partial(ratio, waveform, amplitude, component.get("phase", 0.0)))
+        return partials, noises
+    
+    def _render_partials(self, partials: List[Partial], noises: List[Tuple[str, float]],
+                         frequency: float, samples: int) -> np.ndarray:
+        """Somme des oscillateurs (une lecture de table d'onde) et des bruits"""
+        signal = self.oscillators.render(partials, frequency, samples)
+        for waveform, amplitude in noises:
+            noise = self.generate_waveform(waveform, frequency, samples)
+            noise *= amplitude
+            signal += noise
+        return signal
     
     # ===== SYSTÈME D'ENVELOPPES AVANCÉ =====
     
     def create_adsr_envelope(self, samples: int, attack_ms: float = 10.0, 
                            decay_ms: float = 50.0, sustain_level: float = 0.7,
                            release_ms: float = 200.0, curve_type: str = "exponential") -> np.ndarray:
-        """Enveloppe ADSR avec différents types de courbes"""
-        envelope = np.ones(samples)
+        """Enveloppe ADSR avec différents types de courbes (float32)"""
+        envelope = np.ones(samples, dtype=np.float32)
         
         # Conversion en échantillons
         attack_samples = max(1, int(attack_ms * self.sample_rate / 1000))
@@ -214,8 +246,9 @@ class AdvancedSoundGenerator:
         """
         Crée une enveloppe personnalisée à partir de points de contrôle
         points = [(time_ratio, amplitude), ...] où time_ratio est entre 0 et 1
+        (float32)
         """
-        envelope = np.ones(samples)
+        envelope = np.ones(samples, dtype=np.float32)
         
         if len(points) < 2:
             return envelope
@@ -245,26 +278,18 @@ class AdvancedSoundGenerator:
         t = np.linspace(0, samples / self.sample_rate, samples)
         modulation = np.sin(2 * self.pi * mod_frequency * t) * mod_depth
         
-        # Application de la modulation via interpolation
-        result = np.zeros_like(signal)
-        for i in range(samples):
-            mod_index = i + modulation[i]
-            if 0 <= mod_index < samples - 1:
-                # Interpolation linéaire
-                floor_idx = int(mod_index)
-                frac = mod_index - floor_idx
-                result[i] = signal[floor_idx] * (1 - frac) + signal[floor_idx + 1] * frac
-            else:
-                result[i] = signal[i]
-        
-        return result
+        # Application de la modulation via interpolation (lecture à l'indice i + modulation[i])
+        return dsp.fractional_delay(signal, -modulation)
     
     def add_amplitude_modulation(self, signal: np.ndarray, mod_frequency: float,
                                mod_depth: float, samples: int) -> np.ndarray:
         """Modulation d'amplitude (tremolo)"""
         t = np.linspace(0, samples / self.sample_rate, samples)
-        modulation = 1 + mod_depth * np.sin(2 * self.pi * mod_frequency * t)
-        return signal * modulation
+        modulation = np.sin(2 * self.pi * mod_frequency * t)
+        modulation *= mod_depth
+        modulation += 1
+        # Produit dans le type du signal (float32 reste float32)
+        return np.multiply(signal, modulation, out=np.empty_like(signal))
     
     def add_turbulence(self, signal: np.ndarray, turbulence_config: Dict[str, Any]) -> np.ndarray:
         """
@@ -308,30 +333,22 @@ class AdvancedSoundGenerator:
         """Filtre passe-bas simple"""
         # Filtre IIR simple
         alpha = np.exp(-2 * self.pi * cutoff_freq / self.sample_rate)
-        result = np.zeros_like(signal)
-        result[0] = signal[0] * (1 - alpha)
-        
-        for i in range(1, len(signal)):
-            result[i] = alpha * result[i-1] + (1 - alpha) * signal[i]
+        result = dsp.one_pole_lowpass(signal, alpha)
         
         # Ajout de résonance
-        if resonance > 0:
-            # Feedback simple pour la résonance
-            for i in range(2, len(signal)):
-                result[i] += resonance * 0.3 * (result[i-1] - result[i-2])
-        
-        return result
+        if resonance > 0 and len(result) > 2:
+            # Feedback simple pour la résonance (à partir du 3e échantillon) :
+            # y[i] = x[i] + k * (y[i-1] - y[i-2]), soit un filtre tout-pôles d'ordre 2
+            k = resonance * 0.3
+            result[1] -= k * result[0]
+            result = dsp.iir_filter([1.0], [1.0, -k, k], result)
+        
+        return result.astype(signal.dtype, copy=False)
     
     def apply_highpass_filter(self, signal: np.ndarray, cutoff_freq: float) -> np.ndarray:
         """Filtre passe-haut simple"""
         alpha = np.exp(-2 * self.pi * cutoff_freq / self.sample_rate)
-        result = np.zeros_like(signal)
-        result[0] = signal[0]
-        
-        for i in range(1, len(signal)):
-            result[i] = alpha * (result[i-1] + signal[i] - signal[i-1])
-        
-        return result
+        return dsp.one_pole_highpass(signal, alpha).astype(signal.dtype, copy=False)
     
     def apply_bandpass_filter(self, signal: np.ndarray, low_freq: float, high_freq: float) -> np.ndarray:
         """Filtre passe-bande"""
@@ -348,8 +365,8 @@ class AdvancedSoundGenerator:
         # Génération d'une sinusoïde à éliminer
         notch_signal = np.sin(2 * self.pi * notch_freq * t)
         
-        # Soustraction avec facteur Q
-        correlation = np.correlate(signal, notch_signal, mode='same')
+        # Soustraction avec facteur Q (corrélation via FFT)
+        correlation = dsp.fft_convolve(signal, notch_signal[::-1], mode='same')
         adjustment = correlation * notch_signal / (q_factor * len(signal))
         
         return signal - adjustment[:len(signal)]
@@ -359,8 +376,6 @@ class AdvancedSoundGenerator:
     def apply_reverb(self, signal: np.ndarray, room_size: float = 0.5, 
                     damping: float = 0.5, wet_level: float = 0.3) -> np.ndarray:
         """Réverbération simple"""
-        samples = len(signal)
-        
         # Délais multiples pour simuler la réverbération
         delays = [
             int(0.03 * self.sample_rate),   # 30ms
@@ -369,39 +384,28 @@ class AdvancedSoundGenerator:
             int(0.12 * self.sample_rate),   # 120ms
         ]
         
-        gains = [0.7, 0.5, 0.3, 0.2]
+        gains = [gain * room_size * (1 - damping) for gain in (0.7, 0.5, 0.3, 0.2)]
         
-        reverb_signal = np.zeros(samples + max(delays))
-        reverb_signal[:samples] = signal
+        # Quatre échos discrets : FIR creux, appliqué par décalages
+        reverb_signal = dsp.tapped_delay(signal, delays, gains)
         
-        for delay, gain in zip(delays, gains):
-            gain *= room_size
-            for i in range(samples):
-                if i + delay < len(reverb_signal):
-                    reverb_signal[i + delay] += signal[i] * gain * (1 - damping)
-        
-        # Mixage wet/dry
-        return signal * (1 - wet_level) + reverb_signal[:samples] * wet_level
+        # Mixage wet/dry (dans le buffer de la réverbération)
+        reverb_signal *= wet_level
+        reverb_signal += signal * (1 - wet_level)
+        return reverb_signal
     
     def apply_delay(self, signal: np.ndarray, delay_ms: float, feedback: float = 0.3,
                    wet_level: float = 0.3) -> np.ndarray:
         """Effet de délai/écho"""
         delay_samples = int(delay_ms * self.sample_rate / 1000)
-        samples = len(signal)
-        
-        delayed_signal = np.zeros(samples + delay_samples)
-        delayed_signal[:samples] = signal
         
-        # Application du feedback
-        for i in range(samples):
-            if i + delay_samples < len(delayed_signal):
-                delayed_signal[i + delay_samples] += signal[i] * feedback
-                
-                # Feedback récursif
-                if i + 2 * delay_samples < len(delayed_signal):
-                    delayed_signal[i + 2 * delay_samples] += signal[i] * feedback * feedback
+        # Application du feedback : écho simple puis écho du feedback récursif
+        delayed_signal = dsp.tapped_delay(signal, [delay_samples, 2 * delay_samples],
+                                          [feedback, feedback * feedback])
         
-        return signal * (1 - wet_level) + delayed_signal[:samples] * wet_level
+        delayed_signal *= wet_level
+        delayed_signal += signal * (1 - wet_level)
+        return delayed_signal
     
     def apply_chorus(self, signal: np.ndarray, rate: float = 2.0, depth: float = 0.02,
                     mix: float = 0.5) -> np.ndarray:
@@ -412,27 +416,19 @@ class AdvancedSoundGenerator:
         # Modulation de délai variable
         modulation = depth * np.sin(2 * self.pi * rate * t)
         
-        chorus_signal = np.zeros_like(signal)
-        for i in range(samples):
-            delay_samples = modulation[i] * self.sample_rate
-            delayed_idx = i - delay_samples
-            
-            if 0 <= delayed_idx < samples - 1:
-                floor_idx = int(delayed_idx)
-                frac = delayed_idx - floor_idx
-                chorus_signal[i] = signal[floor_idx] * (1 - frac) + signal[floor_idx + 1] * frac
-            else:
-                chorus_signal[i] = signal[i]
+        chorus_signal = dsp.fractional_delay(signal, modulation * self.sample_rate)
         
-        return signal * (1 - mix) + chorus_signal * mix
+        chorus_signal *= mix
+        chorus_signal += signal * (1 - mix)
+        return chorus_signal
     
     def apply_distortion(self, signal: np.ndarray, drive: float = 2.0, tone: float = 0.5) -> np.ndarray:
         """Distorsion/saturation"""
         # Saturation douce (soft clipping)
-        driven_signal = signal * drive
+        saturated = signal * drive
         
-        # Fonction de saturation
-        saturated = np.tanh(driven_signal)
+        # Fonction de saturation (en place)
+        np.tanh(saturated, out=saturated)
         
         # Contrôle de tonalité (filtre simple)
         if tone < 0.5:
@@ -442,13 +438,16 @@ class AdvancedSoundGenerator:
             # Plus brillant
             saturated = self.apply_highpass_filter(saturated, (tone - 0.5) * 500)
         
-        return saturated * 0.7  # Compensation de volume
+        saturated *= 0.7  # Compensation de volume
+        return saturated
     
     def apply_bitcrusher(self, signal: np.ndarray, bits: int = 8, sample_rate_reduction: int = 1) -> np.ndarray:
         """Effet de dégradation numérique"""
         # Réduction de la résolution en bits
         max_val = 2 ** (bits - 1) - 1
-        crushed = np.round(signal * max_val) / max_val
+        crushed = signal * max_val
+        np.round(crushed, out=crushed)
+        crushed /= max_val
         
         # Réduction du taux d'échantillonnage
         if sample_rate_reduction > 1:
@@ -456,7 +455,7 @@ class AdvancedSoundGenerator:
             # Interpolation pour retrouver la taille originale
             crushed = np.interp(np.arange(len(signal)), 
                               np.arange(0, len(signal), sample_rate_reduction), 
-                              decimated)
+                              decimated).astype(signal.dtype, copy=False)
         
         return crushed
     
@@ -522,18 +521,14 @@ class AdvancedSoundGenerator:
         
         samples = int(self.sample_rate * duration)
         
-        # 1. Génération de l'onde de base
-        signal = self.generate_waveform(waveform, frequency, samples)
-        
-        # 2. Ajout des harmoniques
-        harmonics_config = config.get("harmonics", [])
-        if harmonics_config:
-            signal = self.add_harmonics(signal, frequency, samples, harmonics_config)
-        
-        # 3. Ajout des sous-harmoniques
-        subharmonics_config = config.get("subharmonics", [])
-        if subharmonics_config:
-            signal = self.add_subharmonics(signal, frequency, samples, subharmonics_config)
+        # 1-3. Onde de base, harmoniques et sous-harmoniques : une seule table d'onde
+        partials, noises = self._partials(frequency, config.get("harmonics", []),
+                                          config.get("subharmonics", []))
+        if waveform in self.NOISE_WAVEFORMS:
+            noises.insert(0, (waveform, 1.0))
+        else:
+            partials.insert(0, Partial(1.0, waveform))
+        signal = self._render_partials(partials, noises, frequency, samples)
         
         # 4. Application des modulations
         modulation = config.get("modulation", {})
@@ -631,10 +626,10 @@ class AdvancedSoundGenerator:
         # 9. Application du volume final
         signal *= volume
         
-        # 10. Normalisation et limitation
-        max_val = np.max(np.abs(signal))
+        # 10. Normalisation et limitation (en place : le signal est propre à cette note)
+        max_val = peak_level(signal)
         if max_val > 1.0:
-            signal = signal / max_val * 0.95  # Évite la saturation
+            signal *= 0.95 / max_val  # Évite la saturation
         
         return signal
     
@@ -1068,15 +1063,49 @@ class SimpleMidiAudioGenerator(IAudioGenerator):
             logger.error(f"Error generation: {e}")
             return None
     
+    def stream(self, block_size: int = AUDIO_BLOCK_SIZE) -> Optional[AudioStream]:
+        """Generate the audio as 16-bit PCM blocks (same track as generate(), no WAV)"""
+        self.sound = random.choice(self.sound_types)
+        logger.info(f"Sound type: {self.sound} (streamed)")
+        total_samples = int(self.sample_rate * self.duration)
+        mixer = self._place_events(total_samples)
+        if mixer is None:
+            mixer = EventMixer(total_samples)  # Silence
+        duck_amount = 2.0 if self.auto_volume_adjust else 0.0
+
+        def blocks():
+            # First pass for the peak (normalization), second one for the output
+            max_val = 0.0
+            for block in mixer.render_blocks(block_size, duck_amount):
+                max_val = max(max_val, peak_level(block))
+            gain = self._output_gain(max_val)
+
+            offset = 0
+            for block in mixer.render_blocks(block_size, duck_amount):
+                block *= gain
+                self._apply_fades(block, offset, total_samples)
+                offset += len(block)
+                yield block
+
+        return AudioStream(self.sample_rate, 1, pcm16(blocks()))
+
     def _process_events(self):
         """Process events and play the nites"""
+        mixer = self._place_events(len(self.audio_data))
+        if mixer is not None:
+            # Superposed notes are reduced progressively with the activity around them
+            mixer.render(duck_amount=2.0 if self.auto_volume_adjust else 0.0, out=self.audio_data)
+
+    def _place_events(self, total_samples: int) -> Optional[EventMixer]:
+        """Notes of the events placed on the timeline (mixed by the caller)"""
         if not self.melody_notes:
             logger.warning("Unavailable melody")
-            return
+            return None
 
         note_index = 0
 
-        active_notes_timeline = np.zeros(len(self.audio_data))
+        # Notes are collected, then mixed (and ducked) in a single pass
+        mixer = EventMixer(total_samples)
 
         for event in self.events:
             try:
@@ -1087,33 +1116,21 @@ class SimpleMidiAudioGenerator(IAudioGenerator):
                     frequency = self.melody_notes[note_index % len(self.melody_notes)]
                     note_index += 1
                     
-                    # Smart calcule of the volume
                     start_sample = int(event.time * self.sample_rate)
                     
-                    # Generate the sound for this note
-                    sound = self._generate_sound(frequency, event)
+                    # Generate the sound for this note (cached, volume applied when mixing)
+                    sound, gain = self._generate_sound(frequency, event)
                     
-                    # Mange superposed sounds
-                    end_sample = min(start_sample + len(sound), len(self.audio_data))
-
-                    if start_sample < len(self.audio_data):
-                        length = end_sample - start_sample
-                        
-                        # Count the simultanous active notes
-                        if self.auto_volume_adjust:
-
-                            region_activity = np.mean(np.abs(self.audio_data[start_sample:end_sample]))
-                            volume_reduction = 1.0 / (1.0 + region_activity * 2)  # Progressive reduction
-                            sound = sound * volume_reduction
-                        
-                        # Natural superposition
-                        self.audio_data[start_sample:end_sample] += sound[:length]
+                    # Natural superposition
+                    mixer.add(sound, start_sample, gain)
 
             except Exception as e:
                 logger.warning(f"Error event: {e}")
 
-    def _generate_sound(self, frequency: float, event: AudioEvent) -> np.ndarray:
-        """Génère un son satisfaisant selon le type configuré"""
+        return mixer
+
+    def _generate_sound(self, frequency: float, event: AudioEvent) -> Tuple[np.ndarray, float]:
+        """Génère un son satisfaisant selon le type configuré : (forme d'onde, gain de mixage)"""
         
         # Ajuster le volume et la durée selon l'événement
         volume = self.volume
@@ -1124,76 +1141,60 @@ class SimpleMidiAudioGenerator(IAudioGenerator):
             volume *= event.params.get("volume", 1.0)
             duration *= event.params.get("duration", 1.0)
         
-        # Générer le son selon le type
-        if self.sound == "satisfying_bounce":
-            return self.sound_gen.satisfying_bounce(frequency, duration, volume)
-        elif self.sound == "asmr_pop":
-            return self.sound_gen.asmr_pop(frequency, duration, volume)
-        elif self.sound == "soft_chime":
-            return self.sound_gen.soft_chime(frequency, duration, volume)
-        elif self.sound == "water_drop":
-            return self.sound_gen.water_drop(frequency, duration, volume)
-        elif self.sound == "gentle_pluck":
-            return self.sound_gen.gentle_pluck(frequency, duration, volume)
-        elif self.sound == "crystal_ting":
-            return self.sound_gen.crystal_ting(frequency, duration, volume)
-        # Nouveaux presets ultra-satisfaisants
-        elif self.sound == "ultra_satisfying_bounce":
-            return self.sound_gen.ultra_satisfying_bounce(frequency, duration, volume)
-        elif self.sound == "deep_asmr_pop":
-            return self.sound_gen.deep_asmr_pop(frequency, duration, volume)
-        elif self.sound == "velvet_chime":
-            return self.sound_gen.velvet_chime(frequency, duration, volume)
-        elif self.sound == "bubble_pop":
-            return self.sound_gen.bubble_pop(frequency, duration, volume)
-        else:
-            # Fallback vers le son de rebond satisfaisant
-            return self.sound_gen.satisfying_bounce(frequency, duration, volume)
+        # Générer le son selon le type (fallback vers le son de rebond satisfaisant)
+        sound_type = self.sound if self.sound in self.sound_types else "satisfying_bounce"
+        return self.sound_gen.cached_preset_sound(sound_type, frequency, duration, volume)
     
     def _normalize_and_save(self):
         """Normalize and save the audio output"""
         
         # Step 1: Normalization
-        max_val = np.max(np.abs(self.audio_data))
+        self.audio_data *= self._output_gain(peak_level(self.audio_data))
+        
+        # Step 2: Apply smooth fade in/out (50 ms)
+        self._apply_fades(self.audio_data, 0, len(self.audio_data))
 
+        # Step 3: Export as WAV file
+        self._save_to_wav()
+
+    def _output_gain(self, max_val: float) -> float:
+        """Normalization gain for a mix peaking at max_val"""
         if max_val > 1.0:
             # Soft compression to prevent clipping
             compression_ratio = 0.8 / max_val
-            self.audio_data = self.audio_data * compression_ratio
             logger.info(f"Compression applied: {compression_ratio:.3f}")
-        else:
-            # Gentle amplification if the signal is too weak
-            if 0 < max_val < 0.3:
-                amplification = 0.7 / max_val
-                self.audio_data = self.audio_data * amplification
-                logger.info(f"Amplification applied: {amplification:.3f}")
-        
-        # Step 2: Apply smooth fade in/out (50 ms)
-        fade_samples = int(0.05 * self.sample_rate)  # 50 ms fade duration
-        if len(self.audio_data) > fade_samples * 2:
+            return compression_ratio
+        # Gentle amplification if the signal is too weak
+        if 0 < max_val < 0.3:
+            amplification = 0.7 / max_val
+            logger.info(f"Amplification applied: {amplification:.3f}")
+            return amplification
+        return 1.0
+
+    def _apply_fades(self, samples: np.ndarray, offset: int, total_samples: int):
+        """Smooth 50 ms fade in/out on `samples`, located at `offset` in a track of total_samples"""
+        fade_samples = int(0.05 * self.sample_rate)
+        if total_samples <= fade_samples * 2:
+            return
+        end = offset + len(samples)
+        if offset < fade_samples:
             # Smooth fade-in (sinusoidal)
             fade_in = np.sin(np.linspace(0, np.pi / 2, fade_samples)) ** 2
-            self.audio_data[:fade_samples] *= fade_in
-
+            stop = min(end, fade_samples)
+            samples[:stop - offset] *= fade_in[offset:stop]
+        fade_start = total_samples - fade_samples
+        if end > fade_start:
             # Smooth fade-out (cosine-based)
             fade_out = np.cos(np.linspace(0, np.pi / 2, fade_samples)) ** 2
-            self.audio_data[-fade_samples:] *= fade_out
-
-        # Step 3: Export as WAV file
-        self._save_to_wav()
+            first = max(offset, fade_start)
+            samples[first - offset:] *= fade_out[first - fade_start:end - fade_start]
 
     def _save_to_wav(self):
         """Save the audio buffer to a WAV file"""
         
         try:
-            # Convert float32 to 16-bit PCM
-            audio_int16 = (self.audio_data * 32767).astype(np.int16)
-
-            with wave.open(self.output_path, 'w') as wav_file:
-                wav_file.setnchannels(1)         # Mono
-                wav_file.setsampwidth(2)         # 16-bit samples
-                wav_file.setframerate(self.sample_rate)
-                wav_file.writeframes(audio_int16.tobytes())
+            # Convert float32 to 16-bit PCM (mono), block by block
+            AudioStream(self.sample_rate, 1, pcm16(buffer_blocks(self.audio_data))).write_wav(self.output_path)
             
             logger.info(f"WAV file saved: {self.output_path}")
         
@@ -0,0 +1,224 @@
+# src/audio_generators/viral_audio/effects/envelope.py
+"""
+Envelope followers - vectorised equivalents of per-sample envelope loops
+"""
+
+from typing import Optional
+
+import numpy as np
+
+BLOCK_SIZE = 1024      # Samples per row of the block solver
+CHUNK_SIZE = 16384     # Samples settled together before moving on (stays in cache)
+MAX_PEAK_PASSES = 8    # Reset corrections per chunk before the sequential fallback
+
+
+def _block_responses(coef: np.ndarray, drive: np.ndarray):
+    """
+    Per block (row), the response of y[j] = coef[j] * y[j-1] + drive[j]
+    to a zero incoming state, and the decay of the incoming state:
+    y = response + decay * y_in.
+    """
+    decay = np.cumprod(coef, axis=1)
+    return decay * np.cumsum(drive / decay, axis=1), decay
+
+
+def _follow_chunk(x: np.ndarray, attack_coef: float, release_coef: float,
+                  state: float, release_decay: np.ndarray):
+    """Envelope of consecutive blocks (rows) entered with `state`; returns (envelope, end state)"""
+    rows, block = x.shape
+    # First guess: release everywhere (attack is the rare case) - constant decay per row
+    attack = np.zeros(x.shape, dtype=bool)
+    decay = np.broadcast_to(release_decay[:block], x.shape).copy()
+    response = decay * np.cumsum(x * ((1 - release_coef) / release_decay[:block]), axis=1)
+    starts = np.empty(rows)
+    envelope = np.empty(x.shape)
+    rising = np.empty(x.shape, dtype=bool)
+    first = 0
+
+    while True:
+        # Chain the blocks: the state entering block k is the last value of block k-1.
+        # Blocks before the first changed one are unchanged and already consistent.
+        end = state if first == 0 else starts[first - 1] * decay[first - 1, -1] + response[first - 1, -1]
+        for k, (d, r) in enumerate(zip(decay[first:, -1].tolist(), response[first:, -1].tolist()), first):
+            starts[k] = end
+            end = d * end + r
+        np.multiply(decay[first:], starts[first:, None], out=envelope[first:])
+        envelope[first:] += response[first:]
+
+        # Attack wherever the input exceeds the previous envelope value
+        np.greater(x[first:, 1:], envelope[first:, :-1], out=rising[first:, 1:])
+        np.greater(x[first:, 0], starts[first:], out=rising[first:, 0])
+        dirty = first + np.flatnonzero((rising[first:] != attack[first:]).any(axis=1))
+        if len(dirty) == 0:
+            return envelope, end
+
+        attack[dirty] = rising[dirty]
+        coef = np.where(attack[dirty], attack_coef, release_coef)
+        response[dirty], decay[dirty] = _block_responses(coef, (1 - coef) * x[dirty])
+        first = int(dirty[0])
+
+
+def follow_envelope(abs_signal: np.ndarray, attack_coef: float, release_coef: float,
+                    initial: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Attack/release envelope follower:
+
+        coef = attack_coef if x[i] > env[i-1] else release_coef
+        env[i] = coef * env[i-1] + (1 - coef) * x[i]
+
+    with env[-1] = initial.
+
+    Once the attack/release choice of every sample is known the recurrence
+    is linear and is solved block-wise with cumulative products/sums. The
+    choice is guessed (release everywhere), recomputed from the resulting
+    envelope, and the blocks whose choice changed are solved again until
+    it is stable - at which point the envelope satisfies the recurrence
+    exactly. Chunks are settled in order, each starting from the exact end
+    state of the previous one, and solved in float64 whatever the dtype of
+    the input and output.
+
+    Args:
+        abs_signal: Rectified input, 1D
+        attack_coef: Smoothing coefficient while rising (0 < coef <= 1)
+        release_coef: Smoothing coefficient while falling (0 < coef <= 1)
+        initial: Envelope value before the first sample
+        out: Output buffer, same length as the input - may be the input
+            itself (each chunk is read before it is written)
+
+    Returns:
+        Envelope in `out`, or in a new float64 array
+    """
+    n = len(abs_signal)
+    if out is None:
+        out = np.empty(n)
+    if n == 0:
+        return out
+
+    # Blocks short enough that the cumulated decay cannot underflow
+    min_coef = min(attack_coef, release_coef)
+    block = BLOCK_SIZE if min_coef >= 0.9 else max(1, min(BLOCK_SIZE, int(200 / -np.log10(min_coef))))
+    chunk = max(1, CHUNK_SIZE // block) * block
+
+    release_decay = np.cumprod(np.full(block, release_coef))
+    state = float(initial)
+    for start in range(0, n, chunk):
+        part = abs_signal[start:start + chunk]
+        x = np.zeros((-(-len(part) // block), block))
+        x.ravel()[:len(part)] = part
+        envelope, state = _follow_chunk(x, attack_coef, release_coef, state, release_decay)
+        out[start:start + len(part)] = envelope.ravel()[:len(part)]
+    return out
+
+
+def _settle_peaks(x: np.ndarray, state: float, log_release: float, out: np.ndarray) -> float:
+    """
+    Peaks of one chunk entered with `state` (peak of the previous sample),
+    written to `out`; returns the end state.
+
+    Each pass recomputes only from the first disagreement on, which is
+    exact afterwards - so every pass settles at least one more sample.
+    After MAX_PEAK_PASSES passes the rest of the chunk is run sample by
+    sample (inputs with a reset every few samples would otherwise take
+    one pass per reset).
+    """
+    m = len(x)
+    index = np.arange(m)
+
+    # First guess: resets of max(x[i], release_coef * peak[i-1]), a running maximum
+    # of x[k] / release_coef**k (in log form). It only differs from the exact rule
+    # when x[i] lies between release_coef * peak[i-1] and peak[i-1].
+    with np.errstate(divide="ignore"):
+        scaled = np.log(x) - index * log_release
+        entry = np.log(state) + log_release
+    running = np.maximum.accumulate(scaled)
+    resets = np.empty(m, dtype=bool)
+    resets[0] = scaled[0] > entry
+    np.greater(scaled[1:], np.maximum(running[:-1], entry), out=resets[1:])
+
+    consistent = np.empty(m, dtype=bool)
+    first = 0
+    for _ in range(MAX_PEAK_PASSES):
+        previous = state if first == 0 else float(out[first - 1])
+        tail = index[first:]
+        last = np.maximum.accumulate(np.where(resets[first:], tail, -1))
+        held = last >= 0
+        out[first:] = previous * np.exp((tail - first + 1) * log_release)
+        out[first:][held] = x[last[held]] * np.exp((tail[held] - last[held]) * log_release)
+
+        consistent[first] = x[first] > previous
+        np.greater(x[first + 1:], out[first:-1], out=consistent[first + 1:])
+        mismatch = np.flatnonzero(consistent[first:] != resets[first:])
+        if len(mismatch) == 0:
+            return float(out[-1])
+        # Everything before the first disagreement is already exact
+        first += int(mismatch[0])
+        resets[first:] = consistent[first:]
+
+    release_coef = np.exp(log_release)
+    previous = state if first == 0 else float(out[first - 1])
+    peaks = x[first:].tolist()
+    for i, value in enumerate(peaks):
+        previous = peaks[i] = value if value > previous else previous * release_coef
+    out[first:] = peaks
+    return previous
+
+
+def peak_envelope(abs_signal: np.ndarray, release_coef: float) -> np.ndarray:
+    """
+    Instant-attack peak hold with exponential release:
+
+        peak[i] = x[i] if x[i] > peak[i-1] else peak[i-1] * release_coef
+
+    with peak[-1] = 0 and 0 < release_coef <= 1. Between two resets
+    (x[i] > peak[i-1]) the peak is the last reset value decayed by
+    release_coef per sample, so it has a closed form for a given set of
+    resets. Chunks are settled in order: the resets are guessed, then
+    corrected from the first disagreement on until consistent, for a
+    bounded number of passes before falling back to a sequential loop.
+
+    Returns:
+        float64 peak envelope, same length as the input
+    """
+    n = len(abs_signal)
+    peak = np.empty(n)
+    x = np.asarray(abs_signal, dtype=np.float64)
+    log_release = np.log(release_coef)
+
+    state = 0.0
+    for start in range(0, n, CHUNK_SIZE):
+        state = _settle_peaks(x[start:start + CHUNK_SIZE], state, log_release,
+                              peak[start:start + CHUNK_SIZE])
+    return peak
+
+
+def peak_regions(abs_signal: np.ndarray, release_coef: float, level: float,
+                 min_gap: int = 4096):
+    """
+    Sample ranges [start, end) outside of which peak_envelope() stays at or
+    below `level`.
+
+    The peak never exceeds the running maximum of x[k] * release_coef**(i-k),
+    so it can only go above `level` for a bounded time after a sample above
+    it. Each range starts on such a sample, which is always a reset - so a
+    range can be processed on its own, from a zero state.
+
+    Args:
+        min_gap: Ranges closer than this are merged (fewer, larger calls)
+    """
+    loud = np.flatnonzero(abs_signal > level)
+    n = len(abs_signal)
+    if len(loud) == 0:
+        return []
+    if release_coef >= 1 or level <= 0:
+        ends = np.full(len(loud), n)
+    else:
+        # Samples until x[k] * release_coef**t falls to the level
+        hold = np.log(level / abs_signal[loud]) / np.log(release_coef)
+        ends = np.minimum(loud + np.floor(hold).astype(np.int64) + 1, n)
+
+    # Merge overlapping (or close) ranges: a new one starts where no earlier range reaches
+    reach = np.maximum.accumulate(ends)
+    breaks = np.flatnonzero(loud[1:] >= reach[:-1] + min_gap) + 1
+    starts = loud[np.concatenate(([0], breaks))]
+    stops = reach[np.concatenate((breaks - 1, [len(loud) - 1]))]
+    return list(zip(starts.tolist(), stops.tolist()))
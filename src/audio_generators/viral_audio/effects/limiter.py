@@ -3,8 +3,12 @@
 Limiter - Peak limiting to prevent clipping
 """
 
+from typing import Optional
+
 import numpy as np
 
+from .envelope import peak_envelope, peak_regions
+
 
 class Limiter:
     """
@@ -16,39 +20,31 @@ class Limiter:
         self.ceiling_db = -0.5  # Output ceiling
         self.release_ms = 100.0
 
-    def process(self, signal: np.ndarray) -> np.ndarray:
-        """Apply limiting to signal"""
+    def process(self, signal: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Apply limiting to signal, into `out` (which may be the signal
+        itself) or a new array of its dtype
+        """
         if len(signal) == 0:
             return signal
 
         ceiling_lin = 10 ** (self.ceiling_db / 20)
         release_coef = np.exp(-1.0 / (self.release_ms * self.sample_rate / 1000))
 
-        # Find peaks above ceiling
         abs_signal = np.abs(signal)
-        limited = signal.copy()
-
-        # Envelope follower for smooth limiting
-        gain = np.ones_like(signal)
-        peak_hold = 0.0
-
-        for i in range(len(signal)):
-            # Update peak
-            if abs_signal[i] > peak_hold:
-                peak_hold = abs_signal[i]
-            else:
-                peak_hold = peak_hold * release_coef
-
-            # Calculate gain if above ceiling
-            if peak_hold > ceiling_lin:
-                gain[i] = ceiling_lin / peak_hold
-            else:
-                gain[i] = 1.0
-
-        # Apply gain
-        limited = signal * gain
+        if out is None:
+            out = signal.copy()
+        elif out is not signal:
+            np.copyto(out, signal)
+
+        # Peak envelope (instant attack, exponential release) for smooth limiting.
+        # It can only exceed the ceiling for a while after a sample above it,
+        # everywhere else the gain stays at 1 (and the samples are left as they are).
+        for start, end in peak_regions(abs_signal, release_coef, ceiling_lin):
+            peak_hold = peak_envelope(abs_signal[start:end], release_coef)
+            over = peak_hold > ceiling_lin
+            region = out[start:end]
+            region[over] *= (ceiling_lin / peak_hold[over]).astype(out.dtype)
 
         # Hard clip as safety (should rarely trigger)
-        limited = np.clip(limited, -ceiling_lin, ceiling_lin)
-
-        return limited
+        return np.clip(out, -ceiling_lin, ceiling_lin, out=out)
@@ -6,6 +6,9 @@ Adds "air" and sparkle to the sound
 
 import numpy as np
 
+from src.audio_generators import dsp
+from .batch import sample_counts, time_grid, add_partial, layer_envelope
+
 
 class AirLayer:
     """
@@ -23,59 +26,54 @@ class AirLayer:
                  intensity: float = 1.0, richness: float = 0.0) -> np.ndarray:
         """Generate air/shimmer signal"""
         samples = int(self.sample_rate * duration)
-
-        # Filtered noise for natural air sound
-        noise = np.random.uniform(-1, 1, samples)
-
-        # Apply bandpass filter (simple IIR approximation)
-        signal = self._bandpass_filter(noise, 8000, 16000)
+        signal = np.zeros(samples, dtype=np.float32)
+        row = self.generate_batch([frequency], [duration], [intensity], [richness])[0]
+        signal[:len(row)] = row[:samples]
+        return signal
+
+    def generate_batch(self, frequencies, durations, intensities, richness) -> np.ndarray:
+        """Air signals of many events, one row each (float32, up to the end of the envelope)"""
+        durations = np.asarray(durations, dtype=np.float64)
+        samples = sample_counts(durations, self.sample_rate)
+        # Envelope first: it ends before the notes, and the rows with it
+        envelope = self._create_envelope(samples)
+        length = envelope.shape[1]
+        t = time_grid(durations, samples, length)
+
+        # Filtered noise for natural air sound (bandpass 8-16kHz, all rows in one FFT)
+        signal = self._bandpass_noise(len(samples), length, 8000, 16000)
 
         # Add subtle sine for tonal quality
-        t = np.linspace(0, duration, samples)
-        signal += np.sin(2 * np.pi * self.freq_center * t) * 0.3
+        add_partial(signal, t, 2 * np.pi * self.freq_center, 0.3, scratch=t)
 
         # Apply envelope
-        envelope = self._create_envelope(samples, intensity)
-        signal = signal * envelope
+        signal *= envelope
 
         # Normalize
-        max_val = np.max(np.abs(signal))
-        if max_val > 0:
-            signal = signal / max_val
-
-        return signal.astype(np.float32)
-
-    def _bandpass_filter(self, signal: np.ndarray, low: float, high: float) -> np.ndarray:
-        """Simple bandpass filter using FFT"""
-        # FFT
-        fft = np.fft.rfft(signal)
-        freqs = np.fft.rfftfreq(len(signal), 1 / self.sample_rate)
-
-        # Create bandpass mask
-        mask = (freqs >= low) & (freqs <= high)
-
-        # Apply with smooth rolloff
-        fft_filtered = fft * mask
-
-        # IFFT
-        return np.fft.irfft(fft_filtered, len(signal))
-
-    def _create_envelope(self, samples: int, intensity: float) -> np.ndarray:
-        """Fast envelope for air"""
+        max_val = np.maximum(np.max(signal, axis=1, keepdims=True, initial=0.0),
+                             -np.min(signal, axis=1, keepdims=True, initial=0.0))
+        np.divide(signal, max_val, out=signal, where=max_val > 0)
+        return signal
+
+    def _bandpass_noise(self, rows: int, length: int, low: float, high: float) -> np.ndarray:
+        """
+        White noise band-limited to [low, high] with an FFT mask, `rows` x
+        `length` (float32). Generated at a fast FFT size and cropped: the same
+        filtered noise in distribution, without an FFT of an arbitrary length
+        per event.
+        """
+        size = dsp._fft_size(max(length, 1))
+        noise = np.random.uniform(-1, 1, (rows, size))
+
+        # FFT, bandpass mask, IFFT
+        fft = np.fft.rfft(noise, axis=1)
+        freqs = np.fft.rfftfreq(size, 1 / self.sample_rate)
+        fft *= (freqs >= low) & (freqs <= high)
+        return np.fft.irfft(fft, size, axis=1)[:, :length].astype(np.float32)
+
+    def _create_envelope(self, samples: np.ndarray) -> np.ndarray:
+        """Fast envelope for air (attack, then decay)"""
         attack_samples = max(1, int(self.attack_ms * self.sample_rate / 1000))
         decay_samples = int(self.decay_ms * self.sample_rate / 1000)
-
-        envelope = np.zeros(samples)
-
-        # Fast attack
-        if attack_samples < samples:
-            envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-
-        # Decay
-        decay_start = attack_samples
-        if decay_samples > 0 and decay_start < samples:
-            decay_len = min(decay_samples, samples - decay_start)
-            decay = np.exp(-np.linspace(0, 4, decay_len))
-            envelope[decay_start:decay_start + decay_len] = decay
-
-        return envelope
+        return layer_envelope(samples, np.full(len(samples), attack_samples), 0,
+                              decay_samples, "linear", 4.0)
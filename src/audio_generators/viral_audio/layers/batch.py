@@ -0,0 +1,106 @@
+# src/audio_generators/viral_audio/layers/batch.py
+"""
+Batch helpers - render one layer for many events at once.
+
+A batch is a 2D array: one row per event, zero-padded to the longest
+event. The helpers reproduce the per-event np.linspace curves of the
+layers row by row, so a batch row equals the layer's generate() output.
+Rows stop where the envelopes fall silent - the layers' envelopes end
+well before their notes - and the rest of each note is silence.
+
+Signals and envelopes are float32; phases stay float64 (a float32 phase
+loses the pitch), in one scratch array per batch reused for every partial.
+"""
+
+import numpy as np
+
+
+def sample_counts(durations: np.ndarray, sample_rate: int) -> np.ndarray:
+    """int(sample_rate * duration) per event"""
+    return (sample_rate * np.asarray(durations, dtype=np.float64)).astype(np.int64)
+
+
+def time_grid(durations: np.ndarray, samples: np.ndarray, length: int) -> np.ndarray:
+    """np.linspace(0, duration, samples) per row, over `length` columns"""
+    step = np.asarray(durations, dtype=np.float64) / np.maximum(samples - 1, 1)
+    return np.arange(length)[None, :] * step[:, None]
+
+
+def sine_rows(phase: np.ndarray) -> np.ndarray:
+    """np.sin(phase) as float32 rows"""
+    return np.sin(phase, out=np.empty(phase.shape, dtype=np.float32))
+
+
+def add_partial(signal: np.ndarray, phase: np.ndarray, ratio: float, amplitude,
+                scratch: np.ndarray):
+    """signal += sin(phase * ratio) * amplitude, computed in `scratch` (shaped as phase)"""
+    np.multiply(phase, ratio, out=scratch)
+    np.sin(scratch, out=scratch)
+    scratch *= amplitude
+    signal += scratch
+
+
+def segment_ramp(length: int, starts, counts, first: float, last: float):
+    """
+    Per row, np.linspace(first, last, count) laid on columns
+    [start, start + count) of `length` columns.
+
+    Returns:
+        (ramp values - meaningful where the mask is set, mask)
+    """
+    starts = np.broadcast_to(np.asarray(starts, dtype=np.int64), np.shape(counts))
+    counts = np.asarray(counts, dtype=np.int64)
+    offset = np.arange(length)[None, :] - starts[:, None]
+    mask = (offset >= 0) & (offset < counts[:, None])
+    step = (last - first) / np.maximum(counts - 1, 1)
+    return first + offset * step[:, None], mask
+
+
+def fill_segments(rows: np.ndarray, starts, counts, first: float, last: float, curve=None):
+    """
+    Per row, write curve(np.linspace(first, last, count)) on columns
+    [start, start + count) of `rows` (the linspace itself without a curve).
+    Only the columns the segments span are computed.
+    """
+    starts = np.broadcast_to(np.asarray(starts, dtype=np.int64), np.shape(counts))
+    counts = np.asarray(counts, dtype=np.int64)
+    used = counts > 0
+    if not np.any(used):
+        return
+    low = int(starts[used].min())
+    high = min(int((starts + counts)[used].max()), rows.shape[1])
+    ramp, mask = segment_ramp(high - low, starts - low, counts, first, last)
+    values = ramp[mask]
+    rows[:, low:high][mask] = values if curve is None else curve(values)
+
+
+def layer_envelope(samples: np.ndarray, attack: np.ndarray, hold, decay: int,
+                   attack_shape: str, decay_rate: float) -> np.ndarray:
+    """
+    Attack / hold / decay envelope of the layers, per row:
+      - attack over [0, attack) when attack < samples: linear 0 -> 1, or
+        "exponential" 1 - exp(-linspace(0, 5, attack))
+      - 1.0 over the hold, cut to the note
+      - decay exp(-linspace(0, decay_rate, n)) after it, n = decay cut to the note
+
+    The envelope is silent after the decay: the rows end at the longest
+    attack + hold + decay (cut to the note), which sets the batch width.
+    Returns float32 rows.
+    """
+    attack = np.asarray(attack, dtype=np.int64)
+    hold = np.minimum(hold, samples - attack)
+    length = int(np.minimum(samples, attack + np.maximum(hold, 0) + decay).max(initial=0))
+    envelope = np.zeros((len(samples), length), dtype=np.float32)
+
+    if attack_shape == "exponential":
+        fill_segments(envelope, 0, np.where(attack < samples, attack, 0), 0.0, 5.0,
+                      lambda ramp: 1 - np.exp(-ramp))
+    else:
+        fill_segments(envelope, 0, np.where(attack < samples, attack, 0), 0.0, 1.0)
+
+    fill_segments(envelope, attack, np.maximum(hold, 0), 1.0, 1.0)
+
+    decay_start = attack + hold
+    counts = np.where(decay_start < samples, np.minimum(decay, samples - decay_start), 0)
+    fill_segments(envelope, decay_start, counts, 0.0, decay_rate, lambda ramp: np.exp(-ramp))
+    return envelope
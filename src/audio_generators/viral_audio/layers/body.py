@@ -6,6 +6,8 @@ The main "tone" of the sound
 
 import numpy as np
 
+from .batch import sample_counts, time_grid, add_partial, layer_envelope
+
 
 class BodyLayer:
     """
@@ -23,49 +25,51 @@ class BodyLayer:
                  intensity: float = 1.0, richness: float = 0.0) -> np.ndarray:
         """Generate body signal"""
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples)
+        signal = np.zeros(samples, dtype=np.float32)
+        row = self.generate_batch([frequency], [duration], [intensity], [richness])[0]
+        signal[:len(row)] = row[:samples]
+        return signal
+
+    def generate_batch(self, frequencies, durations, intensities, richness) -> np.ndarray:
+        """Body signals of many events, one row each (float32, up to the end of the envelope)"""
+        frequencies, durations = np.asarray(frequencies, dtype=np.float64), np.asarray(durations)
+        intensities, richness = np.asarray(intensities, dtype=np.float64), np.asarray(richness)
+        samples = sample_counts(durations, self.sample_rate)
+        # Envelope first: it ends before the notes, and the rows with it
+        envelope = self._create_envelope(samples, intensities)
+        length = envelope.shape[1]
 
         # Map to body frequency range
-        body_freq = frequency * 1.5
-        body_freq = max(150, min(500, body_freq))
-
-        # Triangle wave for warmth
-        signal = 2 * np.abs(2 * (t * body_freq - np.floor(t * body_freq + 0.5))) - 1
+        body_freq = np.clip(frequencies * 1.5, 150, 500)[:, None]
+        cycles = time_grid(durations, samples, length)
+        cycles *= body_freq
+
+        # Triangle wave for warmth: 2 * |2 * (cycles - round(cycles))| - 1
+        scratch = np.add(cycles, 0.5)
+        np.floor(scratch, out=scratch)
+        np.subtract(cycles, scratch, out=scratch)
+        signal = np.abs(scratch, out=np.empty(scratch.shape, dtype=np.float32))
+        signal *= 4
+        signal -= 1
 
         # Add harmonics for richness
-        if richness > 0.1:
+        rich = np.where(richness > 0.1, richness, 0.0)[:, None]
+        if np.any(rich):
+            phase = cycles
+            phase *= 2 * np.pi
             # 2nd harmonic
-            signal += np.sin(2 * np.pi * body_freq * 2 * t) * 0.4 * richness
+            add_partial(signal, phase, 2, 0.4 * rich, scratch)
             # 3rd harmonic
-            signal += np.sin(2 * np.pi * body_freq * 3 * t) * 0.2 * richness
+            add_partial(signal, phase, 3, 0.2 * rich, scratch)
 
         # Apply envelope
-        envelope = self._create_envelope(samples, intensity)
-        signal = signal * envelope
+        signal *= envelope
+        return signal
 
-        return signal.astype(np.float32)
-
-    def _create_envelope(self, samples: int, intensity: float) -> np.ndarray:
-        """Create snappy envelope"""
-        attack_ms = self.attack_ms * (1.3 - intensity * 0.3)
-        attack_samples = max(1, int(attack_ms * self.sample_rate / 1000))
+    def _create_envelope(self, samples: np.ndarray, intensities: np.ndarray) -> np.ndarray:
+        """Create snappy envelope (fast attack, brief peak hold, decay)"""
+        attack_ms = self.attack_ms * (1.3 - intensities * 0.3)
+        attack_samples = np.maximum(1, (attack_ms * self.sample_rate / 1000).astype(np.int64))
         decay_samples = int(self.decay_ms * self.sample_rate / 1000)
-
-        envelope = np.zeros(samples)
-
-        # Fast attack
-        if attack_samples > 0 and attack_samples < samples:
-            envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-
-        # Peak hold briefly
-        hold_samples = min(int(0.005 * self.sample_rate), samples - attack_samples)
-        envelope[attack_samples:attack_samples + hold_samples] = 1.0
-
-        # Decay
-        decay_start = attack_samples + hold_samples
-        if decay_samples > 0 and decay_start < samples:
-            decay_len = min(decay_samples, samples - decay_start)
-            decay = np.exp(-np.linspace(0, 4, decay_len))
-            envelope[decay_start:decay_start + decay_len] = decay
-
-        return envelope
+        hold_samples = int(0.005 * self.sample_rate)
+        return layer_envelope(samples, attack_samples, hold_samples, decay_samples, "linear", 4.0)
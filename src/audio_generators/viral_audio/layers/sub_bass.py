@@ -6,6 +6,8 @@ The "punch in the chest" feeling
 
 import numpy as np
 
+from .batch import sample_counts, time_grid, sine_rows, add_partial, layer_envelope
+
 
 class SubBassLayer:
     """
@@ -23,45 +25,41 @@ class SubBassLayer:
                  intensity: float = 1.0, richness: float = 0.0) -> np.ndarray:
         """Generate sub bass signal"""
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples)
+        signal = np.zeros(samples, dtype=np.float32)
+        row = self.generate_batch([frequency], [duration], [intensity], [richness])[0]
+        signal[:len(row)] = row[:samples]
+        return signal
+
+    def generate_batch(self, frequencies, durations, intensities, richness) -> np.ndarray:
+        """Sub bass signals of many events, one row each (float32, up to the end of the envelope)"""
+        frequencies, durations = np.asarray(frequencies, dtype=np.float64), np.asarray(durations)
+        intensities, richness = np.asarray(intensities, dtype=np.float64), np.asarray(richness)
+        samples = sample_counts(durations, self.sample_rate)
+        # Envelope first: it ends before the notes, and the rows with it
+        envelope = self._create_envelope(samples, intensities)
+        length = envelope.shape[1]
 
         # Map to sub frequency range (50-150Hz)
-        sub_freq = self.freq_center * (frequency / 200.0)
-        sub_freq = max(50, min(150, sub_freq))
+        sub_freq = np.clip(self.freq_center * (frequencies / 200.0), 50, 150)[:, None]
+        phase = time_grid(durations, samples, length)
+        phase *= 2 * np.pi * sub_freq
 
         # Pure sine for clean sub
-        signal = np.sin(2 * np.pi * sub_freq * t)
+        signal = sine_rows(phase)
 
         # Add first harmonic for punch (2x frequency)
-        if richness > 0.2:
-            harm_amp = 0.3 * richness
-            signal += np.sin(2 * np.pi * sub_freq * 2 * t) * harm_amp
+        harm_amp = np.where(richness > 0.2, 0.3 * richness, 0.0)
+        if np.any(harm_amp):
+            add_partial(signal, phase, 2, harm_amp[:, None], scratch=phase)
 
         # Apply envelope
-        envelope = self._create_envelope(samples, intensity)
-        signal = signal * envelope
+        signal *= envelope
+        return signal
 
-        return signal.astype(np.float32)
-
-    def _create_envelope(self, samples: int, intensity: float) -> np.ndarray:
-        """Create punchy envelope for sub bass"""
+    def _create_envelope(self, samples: np.ndarray, intensities: np.ndarray) -> np.ndarray:
+        """Create punchy envelope for sub bass (exponential attack, exponential fall)"""
         # Faster attack for harder hits
-        attack_ms = self.attack_ms * (1.5 - intensity * 0.5)
-        attack_samples = max(1, int(attack_ms * self.sample_rate / 1000))
+        attack_ms = self.attack_ms * (1.5 - intensities * 0.5)
+        attack_samples = np.maximum(1, (attack_ms * self.sample_rate / 1000).astype(np.int64))
         decay_samples = int(self.decay_ms * self.sample_rate / 1000)
-
-        envelope = np.zeros(samples)
-
-        # Attack - fast exponential
-        if attack_samples > 0 and attack_samples < samples:
-            attack = 1 - np.exp(-np.linspace(0, 5, attack_samples))
-            envelope[:attack_samples] = attack
-
-        # Decay - exponential fall
-        decay_start = attack_samples
-        if decay_samples > 0 and decay_start < samples:
-            decay_len = min(decay_samples, samples - decay_start)
-            decay = np.exp(-np.linspace(0, 4, decay_len))
-            envelope[decay_start:decay_start + decay_len] = decay
-
-        return envelope
+        return layer_envelope(samples, attack_samples, 0, decay_samples, "exponential", 4.0)
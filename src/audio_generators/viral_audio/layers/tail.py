@@ -4,8 +4,15 @@ Tail Layer - Reverb/decay for space and depth
 Adds room feel and sustain
 """
 
+from typing import Optional
+
 import numpy as np
 
+from src.audio_generators import dsp
+from .batch import sample_counts, time_grid, segment_ramp
+
+REVERB_BLOCK_SIZE = 4096    # Samples per reverb block (its scratch stays in cache)
+
 
 class TailLayer:
     """
@@ -23,59 +30,83 @@ class TailLayer:
                  intensity: float = 1.0, richness: float = 0.0) -> np.ndarray:
         """Generate reverb tail"""
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples)
-
-        # Create source impulse (brief tone burst)
-        source_freq = max(200, min(800, frequency))
-        source_duration = 0.02  # 20ms burst
-        source_samples = min(int(source_duration * self.sample_rate), samples)
-
-        source = np.zeros(samples)
-        source[:source_samples] = np.sin(2 * np.pi * source_freq * t[:source_samples])
-        source[:source_samples] *= np.exp(-np.linspace(0, 5, source_samples))
-
-        # Apply simple reverb (multi-tap delay)
-        reverb = self._apply_reverb(source)
-
-        # Mix based on intensity
-        wet_amount = self.wet_mix * (0.5 + intensity * 0.5)
-        signal = source * (1 - wet_amount) + reverb * wet_amount
-
-        return signal.astype(np.float32)
 
-    def _apply_reverb(self, signal: np.ndarray) -> np.ndarray:
-        """Simple multi-tap reverb"""
+        # Create source impulse (brief tone burst), as the wet send
+        burst = self.source_batch([frequency], [duration])[0]
+        wet_amount = self.wet_amounts(intensity)
+        send = np.zeros(samples, dtype=np.float32)
+        send[:len(burst)] = burst[:samples] * wet_amount
+
+        # Mix based on intensity: dry burst, plus simple reverb (multi-tap delay) of the send
+        signal = np.zeros(samples, dtype=np.float32)
+        signal[:len(burst)] = burst[:samples] * (1 - wet_amount)
+        return self.apply_reverb(send, out=signal)
+
+    def source_batch(self, frequencies, durations) -> np.ndarray:
+        """
+        Source bursts of many events (20ms decaying tone, cut to the note),
+        one row each, zero-padded to the longest burst (float64)
+        """
+        frequencies, durations = np.asarray(frequencies, dtype=np.float64), np.asarray(durations)
+        samples = sample_counts(durations, self.sample_rate)
+        source_freq = np.clip(frequencies, 200, 800)[:, None]
+        source_samples = np.minimum(int(0.02 * self.sample_rate), samples)
+        length = int(source_samples.max(initial=0))
+
+        t = time_grid(durations, samples, length)
+        decay, mask = segment_ramp(length, 0, source_samples, 0.0, 5.0)
+        return np.where(mask, np.sin(2 * np.pi * source_freq * t) * np.exp(-decay), 0.0)
+
+    def wet_amounts(self, intensities):
+        """Reverb amount per event (more for harder hits)"""
+        return self.wet_mix * (0.5 + np.asarray(intensities) * 0.5)
+
+    def apply_reverb(self, signal: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Simple multi-tap reverb: damped delay taps of `signal`, cut to its
+        length. The damping is linear, so it is applied once to the sum of
+        the taps - and the reverb of a mix of sources (a layer bus) equals
+        the sum of their reverbs.
+
+        Runs in blocks of REVERB_BLOCK_SIZE samples (the damping state is
+        carried across), so a long bus needs no full-length temporaries.
+        The reverb is added into `out` when given, else returned (float64).
+        """
         samples = len(signal)
-        reverb = np.zeros(samples)
+        if out is None:
+            out = np.zeros(samples)
 
         # Delay taps (in ms)
         delays_ms = [23, 37, 53, 79, 97, 127]
         decays = [0.7, 0.5, 0.35, 0.25, 0.18, 0.12]
-
-        for delay_ms, decay in zip(delays_ms, decays):
-            delay_samples = int(delay_ms * self.sample_rate / 1000)
-            delay_samples = int(delay_samples * self.room_size * 2)
-
-            if delay_samples < samples:
-                # Apply damping (low-pass) to delayed signal
-                delayed = np.zeros(samples)
-                delayed[delay_samples:] = signal[:-delay_samples] if delay_samples > 0 else signal
-
-                # Simple damping
-                damped = self._apply_damping(delayed)
-
-                reverb += damped * decay
-
-        return reverb
-
-    def _apply_damping(self, signal: np.ndarray) -> np.ndarray:
-        """Apply high-frequency damping"""
-        # Simple one-pole lowpass
-        damped = np.zeros_like(signal)
-        damped[0] = signal[0]
-
+        delays = [int(int(delay_ms * self.sample_rate / 1000) * self.room_size * 2)
+                  for delay_ms in delays_ms]
+
+        taps = np.empty(min(REVERB_BLOCK_SIZE, samples))
+        state = 0.0
+        for start in range(0, samples, REVERB_BLOCK_SIZE):
+            end = min(start + REVERB_BLOCK_SIZE, samples)
+            block = taps[:end - start]
+            block.fill(0.0)
+            for delay, decay in zip(delays, decays):
+                first = max(start, delay)
+                if first < end:
+                    block[first - start:] += signal[first - delay:end - delay] * decay
+
+            # Damping (low-pass) of the delayed signal
+            damped = self._apply_damping(block, state, first_block=start == 0)
+            state = damped[-1]
+            out[start:end] += damped
+        return out
+
+    def _apply_damping(self, signal: np.ndarray, state: float = 0.0,
+                       first_block: bool = True) -> np.ndarray:
+        """
+        Apply high-frequency damping: one-pole lowpass from the previous
+        output `state`, y[0] = x[0] on the first block
+        """
         alpha = self.damping
-        for i in range(1, len(signal)):
-            damped[i] = alpha * signal[i] + (1 - alpha) * damped[i - 1]
-
-        return damped
+        drive = alpha * np.asarray(signal, dtype=np.float64)
+        if first_block and len(drive):
+            drive[0] = signal[0]
+        return dsp.one_pole(drive, 1 - alpha, initial=state)
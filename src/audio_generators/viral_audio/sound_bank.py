@@ -0,0 +1,334 @@
+# src/audio_generators/viral_audio/sound_bank.py
+"""
+Sound bank - persistent index of the WAV sound folders.
+
+Every WAV file is decoded once (mono float32, resampled to the engine
+sample rate) into a .npy file of the bank directory, and described in a
+JSON manifest of that sample rate: duration, source sample rate,
+channels, peak and RMS loudness of the decoded PCM. Later runs - and the
+other worker processes - select sounds from the manifest without opening
+the WAV files, and load the decoded PCM memory-mapped (read-only, shared
+through the page cache, no copy).
+
+Entries are keyed by the file path and revalidated against its size and
+modification time; the PCM of a file's previous version is deleted when
+the file is indexed again. Folder listings are reused while the folder's
+own modification time is unchanged; when a listing is refreshed, the
+entries and PCM of files no longer in the folder are deleted. Files that
+fail to decode are remembered (per process) and skipped until their size
+or modification time changes.
+"""
+
+import os
+import json
+import wave
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.atomic_write import atomic_write
+
+logger = logging.getLogger("TikSimPro")
+
+DEFAULT_BANK_DIR = os.path.expanduser("~/.tiksimpro/sound_bank")
+MANIFEST_NAME = "index_{rate}.json"   # One manifest per sample rate
+
+# Bump when decoding/resampling changes, so banked PCM is decoded again
+BANK_VERSION = 1
+
+
+@dataclass
+class SoundInfo:
+    """Manifest entry of a sound file"""
+    path: str
+    size: int
+    mtime_ns: int
+    duration: float          # Seconds
+    source_rate: int         # Sample rate of the file
+    channels: int
+    peak: float              # Of the decoded mono signal, 0..1
+    rms_db: float            # Loudness of the decoded mono signal (dBFS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SoundInfo":
+        return cls(**{k: data[k] for k in cls.__dataclass_fields__})
+
+
+def decode_wav(path: str, sample_rate: int) -> Optional[Tuple[np.ndarray, int, int, float]]:
+    """
+    Decode a WAV file to mono float32 at `sample_rate` (channels averaged,
+    linear-interpolation resampling).
+
+    Returns:
+        (samples, source sample rate, channels, duration in seconds),
+        or None if unsupported
+    """
+    with wave.open(path, 'rb') as wav:
+        rate = wav.getframerate()
+        n_channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        raw_data = wav.readframes(wav.getnframes())
+
+    if sample_width == 2:  # 16-bit
+        data = np.frombuffer(raw_data, dtype=np.int16).astype(np.float32) / 32768.0
+    elif sample_width == 4:  # 32-bit
+        data = np.frombuffer(raw_data, dtype=np.int32).astype(np.float32) / 2147483648.0
+    elif sample_width == 1:  # 8-bit
+        data = (np.frombuffer(raw_data, dtype=np.uint8).astype(np.float32) - 128) / 128.0
+    else:
+        logger.warning(f"Unsupported sample width: {sample_width} ({path})")
+        return None
+
+    if n_channels > 1:
+        data = data.reshape(-1, n_channels).mean(axis=1)
+    duration = len(data) / float(rate)
+
+    if rate != sample_rate:
+        num_samples = int(len(data) * sample_rate / rate)
+        indices = np.linspace(0, len(data) - 1, num_samples)
+        data = np.interp(indices, np.arange(len(data)), data).astype(np.float32)
+
+    return data, rate, n_channels, duration
+
+
+class SoundBank:
+    """
+    Index and decoded-PCM store of WAV sounds at one sample rate.
+
+    Loaded sounds are read-only arrays (memory-mapped .npy files, or
+    in-memory arrays when the bank directory is not writable).
+    """
+
+    def __init__(self, sample_rate: int = 44100, bank_dir: Optional[str] = None):
+        """
+        Args:
+            sample_rate: Sample rate of the loaded sounds
+            bank_dir: Directory of the manifest and decoded PCM
+                (~/.tiksimpro/sound_bank or $TIKSIMPRO_SOUND_BANK_DIR by default)
+        """
+        self.sample_rate = sample_rate
+        self.bank_dir = bank_dir or os.environ.get("TIKSIMPRO_SOUND_BANK_DIR") or DEFAULT_BANK_DIR
+        self._lock = threading.RLock()
+        self._entries: Dict[str, SoundInfo] = self._read_manifest()
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}   # folder -> (mtime_ns, wav paths)
+        self._loaded: Dict[str, Tuple[str, np.ndarray]] = {}    # path -> (PCM file, samples)
+        self._failed: Dict[str, Tuple[int, int]] = {}           # path -> (size, mtime_ns) not decodable
+        self._on_disk: Optional[Dict[str, SoundInfo]] = None    # Manifest as last read, per query()/flush
+        self._removed: set = set()                               # Pruned paths, dropped from the manifest on flush
+        self._dirty = False
+
+    # Index
+    def info(self, path: str) -> Optional[SoundInfo]:
+        """Manifest entry of a WAV file (indexed now if new or modified), None if unreadable"""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            if self._failed.get(path) == (stat.st_size, stat.st_mtime_ns):
+                return None
+            entry = self._entries.get(path)
+            if not self._matches(entry, stat):
+                # Possibly indexed meanwhile by another process
+                latest = self._manifest_entries().get(path)
+                if not self._matches(latest, stat):
+                    return self._index(path, stat, latest or entry)
+                entry = latest
+                self._entries[path] = entry
+            return entry
+
+    def files(self, folder: str) -> List[str]:
+        """WAV files directly in `folder` (sorted; listing cached until the folder changes)"""
+        folder = os.path.abspath(folder)
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return []
+        with self._lock:
+            listing = self._listings.get(folder)
+            if listing is None or listing[0] != mtime_ns:
+                names = sorted(name for name in os.listdir(folder) if name.lower().endswith('.wav'))
+                listing = self._listings[folder] = (mtime_ns, [os.path.join(folder, n) for n in names])
+                self._prune(folder, set(listing[1]))
+            return listing[1]
+
+    def query(self, folders: Sequence[str], min_duration: float = 0.0,
+              max_duration: float = float("inf")) -> List[SoundInfo]:
+        """Indexed sounds of `folders` whose duration is within [min_duration, max_duration]"""
+        sounds = []
+        with self._lock:
+            self._on_disk = None   # Pick up entries written by other processes since the last query
+        for folder in folders:
+            for path in self.files(folder):
+                entry = self.info(path)
+                if entry is not None and min_duration <= entry.duration <= max_duration:
+                    sounds.append(entry)
+        self.flush()
+        return sounds
+
+    # PCM
+    def load(self, path: str) -> Optional[np.ndarray]:
+        """Decoded samples of a WAV file (float32 mono at the bank sample rate), None if unreadable"""
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self.info(path)
+            if entry is None:
+                return None
+            pcm_name = self._pcm_name(entry)
+            loaded = self._loaded.get(path)
+            if loaded is not None and loaded[0] == pcm_name:
+                return loaded[1]
+            try:
+                samples = self._map(os.path.join(self.bank_dir, pcm_name))
+            except (OSError, ValueError):
+                samples = self._decode_and_store(entry)
+            if samples is not None:
+                self._loaded[path] = (pcm_name, samples)
+            self.flush()
+            return samples
+
+    def flush(self) -> None:
+        """Write the manifest if entries were added (merged with entries written by other processes)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = self._read_manifest()
+            self._on_disk = dict(entries)
+            for path in self._removed:
+                entries.pop(path, None)
+            entries.update(self._entries)
+            self._entries = entries
+            data = {"version": BANK_VERSION,
+                    "sounds": {path: entry.to_dict() for path, entry in entries.items()}}
+            try:
+                atomic_write(self._manifest_path(),
+                             lambda f: json.dump(data, f, indent=1), mode="w")
+                self._dirty = False
+                self._removed.clear()
+                self._on_disk = dict(entries)
+            except OSError as e:
+                logger.warning(f"Could not write sound bank {self.bank_dir}: {e}")
+
+    @staticmethod
+    def _matches(entry: Optional[SoundInfo], stat: os.stat_result) -> bool:
+        return entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns
+
+    def _index(self, path: str, stat: os.stat_result,
+               previous: Optional[SoundInfo] = None) -> Optional[SoundInfo]:
+        """
+        Decode a new/modified file: manifest entry + stored PCM (None if it
+        fails to decode). The PCM of the `previous` entry of the file is deleted.
+        """
+        if previous is not None:
+            self._remove_pcm(previous)
+        try:
+            decoded = decode_wav(path, self.sample_rate)
+        except Exception as e:
+            logger.error(f"Error loading audio file {path}: {e}")
+            decoded = None
+        if decoded is None:
+            # Not retried until the file changes
+            self._failed[path] = (stat.st_size, stat.st_mtime_ns)
+            return None
+        self._failed.pop(path, None)
+        samples, rate, channels, duration = decoded
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) if len(samples) else 0.0
+        entry = SoundInfo(
+            path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, duration=duration,
+            source_rate=rate, channels=channels,
+            peak=float(np.max(np.abs(samples))) if len(samples) else 0.0,
+            rms_db=float(20 * np.log10(rms)) if rms > 0 else -120.0)
+        self._entries[path] = entry
+        self._dirty = True
+        self._store(entry, samples)
+        logger.info(f"Indexed sound: {path} ({entry.duration:.2f}s, {entry.rms_db:.1f} dBFS)")
+        return entry
+
+    def _prune(self, folder: str, present: set) -> None:
+        """Forget the entries (and delete the PCM) of the WAV files no longer in `folder`"""
+        for path, entry in list(self._entries.items()):
+            if path not in present and os.path.dirname(path) == folder:
+                self._remove_pcm(entry)
+                del self._entries[path]
+                self._failed.pop(path, None)
+                self._removed.add(path)
+                self._dirty = True
+
+    def _decode_and_store(self, entry: SoundInfo) -> Optional[np.ndarray]:
+        try:
+            decoded = decode_wav(entry.path, self.sample_rate)
+        except Exception as e:
+            logger.error(f"Error loading audio file {entry.path}: {e}")
+            return None
+        return None if decoded is None else self._store(entry, decoded[0])
+
+    def _store(self, entry: SoundInfo, samples: np.ndarray) -> np.ndarray:
+        """Write the decoded PCM and return it memory-mapped, or in memory on failure"""
+        pcm_path = os.path.join(self.bank_dir, self._pcm_name(entry))
+        try:
+            atomic_write(pcm_path, lambda f: np.save(f, np.asarray(samples, dtype=np.float32),
+                                                     allow_pickle=False))
+            return self._map(pcm_path)
+        except OSError as e:
+            logger.warning(f"Could not write sound bank {self.bank_dir}: {e}")
+            samples = np.array(samples, dtype=np.float32)
+            samples.flags.writeable = False
+            return samples
+
+    @staticmethod
+    def _map(pcm_path: str) -> np.ndarray:
+        """Read-only memory map of a stored .npy (as a plain ndarray view, no copy)"""
+        return np.load(pcm_path, mmap_mode='r', allow_pickle=False).view(np.ndarray)
+
+    def _remove_pcm(self, entry: SoundInfo) -> None:
+        """Delete the stored PCM of an outdated entry (mappings already open stay valid)"""
+        self._loaded.pop(entry.path, None)
+        try:
+            os.unlink(os.path.join(self.bank_dir, self._pcm_name(entry)))
+        except OSError:
+            pass  # Never stored, already deleted, or still open elsewhere (Windows)
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.bank_dir, MANIFEST_NAME.format(rate=self.sample_rate))
+
+    def _pcm_name(self, entry: SoundInfo) -> str:
+        key = repr((BANK_VERSION, entry.path, entry.size, entry.mtime_ns, self.sample_rate))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy"
+
+    def _manifest_entries(self) -> Dict[str, SoundInfo]:
+        """Manifest entries, read once per query()/flush rather than on every cache miss"""
+        if self._on_disk is None:
+            self._on_disk = self._read_manifest()
+        return self._on_disk
+
+    def _read_manifest(self) -> Dict[str, SoundInfo]:
+        try:
+            with open(self._manifest_path(), "r") as f:
+                data = json.load(f)
+            if data.get("version") != BANK_VERSION:
+                return {}
+            return {path: SoundInfo.from_dict(entry) for path, entry in data["sounds"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+
+_banks: Dict[Tuple[int, str], SoundBank] = {}
+_banks_lock = threading.Lock()
+
+
+def get_sound_bank(sample_rate: int = 44100) -> SoundBank:
+    """Process-wide sound bank for a sample rate (shared by the engines of a run)"""
+    bank_dir = os.environ.get("TIKSIMPRO_SOUND_BANK_DIR") or DEFAULT_BANK_DIR
+    with _banks_lock:
+        bank = _banks.get((sample_rate, bank_dir))
+        if bank is None:
+            bank = _banks[(sample_rate, bank_dir)] = SoundBank(sample_rate, bank_dir)
+        return bank
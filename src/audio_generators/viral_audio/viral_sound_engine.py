@@ -5,7 +5,6 @@ Optimized for viral, satisfying sounds with 5-layer architecture
 """
 
 import numpy as np
-import wave
 import logging
 import os
 import json
@@ -13,12 +12,14 @@ import random
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
-from src.audio_generators.base_audio_generator import IAudioGenerator
+from src.audio_generators.base_audio_generator import IAudioGenerator, AudioStream, buffer_blocks, peak_level, pcm16
+from src.audio_generators.midi_cache import get_midi_cache
 from src.core.data_pipeline import TrendData, AudioEvent
 
 from .layers import SubBassLayer, BodyLayer, PresenceLayer, AirLayer, TailLayer
 from .mapping import VelocityMapper, ProgressiveBuilder, Humanizer
 from .effects import Compressor, Limiter
+from .sound_bank import get_sound_bank
 
 logger = logging.getLogger("TikSimPro")
 logger.addHandler(logging.StreamHandler())
@@ -31,18 +32,9 @@ class SimpleMidiExtractor:
         self.last_bpm = 120.0  # Default BPM
 
     def extract_notes(self, midi_path: str) -> List[float]:
-        """Extract every notes in a midi file with mido"""
+        """Extract every notes (all tracks) in a midi file"""
         try:
-            import mido
-            midi = mido.MidiFile(midi_path)
-            notes = []
-
-            for track in midi.tracks:
-                for msg in track:
-                    if msg.type == 'note_on' and msg.velocity > 0:
-                        # Convert midi note to frequency
-                        freq = 440.0 * (2 ** ((msg.note - 69) / 12))
-                        notes.append(freq)
+            notes = get_midi_cache().load(midi_path).all_notes()
 
             logger.info(f"{len(notes)} notes extracted from {midi_path}")
             return notes
@@ -63,27 +55,10 @@ class SimpleMidiExtractor:
     def extract_notes_with_bpm(self, midi_path: str) -> tuple:
         """Extract notes AND BPM from MIDI file"""
         try:
-            import mido
-            midi = mido.MidiFile(midi_path)
-            notes = []
-            bpm = 120.0  # Default
-            
-            # Extract tempo (BPM)
-            for track in midi.tracks:
-                for msg in track:
-                    if msg.type == 'set_tempo':
-                        # tempo is in microseconds per beat
-                        bpm = 60_000_000 / msg.tempo
-                        logger.info(f"Extracted BPM: {bpm}")
-                        break
-            
-            # Extract notes
-            for msg in midi.tracks[len(midi.tracks) - 1]:  # Use last track for melody
-                if msg.type == 'note_on' and msg.velocity > 0:
-                    freq = 440.0 * (2 ** ((msg.note - 69) / 12))
-                    print(msg)
-                    print("Note:", self.get_note_name(msg.note), "Frequency:", freq)
-                    notes.append(freq)
+            # Compiled once per file (melody track + tempo map), shared by every generator
+            midi = get_midi_cache().load(midi_path)
+            notes = midi.melody_notes()  # Last track with notes = melody
+            bpm = midi.bpm  # First tempo of the file, 120 without one
 
             self.last_bpm = bpm
             logger.info(f"{len(notes)} notes extracted, BPM: {bpm:.1f} from {midi_path}")
@@ -167,6 +142,9 @@ class ViralSoundEngine(IAudioGenerator):
         'bright': {'sub': 0.2, 'body': 0.6, 'presence': 0.9, 'air': 1.0, 'tail': 0.3},
     }
 
+    # Collisions rendered together by each layer (one 2D array per batch)
+    LAYER_BATCH_SIZE = 64
+
     def __init__(self, sample_rate: int = 44100, mode: str = 'maximum_punch',
                  progressive_build: bool = True, music_folder: str = './music'):
         self.sample_rate = sample_rate
@@ -196,6 +174,8 @@ class ViralSoundEngine(IAudioGenerator):
         # State
         self.events: List[AudioEvent] = []
         self.audio_data: Optional[np.ndarray] = None
+        # Standard collisions planned during the event loop, rendered layer by layer after it
+        self._pending_hits: List[Dict[str, Any]] = []
 
         # MIDI mode state
         self.midi_notes: List[float] = []
@@ -227,9 +207,8 @@ class ViralSoundEngine(IAudioGenerator):
         self.viral_sound_duration_max = 7.0  # Durée max en secondes (7s max)
         self.viral_fallback_to_generated = True  # Fallback sur synthèse si pas de son
 
-        # Cache des sons chargés
-        self._sound_cache: Dict[str, np.ndarray] = {}
-        self._sound_durations: Dict[str, float] = {}  # Cache des durées
+        # Sons décodés (index et PCM partagés entre moteurs et processus)
+        self.sound_bank = get_sound_bank(sample_rate)
 
         logger.info(f"ViralSoundEngine initialized - Mode: {mode}, Progressive: {progressive_build}")
 
@@ -242,6 +221,7 @@ class ViralSoundEngine(IAudioGenerator):
                 self.progressive_builder.enabled = config['progressive_build']
             if 'sample_rate' in config:
                 self.sample_rate = config['sample_rate']
+                self.sound_bank = get_sound_bank(self.sample_rate)
             if 'music_folder' in config:
                 self.music_folder = config['music_folder']
 
@@ -277,132 +257,69 @@ class ViralSoundEngine(IAudioGenerator):
             return False
 
     def _load_audio_file(self, file_path: str) -> Optional[np.ndarray]:
-        """Charge un fichier audio WAV et retourne les samples"""
-        if file_path in self._sound_cache:
-            return self._sound_cache[file_path]
-
-        try:
-            if not file_path.lower().endswith('.wav'):
-                logger.warning(f"Unsupported audio format: {file_path}")
-                return None
-
-            # Utiliser le module wave standard (pas de dépendance externe)
-            with wave.open(file_path, 'rb') as wav:
-                rate = wav.getframerate()
-                n_channels = wav.getnchannels()
-                sample_width = wav.getsampwidth()
-                n_frames = wav.getnframes()
-
-                raw_data = wav.readframes(n_frames)
-
-            # Convertir en numpy array
-            if sample_width == 2:  # 16-bit
-                data = np.frombuffer(raw_data, dtype=np.int16)
-                data = data.astype(np.float32) / 32768.0
-            elif sample_width == 4:  # 32-bit
-                data = np.frombuffer(raw_data, dtype=np.int32)
-                data = data.astype(np.float32) / 2147483648.0
-            elif sample_width == 1:  # 8-bit
-                data = np.frombuffer(raw_data, dtype=np.uint8)
-                data = (data.astype(np.float32) - 128) / 128.0
-            else:
-                logger.warning(f"Unsupported sample width: {sample_width}")
-                return None
-
-            # Si stéréo, prendre le mono (moyenne des canaux)
-            if n_channels > 1:
-                data = data.reshape(-1, n_channels).mean(axis=1)
-
-            # Resampler si nécessaire (interpolation linéaire simple)
-            if rate != self.sample_rate:
-                num_samples = int(len(data) * self.sample_rate / rate)
-                indices = np.linspace(0, len(data) - 1, num_samples)
-                data = np.interp(indices, np.arange(len(data)), data).astype(np.float32)
-
-            self._sound_cache[file_path] = data
-            logger.info(f"Loaded audio file: {file_path} ({len(data)} samples)")
-            return data
-
-        except Exception as e:
-            logger.error(f"Error loading audio file {file_path}: {e}")
+        """Charge un fichier audio WAV et retourne les samples (décodés une fois, via la banque de sons)"""
+        if not file_path.lower().endswith('.wav'):
+            logger.warning(f"Unsupported audio format: {file_path}")
             return None
+        return self.sound_bank.load(file_path)
 
     def _get_random_sound_from_folder(self, folder: str) -> Optional[np.ndarray]:
         """Charge un fichier audio aléatoire depuis un dossier"""
         try:
-            folder_path = Path(folder)
-            if not folder_path.exists():
+            if not os.path.isdir(folder):
                 logger.warning(f"Sound folder not found: {folder}")
                 return None
 
-            sound_files = list(folder_path.glob('*.wav')) + list(folder_path.glob('*.WAV'))
+            sound_files = self.sound_bank.files(folder)
             if not sound_files:
                 logger.warning(f"No sound files in {folder}")
                 return None
 
             selected = random.choice(sound_files)
-            return self._load_audio_file(str(selected))
+            return self._load_audio_file(selected)
 
         except Exception as e:
             logger.error(f"Error getting random sound: {e}")
             return None
 
     def _get_sound_duration(self, file_path: str) -> float:
-        """Retourne la durée d'un fichier audio en secondes"""
-        if file_path in self._sound_durations:
-            return self._sound_durations[file_path]
-
-        try:
-            with wave.open(file_path, 'rb') as wav:
-                frames = wav.getnframes()
-                rate = wav.getframerate()
-                duration = frames / float(rate)
-                self._sound_durations[file_path] = duration
-                return duration
-        except Exception:
-            return 0.0
+        """Retourne la durée d'un fichier audio en secondes (index de la banque de sons)"""
+        info = self.sound_bank.info(file_path)
+        return info.duration if info is not None else 0.0
 
     def _get_random_viral_sound(self) -> Optional[np.ndarray]:
         """Charge un son viral aléatoire depuis sounds/viral/ (tous sous-dossiers)
         Filtre par durée min/max si configuré"""
         try:
-            folder_path = Path(self.viral_sounds_folder)
-            if not folder_path.exists():
+            if not os.path.isdir(self.viral_sounds_folder):
                 logger.warning(f"Viral sounds folder not found: {self.viral_sounds_folder}")
                 return None
 
-            # Cherche dans tous les sous-dossiers (animals, bass, memes)
-            sound_files = []
-            for subdir in ['animals', 'bass', 'memes']:
-                subdir_path = folder_path / subdir
-                if subdir_path.exists():
-                    sound_files.extend(list(subdir_path.glob('*.wav')))
+            # Cherche dans tous les sous-dossiers (animals, bass, memes) et à la racine
+            folders = [os.path.join(self.viral_sounds_folder, subdir) for subdir in ['animals', 'bass', 'memes']]
+            folders.append(self.viral_sounds_folder)
 
-            # Cherche aussi à la racine
-            sound_files.extend(list(folder_path.glob('*.wav')))
+            # Filtrer par durée si min/max configurés (requête sur l'index, sans ouvrir les fichiers)
+            filtered = self.viral_sound_duration_min > 0 or self.viral_sound_duration_max < 7.0
+            if filtered:
+                sounds = self.sound_bank.query(folders, self.viral_sound_duration_min,
+                                               self.viral_sound_duration_max)
+            else:
+                sounds = [path for folder in folders for path in self.sound_bank.files(folder)]
 
-            if not sound_files:
-                logger.warning(f"No viral sounds found in {self.viral_sounds_folder}")
+            if not sounds:
+                if filtered and any(self.sound_bank.files(folder) for folder in folders):
+                    logger.warning(f"No sounds match duration filter {self.viral_sound_duration_min}-{self.viral_sound_duration_max}s")
+                else:
+                    logger.warning(f"No viral sounds found in {self.viral_sounds_folder}")
                 return None
+            if filtered:
+                logger.debug(f"Filtered to {len(sounds)} sounds by duration ({self.viral_sound_duration_min}-{self.viral_sound_duration_max}s)")
+                sounds = [info.path for info in sounds]
 
-            # Filtrer par durée si min/max configurés
-            if self.viral_sound_duration_min > 0 or self.viral_sound_duration_max < 7.0:
-                filtered_files = []
-                for f in sound_files:
-                    duration = self._get_sound_duration(str(f))
-                    if self.viral_sound_duration_min <= duration <= self.viral_sound_duration_max:
-                        filtered_files.append(f)
-
-                if filtered_files:
-                    sound_files = filtered_files
-                    logger.debug(f"Filtered to {len(sound_files)} sounds by duration ({self.viral_sound_duration_min}-{self.viral_sound_duration_max}s)")
-                else:
-                    logger.warning(f"No sounds match duration filter {self.viral_sound_duration_min}-{self.viral_sound_duration_max}s")
-                    return None
-
-            selected = random.choice(sound_files)
-            logger.info(f"Selected viral sound: {selected.name}")
-            return self._load_audio_file(str(selected))
+            selected = random.choice(sounds)
+            logger.info(f"Selected viral sound: {os.path.basename(selected)}")
+            return self._load_audio_file(selected)
 
         except Exception as e:
             logger.error(f"Error getting viral sound: {e}")
@@ -524,6 +441,7 @@ class ViralSoundEngine(IAudioGenerator):
 
             # Reset note index for MIDI mode
             self.current_note_index = 0
+            self._pending_hits = []
 
             for event in self.events:
                 if event.event_type == 'collision':
@@ -531,6 +449,9 @@ class ViralSoundEngine(IAudioGenerator):
                 elif event.event_type == 'passage':  # <--- NOUVEAU
                     self._process_passage(event)
 
+            # Render the planned collisions, one batch of events per layer
+            self._render_collision_batch()
+
             # Apply master effects
             self._apply_master_effects()
 
@@ -656,36 +577,78 @@ class ViralSoundEngine(IAudioGenerator):
 
         # Sound duration based on velocity
         sound_duration = 0.15 + (audio_params['intensity'] * 0.15)
-        samples = int(self.sample_rate * sound_duration)
-
-        # Generate each active layer
-        layer_signals = {}
-        for layer_name in active_layers:
-            if layer_name in self.layers:
-                layer = self.layers[layer_name]
-                signal = layer.generate(
-                    frequency=base_freq,
-                    duration=sound_duration,
-                    intensity=audio_params['intensity'],
-                    richness=harmonic_richness
-                )
-
-                # Apply progressive volume modifier
-                volume_mod = self.progressive_builder.get_layer_volume(layer_name)
-                layer_signals[layer_name] = signal * volume_mod
-
-        # Mix layers according to mode
-        mixed = self._mix_layers(layer_signals)
-
-        # Apply to main buffer at event time
+
         start_sample = int(event.time * self.sample_rate)
-        end_sample = min(start_sample + len(mixed), len(self.audio_data))
+        if start_sample >= len(self.audio_data):
+            return
 
-        if start_sample < len(self.audio_data) and len(mixed) > 0:
-            length = end_sample - start_sample
-            # Apply master volume from velocity
-            mixed = mixed[:length] * audio_params['volume']
-            self.audio_data[start_sample:end_sample] += mixed
+        # Plan the hit: the layers are rendered for all collisions at once after the event loop
+        self._pending_hits.append({
+            'start': start_sample,
+            'frequency': base_freq,
+            'duration': sound_duration,
+            'intensity': audio_params['intensity'],
+            'richness': harmonic_richness,
+            'volume': audio_params['volume'],
+            # Progressive volume modifier of each active layer
+            'layers': {name: self.progressive_builder.get_layer_volume(name)
+                       for name in active_layers if name in self.layers},
+        })
+
+    def _render_collision_batch(self):
+        """
+        Render the planned collisions: each layer generates its signal for a
+        batch of hits at once, and the rows are added to the buffer at their
+        event times. The tail layer's reverb runs once, on the summed wet send
+        of every hit (the reverb is linear, so this equals a reverb per hit).
+        """
+        hits, self._pending_hits = self._pending_hits, []
+        if not hits:
+            return
+
+        mix_ratios = self._get_mix_ratios()
+        for layer_name, layer in self.layers.items():
+            layer_hits = [h for h in hits if layer_name in h['layers']]
+            if not layer_hits:
+                continue
+            ratio = mix_ratios.get(layer_name, 0.5)
+            gains = np.array([h['layers'][layer_name] * ratio * h['volume'] for h in layer_hits])
+
+            if layer_name == 'tail':
+                self._render_tail_bus(layer, layer_hits, gains)
+                continue
+
+            for first in range(0, len(layer_hits), self.LAYER_BATCH_SIZE):
+                batch = layer_hits[first:first + self.LAYER_BATCH_SIZE]
+                signals = layer.generate_batch(
+                    [h['frequency'] for h in batch], [h['duration'] for h in batch],
+                    [h['intensity'] for h in batch], [h['richness'] for h in batch])
+                signals *= gains[first:first + len(batch), None]
+                self._add_rows(signals, batch)
+
+    def _render_tail_bus(self, layer: TailLayer, hits: List[Dict[str, Any]], gains: np.ndarray):
+        """
+        Tail layer: dry source bursts straight into the buffer, plus one
+        reverb of the summed wet send
+        """
+        wet = np.zeros_like(self.audio_data)
+        wet_amounts = layer.wet_amounts([h['intensity'] for h in hits])
+        for first in range(0, len(hits), self.LAYER_BATCH_SIZE):
+            batch = hits[first:first + self.LAYER_BATCH_SIZE]
+            sources = layer.source_batch([h['frequency'] for h in batch], [h['duration'] for h in batch])
+            amounts = wet_amounts[first:first + len(batch), None]
+            batch_gains = gains[first:first + len(batch), None]
+            self._add_rows(sources * (batch_gains * (1 - amounts)), batch)
+            self._add_rows(sources * (batch_gains * amounts), batch, wet)
+        layer.apply_reverb(wet, out=self.audio_data)
+
+    def _add_rows(self, signals: np.ndarray, hits: List[Dict[str, Any]], bus: Optional[np.ndarray] = None):
+        """Add each hit's row at its start sample (cut to the end of the buffer)"""
+        bus = self.audio_data if bus is None else bus
+        for signal, hit in zip(signals, hits):
+            start = hit['start']
+            length = min(len(signal), len(bus) - start)
+            bus[start:start + length] += signal[:length]
 
     def _process_collision_physics_sync(self, event: AudioEvent):
         """
@@ -895,40 +858,23 @@ class ViralSoundEngine(IAudioGenerator):
             # On ajoute le son de passage par dessus le reste (mixage additif)
             self.audio_data[start_sample:end_sample] += passage_mix[:l] * 0.7 # Volume à 70% pour pas saturer
             
-    def _mix_layers(self, layer_signals: Dict[str, np.ndarray]) -> np.ndarray:
-        """Mix layers according to current timbre (randomly selected per video)"""
-        if not layer_signals:
-            return np.zeros(100)
-
-        # Get max length
-        max_len = max(len(s) for s in layer_signals.values())
-        mixed = np.zeros(max_len, dtype=np.float32)
-
+    def _get_mix_ratios(self) -> Dict[str, float]:
+        """Layer mix ratios: timbre preset of the video, else the mode's mix"""
         # Use timbre preset for variety between videos
         if self.current_timbre and self.current_timbre in self.TIMBRE_PRESETS:
-            mix_ratios = self.TIMBRE_PRESETS[self.current_timbre]
-        else:
-            mix_ratios = self.MODE_MIX.get(self.mode, self.MODE_MIX['maximum_punch'])
-
-        for layer_name, signal in layer_signals.items():
-            ratio = mix_ratios.get(layer_name, 0.5)
-            # Pad signal if needed
-            if len(signal) < max_len:
-                signal = np.pad(signal, (0, max_len - len(signal)))
-            mixed += signal * ratio
-
-        return mixed
+            return self.TIMBRE_PRESETS[self.current_timbre]
+        return self.MODE_MIX.get(self.mode, self.MODE_MIX['maximum_punch'])
 
     def _apply_master_effects(self):
         """Apply master effects chain"""
-        if self.audio_data is None or np.max(np.abs(self.audio_data)) == 0:
+        if self.audio_data is None or peak_level(self.audio_data) == 0:
             return
 
-        # Compression for punch
-        self.audio_data = self.compressor.process(self.audio_data)
+        # Compression for punch (in place)
+        self.compressor.process(self.audio_data, out=self.audio_data)
 
-        # Limiting to prevent clipping
-        self.audio_data = self.limiter.process(self.audio_data)
+        # Limiting to prevent clipping (in place)
+        self.limiter.process(self.audio_data, out=self.audio_data)
 
     def _normalize_and_save(self):
         """Normalize and save to WAV"""
@@ -936,10 +882,10 @@ class ViralSoundEngine(IAudioGenerator):
             return
 
         # Normalize to -1dB
-        max_val = np.max(np.abs(self.audio_data))
+        max_val = peak_level(self.audio_data)
         if max_val > 0:
             target = 0.9  # -1dB headroom
-            self.audio_data = self.audio_data * (target / max_val)
+            self.audio_data *= target / max_val
 
         # Fade in/out to avoid clicks
         fade_samples = int(0.01 * self.sample_rate)
@@ -949,15 +895,8 @@ class ViralSoundEngine(IAudioGenerator):
             self.audio_data[:fade_samples] *= fade_in
             self.audio_data[-fade_samples:] *= fade_out
 
-        # Convert to 16-bit PCM
-        audio_int16 = (self.audio_data * 32767).astype(np.int16)
-
-        # Save WAV
-        with wave.open(self.output_path, 'w') as wav:
-            wav.setnchannels(1)
-            wav.setsampwidth(2)
-            wav.setframerate(self.sample_rate)
-            wav.writeframes(audio_int16.tobytes())
+        # Convert to 16-bit PCM and save WAV, block by block
+        AudioStream(self.sample_rate, 1, pcm16(buffer_blocks(self.audio_data))).write_wav(self.output_path)
 
         logger.info(f"Audio saved: {self.output_path}")
 
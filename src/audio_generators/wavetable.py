@@ -0,0 +1,261 @@
+# src/audio_generators/wavetable.py
+"""
+Wavetable oscillators - band-limited table lookup in place of np.sin.
+
+The partials of a note (ratio to the fundamental, waveform, amplitude,
+phase) are summed once into a table holding one period of the whole
+sound, for each octave of the fundamental. Each octave's table keeps only
+the harmonics that stay below Nyquist at the top of the octave, so saw,
+square and triangle waves no longer alias. A note is then a phase
+accumulator (in cycles of the fundamental) and one linearly interpolated
+lookup in float32, whatever the number of partials.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+OCTAVE_BASE = 20.0       # Lowest fundamental of the first octave table (Hz)
+MAX_DENOMINATOR = 16     # Partial ratios p/q with q <= this share the fundamental's table
+MIN_TABLE_SIZE = 256     # Samples per table (before the guard samples), powers of 2
+MAX_TABLE_SIZE = 1 << 18
+INTERPOLATION_ERROR = 1e-4   # Largest linear-interpolation error allowed per harmonic
+
+WAVEFORMS = ("sine", "square", "pulse", "sawtooth", "triangle")
+
+
+class Partial(NamedTuple):
+    """One oscillator of a note, relative to the fundamental"""
+    ratio: float             # Frequency / fundamental frequency
+    waveform: str = "sine"   # One of WAVEFORMS (anything else plays a sine)
+    amplitude: float = 1.0
+    phase: float = 0.0       # Start phase of the partial, in its own cycles
+
+
+def waveform_series(waveform: str, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fourier series of a unit waveform up to harmonic `count`:
+    wave(p) = sum(Re(coefs[k] * exp(2i*pi*harmonics[k]*p))), p in cycles.
+
+    The phases match the naive generators: a sine, a square as the sign of
+    the sine, a saw rising through 0 at p = 0, a triangle at -1 at p = 0.
+    """
+    k = np.arange(1, max(count, 1) + 1, dtype=np.float64)
+    odd = k[::2]
+    if waveform in ("square", "pulse"):
+        # (4 / pi) * sin(2 pi k p) / k, odd k
+        return odd, -1j * 4 / (np.pi * odd)
+    if waveform == "sawtooth":
+        # (2 / pi) * (-1)^(k+1) * sin(2 pi k p) / k
+        return k, -1j * 2 / np.pi * np.where(k % 2 == 1, 1.0, -1.0) / k
+    if waveform == "triangle":
+        # -(8 / pi^2) * cos(2 pi k p) / k^2, odd k
+        return odd, -8 / (np.pi ** 2 * odd ** 2) + 0j
+    return k[:1], np.array([-1j])
+
+
+class _Spectrum:
+    """
+    Partials sharing a table: table period = `cycles` periods of the
+    fundamental, each term at an integer bin of that period.
+    """
+
+    def __init__(self, partials: Sequence[Partial], sample_rate: int):
+        self.partials = tuple(partials)
+        self.nyquist = sample_rate / 2
+        ratios = [Fraction(p.ratio).limit_denominator(MAX_DENOMINATOR) for p in self.partials]
+        self.denominators = [r.denominator for r in ratios]
+        self.cycles = math.lcm(*self.denominators)
+        self.ratios = [float(r) for r in ratios]
+        self._tables: Dict[int, np.ndarray] = {}
+        self._splits: Dict[int, Tuple[Tuple[Partial, ...], Tuple[Partial, ...]]] = {}
+
+    def split(self, octave: int) -> Tuple[Tuple[Partial, ...], Tuple[Partial, ...]]:
+        """
+        (partials sharing a table, partials played from their own table) for
+        an octave. A large `cycles` (lcm of the denominators) puts the upper
+        harmonics past the largest table: partials are added from the
+        smallest denominator on while the shared table still fits, the
+        others get a table each.
+        """
+        result = self._splits.get(octave)
+        if result is None:
+            top = OCTAVE_BASE * 2.0 ** (octave + 1)
+            kept, cycles = [], 1
+            for index in sorted(range(len(self.partials)), key=self.denominators.__getitem__):
+                grown = math.lcm(cycles, self.denominators[index])
+                bins, coefs = self._terms(top, [*kept, index], grown)
+                if _table_size(bins, coefs) <= MAX_TABLE_SIZE:
+                    kept.append(index)
+                    cycles = grown
+            kept = set(kept)
+            result = self._splits[octave] = (
+                tuple(p for i, p in enumerate(self.partials) if i in kept),
+                tuple(p for i, p in enumerate(self.partials) if i not in kept))
+        return result
+
+    def table(self, octave: int) -> np.ndarray:
+        """float32 table of an octave, with 2 guard samples (table[n + i] = table[i])"""
+        table = self._tables.get(octave)
+        if table is None:
+            table = self._tables[octave] = self._build(OCTAVE_BASE * 2.0 ** (octave + 1))
+        return table
+
+    def _terms(self, top_frequency: float, indices: Sequence[int],
+               cycles: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (bins, coefficients) of the harmonics below Nyquist of the partials
+        `indices`, for a fundamental of `top_frequency` and a table period
+        of `cycles` fundamental periods
+        """
+        bins, coefs = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.complex128)]
+        for index in indices:
+            partial, ratio = self.partials[index], self.ratios[index]
+            count = int(self.nyquist / (top_frequency * ratio))
+            if count < 1:
+                continue
+            harmonics, series = waveform_series(partial.waveform, count)
+            bins.append(np.rint(harmonics * ratio * cycles).astype(np.int64))
+            coefs.append(partial.amplitude * series * np.exp(2j * np.pi * harmonics * partial.phase))
+        return np.concatenate(bins), np.concatenate(coefs)
+
+    def _build(self, top_frequency: float) -> np.ndarray:
+        """Sum of the partials' harmonics below Nyquist for a fundamental of `top_frequency`"""
+        bins, coefs = self._terms(top_frequency, range(len(self.partials)), self.cycles)
+        needed = _table_size(bins, coefs)
+        size = MIN_TABLE_SIZE
+        while size < needed and size < MAX_TABLE_SIZE:
+            size *= 2
+
+        # Bins past the table only when a single partial does not fit (split() keeps the rest apart)
+        keep = bins < size // 2
+        spectrum = np.zeros(size // 2 + 1, dtype=np.complex128)
+        np.add.at(spectrum, bins[keep], coefs[keep])
+        # irfft(X)[n] = (X[0] + 2 * sum(Re(X[k] * e^(2i*pi*k*n/N)))) / N, and X[0] = 0
+        table = np.fft.irfft(spectrum * (size / 2), size)
+        return np.concatenate((table, table[:2])).astype(np.float32)
+
+
+def _table_size(bins: np.ndarray, coefs: np.ndarray) -> float:
+    """Table size needed by terms at `bins` (before rounding up to a power of 2)"""
+    # Linear interpolation errs by up to |c| * (2 pi bin / size)^2 / 8 on a harmonic
+    needed = np.max(2 * np.pi * bins * np.sqrt(np.abs(coefs) / (8 * INTERPOLATION_ERROR)), initial=0.0)
+    return max(needed, 4 * np.max(bins, initial=0))
+
+
+class WavetableBank:
+    """
+    Band-limited tables of the note spectra played at one sample rate.
+
+    Tables are built on first use (per spectrum and octave) and kept in an
+    LRU of `max_spectra` spectra.
+    """
+
+    def __init__(self, sample_rate: int = 44100, max_spectra: int = 256):
+        self.sample_rate = sample_rate
+        self.max_spectra = max_spectra
+        self._spectra: "OrderedDict[Tuple[Partial, ...], _Spectrum]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def render(self, partials: Sequence[Partial], frequency: float, samples: int,
+               phase: Optional[np.ndarray] = None,
+               max_frequency: Optional[float] = None) -> np.ndarray:
+        """
+        Sum of the partials of a note (float32).
+
+        Args:
+            partials: Oscillators of the note
+            frequency: Fundamental frequency (Hz)
+            samples: Length of the note
+            phase: Phase of the fundamental in cycles, per sample, for a
+                modulated pitch (a constant-frequency phase accumulator
+                by default)
+            max_frequency: Highest instantaneous fundamental frequency,
+                which selects the octave table (`frequency` by default)
+        """
+        out = np.zeros(samples, dtype=np.float32)
+        shared, apart = [], []
+        for partial in partials:
+            ratio = float(Fraction(partial.ratio).limit_denominator(MAX_DENOMINATOR))
+            (shared if abs(ratio - partial.ratio) <= 1e-9 * partial.ratio else apart).append(partial)
+        top = max_frequency if max_frequency is not None else frequency
+        groups = []
+        if shared:
+            # Partials that do not fit the shared table keep their ratio, in a table each
+            fitting, rest = self._spectrum(tuple(shared)).split(_octave(top))
+            groups += [(self._spectrum(part), 1.0) for part in (fitting, *((p,) for p in rest)) if part]
+        # Ratio without a small denominator: own table, at its own frequency
+        groups += [(self._spectrum((Partial(1.0, p.waveform, p.amplitude, p.phase),)), p.ratio)
+                   for p in apart]
+        for spectrum, scale in groups:
+            if phase is None:
+                position = _accumulate(frequency * scale / (self.sample_rate * spectrum.cycles), samples)
+            else:
+                position = _fixed_point(phase * (scale / spectrum.cycles))
+            self._lookup(spectrum.table(_octave(top * scale)), position, out)
+        return out
+
+    def _spectrum(self, partials: Tuple[Partial, ...]) -> _Spectrum:
+        with self._lock:
+            spectrum = self._spectra.get(partials)
+            if spectrum is None:
+                spectrum = self._spectra[partials] = _Spectrum(partials, self.sample_rate)
+                while len(self._spectra) > self.max_spectra:
+                    self._spectra.popitem(last=False)
+            else:
+                self._spectra.move_to_end(partials)
+            return spectrum
+
+    @staticmethod
+    def _lookup(table: np.ndarray, position: np.ndarray, out: np.ndarray) -> None:
+        """out += table at `position` (uint32 fraction of the table period), linearly interpolated"""
+        shift = 33 - (len(table) - 2).bit_length()   # 32 - log2(table size)
+        index = position >> shift
+        frac = (position & ((1 << shift) - 1)).astype(np.float32)
+        frac *= 1.0 / (1 << shift)
+        low = table.take(index)
+        high = table.take(index + 1)
+        high -= low
+        high *= frac
+        out += low
+        out += high
+
+
+def _octave(frequency: float) -> int:
+    """Octave table of a fundamental frequency"""
+    return max(0, int(math.floor(math.log2(max(frequency, OCTAVE_BASE) / OCTAVE_BASE))))
+
+
+def _accumulate(increment: float, samples: int) -> np.ndarray:
+    """
+    Phase accumulator: n * increment (fraction of a period per sample) in
+    32-bit fixed point, wrapping at each period. Accumulated in 64 bits, so
+    the rounding of the increment does not drift the upper bins of a table
+    spanning many fundamental periods.
+    """
+    step = np.uint64(int(round(increment * 2.0 ** 64)) & 0xFFFFFFFFFFFFFFFF)
+    position = np.arange(samples, dtype=np.uint64) * step
+    position >>= np.uint64(32)
+    return position.astype(np.uint32)
+
+
+def _fixed_point(phase: np.ndarray) -> np.ndarray:
+    """Phase in periods (float) to the accumulator's 32-bit fixed point"""
+    return (np.asarray(phase, dtype=np.float64) * 2.0 ** 32).astype(np.int64).astype(np.uint32)
+
+
+_banks: Dict[int, WavetableBank] = {}
+_banks_lock = threading.Lock()
+
+
+def get_wavetable_bank(sample_rate: int = 44100) -> WavetableBank:
+    """Process-wide wavetable bank for a sample rate (shared by the sound generators)"""
+    with _banks_lock:
+        bank = _banks.get(sample_rate)
+        if bank is None:
+            bank = _banks[sample_rate] = WavetableBank(sample_rate)
+        return bank
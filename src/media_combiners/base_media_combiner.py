@@ -5,6 +5,10 @@ Base class interface for a combiner.
 
 from abc import ABC, abstractmethod
 from typing import Optional
+import os
+import tempfile
+
+from src.audio_generators.base_audio_generator import AudioStream
 
 
 class IMediaCombiner(ABC):
@@ -23,4 +27,28 @@ class IMediaCombiner(ABC):
         Returns:
             Path to the combined file, or None if failed
         """
-        pass
\ No newline at end of file
+        pass
+
+    def combine_stream(self, video_path: str, audio: AudioStream, output_path: str) -> Optional[str]:
+        """
+        Combine a video and an audio track streamed as PCM blocks
+        
+        The default implementation writes the stream to a temporary WAV
+        file and calls combine(); combiners able to consume the blocks
+        directly override it.
+        
+        Args:
+            video_path: Path to the video file
+            audio: Audio stream (consumed)
+            output_path: Path to the output file
+            
+        Returns:
+            Path to the combined file, or None if failed
+        """
+        fd, audio_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            audio.write_wav(audio_path)
+            return self.combine(video_path, audio_path, output_path)
+        finally:
+            os.remove(audio_path)
@@ -7,9 +7,12 @@ import os
 import logging
 from typing import Optional
 import subprocess
+import tempfile
 from pathlib import Path
 
+from src.audio_generators.base_audio_generator import AudioStream
 from src.media_combiners.base_media_combiner import IMediaCombiner
+from src.utils.video.encoder_profile import get_encoder_profile
 
 logger = logging.getLogger("TikSimPro")
 
@@ -18,8 +21,17 @@ class FFmpegMediaCombiner(IMediaCombiner):
     Combineur de médias utilisant FFmpeg pour fusionner vidéo et audio
     """
     
-    def __init__(self):
-        """Initialise le combineur de médias"""
+    def __init__(self, reencode_video: bool = False, use_gpu: bool = False):
+        """
+        Initialise le combineur de médias
+
+        Args:
+            reencode_video: Réencoder la vidéo (profil d'encodeur de la machine)
+                au lieu de copier le flux
+            use_gpu: Autoriser les encodeurs matériels pour le réencodage
+        """
+        self.reencode_video = reencode_video
+        self.use_gpu = use_gpu
         # Vérifier que FFmpeg est disponible
         self.ffmpeg_path = self._find_ffmpeg()
         if not self.ffmpeg_path:
@@ -61,6 +73,14 @@ class FFmpegMediaCombiner(IMediaCombiner):
         
         return None
     
+    def _video_args(self) -> list:
+        """Options vidéo FFmpeg: copie du flux, ou profil d'encodeur de la machine"""
+        if not self.reencode_video:
+            return ["-c:v", "copy"]
+        # Même profil que les générateurs (mesuré une fois par machine, puis lu du cache)
+        profile = get_encoder_profile(self.ffmpeg_path, self.use_gpu)
+        return profile.output_args() + ["-pix_fmt", "yuv420p"]
+
     def combine(self, video_path: str, audio_path: str, output_path: str) -> Optional[str]:
         """
         Combine une vidéo et une piste audio
@@ -99,7 +119,7 @@ class FFmpegMediaCombiner(IMediaCombiner):
                 "-y",  # Écraser le fichier de sortie si existe
                 "-i", video_path,  # Fichier vidéo
                 "-i", audio_path,  # Fichier audio
-                "-c:v", "copy",  # Copier le codec vidéo
+                *self._video_args(),  # Copie du flux vidéo, ou réencodage
                 "-c:a", "aac",  # Codec audio AAC
                 "-b:a", "192k",  # Bitrate audio
                 "-shortest",  # Utiliser la durée la plus courte
@@ -130,6 +150,87 @@ class FFmpegMediaCombiner(IMediaCombiner):
             logger.error(f"Erreur lors de la combinaison des médias: {e}")
             return None
 
+    def combine_stream(self, video_path: str, audio: AudioStream, output_path: str) -> Optional[str]:
+        """
+        Combine une vidéo et une piste audio reçue en blocs PCM
+        
+        Les blocs sont écrits sur l'entrée standard de FFmpeg au fur et à
+        mesure de leur génération : l'encodage AAC se fait en parallèle,
+        sans fichier WAV intermédiaire ni piste complète en mémoire.
+        
+        Args:
+            video_path: Chemin de la vidéo
+            audio: Flux audio (consommé)
+            output_path: Chemin du fichier de sortie
+            
+        Returns:
+            Chemin du fichier combiné, ou None en cas d'échec
+        """
+        if not os.path.exists(video_path):
+            logger.error(f"Fichier vidéo non trouvé: {video_path}")
+            return None
+        
+        if not self.ffmpeg_path:
+            logger.error("FFmpeg non disponible, impossible de combiner les médias")
+            return None
+        
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            
+            cmd = [
+                self.ffmpeg_path,
+                "-y",
+                "-i", video_path,  # Fichier vidéo
+                "-f", "s16le",  # Audio PCM 16-bit brut...
+                "-ar", str(audio.sample_rate),
+                "-ac", str(audio.channels),
+                "-i", "pipe:0",  # ...lu sur l'entrée standard
+                *self._video_args(),
+                "-c:a", "aac",
+                "-b:a", "192k",
+                "-shortest",
+                output_path
+            ]
+            
+            logger.info(f"Combinaison de {video_path} et d'un flux audio en {output_path}")
+            # stderr dans un fichier temporaire : un pipe non lu pourrait bloquer FFmpeg
+            with tempfile.TemporaryFile() as stderr:
+                process = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                           stdout=subprocess.DEVNULL, stderr=stderr)
+                try:
+                    for block in audio.blocks:
+                        process.stdin.write(block)
+                except BrokenPipeError:
+                    pass  # FFmpeg s'est arrêté (-shortest ou erreur) : code de retour vérifié ci-dessous
+                except BaseException:
+                    process.kill()
+                    process.wait()
+                    raise
+                finally:
+                    try:
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                returncode = process.wait()
+                
+                if returncode != 0:
+                    stderr.seek(0)
+                    logger.error(f"Erreur FFmpeg: {stderr.read().decode('utf-8', 'replace')}")
+                    return None
+            
+            if not os.path.exists(output_path):
+                logger.error(f"Fichier de sortie non créé: {output_path}")
+                return None
+            
+            logger.info(f"Combinaison réussie: {output_path}")
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la combinaison des médias: {e}")
+            return None
+
 
 class MoviePyMediaCombiner(IMediaCombiner):
     """
@@ -383,9 +383,8 @@ class LearningPipeline:
 
             # Generate audio if available
             audio_file = None
+            audio_stream = None
             if self.audio_generator:
-                audio_file = temp_manager.create_audio_file("audio_gen", "wav")
-                self.audio_generator.set_output_path(str(audio_file))
                 self.audio_generator.set_duration(self.config.video_duration)
 
                 # Set audio mode from AI decision
@@ -399,12 +398,28 @@ class LearningPipeline:
                     events = self.video_generator.get_audio_events()
                     self.audio_generator.add_events(events)
 
-                audio_result = self.audio_generator.generate()
-                if not (audio_result and os.path.exists(audio_result)):
-                    audio_file = None
+                # Stream the audio into the combiner when possible (no intermediate WAV)
+                if self.media_combiner:
+                    audio_stream = self.audio_generator.stream()
+                if audio_stream is None:
+                    audio_file = self._generate_audio_file(temp_manager)
 
             # Combine audio
-            if audio_file and self.media_combiner:
+            if audio_stream is not None:
+                combined_file = temp_manager.create_video_file("combined", "mp4", "combined")
+                combined_result = self.media_combiner.combine_stream(
+                    current_video, audio_stream, str(combined_file)
+                )
+                if not (combined_result and os.path.exists(combined_result)):
+                    # Fall back to the WAV track rather than shipping a silent video
+                    logger.warning("Streamed audio could not be combined, retrying with a WAV track")
+                    audio_file = self._generate_audio_file(temp_manager)
+                    combined_result = self.media_combiner.combine(
+                        current_video, audio_file, str(combined_file)
+                    ) if audio_file else None
+                if combined_result and os.path.exists(combined_result):
+                    current_video = combined_result
+            elif audio_file and self.media_combiner:
                 combined_file = temp_manager.create_video_file("combined", "mp4", "combined")
                 combined_result = self.media_combiner.combine(
                     current_video, str(audio_file), str(combined_file)
@@ -459,6 +474,17 @@ class LearningPipeline:
             temp_manager.mark_error()
             return None, None
 
+    def _generate_audio_file(self, temp_manager) -> Optional[str]:
+        """Render the audio track to a temporary WAV file; returns its path or None if failed"""
+        audio_file = temp_manager.create_audio_file("audio_gen", "wav")
+        self.audio_generator.set_output_path(str(audio_file))
+        try:
+            audio_result = self.audio_generator.generate()
+        except Exception as e:
+            logger.error(f"Audio generation error: {e}")
+            return None
+        return audio_result if audio_result and os.path.exists(audio_result) else None
+
     def _validate_video(self, video_path: str) -> ValidationResult:
         """Validate video before publishing."""
         audio_events = None
@@ -150,12 +150,9 @@ class SimplePipeline(IPipeline):
             
             # ===== STEP 3: AUDIO GENERATION =====
             logger.info("3/5: Generating audio...")
+            audio_stream = None
             try:
                 if self.audio_generator:
-                    # Create audio file path using unified temp manager
-                    audio_file = self.temp_manager.create_audio_file("audio_generation", "wav")
-                    
-                    self.audio_generator.set_output_path(str(audio_file))
                     self.audio_generator.set_duration(self.config["video_duration"])
                     self.audio_generator.apply_trend_data(trend_data)
                     
@@ -165,13 +162,15 @@ class SimplePipeline(IPipeline):
                         self.audio_generator.add_events(events)
                         logger.debug(f"Added {len(events)} audio events")
                     
-                    audio_result = self.audio_generator.generate()
-                    if audio_result and os.path.exists(audio_result):
-                        audio_file = audio_result
-                        logger.info(f"Audio generated: {audio_file}")
-                    else:
-                        logger.warning("Audio generation failed, continuing without audio")
+                    # Stream the audio into the combiner when possible (rendered during step 4)
+                    if self.media_combiner and self.config.get("stream_audio", True):
+                        audio_stream = self.audio_generator.stream()
+                    
+                    if audio_stream is not None:
                         audio_file = None
+                        logger.info("Audio will be streamed into the media combiner")
+                    else:
+                        audio_file = self._generate_audio_file()
                 else:
                     logger.info("No audio generator configured, skipping audio")
                     audio_file = None
@@ -179,6 +178,7 @@ class SimplePipeline(IPipeline):
             except Exception as e:
                 logger.error(f"Audio generation error: {e}")
                 audio_file = None  # Continue without audio
+                audio_stream = None
             
             # Current video path (for next step)
             current_video = video_file
@@ -186,7 +186,8 @@ class SimplePipeline(IPipeline):
             # ===== STEP 4: MEDIA COMBINATION =====
             logger.info("4/5: Combining media...")
             try:
-                if audio_file and self.media_combiner and os.path.exists(audio_file):
+                has_audio = audio_stream is not None or (audio_file and os.path.exists(audio_file))
+                if has_audio and self.media_combiner:
                     # Verify video file still exists
                     if not os.path.exists(current_video):
                         logger.error(f"Video file disappeared: {current_video}")
@@ -196,9 +197,21 @@ class SimplePipeline(IPipeline):
                     # Create combined file path using unified temp manager
                     combined_file = self.temp_manager.create_video_file("media_combination", "mp4", "combined")
                     
-                    combined_result = self.media_combiner.combine(
-                        current_video, audio_file, str(combined_file)
-                    )
+                    if audio_stream is not None:
+                        combined_result = self.media_combiner.combine_stream(
+                            current_video, audio_stream, str(combined_file)
+                        )
+                        if not (combined_result and os.path.exists(combined_result)):
+                            # Fall back to the WAV track rather than shipping a silent video
+                            logger.warning("Streamed audio could not be combined, retrying with a WAV track")
+                            audio_file = self._generate_audio_file()
+                            combined_result = self.media_combiner.combine(
+                                current_video, audio_file, str(combined_file)
+                            ) if audio_file else None
+                    else:
+                        combined_result = self.media_combiner.combine(
+                            current_video, audio_file, str(combined_file)
+                        )
                     
                     if combined_result and os.path.exists(combined_result):
                         current_video = combined_result
@@ -354,6 +367,22 @@ class SimplePipeline(IPipeline):
             # Cleanup is handled automatically by temp_manager
             pass
     
+    def _generate_audio_file(self) -> Optional[str]:
+        """Render the audio track to a temporary WAV file; returns its path or None if failed"""
+        # Create audio file path using unified temp manager
+        audio_file = self.temp_manager.create_audio_file("audio_generation", "wav")
+        self.audio_generator.set_output_path(str(audio_file))
+        try:
+            audio_result = self.audio_generator.generate()
+        except Exception as e:
+            logger.error(f"Audio generation error: {e}")
+            return None
+        if audio_result and os.path.exists(audio_result):
+            logger.info(f"Audio generated: {audio_result}")
+            return audio_result
+        logger.warning("Audio generation failed, continuing without audio")
+        return None
+
     def _publish_video(self, video_path: str, trend_data):
         """Publish video to configured platforms"""
         for platform, publisher in self.publishers.items():
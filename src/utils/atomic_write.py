@@ -0,0 +1,38 @@
+# src/utils/atomic_write.py
+"""
+Atomic file writes for the on-disk caches shared by concurrent runs
+"""
+
+import os
+import tempfile
+from typing import IO, Callable
+
+
+def atomic_write(path: str, writer: Callable[[IO], None], mode: str = "wb") -> None:
+    """
+    Write a file through a temporary file of its directory and os.replace,
+    so concurrent readers see either the previous file or the complete new
+    one, never a partial write.
+
+    Args:
+        path: Destination file (its directory is created if needed)
+        writer: Called with the open temporary file, writes the content
+        mode: "wb" (binary) or "w" (text)
+
+    Raises:
+        OSError: The file could not be written (the temporary file is removed)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or None, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            writer(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,185 @@
+# physics_engine/collision/broadphase.py
+"""
+Broadphase : paires candidates de collision à partir des boîtes englobantes
+
+Chaque broadphase reçoit les boîtes de tous les corps dans un tableau
+(n, 4) = (min_x, min_y, max_x, max_y) et le masque des corps statiques, et
+renvoie les paires d'indices (i < j) dont les boîtes se chevauchent, sans
+les paires de deux corps statiques, triées comme la double boucle i < j :
+la narrowphase voit les mêmes paires dans le même ordre qu'en O(n²).
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..core.vector import Vector2D
+from .detector import QuadTree
+
+BROADPHASES = ("none", "grid", "sap", "quadtree")
+
+
+def _pairs_in_runs(run_end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pour chaque position p d'un tableau, les paires (p, q) avec p < q < run_end[p]
+    """
+    counts = np.maximum(run_end - np.arange(len(run_end)) - 1, 0)
+    total = int(counts.sum())
+    first = np.repeat(np.arange(len(run_end)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return first, first + 1 + offsets
+
+
+def _finish_pairs(a: np.ndarray, b: np.ndarray, bounds: np.ndarray, static: np.ndarray,
+                  unique: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Paires (i < j) dont les boîtes se chevauchent, sans statique-statique, triées"""
+    first, second = np.minimum(a, b), np.maximum(a, b)
+    box_a, box_b = bounds[first], bounds[second]
+    keep = ((box_a[:, 0] <= box_b[:, 2]) & (box_b[:, 0] <= box_a[:, 2]) &
+            (box_a[:, 1] <= box_b[:, 3]) & (box_b[:, 1] <= box_a[:, 3]) &
+            ~(static[first] & static[second]) & (first != second))
+    keys = first[keep] * len(bounds) + second[keep]
+    keys = np.unique(keys) if unique else np.sort(keys)
+    return keys // len(bounds), keys % len(bounds)
+
+
+class GridBroadphase:
+    """
+    Grille uniforme à hachage vectorisé : chaque boîte est inscrite dans
+    toutes les cellules qu'elle couvre, les entrées sont triées par clé de
+    cellule, et les paires sont formées dans chaque cellule.
+    """
+
+    name = "grid"
+
+    def __init__(self, cell_size: float = 0.0):
+        """
+        Args:
+            cell_size: Côté d'une cellule ; 0 = la plus grande boîte des corps
+                dynamiques (chacun couvre alors au plus 4 cellules)
+        """
+        self.cell_size = cell_size
+        self.candidates = 0
+
+    def _cell_size(self, bounds: np.ndarray, static: np.ndarray) -> float:
+        if self.cell_size > 0:
+            return self.cell_size
+        extents = bounds[:, 2:] - bounds[:, :2]
+        sized = extents[~static] if (~static).any() else extents
+        return max(float(sized.max(initial=0.0)), 1.0)
+
+    def pairs(self, bounds: np.ndarray, static: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(bounds)
+        if n < 2:
+            self.candidates = 0
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        cell = self._cell_size(bounds, static)
+        low = np.floor(bounds[:, :2] / cell).astype(np.int64)
+        high = np.floor(bounds[:, 2:] / cell).astype(np.int64)
+        span = high - low + 1
+        counts = span[:, 0] * span[:, 1]
+
+        # Une entrée par (corps, cellule couverte)
+        body = np.repeat(np.arange(n), counts)
+        local = np.arange(len(body)) - np.repeat(np.cumsum(counts) - counts, counts)
+        col = low[body, 0] + local % span[body, 0]
+        row = low[body, 1] + local // span[body, 0]
+        col -= col.min()
+        row -= row.min()
+        key = col * (int(row.max()) + 1) + row
+
+        order = np.argsort(key, kind="stable")
+        key, body = key[order], body[order]
+        # Fin de la cellule de chaque entrée
+        boundaries = np.flatnonzero(np.diff(key)) + 1
+        run_end = np.repeat(np.append(boundaries, len(key)),
+                            np.diff(np.concatenate(([0], boundaries, [len(key)]))))
+        first, second = _pairs_in_runs(run_end)
+        self.candidates = len(first)
+        # Une paire partageant plusieurs cellules n'est gardée qu'une fois
+        return _finish_pairs(body[first], body[second], bounds, static, unique=True)
+
+
+class SweepAndPruneBroadphase:
+    """
+    Tri et balayage sur un axe : les boîtes sont triées par leur minimum sur
+    l'axe, et chacune est appariée aux suivantes tant que leur minimum ne
+    dépasse pas son maximum. Les paires retenues sont ensuite testées sur
+    l'autre axe.
+    """
+
+    name = "sap"
+
+    def __init__(self, axis: Optional[int] = None):
+        """
+        Args:
+            axis: 0 = x, 1 = y ; None = l'axe où les centres des boîtes sont
+                le plus dispersés (y pour une scène verticale 1080x1920)
+        """
+        self.axis = axis
+        self.candidates = 0
+
+    def pairs(self, bounds: np.ndarray, static: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        axis = self.axis
+        if axis is None:
+            centres = bounds[:, :2] + bounds[:, 2:]
+            axis = int(np.argmax(centres.var(axis=0))) if len(bounds) else 0
+        order = np.argsort(bounds[:, axis], kind="stable")
+        sorted_min = bounds[order, axis]
+        run_end = np.searchsorted(sorted_min, bounds[order, axis + 2], side="right")
+        first, second = _pairs_in_runs(run_end)
+        self.candidates = len(first)
+        return _finish_pairs(order[first], order[second], bounds, static)
+
+
+class _Box:
+    """Boîte d'un corps, pour le QuadTree (qui lit get_bounding_box)"""
+
+    __slots__ = ["index", "box"]
+
+    def __init__(self, index: int, bounds: np.ndarray):
+        self.index = index
+        self.box = (Vector2D(bounds[0], bounds[1]), Vector2D(bounds[2], bounds[3]))
+
+    def get_bounding_box(self) -> Tuple[Vector2D, Vector2D]:
+        return self.box
+
+
+class QuadTreeBroadphase:
+    """QuadTree de collision/detector.py, reconstruit à chaque pas"""
+
+    name = "quadtree"
+
+    def __init__(self, width: float, height: float, max_objects: int = 10, max_levels: int = 5):
+        self.tree = QuadTree((0, 0, width, height), max_objects, max_levels)
+        self.candidates = 0
+
+    def pairs(self, bounds: np.ndarray, static: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        self.tree.clear()
+        boxes = [_Box(index, row) for index, row in enumerate(bounds.tolist())]
+        for box in boxes:
+            self.tree.insert(box)
+
+        first, second = [], []
+        for box in boxes:
+            nearby = []
+            self.tree.retrieve(nearby, box)
+            first.extend([box.index] * len(nearby))
+            second.extend(other.index for other in nearby)
+        self.candidates = len(first)
+        # Chaque paire est retrouvée depuis ses deux corps (et chaque corps avec lui-même)
+        return _finish_pairs(np.array(first, dtype=np.int64), np.array(second, dtype=np.int64),
+                             bounds, static, unique=True)
+
+
+def make_broadphase(name: str, width: float, height: float,
+                    cell_size: float = 0.0) -> Optional[object]:
+    """Broadphase de EngineConfig.broadphase (None pour "none" : double boucle)"""
+    if name == "none":
+        return None
+    if name == "grid":
+        return GridBroadphase(cell_size)
+    if name == "sap":
+        return SweepAndPruneBroadphase()
+    if name == "quadtree":
+        return QuadTreeBroadphase(width, height)
+    raise ValueError(f"Broadphase inconnue : {name!r} (choix : {', '.join(BROADPHASES)})")
@@ -6,8 +6,11 @@ import math
 from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
+import numpy as np
+
 from ..core.vector import Vector2D
 from ..physics.body import PhysicsBody, Circle, Segment, Ring
+from .narrowphase import RingArrays, angles_in_gap
 
 @dataclass
 class CollisionInfo:
@@ -309,6 +312,94 @@ class ContinuousCollisionDetector:
                 break
         
         return (t_min + t_max) / 2
+    
+    def circle_circle_toi(self, start_a: np.ndarray, motion_a: np.ndarray, start_b: np.ndarray,
+                          motion_b: np.ndarray, radius_sum: np.ndarray) -> np.ndarray:
+        """
+        Instant de contact de cercles en mouvement rectiligne pendant un pas
+        
+        Args:
+            start_a, start_b: Positions en début de pas (..., 2)
+            motion_a, motion_b: Déplacements pendant le pas (..., 2)
+            radius_sum: Sommes des rayons (...)
+        
+        Returns:
+            Fraction du pas [0, 1] où |B - A| atteint radius_sum (inf sans
+            contact, ou si les cercles se chevauchent déjà au début du pas)
+        """
+        offset = start_b - start_a
+        relative = motion_b - motion_a
+        a = np.einsum('...i,...i', relative, relative)
+        b = 2 * np.einsum('...i,...i', offset, relative)
+        c = np.einsum('...i,...i', offset, offset) - radius_sum * radius_sum
+        disc = b * b - 4 * a * c
+        
+        toi = np.full(np.shape(c), np.inf)
+        valid = (c > 0) & (disc >= 0) & (a > 0) & (b < 0)
+        # Première racine : entrée dans le disque de rayon radius_sum
+        root = (-b[valid] - np.sqrt(disc[valid])) / (2 * a[valid])
+        toi[valid] = np.where(root <= 1.0, root, np.inf)
+        return toi
+    
+    def circle_ring_toi(self, start: np.ndarray, motion: np.ndarray, radius: np.ndarray,
+                        rings: RingArrays) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Instant où des cercles en mouvement rectiligne atteignent le bord des
+        anneaux (fixes) pendant un pas : bord intérieur en sortant du trou,
+        bord extérieur en arrivant de l'extérieur, ou tout de suite pour un
+        cercle déjà contre un bord et qui s'y enfonce. Un passage par le gap
+        (à l'angle du point de contact) n'est pas un contact.
+        
+        Args:
+            start, motion: Positions en début de pas et déplacements (f, 2)
+            radius: Rayons (f,)
+            rings: Anneaux (m lignes)
+        
+        Returns:
+            (toi, side) : fraction du pas [0, 1] (inf sans contact) et côté
+            touché (1 = intérieur, 2 = extérieur), de forme (f, m)
+        """
+        offset = start[:, None, :] - rings.center[None, :, :]
+        motion = np.broadcast_to(motion[:, None, :], offset.shape)
+        radius = radius[:, None]
+        a = np.einsum('fmi,fmi->fm', motion, motion)
+        b = 2 * np.einsum('fmi,fmi->fm', offset, motion)
+        distance_sq = np.einsum('fmi,fmi->fm', offset, offset)
+        toi = np.full(distance_sq.shape, np.inf)
+        side = np.zeros(distance_sq.shape, dtype=np.int64)
+        moving = a > 0
+        safe_a = np.where(moving, a, 1.0)
+        
+        # Sortie du disque de rayon inner - radius (seconde racine)
+        limit = rings.inner - radius
+        c = distance_sq - limit * limit
+        root = (-b + np.sqrt(np.maximum(b * b - 4 * a * c, 0.0))) / (2 * safe_a)
+        hit = moving & (limit > 0) & (c < 0) & (root <= 1.0)
+        toi[hit], side[hit] = root[hit], 1
+        
+        # Entrée dans le disque de rayon outer + radius (première racine)
+        limit = rings.outer + radius
+        c = distance_sq - limit * limit
+        disc = b * b - 4 * a * c
+        root = (-b - np.sqrt(np.maximum(disc, 0.0))) / (2 * safe_a)
+        hit = moving & (c > 0) & (disc >= 0) & (b < 0) & (root <= 1.0) & (root < toi)
+        toi[hit], side[hit] = root[hit], 2
+        
+        # Départ déjà contre un bord (dans le mur), en s'y enfonçant
+        middle = (rings.inner + rings.outer) / 2
+        distance = np.sqrt(distance_sq)
+        against_inner = (distance >= rings.inner - radius) & (distance < middle) & (b > 0)
+        against_outer = (distance <= rings.outer + radius) & (distance >= middle) & (b < 0)
+        toi[against_inner | against_outer] = 0.0
+        side[against_inner] = 1
+        side[against_outer] = 2
+        
+        # Passage par le gap
+        point = offset + np.where(np.isfinite(toi), toi, 0.0)[..., None] * motion
+        angle = (np.degrees(np.arctan2(point[..., 1], point[..., 0])) + 360) % 360
+        through = np.isfinite(toi) & angles_in_gap(angle, rings.gap_start, rings.gap_angle)
+        toi[through], side[through] = np.inf, 0
+        return toi, side
 
 class QuadTree:
     """Quadtree pour optimisation spatiale avancée"""
@@ -0,0 +1,205 @@
+# physics_engine/collision/narrowphase.py
+"""
+Narrowphase vectorisée : contacts cercle-cercle et cercle-anneau
+
+Reçoit les paires candidates de la broadphase sous forme de tableaux
+d'indices (first, second) et calcule en un bloc normales, pénétrations et
+points de contact. Les formules sont celles des tests par objet
+(PhysicsEngine._check_collision, Ring.collision_with_circle) : les contacts
+trouvés sont les mêmes. La normale va toujours du corps `first` vers le
+corps `second`.
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+# Formes traitées en lot (les autres paires passent par le test par objet)
+OTHER, CIRCLE, RING = 0, 1, 2
+
+# Côté d'anneau touché par un contact (ContactBatch.ring_side)
+RING_SIDES = ("", "inner", "outer")
+
+
+def body_kind(body) -> int:
+    """Forme d'un corps pour la narrowphase"""
+    if hasattr(body, 'radius'):
+        return CIRCLE
+    if hasattr(body, 'inner_radius') and hasattr(body, 'point_in_gap'):
+        return RING
+    return OTHER
+
+
+@dataclass
+class RingArrays:
+    """Anneaux d'une scène, une ligne par anneau"""
+    center: np.ndarray      # (m, 2)
+    inner: np.ndarray       # (m,)
+    outer: np.ndarray       # (m,)
+    gap_start: np.ndarray   # (m,) début du gap, rotation comprise, en degrés [0, 360)
+    gap_angle: np.ndarray   # (m,) ouverture du gap en degrés (0 = pas de gap)
+
+    @classmethod
+    def from_bodies(cls, rings: List) -> 'RingArrays':
+        """Lit l'état courant (position, rotation) des anneaux"""
+        return cls(
+            center=np.array([ring.position.tuple() for ring in rings], dtype=float).reshape(-1, 2),
+            inner=np.array([ring.inner_radius for ring in rings], dtype=float),
+            outer=np.array([ring.outer_radius for ring in rings], dtype=float),
+            gap_start=np.array([(ring.gap_start + ring.rotation) % 360 for ring in rings], dtype=float),
+            gap_angle=np.array([ring.gap_angle for ring in rings], dtype=float)
+        )
+
+
+@dataclass
+class ContactBatch:
+    """Contacts trouvés, une ligne par contact, dans l'ordre des paires candidates"""
+    pair: np.ndarray           # (k,) indice de la paire candidate
+    first: np.ndarray          # (k,) indice du premier corps
+    second: np.ndarray         # (k,) indice du second corps
+    normal: np.ndarray         # (k, 2) de first vers second
+    penetration: np.ndarray    # (k,)
+    contact_point: np.ndarray  # (k, 2)
+    ring_side: np.ndarray      # (k,) 0 = cercle-cercle, 1 = bord intérieur, 2 = bord extérieur
+
+    def __len__(self) -> int:
+        return len(self.pair)
+
+
+def _normalized(delta: np.ndarray, distance: np.ndarray) -> np.ndarray:
+    """delta / distance par ligne, (0, 0) pour une distance nulle (comme Vector2D.normalized)"""
+    normal = np.zeros_like(delta)
+    np.divide(delta, distance[:, None], out=normal, where=distance[:, None] > 0)
+    return normal
+
+
+def _distance(delta: np.ndarray) -> np.ndarray:
+    # Même ordre d'opérations que Vector2D.distance_to
+    return np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+
+def circle_circle_contacts(position_a: np.ndarray, radius_a: np.ndarray,
+                           position_b: np.ndarray, radius_b: np.ndarray
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Contacts entre les cercles A[k] et B[k]
+
+    Returns:
+        (hit, normal, penetration, contact_point) : masque (k,) des paires en
+        contact, puis normale A -> B, pénétration et point de contact (sur le
+        bord de A) pour les seules paires touchées
+    """
+    delta = position_b - position_a
+    distance = _distance(delta)
+    radius_sum = radius_a + radius_b
+    hit = distance < radius_sum
+
+    delta, distance = delta[hit], distance[hit]
+    normal = _normalized(delta, distance)
+    penetration = radius_sum[hit] - distance
+    contact_point = position_a[hit] + normal * radius_a[hit][:, None]
+    return hit, normal, penetration, contact_point
+
+
+def angles_in_gap(angle: np.ndarray, gap_start: np.ndarray, gap_angle: np.ndarray) -> np.ndarray:
+    """
+    Angles (degrés, [0, 360)) situés dans le gap [gap_start, gap_start + gap_angle]
+    de leur anneau ; version vectorisée de Ring.point_in_gap
+    """
+    gap_end = (gap_start + gap_angle) % 360
+    inside = np.where(gap_start <= gap_end,
+                      (gap_start <= angle) & (angle <= gap_end),
+                      (angle >= gap_start) | (angle <= gap_end))  # Le gap traverse 0°
+    return inside & (gap_angle > 0)
+
+
+def circle_ring_contacts(circle_position: np.ndarray, circle_radius: np.ndarray,
+                         rings: RingArrays, ring: np.ndarray
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Contacts entre les cercles [k] et les anneaux rings[ring[k]]
+
+    Returns:
+        (hit, side, normal, penetration, contact_point) : masque (k,) des
+        paires en contact, puis pour les seules paires touchées le côté
+        (1 = intérieur, 2 = extérieur), la normale cercle -> anneau au sens de
+        Ring.collision_with_circle, la pénétration et le point de contact
+    """
+    center = rings.center[ring]
+    inner, outer = rings.inner[ring], rings.outer[ring]
+    delta = circle_position - center
+    distance = _distance(delta)
+
+    # Cercle dans la zone de l'anneau, hors du gap
+    near = (distance + circle_radius >= inner) & (distance - circle_radius <= outer)
+    angle = (np.degrees(np.arctan2(delta[:, 1], delta[:, 0])) + 360) % 360
+    near &= ~angles_in_gap(angle, rings.gap_start[ring], rings.gap_angle[ring])
+
+    # Côté du mur selon sa ligne médiane (comme circle_ring_toi) : un cercle juste
+    # à l'extérieur d'un anneau plus fin que son diamètre touche le bord extérieur
+    inner_side = distance < (inner + outer) / 2
+    inner_hit = near & inner_side & (distance < inner + circle_radius)
+    outer_hit = near & ~inner_side & (distance + circle_radius > outer)
+    hit = inner_hit | outer_hit
+    inner_hit = inner_hit[hit]
+
+    delta, distance, radius = delta[hit], distance[hit], circle_radius[hit]
+    inner, outer = inner[hit], outer[hit]
+    direction = _normalized(delta, distance)
+    side = np.where(inner_hit, 1, 2)
+    # Bord intérieur : repoussé vers le centre ; bord extérieur : vers l'extérieur
+    normal = np.where(inner_hit[:, None], direction, -direction)
+    penetration = np.where(inner_hit, distance + radius - inner, outer + radius - distance)
+    contact_point = center[hit] + direction * np.where(inner_hit, inner, outer)[:, None]
+    return hit, side, normal, penetration, contact_point
+
+
+def batch_contacts(first: np.ndarray, second: np.ndarray, kind: np.ndarray,
+                   position: np.ndarray, radius: np.ndarray,
+                   rings: RingArrays, ring_row: np.ndarray) -> Tuple[ContactBatch, np.ndarray]:
+    """
+    Narrowphase des paires candidates (first[p], second[p])
+
+    Args:
+        kind: (n,) forme de chaque corps (OTHER, CIRCLE, RING)
+        position: (n, 2) positions des corps
+        radius: (n,) rayons des cercles (ignorés pour les autres formes)
+        rings: anneaux de la scène
+        ring_row: (n,) ligne de chaque anneau dans `rings` (-1 pour les autres corps)
+
+    Returns:
+        (contacts, rest) : contacts cercle-cercle et cercle-anneau triés par
+        paire, et indices des paires d'autres formes, à tester par objet
+    """
+    kind_a, kind_b = kind[first], kind[second]
+    circles = (kind_a == CIRCLE) & (kind_b == CIRCLE)
+    ring_first = (kind_a == RING) & (kind_b == CIRCLE)
+    ring_second = (kind_a == CIRCLE) & (kind_b == RING)
+    rest = np.flatnonzero(~(circles | ring_first | ring_second))
+
+    parts = []
+
+    pair = np.flatnonzero(circles)
+    a, b = first[pair], second[pair]
+    hit, normal, penetration, contact_point = circle_circle_contacts(
+        position[a], radius[a], position[b], radius[b])
+    parts.append((pair[hit], normal, penetration, contact_point, np.zeros(hit.sum(), dtype=np.int64)))
+
+    pair = np.flatnonzero(ring_first | ring_second)
+    if len(pair):
+        swapped = ring_first[pair]
+        circle = np.where(swapped, second[pair], first[pair])
+        ring = np.where(swapped, first[pair], second[pair])
+        hit, side, normal, penetration, contact_point = circle_ring_contacts(
+            position[circle], radius[circle], rings, ring_row[ring])
+        # Normale de first vers second : inversée quand l'anneau vient en premier
+        normal[swapped[hit]] *= -1
+        parts.append((pair[hit], normal, penetration, contact_point, side))
+
+    pair, normal, penetration, contact_point, side = (np.concatenate(column) for column in zip(*parts))
+    order = np.argsort(pair, kind="stable")
+    pair = pair[order]
+    contacts = ContactBatch(pair=pair, first=first[pair], second=second[pair],
+                            normal=normal[order].reshape(-1, 2), penetration=penetration[order],
+                            contact_point=contact_point[order].reshape(-1, 2), ring_side=side[order])
+    return contacts, rest
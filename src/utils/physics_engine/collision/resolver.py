@@ -14,8 +14,30 @@ class CollisionResolver:
         self.position_correction_factor = 0.8
         self.velocity_threshold = 0.01
         
+        # Solveur itératif (ContactSolver) ; None : une résolution par collision
+        self.solver = None
+        
     def resolve_collisions(self, collisions: List[CollisionInfo], dt: float):
-        """Résout toutes les collisions"""
+        """
+        Résout toutes les collisions
+
+        Avec le solveur, seuls les contacts qui ont reçu une impulsion
+        déclenchent on_collision (même règle que PhysicsEngine)
+        """
+        if self.solver is not None:
+            impulses = self.solver.solve([(collision.body_a, collision.body_b, collision.normal,
+                                           collision.penetration) for collision in collisions], dt)
+            for collision, impulse in zip(collisions, impulses):
+                if impulse <= 0:
+                    continue
+                collision.metadata['impulse'] = impulse
+                body_a, body_b = collision.body_a, collision.body_b
+                if body_a.on_collision:
+                    body_a.on_collision(body_a, body_b, collision)
+                if body_b.on_collision:
+                    body_b.on_collision(body_b, body_a, collision)
+            return
+        
         for collision in collisions:
             self.resolve_collision(collision, dt)
     
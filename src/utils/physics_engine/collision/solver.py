@@ -0,0 +1,188 @@
+# physics_engine/collision/solver.py
+"""
+Solveur de contacts à impulsions séquentielles
+
+Chaque contact (corps A, corps B, normale A -> B, pénétration) porte une
+impulsion normale accumulée, bornée à >= 0, et une impulsion de frottement
+bornée par mu * impulsion normale. Les contacts sont parcourus plusieurs
+fois par pas (itérations de vitesse) : une pile de balles converge vers un
+état de repos au lieu de recevoir une seule impulsion par contact dans
+l'ordre de la liste. Les impulsions d'un pas sont gardées dans un cache
+indexé par paire de corps et réappliquées au pas suivant (warm starting).
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+from ..core.vector import Vector2D
+
+POSITION_CORRECTIONS = ("baumgarte", "split")
+
+
+class ContactSolver:
+    """Solveur à impulsions séquentielles avec cache de contacts"""
+
+    def __init__(self, velocity_iterations: int = 8, position_iterations: int = 3,
+                 position_correction: str = "baumgarte", baumgarte: float = 0.2,
+                 slop: float = 0.5, restitution_threshold: float = 50.0,
+                 warm_starting: bool = True, warm_start_factor: Optional[float] = None,
+                 warm_start_max_angle: float = 15.0):
+        """
+        Args:
+            velocity_iterations: Passages sur tous les contacts par pas
+            position_iterations: Passages de correction de position ("split")
+            position_correction: "baumgarte" (biais de vitesse proportionnel à
+                la pénétration) ou "split" (positions corrigées à part, sans
+                ajouter de quantité de mouvement)
+            baumgarte: Part de la pénétration corrigée par pas
+            slop: Pénétration tolérée (pixels), évite le tremblement au repos
+            restitution_threshold: Vitesse d'approche (pixels/s) en dessous de
+                laquelle un contact ne rebondit pas
+            warm_starting: Réappliquer les impulsions du pas précédent
+            warm_start_factor: Part des impulsions du pas précédent réappliquée.
+                Par défaut 0.8 avec "baumgarte" (l'impulsion gardée contient le
+                biais de pénétration, réappliquée entière elle fait trembler
+                les piles) et 1.0 avec "split" (elle porte seule le poids de la pile)
+            warm_start_max_angle: Rotation de la normale (degrés) au-delà de
+                laquelle l'impulsion du pas précédent n'est pas réappliquée
+        """
+        if position_correction not in POSITION_CORRECTIONS:
+            raise ValueError(f"Correction de position inconnue : {position_correction!r} "
+                             f"(choix : {', '.join(POSITION_CORRECTIONS)})")
+        self.velocity_iterations = velocity_iterations
+        self.position_iterations = position_iterations
+        self.position_correction = position_correction
+        self.baumgarte = baumgarte
+        self.slop = slop
+        self.restitution_threshold = restitution_threshold
+        self.warm_starting = warm_starting
+        if warm_start_factor is None:
+            warm_start_factor = 0.8 if position_correction == "baumgarte" else 1.0
+        self.warm_start_factor = warm_start_factor
+        self.warm_start_min_cos = math.cos(math.radians(warm_start_max_angle))
+
+        # Impulsions (normale, tangentielle) et normale (x, y) du dernier pas,
+        # par paire (id(A), id(B))
+        self.cache: Dict[Tuple[int, int], Tuple[float, float, float, float]] = {}
+
+    def solve(self, contacts: List[Tuple[object, object, Vector2D, float]], dt: float) -> List[float]:
+        """
+        Résout les contacts d'un pas
+
+        Args:
+            contacts: (corps A, corps B, normale A -> B, pénétration)
+            dt: Pas de temps
+
+        Returns:
+            Impulsion normale accumulée de chaque contact
+        """
+        # Vitesses des corps concernés, dans des listes locales pendant les itérations
+        slots = {}
+        bodies, vx, vy, inv_mass = [], [], [], []
+
+        def slot(body) -> int:
+            index = slots.get(id(body))
+            if index is None:
+                index = slots[id(body)] = len(bodies)
+                bodies.append(body)
+                vx.append(body.velocity.x)
+                vy.append(body.velocity.y)
+                inv_mass.append(0.0 if body.static else 1.0 / body.mass)
+            return index
+
+        baumgarte = self.position_correction == "baumgarte"
+        rows = []
+        for body_a, body_b, normal, penetration in contacts:
+            a, b = slot(body_a), slot(body_b)
+            mass_sum = inv_mass[a] + inv_mass[b]
+            k = 1.0 / mass_sum if mass_sum > 0 else 0.0
+            nx, ny = normal.x, normal.y
+
+            # Rebond seulement au-dessus du seuil de vitesse d'approche
+            approach = (vx[b] - vx[a]) * nx + (vy[b] - vy[a]) * ny
+            restitution = min(body_a.restitution, body_b.restitution)
+            bias = -restitution * approach if approach < -self.restitution_threshold else 0.0
+            if baumgarte:
+                bias += self.baumgarte / dt * max(penetration - self.slop, 0.0)
+            mu = math.sqrt(max(body_a.friction, 0.0) * max(body_b.friction, 0.0))
+
+            key = (id(body_a), id(body_b))
+            jn = jt = 0.0
+            cached = self.cache.get(key) if self.warm_starting else None
+            # Contact qui a tourné (balle qui roule sur une autre) : impulsion obsolète
+            if cached is not None and cached[2] * nx + cached[3] * ny >= self.warm_start_min_cos:
+                jn, jt = cached[0] * self.warm_start_factor, cached[1] * self.warm_start_factor
+            rows.append([a, b, nx, ny, penetration, k, bias, mu, jn, jt, key])
+
+        # Warm starting : impulsions du pas précédent, une fois tous les biais
+        # calculés sur les vitesses d'avant le pas (tangente t = (-ny, nx))
+        for a, b, nx, ny, _, k, _, _, jn, jt, _ in rows:
+            if k == 0.0 or not (jn or jt):
+                continue
+            px, py = jn * nx - jt * ny, jn * ny + jt * nx
+            vx[a] -= px * inv_mass[a]
+            vy[a] -= py * inv_mass[a]
+            vx[b] += px * inv_mass[b]
+            vy[b] += py * inv_mass[b]
+
+        for _ in range(self.velocity_iterations):
+            for row in rows:
+                a, b, nx, ny, _, k, bias, mu, jn, jt, _ = row
+                if k == 0.0:
+                    continue
+                ima, imb = inv_mass[a], inv_mass[b]
+                dvx, dvy = vx[b] - vx[a], vy[b] - vy[a]
+
+                # Frottement, borné par mu * impulsion normale (tangente t = (-ny, nx))
+                vt = dvy * nx - dvx * ny
+                new_jt = min(max(jt - vt * k, -mu * jn), mu * jn)
+                dt_impulse = new_jt - jt
+                row[9] = new_jt
+                vx[a] += dt_impulse * ny * ima
+                vy[a] -= dt_impulse * nx * ima
+                vx[b] -= dt_impulse * ny * imb
+                vy[b] += dt_impulse * nx * imb
+
+                # Impulsion normale accumulée, jamais attractive
+                vn = (vx[b] - vx[a]) * nx + (vy[b] - vy[a]) * ny
+                new_jn = max(jn + (bias - vn) * k, 0.0)
+                dn = new_jn - jn
+                row[8] = new_jn
+                vx[a] -= dn * nx * ima
+                vy[a] -= dn * ny * ima
+                vx[b] += dn * nx * imb
+                vy[b] += dn * ny * imb
+
+        for index, body in enumerate(bodies):
+            if not body.static:
+                body.velocity = Vector2D(vx[index], vy[index])
+
+        if not baumgarte:
+            self._correct_positions(rows, bodies, inv_mass)
+
+        self.cache = {row[10]: (row[8], row[9], row[2], row[3]) for row in rows}
+        return [row[8] for row in rows]
+
+    def _correct_positions(self, rows: List[list], bodies: List, inv_mass: List[float]):
+        """
+        Correction de position séparée (split impulse) : chaque passage
+        retire une part de la pénétration restante, estimée à partir des
+        déplacements déjà appliqués, sans toucher aux vitesses
+        """
+        dx = [0.0] * len(bodies)
+        dy = [0.0] * len(bodies)
+        for _ in range(self.position_iterations):
+            for a, b, nx, ny, penetration, k, *_ in rows:
+                if k == 0.0:
+                    continue
+                remaining = penetration - ((dx[b] - dx[a]) * nx + (dy[b] - dy[a]) * ny)
+                correction = self.baumgarte * (remaining - self.slop)
+                if correction <= 0.0:
+                    continue
+                correction *= k
+                dx[a] -= correction * nx * inv_mass[a]
+                dy[a] -= correction * ny * inv_mass[a]
+                dx[b] += correction * nx * inv_mass[b]
+                dy[b] += correction * ny * inv_mass[b]
+        for index, body in enumerate(bodies):
+            if not body.static and (dx[index] or dy[index]):
+                body.position += Vector2D(dx[index], dy[index])
@@ -4,10 +4,16 @@ Moteur de physique principal
 """
 import pygame
 import time
+import numpy as np
 from typing import List, Optional, Callable
 from dataclasses import dataclass
 
 from .vector import Vector2D
+from .world import BatchWorld
+from ..collision.broadphase import make_broadphase, SweepAndPruneBroadphase
+from ..collision.solver import ContactSolver
+from ..collision.detector import ContinuousCollisionDetector
+from ..collision.narrowphase import CIRCLE, RING, RING_SIDES, RingArrays, batch_contacts, body_kind
 
 @dataclass
 class EngineConfig:
@@ -21,6 +27,18 @@ class EngineConfig:
     friction: float = 0.1
     background_color: tuple = (15, 15, 25)
     max_velocity: float = 2000.0  # Vitesse max pour éviter les bugs
+    batch_world: bool = False  # Cercles dynamiques dans des tableaux NumPy (scènes à 1k-10k corps)
+    broadphase: str = "none"  # "none" (toutes les paires), "grid", "sap" (tri et balayage) ou "quadtree"
+    grid_cell_size: float = 0.0  # Cellule de la broadphase "grid" (0 = plus grand corps dynamique)
+    solver_iterations: int = 0  # Itérations du solveur à impulsions séquentielles (0 = un passage par contact ; callbacks : voir _resolve_collisions)
+    position_correction: str = "baumgarte"  # Solveur : "baumgarte" (biais de vitesse) ou "split" (positions à part)
+    baumgarte: float = 0.2  # Solveur : part de la pénétration corrigée par pas
+    penetration_slop: float = 0.5  # Solveur : pénétration tolérée (pixels)
+    warm_starting: bool = True  # Solveur : impulsions du pas précédent réappliquées (cache de contacts)
+    substeps: int = 1  # Pas physiques fixes (1 / fps / substeps) par image rendue (advance)
+    ccd: bool = False  # Détection continue pour les cercles rapides (pas de traversée des murs)
+    ccd_threshold: float = 0.5  # CCD : déplacement par pas, en rayons, au-delà duquel un cercle est rapide
+    interpolate: bool = False  # Rendu interpolé entre les deux derniers pas physiques (toujours si time_scale != 1)
 
 class PhysicsEngine:
     """Moteur de physique 2D modulaire"""
@@ -43,6 +61,33 @@ class PhysicsEngine:
         self.constraints = []
         self.collision_pairs = []
         
+        # Monde en lots : les cercles dynamiques y sont intégrés en un pas vectorisé,
+        # les autres corps (loose_bodies) par objet
+        self.world = BatchWorld() if self.config.batch_world else None
+        self.loose_bodies = []
+        
+        # Broadphase (None : double boucle sur toutes les paires)
+        self.broadphase = make_broadphase(self.config.broadphase, self.config.width,
+                                          self.config.height, self.config.grid_cell_size)
+        self._bounds_index = None  # Indices des corps du monde / hors monde, recalculés après ajout/retrait
+        
+        # Solveur de contacts (None : une impulsion par contact, dans l'ordre de la liste)
+        self.solver = None
+        if self.config.solver_iterations > 0:
+            self.solver = ContactSolver(velocity_iterations=self.config.solver_iterations,
+                                        position_correction=self.config.position_correction,
+                                        baumgarte=self.config.baumgarte,
+                                        slop=self.config.penetration_slop,
+                                        warm_starting=self.config.warm_starting)
+        
+        # Détection continue (None : collisions aux seules positions de fin de pas)
+        self.ccd = ContinuousCollisionDetector() if self.config.ccd else None
+        
+        # Pas fixe : temps accumulé pas encore simulé, et positions avant le
+        # dernier pas pour le rendu interpolé
+        self.accumulator = 0.0
+        self._previous_positions = None
+        
         # Callbacks
         self.update_callbacks = []
         self.render_callbacks = []
@@ -60,19 +105,33 @@ class PhysicsEngine:
             'frame_time': 0,
             'physics_time': 0,
             'render_time': 0,
-            'bodies_count': 0
+            'bodies_count': 0,
+            'pair_checks': 0,  # Paires testées par la narrowphase au dernier pas
+            'collisions': 0,
+            'steps': 0,  # Pas physiques de la dernière image (advance)
+            'ccd_hits': 0  # Cercles arrêtés à leur instant de contact au dernier pas
         }
     
     def add_body(self, body):
         """Ajoute un corps physique"""
         self.bodies.append(body)
         body.engine = self
+        self._bounds_index = None
+        if self.world is not None and self.world.accepts(body):
+            self.world.add(body)
+        else:
+            self.loose_bodies.append(body)
     
     def remove_body(self, body):
         """Supprime un corps physique"""
         if body in self.bodies:
             self.bodies.remove(body)
             body.engine = None
+            self._bounds_index = None
+            if self.world is not None and body in self.world:
+                self.world.remove(body)
+            else:
+                self.loose_bodies.remove(body)
     
     def add_constraint(self, constraint):
         """Ajoute une contrainte"""
@@ -91,6 +150,73 @@ class PhysicsEngine:
         """Ajoute un callback de collision"""
         self.collision_callbacks.append(callback)
     
+    @property
+    def step_dt(self) -> float:
+        """Durée d'un pas physique fixe"""
+        return self.dt / max(1, self.config.substeps)
+    
+    def advance(self, frame_time: float = None) -> int:
+        """
+        Avance la simulation d'une image : le temps écoulé (1 / fps par
+        défaut, multiplié par time_scale) s'accumule et est consommé par pas
+        fixes de step_dt. Le reste sert à interpoler le rendu.
+        
+        Returns:
+            Nombre de pas physiques effectués
+        """
+        if self.paused:
+            return 0
+        
+        if frame_time is None:
+            frame_time = self.dt
+        step_dt = self.step_dt
+        self.accumulator += frame_time * self.time_scale
+        
+        # Au plus 4 images de retard : au-delà, le temps est abandonné
+        steps = int(self.accumulator / step_dt + 1e-9)
+        max_steps = 4 * max(1, self.config.substeps)
+        if steps > max_steps:
+            steps = max_steps
+            self.accumulator = steps * step_dt
+        self.accumulator = max(self.accumulator - steps * step_dt, 0.0)
+        
+        physics_start = time.time()
+        interpolating = self.interpolating
+        if not interpolating:
+            self._previous_positions = None  # Pas de positions périmées au prochain ralenti
+        for _ in range(steps):
+            if interpolating:
+                self._previous_positions = self._body_positions()
+            self.step(step_dt)
+        self.performance_stats['physics_time'] = time.time() - physics_start
+        self.performance_stats['steps'] = steps
+        return steps
+    
+    @property
+    def interpolating(self) -> bool:
+        """
+        Rendu interpolé : demandé par la configuration, ou imposé hors de
+        time_scale = 1 - au ralenti, advance() ne fait un pas fixe qu'une
+        image sur deux ou plus, et le rendu saccaderait sans interpolation
+        """
+        return self.config.interpolate or self.time_scale != 1.0
+
+    @property
+    def interpolation_alpha(self) -> float:
+        """Part d'un pas déjà écoulée depuis le dernier pas physique"""
+        return min(self.accumulator / self.step_dt, 1.0)
+    
+    def interpolated_positions(self) -> np.ndarray:
+        """
+        Positions (n, 2) des corps à afficher : entre l'avant-dernier et le
+        dernier pas physique, selon interpolation_alpha
+        """
+        current = self._body_positions()
+        previous = self._previous_positions
+        if previous is None or previous.shape != current.shape:
+            return current
+        return previous + (current - previous) * self.interpolation_alpha
+    
     def step(self, dt: float = None):
         """Un pas de simulation"""
         if self.paused:
@@ -101,14 +227,22 @@ class PhysicsEngine:
         
         physics_start = time.time()
         
+        # Positions de début de pas pour la détection continue
+        start = self._body_positions() if self.ccd is not None else None
+        
         # 1. Appliquer les forces
         self._apply_forces(dt)
         
         # 2. Intégrer les positions
         self._integrate(dt)
         
-        # 3. Détecter les collisions
+        # 3. Détecter les collisions (cercles rapides ramenés à leur premier contact)
+        ccd_contacts = self._sweep_fast_bodies(start) if self.ccd is not None else []
         self._detect_collisions()
+        if ccd_contacts:
+            found = {(id(body_a), id(body_b)) for body_a, body_b, _ in self.collision_pairs}
+            self.collision_pairs.extend(contact for contact in ccd_contacts
+                                        if (id(contact[0]), id(contact[1])) not in found)
         
         # 4. Résoudre les collisions
         self._resolve_collisions(dt)
@@ -125,7 +259,10 @@ class PhysicsEngine:
     
     def _apply_forces(self, dt: float):
         """Applique les forces à tous les corps"""
-        for body in self.bodies:
+        if self.world is not None:
+            self.world.apply_forces(self.config.gravity)
+        
+        for body in self.loose_bodies:
             if not body.static:
                 # Gravité
                 body.acceleration = self.config.gravity.copy()
@@ -144,7 +281,10 @@ class PhysicsEngine:
     
     def _integrate(self, dt: float):
         """Intégration de Verlet pour plus de stabilité"""
-        for body in self.bodies:
+        if self.world is not None:
+            self.world.integrate(dt, self.config.max_velocity, self.config.friction)
+        
+        for body in self.loose_bodies:
             if not body.static:
                 # Sauvegarde position précédente
                 old_pos = body.position.copy()
@@ -166,25 +306,239 @@ class PhysicsEngine:
         """Détection de collisions optimisée"""
         self.collision_pairs.clear()
         
-        # Collision simple O(n²) - à optimiser avec spatial hashing si nécessaire
-        for i in range(len(self.bodies)):
-            for j in range(i + 1, len(self.bodies)):
-                body_a = self.bodies[i]
-                body_b = self.bodies[j]
-                
-                # Skip si les deux sont statiques
-                if body_a.static and body_b.static:
-                    continue
-                
-                # Détection de collision spécifique aux formes
+        if self.broadphase is None:
+            # Collision simple O(n²) (EngineConfig.broadphase = "none")
+            checks = 0
+            for i in range(len(self.bodies)):
+                for j in range(i + 1, len(self.bodies)):
+                    body_a = self.bodies[i]
+                    body_b = self.bodies[j]
+                    
+                    # Skip si les deux sont statiques
+                    if body_a.static and body_b.static:
+                        continue
+                    
+                    # Détection de collision spécifique aux formes
+                    checks += 1
+                    collision_info = self._check_collision(body_a, body_b)
+                    if collision_info:
+                        self.collision_pairs.append((body_a, body_b, collision_info))
+        else:
+            # Paires dont les boîtes se chevauchent, dans l'ordre de la double boucle
+            bounds, static = self._body_bounds()
+            first, second = self.broadphase.pairs(bounds, static)
+            checks = len(first)
+            bodies = self.bodies
+            
+            # Cercles et anneaux en lot, les autres formes par objet
+            contacts, rest = batch_contacts(first, second, *self._narrowphase_arrays())
+            found = []
+            for pair, i, j, normal, penetration, contact_point, side in zip(
+                    contacts.pair.tolist(), contacts.first.tolist(), contacts.second.tolist(),
+                    contacts.normal.tolist(), contacts.penetration.tolist(),
+                    contacts.contact_point.tolist(), contacts.ring_side.tolist()):
+                collision_info = {
+                    'normal': Vector2D(*normal),
+                    'penetration': penetration,
+                    'contact_point': Vector2D(*contact_point)
+                }
+                if side:
+                    collision_info['type'] = RING_SIDES[side]
+                found.append((pair, bodies[i], bodies[j], collision_info))
+            for pair in rest.tolist():
+                body_a, body_b = bodies[first[pair]], bodies[second[pair]]
                 collision_info = self._check_collision(body_a, body_b)
                 if collision_info:
-                    self.collision_pairs.append((body_a, body_b, collision_info))
+                    found.append((pair, body_a, body_b, collision_info))
+            if len(rest):
+                found.sort(key=lambda entry: entry[0])
+            self.collision_pairs.extend(entry[1:] for entry in found)
+        
+        self.performance_stats['pair_checks'] = checks
+        self.performance_stats['collisions'] = len(self.collision_pairs)
+    
+    def _body_index(self):
+        """
+        Indices des corps du monde en lots (par ligne) et hors monde, masque
+        des corps statiques, forme de chaque corps et anneaux de la scène ;
+        recalculés après un ajout ou un retrait
+        """
+        if self._bounds_index is None:
+            world_index = np.zeros(len(self.world) if self.world is not None else 0, dtype=np.int64)
+            loose_index = []
+            for index, body in enumerate(self.bodies):
+                if self.world is not None and body in self.world:
+                    world_index[body._row] = index
+                else:
+                    loose_index.append(index)
+            static = np.array([body.static for body in self.bodies], dtype=bool)
+            kind = np.array([body_kind(body) for body in self.bodies], dtype=np.int64)
+            ring_index = np.flatnonzero(kind == RING)
+            ring_row = np.full(len(self.bodies), -1, dtype=np.int64)
+            ring_row[ring_index] = np.arange(len(ring_index))
+            self._bounds_index = (world_index, loose_index, static, kind, ring_index, ring_row)
+        return self._bounds_index
+    
+    def _body_bounds(self):
+        """
+        Boîtes englobantes (n, 4) = (min_x, min_y, max_x, max_y) des corps,
+        dans l'ordre de self.bodies, et masque des corps statiques. Les
+        cercles du monde en lots sont calculés d'un bloc depuis ses tableaux.
+        """
+        world_index, loose_index, static = self._body_index()[:3]
+        
+        bounds = np.empty((len(self.bodies), 4))
+        if len(world_index):
+            position, radius = self.world.position, self.world.radius[:, None]
+            bounds[world_index, :2] = position - radius
+            bounds[world_index, 2:] = position + radius
+        for index in loose_index:
+            min_pos, max_pos = self.bodies[index].get_bounding_box()
+            bounds[index] = (min_pos.x, min_pos.y, max_pos.x, max_pos.y)
+        return bounds, static
+    
+    def _body_positions(self) -> np.ndarray:
+        """Positions (n, 2) des corps, dans l'ordre de self.bodies"""
+        world_index, loose_index = self._body_index()[:2]
+        position = np.empty((len(self.bodies), 2))
+        if len(world_index):
+            position[world_index] = self.world.position
+        for index in loose_index:
+            position[index] = self.bodies[index].position.tuple()
+        return position
+    
+    def _set_body_positions(self, position: np.ndarray):
+        """Écrit les positions (n, 2) des corps non statiques"""
+        world_index, loose_index, static = self._body_index()[:3]
+        if len(world_index):
+            self.world.position[:] = position[world_index]
+        for index in loose_index:
+            if not static[index]:
+                self.bodies[index].position = Vector2D(*position[index])
+    
+    def _narrowphase_arrays(self):
+        """
+        Formes (n,), positions (n, 2) et rayons (n,) des corps, anneaux de la
+        scène et ligne de chaque anneau : les entrées de batch_contacts
+        """
+        world_index, loose_index, _, kind, ring_index, ring_row = self._body_index()
+        
+        radius = np.zeros(len(self.bodies))
+        if len(world_index):
+            radius[world_index] = self.world.radius
+        for index in loose_index:
+            if kind[index] == CIRCLE:
+                radius[index] = self.bodies[index].radius
+        rings = RingArrays.from_bodies([self.bodies[index] for index in ring_index])
+        return kind, self._body_positions(), radius, rings, ring_row
+    
+    def _sweep_fast_bodies(self, start: np.ndarray):
+        """
+        Détection continue : chaque cercle dynamique qui s'est déplacé de plus
+        de ccd_threshold rayons pendant le pas est ramené à son premier
+        contact (autre cercle, ou bord d'anneau) sur le segment parcouru
+        
+        Args:
+            start: Positions (n, 2) des corps en début de pas
+        
+        Returns:
+            Contacts (corps A, corps B, collision_info) aux instants de contact
+        """
+        kind, end, radius, rings, _ = self._narrowphase_arrays()
+        bounds, static = self._body_bounds()
+        motion = end - start
+        travel = np.hypot(motion[:, 0], motion[:, 1])
+        circle = kind == CIRCLE
+        fast = circle & ~static & (travel > self.config.ccd_threshold * radius)
+        if not fast.any():
+            self.performance_stats['ccd_hits'] = 0
+            return []
+        
+        # Paires de cercles dont les boîtes balayées (début + fin de pas) se chevauchent
+        swept = bounds.copy()
+        swept[circle, :2] = np.minimum(bounds[circle, :2], start[circle] - radius[circle, None])
+        swept[circle, 2:] = np.maximum(bounds[circle, 2:], start[circle] + radius[circle, None])
+        # Sans broadphase configurée, un tri et balayage local plutôt que toutes
+        # les paires (n² / 2 indices en mémoire à chaque pas)
+        broadphase = self.broadphase if self.broadphase is not None else SweepAndPruneBroadphase()
+        first, second = broadphase.pairs(swept, static)
+        keep = circle[first] & circle[second] & (fast[first] | fast[second])
+        first, second = first[keep], second[keep]
+        pair_toi = self.ccd.circle_circle_toi(start[first], motion[first], start[second],
+                                              motion[second], radius[first] + radius[second])
+        
+        # Premier contact de chaque cercle rapide : cercle (partenaire >= 0) ou anneau
+        fast_index = np.flatnonzero(fast)
+        best_toi = np.full(len(self.bodies), np.inf)
+        best_partner = np.full(len(self.bodies), -1, dtype=np.int64)
+        owner = np.concatenate((first, second))
+        partner = np.concatenate((second, first))
+        toi = np.concatenate((pair_toi, pair_toi))
+        valid = fast[owner] & np.isfinite(toi)
+        owner, partner, toi = owner[valid], partner[valid], toi[valid]
+        order = np.lexsort((toi, owner))
+        owner, index = np.unique(owner[order], return_index=True)
+        best_toi[owner] = toi[order][index]
+        best_partner[owner] = partner[order][index]
+        
+        ring_bodies = np.flatnonzero(kind == RING)
+        ring_hit = np.full(len(self.bodies), -1, dtype=np.int64)
+        ring_side = np.zeros(len(self.bodies), dtype=np.int64)
+        if len(ring_bodies):
+            toi, side = self.ccd.circle_ring_toi(start[fast_index], motion[fast_index],
+                                                 radius[fast_index], rings)
+            nearest = np.argmin(toi, axis=1)
+            nearest_toi = toi[np.arange(len(fast_index)), nearest]
+            closer = nearest_toi < best_toi[fast_index]
+            hit = fast_index[closer]
+            best_toi[hit] = nearest_toi[closer]
+            ring_hit[hit] = nearest[closer]
+            ring_side[hit] = side[np.arange(len(fast_index)), nearest][closer]
+        
+        contacts = []
+        for i in np.flatnonzero(np.isfinite(best_toi)).tolist():
+            t = best_toi[i]
+            position = start[i] + motion[i] * t
+            if ring_hit[i] >= 0:
+                ring = ring_hit[i]
+                j = int(ring_bodies[ring])
+                direction = position - rings.center[ring]
+                direction /= np.hypot(*direction)
+                side = int(ring_side[i])
+                # Normale du cercle vers l'anneau (Ring.collision_with_circle)
+                normal = direction if side == 1 else -direction
+                edge = rings.inner[ring] if side == 1 else rings.outer[ring]
+                contact_point = rings.center[ring] + direction * edge
+                info_type = RING_SIDES[side]
+            else:
+                j = int(best_partner[i])
+                normal = start[j] + motion[j] * t - position
+                normal /= max(np.hypot(*normal), 1e-12)
+                contact_point = position + normal * radius[i]
+                info_type = None
+            
+            body = self.bodies[i]
+            body.position = Vector2D(*position)
+            
+            # Normale du premier corps (ordre de self.bodies) vers le second
+            first, second = (body, self.bodies[j]) if i < j else (self.bodies[j], body)
+            collision_info = {
+                'normal': Vector2D(*(normal if i < j else -normal)),
+                'penetration': 0.0,
+                'contact_point': Vector2D(*contact_point),
+                'ccd': True
+            }
+            if info_type:
+                collision_info['type'] = info_type
+            contacts.append((first, second, collision_info))
+        
+        self.performance_stats['ccd_hits'] = len(contacts)
+        return contacts
     
     def _check_collision(self, body_a, body_b):
         """Vérifie la collision entre deux corps"""
         # Cette méthode sera implémentée dans le module collision
-        # Pour l'instant, collision cercle-cercle simple
+        # Pour l'instant, collisions cercle-cercle et cercle-anneau (même calcul en lot : narrowphase.py)
         if hasattr(body_a, 'radius') and hasattr(body_b, 'radius'):
             distance = body_a.position.distance_to(body_b.position)
             if distance < body_a.radius + body_b.radius:
@@ -195,10 +549,41 @@ class PhysicsEngine:
                     'penetration': penetration,
                     'contact_point': body_a.position + normal * body_a.radius
                 }
+        
+        # Cercle-anneau (normale inversée quand l'anneau est le premier corps)
+        kinds = (body_kind(body_a), body_kind(body_b))
+        if kinds == (CIRCLE, RING) or kinds == (RING, CIRCLE):
+            circle, ring = (body_a, body_b) if kinds[0] == CIRCLE else (body_b, body_a)
+            collision_info = ring.collision_with_circle(circle.position, circle.radius)
+            if collision_info:
+                if ring is body_a:
+                    collision_info['normal'] = -collision_info['normal']
+                return collision_info
         return None
     
     def _resolve_collisions(self, dt: float):
-        """Résout les collisions détectées"""
+        """
+        Résout les collisions détectées
+        
+        Les callbacks de collision ne reçoivent pas les mêmes contacts selon
+        la résolution. En un passage, tout contact qui ne se sépare pas déjà
+        les déclenche, y compris au repos, à vitesse relative nulle. Avec le
+        solveur, seuls les contacts dont l'impulsion accumulée est > 0 les
+        déclenchent (collision_info['impulse']). Un contact au repos dans la
+        tolérance de pénétration, ou déjà séparé par les autres contacts
+        d'une pile, ne déclenche plus rien, et donc plus de son.
+        """
+        if self.solver is not None:
+            impulses = self.solver.solve([(body_a, body_b, info['normal'], info['penetration'])
+                                          for body_a, body_b, info in self.collision_pairs], dt)
+            # Callbacks des contacts qui ont reçu une impulsion
+            for (body_a, body_b, collision_info), impulse in zip(self.collision_pairs, impulses):
+                if impulse > 0:
+                    collision_info['impulse'] = impulse
+                    for callback in self.collision_callbacks:
+                        callback(body_a, body_b, collision_info)
+            return
+        
         for body_a, body_b, collision_info in self.collision_pairs:
             # Séparer les objets
             normal = collision_info['normal']
@@ -254,9 +639,15 @@ class PhysicsEngine:
         # Nettoyer l'écran
         self.screen.fill(self.config.background_color)
         
-        # Rendu des corps
+        # Rendu des corps, aux positions interpolées entre les deux derniers pas
+        interpolated = self.interpolating and self._previous_positions is not None
+        if interpolated:
+            positions = self._body_positions()
+            self._set_body_positions(self.interpolated_positions())
         for body in self.bodies:
             body.render(self.screen)
+        if interpolated:
+            self._set_body_positions(positions)
         
         # Callbacks de rendu personnalisés
         for callback in self.render_callbacks:
@@ -308,8 +699,8 @@ class PhysicsEngine:
                     elif event.key == pygame.K_ESCAPE:
                         self.running = False
             
-            # Simulation
-            self.step()
+            # Simulation : pas fixes accumulés
+            self.advance()
             
             # Rendu
             self.render()
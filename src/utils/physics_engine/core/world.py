@@ -0,0 +1,229 @@
+# physics_engine/core/world.py
+"""
+Monde en lots : état des cercles dynamiques dans des tableaux NumPy
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from .vector import Vector2D
+
+
+class RowVector(Vector2D):
+    """
+    Vector2D dont x/y sont lus et écrits dans une ligne d'un tableau du monde.
+    La vue suit la ligne, pas le corps : après un BatchWorld.remove, la ligne
+    du corps retiré est reprise par le dernier corps du monde.
+    """
+
+    __slots__ = ['_world', '_field', '_row']
+
+    def __init__(self, world: 'BatchWorld', field: str, row: int):
+        self._world = world
+        self._field = field
+        self._row = row
+
+    @property
+    def x(self) -> float:
+        return float(self._world.arrays[self._field][self._row, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self._world.arrays[self._field][self._row, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._world.arrays[self._field][self._row, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self._world.arrays[self._field][self._row, 1] = value
+
+
+class RowField:
+    """
+    Attribut scalaire d'un corps, stocké dans le tableau `field` du monde
+    tant que le corps y est (dans son __dict__ sinon)
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, body, owner=None):
+        if body is None:
+            return self
+        if body._world is None:
+            return body.__dict__[self.name]
+        return float(body._world.arrays[self.field][body._row])
+
+    def __set__(self, body, value):
+        if body._world is None:
+            body.__dict__[self.name] = value
+        else:
+            body._world.arrays[self.field][body._row] = value
+
+
+class BatchWorld:
+    """
+    Cercles dynamiques (non statiques) d'une simulation, un tableau contigu
+    par grandeur : position, vitesse, accélération et forces (n, 2), masse,
+    rayon, restitution et traînée (n,). Les forces et l'intégration d'un pas
+    portent sur les tableaux entiers ; chaque PhysicsBody ajouté devient une
+    vue sur sa ligne (position, velocity... lisent et écrivent le tableau).
+    """
+
+    VECTOR_FIELDS = ("position", "velocity", "acceleration", "force")
+    SCALAR_FIELDS = ("mass", "radius", "restitution", "drag_coefficient")
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.bodies: List = []
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name in self.VECTOR_FIELDS:
+            self.arrays[name] = np.zeros((capacity, 2))
+        for name in self.SCALAR_FIELDS:
+            self.arrays[name] = np.zeros(capacity)
+        self._scratch = np.zeros((capacity, 2))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, body) -> bool:
+        return body._world is self
+
+    # Vues sur les lignes occupées
+    position = property(lambda self: self.arrays["position"][:self.count])
+    velocity = property(lambda self: self.arrays["velocity"][:self.count])
+    acceleration = property(lambda self: self.arrays["acceleration"][:self.count])
+    force = property(lambda self: self.arrays["force"][:self.count])
+    mass = property(lambda self: self.arrays["mass"][:self.count])
+    radius = property(lambda self: self.arrays["radius"][:self.count])
+    restitution = property(lambda self: self.arrays["restitution"][:self.count])
+    drag_coefficient = property(lambda self: self.arrays["drag_coefficient"][:self.count])
+
+    @staticmethod
+    def accepts(body) -> bool:
+        """Seuls les cercles dynamiques vont dans le monde"""
+        return hasattr(body, 'radius') and not body.static
+
+    def _reserve(self, extra: int):
+        needed = self.count + extra
+        capacity = len(self._scratch)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name, array in self.arrays.items():
+            grown = np.zeros((capacity,) + array.shape[1:])
+            grown[:self.count] = array[:self.count]
+            self.arrays[name] = grown
+        self._scratch = np.zeros((capacity, 2))
+
+    def add(self, body):
+        """Ajoute un cercle dynamique : son état passe dans une nouvelle ligne"""
+        if body._world is not None:
+            return
+        self._reserve(1)
+        row = self.count
+        a = self.arrays
+        a["position"][row] = body.position.tuple()
+        a["velocity"][row] = body.velocity.tuple()
+        a["acceleration"][row] = body.acceleration.tuple()
+        a["force"][row] = (sum(f.x for f in body.forces), sum(f.y for f in body.forces))
+        for name in self.SCALAR_FIELDS:
+            a[name][row] = getattr(body, name)
+        body.forces.clear()
+
+        self.bodies.append(body)
+        self.count += 1
+        body._world = self
+        self._bind(body, row)
+
+    def remove(self, body):
+        """
+        Retire un corps : son état redevient des attributs, la dernière ligne
+        prend sa place. Le corps déplacé reçoit de nouvelles vues ; les vues
+        obtenues avant (body.position, body.velocity) de l'un ou l'autre
+        pointent sur l'ancienne ligne.
+        """
+        if body._world is not self:
+            return
+        row = body._row
+        values = {name: self.arrays[name][row].copy() for name in self.VECTOR_FIELDS}
+        scalars = {name: float(self.arrays[name][row]) for name in self.SCALAR_FIELDS}
+        body._world = None
+        body._row = -1
+        body._position = Vector2D(*values["position"])
+        body._velocity = Vector2D(*values["velocity"])
+        body._acceleration = Vector2D(*values["acceleration"])
+        if values["force"].any():
+            body.forces.append(Vector2D(*values["force"]))
+        for name, value in scalars.items():
+            setattr(body, name, value)
+
+        last = self.count - 1
+        moved = self.bodies.pop()
+        if moved is not body:
+            for array in self.arrays.values():
+                array[row] = array[last]
+            self.bodies[row] = moved
+            self._bind(moved, row)
+        self.count = last
+
+    def _bind(self, body, row: int):
+        body._row = row
+        body._position = RowVector(self, "position", row)
+        body._velocity = RowVector(self, "velocity", row)
+        body._acceleration = RowVector(self, "acceleration", row)
+
+    def add_force(self, row: int, force: Vector2D):
+        self.arrays["force"][row, 0] += force.x
+        self.arrays["force"][row, 1] += force.y
+
+    def apply_forces(self, gravity: Vector2D):
+        """
+        Accélération de chaque corps : gravité, résistance de l'air
+        (-v * |v| * 0.5 * traînée / masse) et forces accumulées, remises à zéro
+        """
+        n = self.count
+        if n == 0:
+            return
+        velocity, acceleration, force = self.velocity, self.acceleration, self.force
+        speed = np.hypot(velocity[:, 0], velocity[:, 1])
+        # Résistance de l'air, puis forces personnalisées, divisées par la masse
+        air = speed * self.drag_coefficient
+        air *= -0.5
+        np.multiply(velocity, air[:, None], out=acceleration)
+        acceleration += force
+        acceleration /= self.mass[:, None]
+        acceleration += gravity.tuple()
+        force.fill(0.0)
+
+    def integrate(self, dt: float, max_velocity: float, friction: float):
+        """
+        position += v * dt + a * dt² / 2, puis v += a * dt, limitée à
+        max_velocity, et frottement v *= 1 - friction * dt
+        """
+        n = self.count
+        if n == 0:
+            return
+        position, velocity, acceleration = self.position, self.velocity, self.acceleration
+        step = self._scratch[:n]
+        np.multiply(velocity, dt, out=step)
+        position += step
+        np.multiply(acceleration, 0.5 * dt * dt, out=step)
+        position += step
+
+        np.multiply(acceleration, dt, out=step)
+        velocity += step
+
+        # Limitation de vitesse
+        speed = np.hypot(velocity[:, 0], velocity[:, 1])
+        fast = speed > max_velocity
+        if fast.any():
+            velocity[fast] *= (max_velocity / speed[fast])[:, None]
+
+        # Frottement
+        velocity *= 1.0 - friction * dt
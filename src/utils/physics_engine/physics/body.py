@@ -8,10 +8,24 @@ from typing import List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 
 from ..core.vector import Vector2D
+from ..core.world import RowField
 from ..core.utils import rainbow_color, hsv_to_rgb
 
 class PhysicsBody(ABC):
-    """Classe de base pour tous les corps physiques"""
+    """
+    Classe de base pour tous les corps physiques
+    
+    Dans un BatchWorld, l'état (position, vitesse, accélération, masse...)
+    est une vue sur la ligne du corps dans les tableaux du monde.
+    """
+    
+    # Monde en lots contenant le corps, et sa ligne (None / -1 hors monde)
+    _world = None
+    _row = -1
+    
+    mass = RowField("mass")
+    restitution = RowField("restitution")
+    drag_coefficient = RowField("drag_coefficient")
     
     def __init__(self, position: Vector2D, mass: float = 1.0, static: bool = False):
         # Propriétés physiques
@@ -48,9 +62,53 @@ class PhysicsBody(ABC):
         # Callbacks personnalisés
         self.on_collision = None
     
+    @property
+    def position(self) -> Vector2D:
+        """
+        Position du corps. Dans un BatchWorld, c'est une vue vivante sur une
+        ligne du tableau (RowVector), pas une copie : la garder au-delà d'un
+        BatchWorld.remove est à éviter, la ligne est alors reprise par un
+        autre corps et la vue lit et écrit la position de celui-ci. Utiliser
+        position.copy() pour conserver une valeur.
+        """
+        return self._position
+    
+    @position.setter
+    def position(self, value: Vector2D):
+        if self._world is None:
+            self._position = value
+        else:
+            self._world.arrays["position"][self._row] = (value.x, value.y)
+    
+    @property
+    def velocity(self) -> Vector2D:
+        """Vitesse du corps - vue vivante dans un BatchWorld, comme position"""
+        return self._velocity
+    
+    @velocity.setter
+    def velocity(self, value: Vector2D):
+        if self._world is None:
+            self._velocity = value
+        else:
+            self._world.arrays["velocity"][self._row] = (value.x, value.y)
+    
+    @property
+    def acceleration(self) -> Vector2D:
+        return self._acceleration
+    
+    @acceleration.setter
+    def acceleration(self, value: Vector2D):
+        if self._world is None:
+            self._acceleration = value
+        else:
+            self._world.arrays["acceleration"][self._row] = (value.x, value.y)
+    
     def add_force(self, force: Vector2D):
         """Ajoute une force au corps"""
-        self.forces.append(force)
+        if self._world is None:
+            self.forces.append(force)
+        else:
+            self._world.add_force(self._row, force)
     
     def add_impulse(self, impulse: Vector2D):
         """Ajoute une impulsion au corps"""
@@ -123,6 +181,8 @@ class PhysicsBody(ABC):
 class Circle(PhysicsBody):
     """Corps physique circulaire"""
     
+    radius = RowField("radius")
+    
     def __init__(self, position: Vector2D, radius: float, mass: float = 1.0, static: bool = False):
         super().__init__(position, mass, static)
         self.radius = radius
@@ -425,6 +485,12 @@ class Ring(PhysicsBody):
         else:  # Le gap traverse 0°
             return angle >= gap_start_rotated or angle <= gap_end
     
+    def get_bounding_box(self) -> Tuple[Vector2D, Vector2D]:
+        """Bounding box de l'anneau"""
+        min_pos = Vector2D(self.position.x - self.outer_radius, self.position.y - self.outer_radius)
+        max_pos = Vector2D(self.position.x + self.outer_radius, self.position.y + self.outer_radius)
+        return (min_pos, max_pos)
+    
     def collision_with_circle(self, circle_pos: Vector2D, circle_radius: float) -> dict:
         """Détection de collision avec un cercle"""
         distance = self.position.distance_to(circle_pos)
@@ -443,20 +509,24 @@ class Ring(PhysicsBody):
         # Collision détectée
         collision_info = {}
         
-        if distance < self.inner_radius + circle_radius:
+        # Côté du mur selon sa ligne médiane : un cercle juste à l'extérieur d'un
+        # anneau plus fin que son diamètre touche le bord extérieur
+        inner_side = distance < (self.inner_radius + self.outer_radius) / 2
+        
+        if inner_side and distance < self.inner_radius + circle_radius:
             # Collision avec le bord intérieur
             normal = (circle_pos - self.position).normalized
-            penetration = self.inner_radius + circle_radius - distance
+            penetration = distance + circle_radius - self.inner_radius
             collision_info = {
                 'type': 'inner',
                 'normal': normal,
                 'penetration': penetration,
                 'contact_point': self.position + normal * self.inner_radius
             }
-        elif distance + circle_radius > self.outer_radius:
+        elif not inner_side and distance + circle_radius > self.outer_radius:
             # Collision avec le bord extérieur
             normal = (self.position - circle_pos).normalized
-            penetration = circle_radius + distance - self.outer_radius
+            penetration = self.outer_radius + circle_radius - distance
             collision_info = {
                 'type': 'outer',
                 'normal': normal,
@@ -1,15 +1,27 @@
 # src/utils/video/__init__.py
 """Video utilities for TikSimPro"""
 
-from .particles import SimpleParticle, ParticleSpawner
+from .particles import ParticlePool, ParticleSpawner
 from .background_manager import BackgroundManager, BackgroundMode
 from .engagement_texts import EngagementTextManager, VideoType
+from .frame_ring import FrameBufferPool, FrameSpillRing
+from .simulation_log import SimulationLog
+from .text_cache import TextCache, get_text_cache
+from .encoder_profile import EncoderProfile, EncoderProfiler, get_encoder_profile
 
 __all__ = [
-    'SimpleParticle',
+    'ParticlePool',
     'ParticleSpawner',
     'BackgroundManager',
     'BackgroundMode',
     'EngagementTextManager',
-    'VideoType'
+    'VideoType',
+    'FrameBufferPool',
+    'FrameSpillRing',
+    'SimulationLog',
+    'TextCache',
+    'get_text_cache',
+    'EncoderProfile',
+    'EncoderProfiler',
+    'get_encoder_profile'
 ]
@@ -6,10 +6,13 @@ Background manager with multiple modes for satisfying visuals.
 import pygame
 import colorsys
 import math
+from collections import OrderedDict
 from enum import Enum
 from typing import Dict, Any, Tuple, Optional, List
 import random
 
+import numpy as np
+
 
 class BackgroundMode(Enum):
     """Available background modes"""
@@ -63,8 +66,15 @@ class BackgroundManager:
         self.saturation = 0.3  # Low saturation for pleasant look
         self.value = 0.15  # Low value for dark but colorful background
 
-        # Pre-rendered gradient surface (for static gradient)
-        self._gradient_surface: Optional[pygame.Surface] = None
+        self.hue_quantum = 0.0  # Degrees; the hue is rounded to this step (0 = exact hue)
+        self.band_height = 4    # Rows sharing one colour in the animated gradient
+
+        # Pre-built gradient columns (1xH, packed pixels), least recently used first.
+        # At least one column per hue step of a full animation cycle is kept
+        self.cache_size = 64
+        self._column_cache: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def configure(self, config: Dict[str, Any]) -> None:
         """
@@ -78,6 +88,9 @@ class BackgroundManager:
         - animation_speed: float for ANIMATED_GRADIENT
         - saturation: float (0-1) for ANIMATED_GRADIENT
         - value: float (0-1) for ANIMATED_GRADIENT
+        - hue_quantum: float (degrees) for ANIMATED_GRADIENT, 0 (default) to disable.
+          Rounding the hue makes the colours move in visible steps
+        - cache_size: int, minimum number of gradient columns kept
         """
         # Set mode
         mode = config.get("mode", self.mode)
@@ -104,27 +117,83 @@ class BackgroundManager:
                 # Random preset
                 preset = random.choice(self.GRADIENT_PRESETS)
                 self.gradient_top, self.gradient_bottom = preset
-            # Pre-render gradient
-            self._prerender_gradient()
 
         elif self.mode == BackgroundMode.ANIMATED_GRADIENT:
             self.animation_speed = config.get("animation_speed", 30)
             self.saturation = config.get("saturation", 0.3)
             self.value = config.get("value", 0.15)
             self.current_hue = config.get("start_hue", random.uniform(0, 360))
+            self.hue_quantum = config.get("hue_quantum", self.hue_quantum)
 
-    def _prerender_gradient(self) -> None:
-        """Pre-render static gradient for performance"""
-        self._gradient_surface = pygame.Surface((self.width, self.height))
+        self.cache_size = config.get("cache_size", self.cache_size)
+        self._column_cache.clear()
 
-        for y in range(self.height):
-            # Linear interpolation
-            t = y / self.height
-            r = int(self.gradient_top[0] * (1 - t) + self.gradient_bottom[0] * t)
-            g = int(self.gradient_top[1] * (1 - t) + self.gradient_bottom[1] * t)
-            b = int(self.gradient_top[2] * (1 - t) + self.gradient_bottom[2] * t)
+    def resize(self, width: int, height: int) -> None:
+        """Change the render size"""
+        if (width, height) == (self.width, self.height):
+            return
+        self.width = width
+        self.height = height
+        self._column_cache.clear()
+
+    def _cache_capacity(self) -> int:
+        """Columns kept: cache_size, raised to the hue steps of one animation cycle"""
+        if self.mode != BackgroundMode.ANIMATED_GRADIENT:
+            return max(1, self.cache_size)
+        # Without rounding: a cycle has ~100 integer colour pairs at the default saturation/value
+        steps = math.ceil(360 / self.hue_quantum) if self.hue_quantum > 0 else 360
+        return max(1, self.cache_size, steps)
+
+    def _gradient_column(self, surface: pygame.Surface, top: Tuple[int, int, int],
+                         bottom: Tuple[int, int, int], band_height: int = 1) -> np.ndarray:
+        """
+        1xH vertical gradient packed in the surface's pixel format (cached).
 
-            pygame.draw.line(self._gradient_surface, (r, g, b), (0, y), (self.width, y))
+        Args:
+            band_height: Rows sharing the colour of the band's first row
+        """
+        key = (top, bottom, band_height, surface.get_shifts(), surface.get_losses(), surface.get_masks()[3])
+        column = self._column_cache.get(key)
+        if column is not None:
+            self._column_cache.move_to_end(key)
+            self.cache_hits += 1
+            return column
+
+        self.cache_misses += 1
+        rows = (np.arange(self.height) // band_height) * band_height
+        t = (rows / self.height)[:, None]
+        rgb = (np.array(top, dtype=np.float64) * (1 - t)
+               + np.array(bottom, dtype=np.float64) * t).astype(np.uint32)
+
+        shifts, losses = surface.get_shifts(), surface.get_losses()
+        column = np.full(self.height, surface.get_masks()[3], dtype=np.uint32)
+        for channel in range(3):
+            column |= (rgb[:, channel] >> losses[channel]) << shifts[channel]
+
+        self._column_cache[key] = column
+        while len(self._column_cache) > self._cache_capacity():
+            self._column_cache.popitem(last=False)
+        return column
+
+    def _fill_gradient(self, surface: pygame.Surface, top: Tuple[int, int, int],
+                       bottom: Tuple[int, int, int], band_height: int = 1) -> None:
+        """Stretch a gradient column over the surface in a single write"""
+        if surface.get_bytesize() not in (2, 4):
+            # No integer view for 24-bit / palette surfaces: go through a column surface
+            column_surface = pygame.Surface((1, self.height), 0, 32)
+            pygame.surfarray.pixels2d(column_surface)[0] = self._gradient_column(column_surface, top, bottom, band_height)
+            surface.blit(pygame.transform.scale(column_surface, (self.width, self.height)), (0, 0))
+            return
+
+        column = self._gradient_column(surface, top, bottom, band_height)
+        width = min(self.width, surface.get_width())
+        height = min(self.height, surface.get_height())
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            pixels.T[:height, :width] = column[:height, None]
+        finally:
+            # Dropping the array reference unlocks the surface
+            del pixels
 
     def render(self, surface: pygame.Surface, time_elapsed: float = 0.0) -> None:
         """
@@ -151,6 +220,8 @@ class BackgroundManager:
         """
         # Update hue based on time
         current_hue = (self.current_hue + self.animation_speed * time_elapsed) % 360
+        if self.hue_quantum > 0:
+            current_hue = (round(current_hue / self.hue_quantum) * self.hue_quantum) % 360
 
         # Create complementary hue for gradient bottom
         bottom_hue = (current_hue + 30) % 360  # Slight hue shift
@@ -162,15 +233,8 @@ class BackgroundManager:
         top_color = (int(r1 * 255), int(g1 * 255), int(b1 * 255))
         bottom_color = (int(r2 * 255), int(g2 * 255), int(b2 * 255))
 
-        # Render gradient (optimized: fewer lines for better performance)
-        step = 4  # Render every 4 pixels
-        for y in range(0, self.height, step):
-            t = y / self.height
-            r = int(top_color[0] * (1 - t) + bottom_color[0] * t)
-            g = int(top_color[1] * (1 - t) + bottom_color[1] * t)
-            b = int(top_color[2] * (1 - t) + bottom_color[2] * t)
-
-            pygame.draw.rect(surface, (r, g, b), (0, y, self.width, step))
+        # Rows are drawn in bands; neighbouring hues reuse the same cached column
+        self._fill_gradient(surface, top_color, bottom_color, self.band_height)
 
     def _render_solid_pastel(self, surface: pygame.Surface) -> None:
         """Render single pleasant pastel color"""
@@ -186,16 +250,8 @@ class BackgroundManager:
             surface.fill((20, 20, 25))
 
     def _render_static_gradient(self, surface: pygame.Surface) -> None:
-        """Render pre-rendered static gradient"""
-        if self._gradient_surface:
-            surface.blit(self._gradient_surface, (0, 0))
-        else:
-            # Fallback: render on the fly
-            self._prerender_gradient()
-            if self._gradient_surface:
-                surface.blit(self._gradient_surface, (0, 0))
-            else:
-                surface.fill((0, 0, 0))
+        """Render static gradient from its cached column"""
+        self._fill_gradient(surface, self.gradient_top, self.gradient_bottom)
 
     @classmethod
     def random_mode(cls) -> BackgroundMode:
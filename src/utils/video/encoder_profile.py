@@ -0,0 +1,363 @@
+# src/utils/video/encoder_profile.py
+"""
+Per-host encoder profile.
+
+The encoders FFmpeg offers are probed once per host (and FFmpeg build),
+candidate x264/x265 presets and tunes are benchmarked on a short synthetic
+clip, and the fastest configuration meeting the quality target is stored
+on disk. Later runs - and every generator/combiner of a run - reuse it
+without spawning FFmpeg.
+
+The benchmark (about 20 short encodes) is opt-in: it runs from
+scripts/benchmark_encoders.py, or on a cache miss when
+$TIKSIMPRO_ENCODER_BENCHMARK is set. Otherwise a host without a stored
+profile uses the default libx264 settings.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import socket
+import logging
+import tempfile
+import threading
+import subprocess
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from src.utils.atomic_write import atomic_write
+
+logger = logging.getLogger("TikSimPro")
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.tiksimpro/encoder_profiles.json")
+
+# Bump when the candidate list or the measurement changes, so cached profiles are re-benchmarked
+PROFILE_VERSION = 1
+
+X264_PRESETS = ("ultrafast", "superfast", "veryfast", "faster")
+X265_PRESETS = ("ultrafast", "superfast", "veryfast")
+TUNES = (None, "zerolatency", "animation")
+CRF = {"libx264": "18", "libx265": "20"}
+
+# Previous hard-coded settings, kept as a candidate and as the fallback without FFmpeg
+LEGACY_X264_ARGS = [
+    '-crf', '18',
+    '-tune', 'zerolatency',
+    '-x264-params', 'ref=1:me=dia:subme=1:analyse=none:trellis=0:no-cabac:aq-mode=0:scenecut=0',
+]
+
+# Hardware encoders, only tried when GPU encoding is requested and FFmpeg lists them
+GPU_CANDIDATES = {
+    'h264_nvenc': ('llhq', ['-b:v', '2000k', '-maxrate', '3000k', '-bufsize', '4000k',
+                            '-rc', 'cbr', '-rc-lookahead', '0', '-2pass', '0']),
+    'h264_amf': ('speed', ['-b:v', '3000k', '-maxrate', '4000k', '-rc', 'cbr',
+                           '-quality', 'speed', '-usage', 'ultralowlatency']),
+    'h264_qsv': ('veryfast', ['-b:v', '3000k', '-maxrate', '4000k', '-look_ahead', '0', '-low_power', '1']),
+}
+
+
+@dataclass
+class EncoderProfile:
+    """Video encoder settings for FFmpeg, with the benchmark figures that selected them"""
+    encoder: str
+    preset: str
+    args: List[str] = field(default_factory=list)
+    encode_fps: float = 0.0   # Frames/s on the benchmark clip (0 = not measured)
+    ssim: float = 0.0         # SSIM against the benchmark source (0 = not measured)
+
+    def output_args(self) -> List[str]:
+        """-c:v / -preset / encoder options for an FFmpeg command"""
+        return ['-c:v', self.encoder, '-preset', self.preset] + list(self.args)
+
+    def describe(self) -> str:
+        tune = self.args[self.args.index('-tune') + 1] if '-tune' in self.args else "-"
+        return f"{self.encoder} {self.preset} (tune {tune})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EncoderProfile":
+        return cls(data["encoder"], data["preset"], list(data.get("args", [])),
+                   float(data.get("encode_fps", 0.0)), float(data.get("ssim", 0.0)))
+
+
+def legacy_profile() -> EncoderProfile:
+    """Settings used before profiling existed (no measurements)"""
+    return EncoderProfile('libx264', 'superfast', list(LEGACY_X264_ARGS))
+
+
+def find_ffmpeg() -> Optional[str]:
+    """FFmpeg executable on the PATH"""
+    return shutil.which('ffmpeg') or shutil.which('ffmpeg.exe')
+
+
+def parse_encoders(output: str) -> Set[str]:
+    """Video encoder names from `ffmpeg -encoders` output"""
+    encoders = set()
+    for line in output.splitlines():
+        # " V....D libx264   libx264 H.264 ..." - capability flags, then the name
+        match = re.match(r"\s*V[.A-Z]{5}\s+(\S+)", line)
+        if match and match.group(1) != "=":
+            encoders.add(match.group(1))
+    return encoders
+
+
+def parse_ssim(output: str) -> Optional[float]:
+    """Overall SSIM from the ssim filter's summary line"""
+    match = re.search(r"SSIM .*All:([0-9.]+)", output)
+    return float(match.group(1)) if match else None
+
+
+def build_candidates(encoders: Set[str], codecs: Tuple[str, ...] = ("libx264", "libx265"),
+                     use_gpu: bool = False) -> List[EncoderProfile]:
+    """Configurations worth benchmarking among the available encoders"""
+    candidates = []
+    if use_gpu:
+        for encoder, (preset, args) in GPU_CANDIDATES.items():
+            if encoder in encoders:
+                candidates.append(EncoderProfile(encoder, preset, list(args)))
+
+    for codec in codecs:
+        if codec not in encoders:
+            continue
+        presets = X264_PRESETS if codec == "libx264" else X265_PRESETS
+        for preset in presets:
+            for tune in TUNES:
+                args = ['-crf', CRF[codec]]
+                if tune:
+                    args += ['-tune', tune]
+                if codec == "libx265":
+                    # hvc1 tag so players that only accept it (Apple) open the MP4
+                    args += ['-x265-params', 'log-level=error', '-tag:v', 'hvc1']
+                candidates.append(EncoderProfile(codec, preset, args))
+        if codec == "libx264":
+            candidates.append(legacy_profile())
+    return candidates
+
+
+class EncoderProfiler:
+    """
+    Probes FFmpeg and benchmarks encoder configurations, caching results
+    per host in a JSON file.
+    """
+
+    def __init__(self, ffmpeg_path: Optional[str] = None, cache_path: Optional[str] = None,
+                 min_ssim: float = 0.98, clip_size: Tuple[int, int] = (540, 960),
+                 clip_fps: int = 30, clip_seconds: float = 2.0,
+                 codecs: Tuple[str, ...] = ("libx264", "libx265")):
+        """
+        Args:
+            ffmpeg_path: FFmpeg executable (searched on the PATH by default)
+            cache_path: JSON cache file (~/.tiksimpro/encoder_profiles.json by default)
+            min_ssim: Quality target - minimum SSIM against the benchmark source
+            clip_size: Benchmark clip resolution (portrait, like the videos)
+            clip_fps: Benchmark clip frame rate (also the GOP size, as when recording)
+            clip_seconds: Benchmark clip duration
+            codecs: Software codecs to consider
+        """
+        self.ffmpeg_path = ffmpeg_path or find_ffmpeg()
+        self.cache_path = cache_path or os.environ.get("TIKSIMPRO_ENCODER_CACHE", DEFAULT_CACHE_PATH)
+        self.min_ssim = min_ssim
+        self.clip_size = clip_size
+        self.clip_fps = clip_fps
+        self.clip_seconds = clip_seconds
+        self.codecs = tuple(codecs)
+        self._version: Optional[str] = None
+
+    # Cache
+    def _host_key(self) -> str:
+        """
+        Host + FFmpeg build - encoder availability and speed are specific to both.
+        The build is identified by its binary (path, size, mtime) so reading the
+        cache never has to run FFmpeg.
+        """
+        path = os.path.realpath(shutil.which(self.ffmpeg_path) or self.ffmpeg_path)
+        try:
+            stat = os.stat(path)
+            build = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            build = path
+        return f"{socket.gethostname()}|{build}"
+
+    def _profile_key(self, use_gpu: bool) -> str:
+        width, height = self.clip_size
+        return (f"v{PROFILE_VERSION}|{width}x{height}@{self.clip_fps}|ssim>={self.min_ssim}"
+                f"|{','.join(self.codecs)}|gpu={int(use_gpu)}")
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _update_cache(self, section: str, value: Any) -> None:
+        """Store one entry for this host"""
+        cache = self._load_cache()
+        cache.setdefault(self._host_key(), {})[section] = value
+        try:
+            atomic_write(self.cache_path, lambda f: json.dump(cache, f, indent=2), mode="w")
+        except OSError as e:
+            logger.warning(f"Could not write encoder cache {self.cache_path}: {e}")
+
+    # Probing
+    def ffmpeg_version(self) -> str:
+        """First line of `ffmpeg -version` ("" without FFmpeg)"""
+        if self._version is None:
+            self._version = ""
+            if self.ffmpeg_path:
+                try:
+                    result = subprocess.run([self.ffmpeg_path, '-version'], capture_output=True,
+                                            text=True, timeout=5)
+                    self._version = result.stdout.split("\n", 1)[0].strip()
+                except (OSError, subprocess.SubprocessError) as e:
+                    logger.warning(f"FFmpeg version probe failed: {e}")
+        return self._version
+
+    def available_encoders(self, refresh: bool = False) -> Set[str]:
+        """Video encoders of this FFmpeg build (probed once per host, then cached)"""
+        if not self.ffmpeg_path:
+            return set()
+        if not refresh:
+            cached = self._load_cache().get(self._host_key(), {}).get("encoders")
+            if cached is not None:
+                return set(cached)
+        try:
+            result = subprocess.run([self.ffmpeg_path, '-hide_banner', '-encoders'],
+                                    capture_output=True, text=True, timeout=5)
+            encoders = parse_encoders(result.stdout)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Encoder detection failed: {e}")
+            return set()
+        self._update_cache("encoders", sorted(encoders))
+        return encoders
+
+    # Benchmark
+    def _make_clip(self, directory: str) -> str:
+        """Synthetic source clip stored raw, so generating it is not part of the timings"""
+        width, height = self.clip_size
+        path = os.path.join(directory, "source.nut")
+        source = f"testsrc2=size={width}x{height}:rate={self.clip_fps}:duration={self.clip_seconds}"
+        subprocess.run([self.ffmpeg_path, '-y', '-v', 'error', '-f', 'lavfi', '-i', source,
+                        '-pix_fmt', 'rgb24', '-c:v', 'rawvideo', path], check=True, capture_output=True)
+        return path
+
+    def measure(self, candidate: EncoderProfile, clip_path: str, directory: str) -> Optional[EncoderProfile]:
+        """
+        Encode the clip with a candidate the way recordings are encoded
+        (yuv420p, no B-frames, 1s GOP) and measure speed and SSIM.
+
+        Returns:
+            The candidate with encode_fps/ssim filled in, or None if it failed
+        """
+        output = os.path.join(directory, "encoded.mp4")
+        frames = int(self.clip_fps * self.clip_seconds)
+        cmd = ([self.ffmpeg_path, '-y', '-v', 'error', '-i', clip_path] + candidate.output_args() +
+               ['-pix_fmt', 'yuv420p', '-bf', '0', '-g', str(self.clip_fps), output])
+        start = time.perf_counter()
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0 or not os.path.exists(output):
+            logger.debug(f"Encoder candidate {candidate.describe()} failed: {result.stderr[-300:]}")
+            return None
+
+        result = subprocess.run([self.ffmpeg_path, '-i', output, '-i', clip_path,
+                                 '-lavfi', '[0:v][1:v]ssim', '-f', 'null', '-'],
+                                capture_output=True, text=True)
+        ssim = parse_ssim(result.stderr)
+        os.remove(output)
+        if ssim is None:
+            return None
+        return EncoderProfile(candidate.encoder, candidate.preset, list(candidate.args),
+                              frames / elapsed if elapsed > 0 else 0.0, ssim)
+
+    def benchmark(self, use_gpu: bool = False) -> List[EncoderProfile]:
+        """Measure every candidate configuration (failed ones are left out)"""
+        candidates = build_candidates(self.available_encoders(), self.codecs, use_gpu)
+        if not candidates:
+            return []
+        logger.info(f"Benchmarking {len(candidates)} encoder configurations (once per host)...")
+        directory = tempfile.mkdtemp(prefix="tiksim_encoders_")
+        try:
+            clip_path = self._make_clip(directory)
+            results = [self.measure(candidate, clip_path, directory) for candidate in candidates]
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Encoder benchmark failed: {e}")
+            return []
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        return [result for result in results if result is not None]
+
+    def select(self, measured: List[EncoderProfile]) -> Optional[EncoderProfile]:
+        """Fastest profile meeting the quality target, else the best-quality one"""
+        if not measured:
+            return None
+        passing = [profile for profile in measured if profile.ssim >= self.min_ssim]
+        if passing:
+            return max(passing, key=lambda profile: profile.encode_fps)
+        best = max(measured, key=lambda profile: profile.ssim)
+        logger.warning(f"No encoder reaches SSIM {self.min_ssim}; using the best one "
+                       f"({best.describe()}, SSIM {best.ssim:.4f})")
+        return best
+
+    def get_profile(self, use_gpu: bool = False, refresh: bool = False,
+                    benchmark: bool = True) -> EncoderProfile:
+        """
+        Profile for this host - from the cache, or benchmarked and cached.
+
+        Falls back to the legacy libx264 settings (not cached) when FFmpeg is
+        missing, nothing could be measured, or nothing is cached and
+        `benchmark` is False.
+        """
+        if not self.ffmpeg_path:
+            return legacy_profile()
+        key = self._profile_key(use_gpu)
+        if not refresh:
+            cached = self._load_cache().get(self._host_key(), {}).get("profiles", {}).get(key)
+            if cached:
+                return EncoderProfile.from_dict(cached)
+            if not benchmark:
+                logger.info("No encoder profile for this host, using default libx264 settings "
+                            "(scripts/benchmark_encoders.py selects one)")
+                return legacy_profile()
+
+        profile = self.select(self.benchmark(use_gpu))
+        if profile is None:
+            logger.warning("Encoder benchmark produced no result, using default libx264 settings")
+            return legacy_profile()
+        self.store(profile, use_gpu)
+        logger.info(f"Encoder profile: {profile.describe()} - {profile.encode_fps:.0f} FPS, "
+                    f"SSIM {profile.ssim:.4f}")
+        return profile
+
+    def store(self, profile: EncoderProfile, use_gpu: bool = False) -> None:
+        """Cache a profile as the selection of this host"""
+        profiles = self._load_cache().get(self._host_key(), {}).get("profiles", {})
+        profiles[self._profile_key(use_gpu)] = profile.to_dict()
+        self._update_cache("profiles", profiles)
+
+
+_profiles: Dict[Tuple[Optional[str], bool], EncoderProfile] = {}
+_profiles_lock = threading.Lock()
+
+
+def get_encoder_profile(ffmpeg_path: Optional[str] = None, use_gpu: bool = False,
+                        refresh: bool = False, benchmark: Optional[bool] = None) -> EncoderProfile:
+    """
+    Process-wide encoder profile (default profiler settings), resolved once
+    per process: later calls return it without touching FFmpeg or the disk.
+
+    Args:
+        benchmark: Benchmark the encoders when no profile is cached
+            (default: $TIKSIMPRO_ENCODER_BENCHMARK is set to 1)
+    """
+    if benchmark is None:
+        benchmark = os.environ.get("TIKSIMPRO_ENCODER_BENCHMARK", "").lower() in ("1", "true", "yes")
+    key = (ffmpeg_path or find_ffmpeg(), use_gpu)
+    with _profiles_lock:
+        if refresh or key not in _profiles:
+            _profiles[key] = EncoderProfiler(key[0]).get_profile(use_gpu, refresh, benchmark)
+        return _profiles[key]
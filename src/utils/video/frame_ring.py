@@ -0,0 +1,209 @@
+# src/utils/video/frame_ring.py
+"""
+Raw frame buffering between the render thread and the FFmpeg writer:
+a pool of reusable frame buffers and a memory-mapped ring used to spill
+frames to disk when the encoder falls behind the render loop.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from queue import Queue, Empty
+from typing import Optional, Tuple
+
+import numpy as np
+import pygame
+
+
+# FFmpeg pix_fmt -> pygame.image.tostring format, used when a surface cannot be read directly
+_TOSTRING_FORMATS = {
+    "rgb24": "RGB",
+    "rgba": "RGBA", "rgb0": "RGBX",
+    "bgra": "BGRA", "bgr0": "BGRA",
+    "argb": "ARGB", "0rgb": "ARGB",
+}
+
+
+def surface_pixel_format(surface: pygame.Surface) -> Tuple[str, int]:
+    """
+    FFmpeg raw input pix_fmt matching the surface's in-memory pixel layout.
+
+    Returns:
+        (pix_fmt, bytes_per_pixel) - falls back to ("rgb24", 3) for layouts
+        FFmpeg cannot read as-is (the frame is then converted by pygame)
+    """
+    bytesize = surface.get_bytesize()
+    if bytesize not in (3, 4):
+        return "rgb24", 3
+
+    masks = surface.get_masks()
+    shifts = surface.get_shifts()
+    layout = ["0"] * bytesize
+    for channel, mask, shift in zip("rgba", masks, shifts):
+        if mask:
+            layout[shift // 8] = channel
+    if sys.byteorder == "big":
+        layout.reverse()
+    name = "".join(layout)
+
+    if bytesize == 3:
+        name = {"rgb": "rgb24", "bgr": "bgr24"}.get(name)
+    elif name not in ("rgba", "rgb0", "bgra", "bgr0", "argb", "0rgb", "abgr", "0bgr"):
+        name = None
+    if name is None:
+        return "rgb24", 3
+    return name, bytesize
+
+
+def copy_surface_pixels(surface: pygame.Surface, out: np.ndarray, pix_fmt: str) -> None:
+    """
+    Copy a surface's pixels into a preallocated flat uint8 buffer.
+
+    When the surface layout matches pix_fmt this is a single memcpy of the
+    pixel rows straight from the surface buffer; otherwise pygame converts it.
+    """
+    width, height = surface.get_size()
+    bytesize = surface.get_bytesize()
+    row_bytes = width * bytesize
+
+    if surface_pixel_format(surface)[0] != pix_fmt or row_bytes * height != out.size:
+        converted = pygame.image.tostring(surface, _TOSTRING_FORMATS.get(pix_fmt, "RGB"))
+        out[:] = np.frombuffer(converted, dtype=np.uint8)
+        return
+
+    view = surface.get_buffer()
+    try:
+        rows = np.frombuffer(view, dtype=np.uint8).reshape(height, surface.get_pitch())
+        np.copyto(out.reshape(height, row_bytes), rows[:, :row_bytes])
+    finally:
+        # Dropping the buffer references unlocks the surface
+        rows = None
+        view = None
+
+
+class FrameBufferPool:
+    """
+    Preallocated, reusable frame buffers.
+
+    The render thread copies each frame into a buffer taken from the pool and
+    the encoder thread gives it back after writing it, so no frame-sized
+    allocation happens per frame.
+    """
+
+    def __init__(self, frame_size: int, count: int):
+        """
+        Args:
+            frame_size: Size of one raw frame in bytes
+            count: Maximum number of buffers (allocated lazily, then reused)
+        """
+        self.frame_size = frame_size
+        self.count = max(1, count)
+        self.allocated = 0
+        self._free: Queue = Queue()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Take a free buffer, or None if none was released before the timeout"""
+        try:
+            return self._free.get_nowait()
+        except Empty:
+            pass
+
+        with self._lock:
+            if self.allocated < self.count:
+                self.allocated += 1
+                return np.empty(self.frame_size, dtype=np.uint8)
+
+        if timeout == 0:
+            return None
+        try:
+            return self._free.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer to the pool"""
+        self._free.put_nowait(buffer)
+
+    def available(self) -> int:
+        return self._free.qsize()
+
+
+class FrameSpillRing:
+    """
+    Fixed-size FIFO of raw frames backed by a memory-mapped temp file.
+
+    The writer (render thread) reserves the next slot with `write()`, the
+    reader (encoder thread) gets the oldest slot back with `read()` and hands
+    it back with `release()` once the bytes have been written to FFmpeg.
+    """
+
+    def __init__(self, frame_size: int, slots: int = 120, directory: Optional[str] = None):
+        """
+        Args:
+            frame_size: Size of one raw frame in bytes
+            slots: Number of frames the ring can hold
+            directory: Where to create the backing file (system temp by default)
+        """
+        self.frame_size = frame_size
+        self.slots = max(1, slots)
+
+        fd, self.path = tempfile.mkstemp(prefix="tiksim_frames_", suffix=".ring", dir=directory)
+        os.close(fd)
+        self._buffer = np.memmap(self.path, dtype=np.uint8, mode="w+",
+                                 shape=(self.slots, frame_size))
+
+        self._head = 0   # Next slot to read
+        self._count = 0  # Slots currently in use
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._count
+
+    def write(self, frame_data, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Copy a frame into the next free slot.
+
+        Returns:
+            Slot index, or None if no slot freed up before the timeout
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._count < self.slots or self._closed, timeout):
+                return None
+            if self._closed:
+                return None
+            slot = (self._head + self._count) % self.slots
+            self._count += 1
+
+        self._buffer[slot] = np.frombuffer(frame_data, dtype=np.uint8, count=self.frame_size)
+        return slot
+
+    def read(self, slot: int) -> memoryview:
+        """Zero-copy view of a spilled frame"""
+        return memoryview(self._buffer[slot])
+
+    def release(self, slot: int) -> None:
+        """Free the oldest slot once its frame has been consumed"""
+        with self._cond:
+            if self._count and slot == self._head:
+                self._head = (self._head + 1) % self.slots
+                self._count -= 1
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Release the mapping and delete the backing file"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        try:
+            self._buffer._mmap.close()
+        except Exception:
+            pass
+        self._buffer = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
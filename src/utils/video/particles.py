@@ -3,63 +3,196 @@
 Particle system for visual effects on collisions.
 """
 
-import pygame
 import math
-import random
-from typing import Tuple, List
+from typing import Tuple, Optional
 
+import numpy as np
+import pygame
+from pygame import gfxdraw
 
-class SimpleParticle:
-    """Lightweight particle for visual effects"""
 
-    def __init__(self, x: float, y: float, vx: float, vy: float,
-                 color: Tuple[int, int, int], size: float = 3.0,
-                 life: float = 0.5, gravity: float = 800):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.size = size
-        self.life = life
-        self.max_life = life
-        self.gravity = gravity
+class ParticlePool:
+    """
+    All live particles of a simulation, stored as NumPy arrays (one array
+    per attribute). Spawning, updating and culling work on whole arrays;
+    only the final draw calls loop over particles.
+    """
 
-    def update(self, dt: float) -> bool:
-        """Update particle state. Returns True if still alive."""
-        self.life -= dt
+    FIELDS = ("x", "y", "vx", "vy", "size", "life", "max_life", "gravity")
 
-        # Apply gravity
-        self.vy += self.gravity * dt
+    def __init__(self, capacity: int = 256, shrink_rate: float = 3.0,
+                 min_size: float = 0.5, seed: Optional[int] = None):
+        """
+        Args:
+            capacity: Initial capacity (grows as needed)
+            shrink_rate: Size decay per second (size *= 1 - dt * shrink_rate)
+            min_size: Size floor while the particle is alive
+            seed: Seed of the pool's random generator (used by spawn_burst)
+        """
+        self.shrink_rate = shrink_rate
+        self.min_size = min_size
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self._arrays = {name: np.zeros(capacity) for name in self.FIELDS}
+        self._color = np.zeros((capacity, 3), dtype=np.int16)
+
+    def __len__(self) -> int:
+        return self.count
+
+    # Live views on the particles currently alive
+    x = property(lambda self: self._arrays["x"][:self.count])
+    y = property(lambda self: self._arrays["y"][:self.count])
+    vx = property(lambda self: self._arrays["vx"][:self.count])
+    vy = property(lambda self: self._arrays["vy"][:self.count])
+    size = property(lambda self: self._arrays["size"][:self.count])
+    life = property(lambda self: self._arrays["life"][:self.count])
+    max_life = property(lambda self: self._arrays["max_life"][:self.count])
+    color = property(lambda self: self._color[:self.count])
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.count + extra
+        capacity = len(self._color)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name, array in self._arrays.items():
+            grown = np.zeros(capacity)
+            grown[:self.count] = array[:self.count]
+            self._arrays[name] = grown
+        color = np.zeros((capacity, 3), dtype=np.int16)
+        color[:self.count] = self._color[:self.count]
+        self._color = color
+
+    def spawn(self, x, y, vx, vy, color, size, life, gravity=800.0, max_life=None) -> int:
+        """
+        Add particles - scalars or arrays, broadcast to the same length.
 
-        # Move particle
-        self.x += self.vx * dt
-        self.y += self.vy * dt
+        Returns:
+            Number of particles added
+        """
+        vx, vy = np.asarray(vx, dtype=np.float64), np.asarray(vy, dtype=np.float64)
+        count = int(np.broadcast(vx, vy, np.asarray(size), np.asarray(life)).size)
+        if count == 0:
+            return 0
+        self._reserve(count)
+        start, end = self.count, self.count + count
+
+        values = {"x": x, "y": y, "vx": vx, "vy": vy, "size": size, "life": life,
+                  "max_life": life if max_life is None else max_life, "gravity": gravity}
+        for name, value in values.items():
+            self._arrays[name][start:end] = value
+        self._color[start:end] = np.clip(color, 0, 255)
+        self.count = end
+        return count
+
+    def spawn_burst(self, x: float, y: float, count: int,
+                    angle_range: Tuple[float, float], speed_range: Tuple[float, float],
+                    size_range: Tuple[float, float], life_range: Tuple[float, float],
+                    color: Tuple[int, int, int], color_jitter: Tuple[int, int] = (-30, 50),
+                    vy_bias: float = 0.0, gravity: float = 800.0) -> int:
+        """
+        Spawn `count` particles from one point with random direction, speed,
+        size, lifetime and colour variation, in a single array write.
 
-        # Shrink over time
-        self.size = max(0.5, self.size * (1 - dt * 3))
+        Args:
+            angle_range: Min/max emission angle (radians)
+            color_jitter: Min/max offset added to each colour channel (inclusive)
+            vy_bias: Added to the vertical velocity (negative = upward)
+        """
+        if count <= 0:
+            return 0
+        rng = self.rng
+        angle = rng.uniform(angle_range[0], angle_range[1], count)
+        speed = rng.uniform(speed_range[0], speed_range[1], count)
+        size = rng.uniform(size_range[0], size_range[1], count)
+        life = rng.uniform(life_range[0], life_range[1], count)
+        colors = np.asarray(color, dtype=np.int16) + rng.integers(
+            color_jitter[0], color_jitter[1] + 1, (count, 3), dtype=np.int16)
+        return self.spawn(x, y, np.cos(angle) * speed, np.sin(angle) * speed + vy_bias,
+                          colors, size, life, gravity)
+
+    def update(self, dt: float) -> None:
+        """Age, move and shrink every particle, then drop the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        a = {name: array[:n] for name, array in self._arrays.items()}
+        a["life"] -= dt
+        a["vy"] += a["gravity"] * dt
+        a["x"] += a["vx"] * dt
+        a["y"] += a["vy"] * dt
+        np.maximum(self.min_size, a["size"] * (1 - dt * self.shrink_rate), out=a["size"])
+
+        alive = a["life"] > 0
+        if alive.all():
+            return
+        kept = int(np.count_nonzero(alive))
+        for name, array in a.items():
+            self._arrays[name][:kept] = array[alive]
+        self._color[:kept] = self._color[:n][alive]
+        self.count = kept
 
-        return self.life > 0
+    def clear(self) -> None:
+        self.count = 0
 
-    def render(self, surface: pygame.Surface):
-        """Render particle with fade effect"""
-        if self.life <= 0:
-            return
+    def render(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0),
+               scale: float = 1.0, smooth: bool = False) -> None:
+        """
+        Draw all particles, faded by remaining life.
 
-        # Calculate fade based on remaining life
-        fade = self.life / self.max_life
+        Positions are drawn at (offset + position) * scale.
 
-        # Apply fade to color
-        col = (
-            int(self.color[0] * fade),
-            int(self.color[1] * fade),
-            int(self.color[2] * fade)
-        )
+        Args:
+            smooth: Anti-aliased circles (gfxdraw) instead of pygame.draw
+        """
+        n = self.count
+        if n == 0:
+            return
+        fade = self.life / self.max_life
+        rgb = (self.color * fade[:, None]).astype(np.int64)
+        px = ((offset[0] + self.x) * scale).astype(np.int64).tolist()
+        py = ((offset[1] + self.y) * scale).astype(np.int64).tolist()
+        radius = np.maximum(1, self.size * scale).astype(np.int64).tolist()
+
+        if smooth:
+            filled_circle, aacircle = gfxdraw.filled_circle, gfxdraw.aacircle
+            for color, x, y, r in zip(rgb.tolist(), px, py, radius):
+                filled_circle(surface, x, y, r, color)
+                aacircle(surface, x, y, r, color)
+        else:
+            # Pre-mapped pixel values are much cheaper to build than colour tuples
+            circle = pygame.draw.circle
+            for color, x, y, r in zip(self._map_colors(surface, rgb), px, py, radius):
+                circle(surface, color, (x, y), r)
 
-        # Draw particle
-        pos = (int(self.x), int(self.y))
-        radius = max(1, int(self.size))
-        pygame.draw.circle(surface, col, pos, radius)
+    @staticmethod
+    def _map_colors(surface: pygame.Surface, rgb: np.ndarray) -> list:
+        """RGB rows -> pixel values in the surface format (what Surface.map_rgb returns)"""
+        shifts, losses = surface.get_shifts(), surface.get_losses()
+        packed = np.full(len(rgb), surface.get_masks()[3], dtype=np.int64)
+        for channel in range(3):
+            packed |= (rgb[:, channel] >> losses[channel]) << shifts[channel]
+        return packed.tolist()
+
+    def bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """(left, top, right, bottom) covered by the particles, or None if empty"""
+        if self.count == 0:
+            return None
+        size = self.size
+        return (float(np.min(self.x - size)), float(np.min(self.y - size)),
+                float(np.max(self.x + size)), float(np.max(self.y + size)))
+
+    def export_records(self, records: np.ndarray) -> None:
+        """Fill SimulationLog records (x, y, size, life, max_life, color)"""
+        for name in ("x", "y", "size", "life", "max_life"):
+            records[name] = getattr(self, name)
+        records["color"] = self.color
+
+    def load_records(self, records: np.ndarray) -> None:
+        """Replace the pool content with logged records (velocities are not logged)"""
+        self.clear()
+        self.spawn(records["x"], records["y"], 0.0, 0.0, records["color"],
+                   records["size"], records["life"], max_life=records["max_life"])
 
 
 class ParticleSpawner:
@@ -67,6 +200,7 @@ class ParticleSpawner:
 
     @staticmethod
     def spawn_collision_particles(
+        pool: ParticlePool,
         x: float, y: float,
         normal_angle: float,
         color: Tuple[int, int, int],
@@ -76,11 +210,12 @@ class ParticleSpawner:
         life_range: Tuple[float, float] = (0.3, 0.6),
         gravity: float = 800,
         spread: float = 0.8
-    ) -> List[SimpleParticle]:
+    ) -> int:
         """
         Spawn particles spreading from collision point.
 
         Args:
+            pool: Pool receiving the particles
             x, y: Collision position
             normal_angle: Angle of the collision normal (radians)
             color: Base color of particles
@@ -91,60 +226,23 @@ class ParticleSpawner:
             gravity: Gravity applied to particles
             spread: Angular spread (radians)
         """
-        particles = []
-
-        for _ in range(count):
-            # Direction opposite to normal with spread
-            angle = normal_angle + math.pi + random.uniform(-spread, spread)
-            speed = random.uniform(*speed_range)
-
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-
-            size = random.uniform(*size_range)
-            life = random.uniform(*life_range)
-
-            # Add color variation for visual interest
-            r = min(255, max(0, color[0] + random.randint(-30, 50)))
-            g = min(255, max(0, color[1] + random.randint(-30, 50)))
-            b = min(255, max(0, color[2] + random.randint(-30, 50)))
-
-            particles.append(SimpleParticle(
-                x, y, vx, vy, (r, g, b), size, life, gravity
-            ))
-
-        return particles
+        # Direction opposite to normal with spread
+        direction = normal_angle + math.pi
+        return pool.spawn_burst(x, y, count, (direction - spread, direction + spread),
+                                speed_range, size_range, life_range, color,
+                                color_jitter=(-30, 50), gravity=gravity)
 
     @staticmethod
     def spawn_celebration_particles(
+        pool: ParticlePool,
         x: float, y: float,
         color: Tuple[int, int, int],
         count: int = 20
-    ) -> List[SimpleParticle]:
+    ) -> int:
         """
         Spawn celebration particles in all directions.
         Used for special events like passing through gaps.
         """
-        particles = []
-
-        for _ in range(count):
-            # Radial explosion
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(200, 600)
-
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed - 200  # Bias upward
-
-            size = random.uniform(3, 7)
-            life = random.uniform(0.5, 1.0)
-
-            # Bright varied colors
-            r = min(255, max(0, color[0] + random.randint(-20, 80)))
-            g = min(255, max(0, color[1] + random.randint(-20, 80)))
-            b = min(255, max(0, color[2] + random.randint(-20, 80)))
-
-            particles.append(SimpleParticle(
-                x, y, vx, vy, (r, g, b), size, life, gravity=600
-            ))
-
-        return particles
+        # Radial explosion, biased upward, bright varied colors
+        return pool.spawn_burst(x, y, count, (0, math.pi * 2), (200, 600), (3, 7), (0.5, 1.0),
+                                color, color_jitter=(-20, 80), vy_bias=-200, gravity=600)
@@ -0,0 +1,106 @@
+# src/utils/video/simulation_log.py
+"""
+Compact per-frame state log produced by a physics-only simulation pass
+and consumed by a separate drawing pass.
+"""
+
+import json
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.core.data_pipeline import AudioEvent
+
+
+class SimulationLog:
+    """
+    Simulation state for every frame of a video, stored in NumPy structured arrays.
+
+    - `frames`: one record per frame (ball state, timers, counters...)
+    - channels: a variable number of records per frame (layers, particles,
+      effects...), stored flat with per-frame offsets
+    - `audio_events`: the events emitted during the simulation
+    """
+
+    def __init__(self, fps: int, frame_count: int, frame_dtype: np.dtype):
+        self.fps = fps
+        self.frame_count = frame_count
+        self.frames = np.zeros(frame_count, dtype=frame_dtype)
+        self.audio_events: List[AudioEvent] = []
+        self.meta: Dict[str, Any] = {}
+
+        self._channel_dtypes: Dict[str, np.dtype] = {}
+        self._pending: Dict[str, List[np.ndarray]] = {}
+        self._channels: Dict[str, np.ndarray] = {}
+        self._offsets: Dict[str, np.ndarray] = {}
+
+    def add_channel(self, name: str, dtype: np.dtype) -> None:
+        """Declare a variable-length per-frame channel"""
+        self._channel_dtypes[name] = np.dtype(dtype)
+        self._pending[name] = [np.zeros(0, dtype=dtype)] * self.frame_count
+
+    def new_records(self, name: str, count: int) -> np.ndarray:
+        """Allocate the records of a channel for one frame (filled by the caller)"""
+        return np.zeros(count, dtype=self._channel_dtypes[name])
+
+    def set_records(self, name: str, frame: int, records: np.ndarray) -> None:
+        """Store the records of a channel for one frame"""
+        self._pending[name][frame] = records
+
+    def finalize(self) -> "SimulationLog":
+        """Pack pending per-frame records into flat arrays + offsets"""
+        for name, chunks in self._pending.items():
+            counts = np.fromiter((len(chunk) for chunk in chunks), dtype=np.int64, count=len(chunks))
+            offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            self._offsets[name] = offsets
+            self._channels[name] = (np.concatenate(chunks) if chunks
+                                    else np.zeros(0, dtype=self._channel_dtypes[name]))
+        self._pending = {}
+        return self
+
+    def records(self, name: str, frame: int) -> np.ndarray:
+        """Records of a channel for one frame (view, no copy)"""
+        offsets = self._offsets[name]
+        return self._channels[name][offsets[frame]:offsets[frame + 1]]
+
+    def channel_names(self) -> List[str]:
+        return list(self._channel_dtypes)
+
+    def nbytes(self) -> int:
+        """Size of the packed log in bytes"""
+        return self.frames.nbytes + sum(a.nbytes for a in self._channels.values()) \
+            + sum(a.nbytes for a in self._offsets.values())
+
+    def save(self, path: str) -> None:
+        """Save as .npz (arrays) with events and metadata as embedded JSON"""
+        arrays = {"frames": self.frames}
+        for name in self._channels:
+            arrays[f"channel_{name}"] = self._channels[name]
+            arrays[f"offsets_{name}"] = self._offsets[name]
+        header = {
+            "fps": self.fps,
+            "meta": self.meta,
+            "audio_events": [event.to_dict() for event in self.audio_events],
+        }
+        arrays["header"] = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "SimulationLog":
+        """Load a log written by save()"""
+        with np.load(path) as data:
+            header = json.loads(data["header"].tobytes().decode("utf-8"))
+            frames = data["frames"]
+            log = cls(header["fps"], len(frames), frames.dtype)
+            log.frames = frames
+            log.meta = header.get("meta", {})
+            log.audio_events = [AudioEvent.from_dict(event) for event in header["audio_events"]]
+            log._pending = {}
+            for key in data.files:
+                if key.startswith("channel_"):
+                    name = key[len("channel_"):]
+                    log._channels[name] = data[key]
+                    log._offsets[name] = data[f"offsets_{name}"]
+                    log._channel_dtypes[name] = data[key].dtype
+        return log
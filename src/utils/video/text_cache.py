@@ -0,0 +1,123 @@
+# src/utils/video/text_cache.py
+"""
+Cache of rendered overlay texts (engagement texts, counters...).
+
+Fonts are pooled per size and each (text, size, colour, outline) is
+composited once - text plus its outline copies - then reused until it
+falls out of the LRU.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Tuple, Optional
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+
+def _premultiplied(surface: pygame.Surface) -> pygame.Surface:
+    """Premultiplied-alpha copy of a rendered text surface"""
+    # premul_alpha() on font.render() output comes back empty: copy to a plain SRCALPHA surface first
+    copy = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    copy.blit(surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+    return copy.premul_alpha()
+
+
+class TextCache:
+    """
+    Pre-composited text surfaces, least recently used evicted first.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._fonts: Dict[int, pygame.font.Font] = {}
+        self._surfaces: "OrderedDict[Tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Font objects are invalid (and crash) once pygame.quit() has run
+        pygame.register_quit(self.clear)
+
+    def font(self, size: int) -> pygame.font.Font:
+        """Default pygame font at the given size (one instance per size)"""
+        if not pygame.font.get_init():
+            # Font objects from a previous init are no longer usable
+            pygame.font.init()
+            self._fonts.clear()
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
+
+    def render(self, text: str, size: int, color: Color,
+               outline_color: Optional[Color] = (0, 0, 0), outline: int = 2) -> pygame.Surface:
+        """
+        Text with its outline, as one surface with per-pixel alpha.
+
+        The outline is the text drawn in outline_color at the 4 diagonal
+        offsets (+/-outline, +/-outline), so the surface is 2*outline wider
+        and taller than the text itself.
+        """
+        key = (text, size, color, outline_color, outline)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        font = self.font(size)
+        text_surface = font.render(text, True, color)
+        if outline_color is None or outline <= 0:
+            surface = text_surface
+        else:
+            # Composited with premultiplied alpha: unlike straight alpha blits onto
+            # a transparent surface, this keeps the anti-aliased edges' colours
+            width, height = text_surface.get_size()
+            surface = pygame.Surface((width + 2 * outline, height + 2 * outline), pygame.SRCALPHA)
+            outline_surface = _premultiplied(font.render(text, True, outline_color))
+            for dx, dy in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                surface.blit(outline_surface, (outline + dx * outline, outline + dy * outline),
+                             special_flags=pygame.BLEND_PREMULTIPLIED)
+            surface.blit(_premultiplied(text_surface), (outline, outline), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+        self._surfaces[key] = surface
+        while len(self._surfaces) > max(1, self.max_entries):
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def blit_centered(self, target: pygame.Surface, text: str, size: int, color: Color,
+                      center: Tuple[int, int], outline_color: Optional[Color] = (0, 0, 0),
+                      outline: int = 2) -> pygame.Rect:
+        """
+        Draw a text centred on `center` (the text, not its outline).
+
+        Returns:
+            Rect covered on the target
+        """
+        surface = self.render(text, size, color, outline_color, outline)
+        # The outline margin is symmetric, so the glyphs land where they would without it
+        rect = surface.get_rect(center=center)
+        if outline_color is None or outline <= 0:
+            return target.blit(surface, rect)
+        return target.blit(surface, rect, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self._fonts.clear()
+
+
+_shared_cache: Optional[TextCache] = None
+
+
+def get_text_cache() -> TextCache:
+    """
+    Process-wide text cache shared by all generators.
+
+    Kept outside the generators so their state stays picklable (snapshots
+    sent to segment workers); each process builds its own cache.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TextCache()
+    return _shared_cache
@@ -4,44 +4,66 @@ import random
 import colorsys
 import logging
 import os
+import numpy as np
+from enum import Enum
 from pygame import gfxdraw
 from typing import Dict, Any, Optional, List, Tuple
 
-from src.video_generators.base_video_generator import IVideoGenerator
+from src.video_generators.base_video_generator import IVideoGenerator, ITwoPassGenerator
 from src.utils.video.background_manager import BackgroundManager, BackgroundMode
 from src.utils.video.engagement_texts import EngagementTextManager, VideoType
+from src.utils.video.particles import ParticlePool
+from src.utils.video.simulation_log import SimulationLog
+from src.utils.video.text_cache import get_text_cache
 
 logger = logging.getLogger("TikSimPro")
 
-class Particle:
-    """Particule individuelle pour effets visuels"""
-    def __init__(self, x: float, y: float, vx: float, vy: float, color: Tuple[int, int, int], size: float = 3.0, life: float = 1.0):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.size = size
-        self.life = life
-        self.max_life = life
-        self.gravity = 800  # Gravité pour les particules
-
-    def update(self, dt: float) -> bool:
-        self.life -= dt
-        self.vy += self.gravity * dt
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.size = max(0.5, self.size * (1 - dt * 2))
-        return self.life > 0
-
-    def render(self, surface: pygame.Surface, center: Tuple[int, int], scale: float):
-        if self.life <= 0: return
-        fade = self.life / self.max_life
-        col = (int(self.color[0]*fade), int(self.color[1]*fade), int(self.color[2]*fade))
-        px = int((center[0] + self.x) * scale)
-        py = int((center[1] + self.y) * scale)
-        size = int(max(1, self.size * scale))
-        pygame.draw.circle(surface, col, (px, py), size)
+# SimulationLog layout (two-pass rendering)
+FRAME_DTYPE = np.dtype([
+    ("time", "f8"), ("ball_x", "f8"), ("ball_y", "f8"),
+    ("ball_vx", "f8"), ("ball_vy", "f8"), ("layer_index", "i4"),
+])
+LAYER_DTYPE = np.dtype([
+    ("radius", "f8"), ("rotation", "f8"), ("hue", "f8"), ("thickness", "f8"),
+    ("gap", "f8"), ("active", "?"), ("target", "?"),
+])
+EFFECT_DTYPE = np.dtype([("radius", "f8"), ("width", "f8"), ("life", "f8"), ("color", "i2", 3)])
+PARTICLE_DTYPE = np.dtype([
+    ("x", "f8"), ("y", "f8"), ("size", "f8"), ("life", "f8"), ("max_life", "f8"), ("color", "i2", 3),
+])
+
+
+class AntialiasMode(Enum):
+    """Stratégie d'anti-aliasing de draw_frame"""
+    SSAA = "ssaa"              # Image entière rendue en xN puis réduite (smoothscale)
+    DIRTY_SSAA = "dirty_ssaa"  # Seule la boîte autour des arcs est rendue en xN
+    GFXDRAW = "gfxdraw"        # Pas de supersampling, primitives anti-aliasées
+
+
+def _aa_ring(surface: pygame.Surface, color: Tuple[int, int, int], center: Tuple[int, int],
+             radius: float, width: int):
+    """Anneau plein avec bords anti-aliasés (rendu sans supersampling)"""
+    cx, cy = int(center[0]), int(center[1])
+    outer = int(radius)
+    pygame.draw.circle(surface, color, (cx, cy), outer, width)
+    gfxdraw.aacircle(surface, cx, cy, outer, color)
+    if outer - width > 0:
+        gfxdraw.aacircle(surface, cx, cy, outer - width, color)
+
+
+def _aa_arc(surface: pygame.Surface, color: Tuple[int, int, int], center: Tuple[int, int],
+            radius: float, width: int, start_angle: float, stop_angle: float):
+    """Arc épais anti-aliasé, tracé comme un polygone (mêmes angles que pygame.draw.arc)"""
+    cx, cy = center
+    inner = max(0.0, radius - width)
+    steps = max(8, int((stop_angle - start_angle) * radius / 4))
+    angles = np.linspace(start_angle, stop_angle, steps)
+    cos, sin = np.cos(angles), np.sin(angles)
+    outer_points = np.column_stack((cx + cos * radius, cy - sin * radius))
+    inner_points = np.column_stack((cx + cos * inner, cy - sin * inner))[::-1]
+    points = np.rint(np.concatenate((outer_points, inner_points))).astype(int).tolist()
+    gfxdraw.filled_polygon(surface, points, color)
+    gfxdraw.aapolygon(surface, points, color)
 
 
 class VisualEffect:
@@ -58,7 +80,7 @@ class VisualEffect:
         self.width = max(0.1, self.width - dt * 5)  # Réduction plus lente (était 15)
         return self.life > 0
 
-    def render(self, surface: pygame.Surface, center: Tuple[int, int], scale: float):
+    def render(self, surface: pygame.Surface, center: Tuple[int, int], scale: float, smooth: bool = False):
         if self.life <= 0 or self.width < 1: return
 
         # On scale tout pour le rendu HD
@@ -70,6 +92,10 @@ class VisualEffect:
         fade = self.life
         col = (int(self.color[0]*fade), int(self.color[1]*fade), int(self.color[2]*fade))
 
+        if smooth:
+            _aa_ring(surface, col, (cx_scaled, cy_scaled), r_scaled, w_scaled)
+            return
+
         rect = pygame.Rect(
             cx_scaled - r_scaled,
             cy_scaled - r_scaled,
@@ -79,7 +105,12 @@ class VisualEffect:
         pygame.draw.arc(surface, col, rect, 0, math.pi * 2, w_scaled)
 
 class ArcLayer:
-    def __init__(self, index: int, radius: float, hue: float, config: Dict[str, Any]):
+    def __init__(self, index: int, radius: float, hue: float, config: Dict[str, Any],
+                 rotation: Optional[float] = None, direction: Optional[int] = None):
+        """
+        rotation / direction : angle initial et sens de rotation (tirés au
+        hasard si absents - à fournir pour ne pas consommer le RNG)
+        """
         self.index = index
         self.radius = radius
         self.base_radius = radius  # Rayon de base pour l'animation ressort
@@ -89,9 +120,10 @@ class ArcLayer:
         gap_deg = config.get("gap_size_deg", 45)
         self.gap_size = math.radians(gap_deg)
 
-        self.rotation = random.uniform(0, math.pi * 2)
+        self.rotation = random.uniform(0, math.pi * 2) if rotation is None else rotation
         base_speed = config.get("rotation_speed", 1.2)
-        direction = 1 if random.random() > 0.5 else -1
+        if direction is None:
+            direction = 1 if random.random() > 0.5 else -1
         self.rotation_speed = (base_speed + (index * 0.05)) * direction
 
         self.is_active = True
@@ -159,20 +191,25 @@ class ArcLayer:
                 return True, False, ball_angle
         return False, False, None
 
-class ArcEscapeSimulator(IVideoGenerator):
+class ArcEscapeSimulator(IVideoGenerator, ITwoPassGenerator):
+    TRANSIENT_ATTRIBUTES = IVideoGenerator.TRANSIENT_ATTRIBUTES + ("hd_surface",)
+
     def __init__(self, width=1080, height=1920, fps=60, duration=30):
         super().__init__(width, height, fps, duration)
         self.center = (width // 2, height // 2)
         
         # === SUPER SAMPLING (La clé de l'antialiasing) ===
-        # On rend l'image 3x plus grande, puis on la réduit.
+        # Par défaut on rend l'image 3x plus grande, puis on la réduit.
         # Cela supprime tous les effets d'escalier sur les arcs.
+        # Voir set_antialiasing() pour les modes plus rapides.
+        self.antialiasing = AntialiasMode.SSAA
+        self.supersampling = 3
         self.render_scale = 3 
         
-        # Surface haute résolution
+        # Surface haute résolution (créée au premier dessin)
         self.hd_width = width * self.render_scale
         self.hd_height = height * self.render_scale
-        self.hd_surface = pygame.Surface((self.hd_width, self.hd_height))
+        self.hd_surface: Optional[pygame.Surface] = None
         
         self.config = {
             "layer_count": 25,          # Plus de layers pour 60sec
@@ -187,12 +224,14 @@ class ArcEscapeSimulator(IVideoGenerator):
             "air_resistance": 0.9998,   # Très peu de résistance
             "jitter_strength": 40.0,    # Chaos pour variété
             "max_velocity": 1400.0,     # Vitesse max plus haute
-            "min_velocity": 300.0       # Vitesse MIN - jamais trop lent!
+            "min_velocity": 300.0,      # Vitesse MIN - jamais trop lent!
+            "physics_substeps": 0,      # Sous-pas physiques par frame (0 = auto, selon max_velocity)
+            "particle_multiplier": 1.0  # Multiplie le nombre de particules par burst
         }
         
         self.layers = []
         self.effects = []
-        self.particles = []  # Liste des particules
+        self.particles = ParticlePool(shrink_rate=2.0)
         self.ball_pos = [0.0, 0.0]
         self.ball_vel = [0.0, 0.0]
 
@@ -213,6 +252,10 @@ class ArcEscapeSimulator(IVideoGenerator):
     def configure(self, config: Dict[str, Any]) -> bool:
         self.config.update(config)
 
+        if "antialiasing" in config or "supersampling" in config:
+            self.set_antialiasing(config.get("antialiasing", self.antialiasing),
+                                  config.get("supersampling", self.supersampling))
+
         # Configure background mode
         if "background" in config:
             self.background_manager.configure(config["background"])
@@ -221,6 +264,43 @@ class ArcEscapeSimulator(IVideoGenerator):
 
         return True
 
+    def set_antialiasing(self, mode, supersampling: Optional[int] = None) -> bool:
+        """
+        Choisit la stratégie d'anti-aliasing.
+
+        Args:
+            mode: AntialiasMode ou sa valeur ("ssaa", "dirty_ssaa", "gfxdraw")
+            supersampling: Facteur de supersampling des modes SSAA (2 = 2x SSAA)
+
+        Note: smoothscale tronque d'environ 2 niveaux pour un facteur qui n'est pas
+        une puissance de 2 ; en dirty_ssaa cela marque le bord de la boîte, donc
+        préférer 2 ou 4 dans ce mode.
+        """
+        try:
+            mode = AntialiasMode(mode)
+        except ValueError:
+            logger.warning(f"Unknown antialiasing mode '{mode}', keeping {self.antialiasing.value}")
+            return False
+
+        if supersampling is not None:
+            self.supersampling = max(1, int(supersampling))
+
+        self.antialiasing = mode
+        self.render_scale = 1 if mode == AntialiasMode.GFXDRAW else self.supersampling
+        self.hd_width = self.width * self.render_scale
+        self.hd_height = self.height * self.render_scale
+        self.hd_surface = None
+
+        # Le fond n'est dessiné en HD qu'en SSAA plein écran
+        background_scale = self.render_scale if mode == AntialiasMode.SSAA else 1
+        self.background_manager.resize(self.width * background_scale, self.height * background_scale)
+        return True
+
+    def _get_hd_surface(self) -> pygame.Surface:
+        if self.hd_surface is None or self.hd_surface.get_size() != (self.hd_width, self.hd_height):
+            self.hd_surface = pygame.Surface((self.hd_width, self.hd_height))
+        return self.hd_surface
+
     def apply_trend_data(self, trend_data: Any) -> None:
         """Apply trend data for engagement texts"""
         self.engagement_manager = EngagementTextManager.for_arc_escape(trend_data)
@@ -246,7 +326,7 @@ class ArcEscapeSimulator(IVideoGenerator):
     def initialize_simulation(self) -> bool:
         self.layers = []
         self.effects = []
-        self.particles = []
+        self.particles = ParticlePool(shrink_rate=2.0, seed=random.getrandbits(32))
         self.current_layer_index = 0
         self.ball_pos = [0.0, 0.0]
         
@@ -265,27 +345,96 @@ class ArcEscapeSimulator(IVideoGenerator):
             layer = ArcLayer(i, radius, hue, self.config)
             if i == 0: layer.is_current_target = True
             self.layers.append(layer)
+
+        # Pick the overlay texts now so drawing never touches the RNG
+        if self._intro_text is None:
+            if self.engagement_manager:
+                self._intro_text = self.engagement_manager.get_intro_text()
+                self.engagement_manager.get_climax_text()
+            else:
+                self._intro_text = "Can the ball escape?"
         return True
 
     def render_frame(self, surface: pygame.Surface, frame_number: int, dt: float) -> bool:
+        self.simulate_frame(dt)
+        return self.draw_frame(surface)
+
+    def simulate_frame(self, dt: float) -> bool:
+        """Physique seule (balle, murs, effets) - aucun dessin"""
         self.time_elapsed += dt
+        substeps = self._physics_substeps(dt)
+        for _ in range(substeps):
+            self._update_physics(dt / substeps, substeps)
+        self._update_effects(dt)
+        return True
 
-        # 1. On travaille sur la surface HD (3x plus grande)
-        # Use background manager instead of hardcoded fill
-        self.background_manager.render(self.hd_surface, self.time_elapsed)
+    def _physics_substeps(self, dt: float) -> int:
+        """
+        Sous-pas fixes de la balle par frame. En auto (0), la balle avance
+        d'au plus un demi-rayon par sous-pas à max_velocity : un rebond la
+        replace contre le mur de moins d'un demi-rayon au lieu de jusqu'à un
+        pas complet (23 px à 1400 px/s et 60 fps).
+        """
+        substeps = int(self.config.get("physics_substeps", 0))
+        if substeps > 0:
+            return substeps
+        reach = self.config.get("max_velocity", 1400.0) * dt
+        return max(1, math.ceil(reach / (0.5 * self.config["ball_size"])))
+
+    def draw_frame(self, surface: pygame.Surface) -> bool:
+        """Dessine l'état courant de la simulation sur la surface finale"""
+        if self.antialiasing == AntialiasMode.GFXDRAW:
+            # Pas de supersampling : tout en 1x avec des primitives anti-aliasées
+            self.background_manager.render(surface, self.time_elapsed)
+            self._draw_scene(surface, (0, 0), 1, smooth=True)
+            self._render_ui(surface, 1)
+            return True
+
+        S = self.render_scale
+
+        if self.antialiasing == AntialiasMode.DIRTY_SSAA:
+            # Fond et UI en 1x, seule la boîte autour des arcs passe en HD
+            self.background_manager.render(surface, self.time_elapsed)
+            box = self._scene_bounds().clip(surface.get_rect())
+            if box.width and box.height:
+                region = self._get_hd_surface().subsurface((0, 0, box.width * S, box.height * S))
+                target = surface.subsurface(box)
+                pygame.transform.scale(target, region.get_size(), region)
+                self._draw_scene(region, box.topleft, S)
+                pygame.transform.smoothscale(region, box.size, target)
+            self._render_ui(surface, 1)
+            return True
+
+        # 1. On travaille sur la surface HD (S fois plus grande)
+        hd_surface = self._get_hd_surface()
+        self.background_manager.render(hd_surface, self.time_elapsed)
+        self._draw_scene(hd_surface, (0, 0), S)
+
+        # D. UI (Engagement texts)
+        self._render_ui(hd_surface, S)
+
+        # --- ÉTAPE FINALE : DOWNSCALING ---
+        # On réduit la surface HD vers la surface finale avec un filtre de lissage (smoothscale)
+        # C'est ÇA qui supprime l'aliasing.
+        pygame.transform.smoothscale(hd_surface, (self.width, self.height), surface)
+
+        return True
+
+    def _draw_scene(self, target: pygame.Surface, origin: Tuple[int, int], S: int, smooth: bool = False):
+        """
+        Dessine murs, effets, particules et balle.
+
+        Args:
+            target: Surface de dessin, couvrant la zone qui commence à `origin` (repère 1x)
+            origin: Coin haut-gauche de la zone dessinée, en pixels de la vidéo
+            S: Facteur d'échelle de la cible
+            smooth: Primitives anti-aliasées (rendu sans supersampling)
+        """
+        # Centre de l'arène, en 1x puis scalé
+        center = (self.width // 2 - origin[0], self.height // 2 - origin[1])
+        cx_hd = center[0] * S
+        cy_hd = center[1] * S
 
-        self._update_physics(dt)
-        self._update_effects(dt)
-        
-        # Centre scalé
-        cx_hd = self.hd_width // 2
-        cy_hd = self.hd_height // 2
-        
-        # Facteur d'échelle pour les dessins
-        S = self.render_scale 
-        
-        # --- DESSIN SUR HD SURFACE ---
-        
         # A. MURS
         for layer in self.layers:
             if not layer.is_active: continue
@@ -296,73 +445,152 @@ class ArcEscapeSimulator(IVideoGenerator):
             r_scaled = layer.radius * S
             thick_scaled = int(layer.thickness * S)
             
-            rect = pygame.Rect(cx_hd - r_scaled, cy_hd - r_scaled, r_scaled * 2, r_scaled * 2)
-            
             if layer.is_current_target:
                 gap_half = layer.gap_size / 2
                 start_angle = -layer.rotation + gap_half
                 stop_angle = -layer.rotation - gap_half + (2 * math.pi)
-                
+
+                if smooth:
+                    _aa_arc(target, color, (cx_hd, cy_hd), r_scaled, thick_scaled, start_angle, stop_angle)
+                    continue
+
                 # Astuce : On dessine l'arc sur la surface HD.
                 # Même si c'est pixelisé ici, ça sera lisse après réduction.
-                pygame.draw.arc(self.hd_surface, color, rect, start_angle, stop_angle, thick_scaled)
-                
-                # Pour rendre les bouts de l'arc ronds et jolis (Round Caps)
-                # On calcule la position des extrémités du mur
-                # (Optionnel, mais ça fait très pro)
-                # start_cap_x = cx_hd + math.cos(start_angle) * r_scaled
-                # start_cap_y = cy_hd - math.sin(start_angle) * r_scaled # Inversion Y pygame
-                # pygame.draw.circle(self.hd_surface, color, (start_cap_x, start_cap_y), thick_scaled//2)
-                
+                rect = pygame.Rect(cx_hd - r_scaled, cy_hd - r_scaled, r_scaled * 2, r_scaled * 2)
+                pygame.draw.arc(target, color, rect, start_angle, stop_angle, thick_scaled)
+            elif smooth:
+                _aa_ring(target, color, (cx_hd, cy_hd), r_scaled, thick_scaled)
             else:
-                pygame.draw.circle(self.hd_surface, color, (cx_hd, cy_hd), int(r_scaled), thick_scaled)
+                pygame.draw.circle(target, color, (cx_hd, cy_hd), int(r_scaled), thick_scaled)
 
         # B. EFFETS
         for effect in self.effects:
-            # On passe le scale à la méthode render de l'effet
-            effect.render(self.hd_surface, (cx_hd, cy_hd), S)
+            effect.render(target, center, S, smooth)
 
         # B2. PARTICULES
-        for particle in self.particles:
-            particle.render(self.hd_surface, (self.width // 2, self.height // 2), S)
+        self.particles.render(target, center, S, smooth)
 
         # C. BALLE
         bx_hd = cx_hd + (self.ball_pos[0] * S)
         by_hd = cy_hd + (self.ball_pos[1] * S)
         ball_rad_hd = int(self.config["ball_size"] * S)
         
-        # Dessin balle HD
-        gfxdraw.filled_circle(self.hd_surface, int(bx_hd), int(by_hd), ball_rad_hd, (255, 255, 255))
-        gfxdraw.aacircle(self.hd_surface, int(bx_hd), int(by_hd), ball_rad_hd, (255, 255, 255))
+        gfxdraw.filled_circle(target, int(bx_hd), int(by_hd), ball_rad_hd, (255, 255, 255))
+        gfxdraw.aacircle(target, int(bx_hd), int(by_hd), ball_rad_hd, (255, 255, 255))
 
-        # D. UI (Engagement texts)
-        self._render_ui(self.hd_surface, S)
+    def _scene_bounds(self) -> pygame.Rect:
+        """Boîte (repère 1x) contenant tout ce que _draw_scene dessine"""
+        reach = 0.0
+        for layer in self.layers:
+            if layer.is_active:
+                reach = max(reach, layer.radius)
+        for effect in self.effects:
+            reach = max(reach, effect.radius)
+
+        ball = self.config["ball_size"]
+        left = min(-reach, self.ball_pos[0] - ball)
+        right = max(reach, self.ball_pos[0] + ball)
+        top = min(-reach, self.ball_pos[1] - ball)
+        bottom = max(reach, self.ball_pos[1] + ball)
+        particle_bounds = self.particles.bounds()
+        if particle_bounds:
+            left = min(left, particle_bounds[0])
+            top = min(top, particle_bounds[1])
+            right = max(right, particle_bounds[2])
+            bottom = max(bottom, particle_bounds[3])
+
+        # Marge pour les arrondis et le filtre de smoothscale
+        margin = 2
+        x0 = self.width // 2 + int(math.floor(left)) - margin
+        y0 = self.height // 2 + int(math.floor(top)) - margin
+        x1 = self.width // 2 + int(math.ceil(right)) + margin
+        y1 = self.height // 2 + int(math.ceil(bottom)) + margin
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def create_simulation_log(self) -> SimulationLog:
+        log = SimulationLog(self.fps, self.total_frames, FRAME_DTYPE)
+        log.add_channel("layers", LAYER_DTYPE)
+        log.add_channel("effects", EFFECT_DTYPE)
+        log.add_channel("particles", PARTICLE_DTYPE)
+        log.meta = {"generator": self.__class__.__name__, "width": self.width, "height": self.height}
+        return log
+
+    def record_log_frame(self, log: SimulationLog, frame: int) -> None:
+        state = log.frames[frame]
+        state["time"] = self.time_elapsed
+        state["ball_x"], state["ball_y"] = self.ball_pos
+        state["ball_vx"], state["ball_vy"] = self.ball_vel
+        state["layer_index"] = self.current_layer_index
+
+        layers = log.new_records("layers", len(self.layers))
+        layers["radius"] = [layer.radius for layer in self.layers]
+        layers["rotation"] = [layer.rotation for layer in self.layers]
+        layers["hue"] = [layer.base_hue for layer in self.layers]
+        layers["thickness"] = [layer.thickness for layer in self.layers]
+        layers["gap"] = [layer.gap_size for layer in self.layers]
+        layers["active"] = [layer.is_active for layer in self.layers]
+        layers["target"] = [layer.is_current_target for layer in self.layers]
+        log.set_records("layers", frame, layers)
+
+        if self.effects:
+            effects = log.new_records("effects", len(self.effects))
+            effects["radius"] = [e.radius for e in self.effects]
+            effects["width"] = [e.width for e in self.effects]
+            effects["life"] = [e.life for e in self.effects]
+            effects["color"] = [e.color for e in self.effects]
+            log.set_records("effects", frame, effects)
+
+        if self.particles:
+            particles = log.new_records("particles", len(self.particles))
+            self.particles.export_records(particles)
+            log.set_records("particles", frame, particles)
+
+    def restore_log_frame(self, log: SimulationLog, frame: int) -> None:
+        state = log.frames[frame]
+        self.time_elapsed = float(state["time"])
+        self.ball_pos = [float(state["ball_x"]), float(state["ball_y"])]
+        self.ball_vel = [float(state["ball_vx"]), float(state["ball_vy"])]
+        self.current_layer_index = int(state["layer_index"])
+
+        layers = log.records("layers", frame)
+        if len(self.layers) != len(layers):
+            # Sens et angle donnés : la restauration ne touche pas au RNG
+            self.layers = [ArcLayer(i, 0.0, 0.0, self.config, rotation=0.0, direction=1)
+                           for i in range(len(layers))]
+        for layer, record in zip(self.layers, layers):
+            layer.radius = float(record["radius"])
+            layer.rotation = float(record["rotation"])
+            layer.base_hue = float(record["hue"])
+            layer.thickness = float(record["thickness"])
+            layer.gap_size = float(record["gap"])
+            layer.is_active = bool(record["active"])
+            layer.is_current_target = bool(record["target"])
 
-        # --- ÉTAPE FINALE : DOWNSCALING ---
-        # On réduit la surface HD vers la surface finale avec un filtre de lissage (smoothscale)
-        # C'est ÇA qui supprime l'aliasing.
-        pygame.transform.smoothscale(self.hd_surface, (self.width, self.height), surface)
+        self.effects = []
+        for record in log.records("effects", frame):
+            effect = VisualEffect(float(record["radius"]), tuple(int(c) for c in record["color"]), 0)
+            effect.width = float(record["width"])
+            effect.life = float(record["life"])
+            self.effects.append(effect)
 
-        return True
+        self.particles.load_records(log.records("particles", frame))
 
     def _render_ui(self, surface: pygame.Surface, scale: float):
         """Render UI with engagement texts - TikTok safe zone"""
         try:
-            if not pygame.font.get_init():
-                pygame.font.init()
+            texts = get_text_cache()
+            width, height = surface.get_size()
+            outline = max(1, int(2 * scale / 3))
 
             # TikTok safe zone: ~150px from top, ~200px from bottom
             safe_top = int(180 * scale)  # Safe zone top
-            safe_bottom = self.hd_height - int(250 * scale)  # Safe zone bottom
+            safe_bottom = height - int(250 * scale)  # Safe zone bottom
 
             # Calculate progress (how many layers passed)
             progress = self.current_layer_index / max(1, len(self.layers))
 
             # Intro text (first 4 seconds)
             if self.time_elapsed < 4:
-                font_size = int(38 * scale)
-                font = pygame.font.Font(None, font_size)
-
                 # Get intro text
                 if self._intro_text is None:
                     if self.engagement_manager:
@@ -370,59 +598,31 @@ class ArcEscapeSimulator(IVideoGenerator):
                     else:
                         self._intro_text = "Can the ball escape?"
 
-                text = self._intro_text
-                text_surface = font.render(text, True, (255, 255, 0))
-                text_rect = text_surface.get_rect(center=(self.hd_width // 2, safe_top))
-
-                # Outline
-                outline = font.render(text, True, (0, 0, 0))
-                for dx, dy in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-                    surface.blit(outline, (text_rect.x + dx, text_rect.y + dy))
-
-                surface.blit(text_surface, text_rect)
+                texts.blit_centered(surface, self._intro_text, int(38 * scale), (255, 255, 0),
+                                    (width // 2, safe_top), outline=outline)
 
             # Layer counter - below intro text
-            font_size = int(56 * scale)
-            font = pygame.font.Font(None, font_size)
             count_text = f"{self.current_layer_index}/{len(self.layers)}"
-
-            text_surface = font.render(count_text, True, (255, 255, 255))
-            text_rect = text_surface.get_rect(center=(self.hd_width // 2, safe_top + int(60 * scale)))
-
-            # Outline
-            outline = font.render(count_text, True, (0, 0, 0))
-            for dx, dy in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-                surface.blit(outline, (text_rect.x + dx, text_rect.y + dy))
-
-            surface.blit(text_surface, text_rect)
+            texts.blit_centered(surface, count_text, int(56 * scale), (255, 255, 255),
+                                (width // 2, safe_top + int(60 * scale)), outline=outline)
 
             # Climax text (near the end) - in bottom safe zone
             if progress > 0.8:
-                font_size = int(44 * scale)
-                font = pygame.font.Font(None, font_size)
-
                 if self.engagement_manager:
                     climax_text = self.engagement_manager.get_climax_text() or "Almost free!"
                 else:
                     climax_text = "Almost free!"
 
-                text_surface = font.render(climax_text, True, (100, 255, 100))
-                text_rect = text_surface.get_rect(center=(self.hd_width // 2, safe_bottom))
-
-                # Outline
-                outline = font.render(climax_text, True, (0, 0, 0))
-                for dx, dy in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-                    surface.blit(outline, (text_rect.x + dx, text_rect.y + dy))
-
-                surface.blit(text_surface, text_rect)
+                texts.blit_centered(surface, climax_text, int(44 * scale), (100, 255, 100),
+                                    (width // 2, safe_bottom), outline=outline)
 
         except Exception as e:
             logger.debug(f"UI error: {e}")
 
-    def _update_physics(self, dt: float):
-        # Paramètres de config
+    def _update_physics(self, dt: float, substeps: int = 1):
+        # Paramètres de config (résistance de l'air réglée par frame, répartie sur les sous-pas)
         gravity = self.config.get("gravity", 1200.0)
-        air_resistance = self.config.get("air_resistance", 0.9998)
+        air_resistance = self.config.get("air_resistance", 0.9998) ** (1.0 / substeps)
         restitution = self.config.get("restitution", 1.02)
         jitter_strength = self.config.get("jitter_strength", 40.0)
         max_velocity = self.config.get("max_velocity", 1400.0)
@@ -538,42 +738,22 @@ class ArcEscapeSimulator(IVideoGenerator):
 
     def _spawn_collision_particles(self, x: float, y: float, normal_angle: float, color: Tuple[int, int, int]):
         """Génère des particules lors d'une collision avec un arc"""
-        num_particles = random.randint(8, 15)
-        for _ in range(num_particles):
-            # Direction opposée à la normale + spread
-            angle = normal_angle + math.pi + random.uniform(-0.8, 0.8)
-            speed = random.uniform(150, 400)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            size = random.uniform(2, 5)
-            life = random.uniform(0.3, 0.6)
-            # Variation de couleur
-            r = min(255, color[0] + random.randint(-30, 50))
-            g = min(255, color[1] + random.randint(-30, 50))
-            b = min(255, color[2] + random.randint(-30, 50))
-            self.particles.append(Particle(x, y, vx, vy, (r, g, b), size, life))
+        num_particles = int(random.randint(8, 15) * self.config.get("particle_multiplier", 1.0))
+        # Direction opposée à la normale + spread, variation de couleur
+        direction = normal_angle + math.pi
+        self.particles.spawn_burst(x, y, num_particles, (direction - 0.8, direction + 0.8),
+                                   (150, 400), (2, 5), (0.3, 0.6), color, color_jitter=(-30, 50))
 
     def _spawn_passage_particles(self, x: float, y: float, color: Tuple[int, int, int]):
         """Génère des particules lors du passage dans un trou (effet célébration)"""
-        num_particles = random.randint(20, 35)
-        for _ in range(num_particles):
-            # Explosion radiale
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(200, 600)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed - 200  # Bias vers le haut
-            size = random.uniform(3, 7)
-            life = random.uniform(0.5, 1.0)
-            # Couleurs vives variées
-            hue_shift = random.uniform(-0.1, 0.1)
-            r = min(255, max(0, color[0] + random.randint(-20, 80)))
-            g = min(255, max(0, color[1] + random.randint(-20, 80)))
-            b = min(255, max(0, color[2] + random.randint(-20, 80)))
-            self.particles.append(Particle(x, y, vx, vy, (r, g, b), size, life))
+        num_particles = int(random.randint(20, 35) * self.config.get("particle_multiplier", 1.0))
+        # Explosion radiale, biais vers le haut, couleurs vives variées
+        self.particles.spawn_burst(x, y, num_particles, (0, math.pi * 2), (200, 600), (3, 7), (0.5, 1.0),
+                                   color, color_jitter=(-20, 80), vy_bias=-200)
 
     def _update_effects(self, dt: float):
         self.effects = [e for e in self.effects if e.update(dt)]
-        self.particles = [p for p in self.particles if p.update(dt)]
+        self.particles.update(dt)
 
 if __name__ == "__main__":
     print("🎯 ARC ESCAPE V4 (Supersampling Antialiasing) 🎯")
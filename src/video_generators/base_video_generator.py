@@ -5,22 +5,89 @@ Base class interface for all video generators.
 
 import os
 import time
+import pickle
+import random
 import logging
+import tempfile
+import shutil
 import pygame
 import subprocess
 import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from abc import ABC, abstractmethod
+from enum import Enum
 from typing import Dict, Any, Optional, List, Tuple, Callable
 from queue import Queue, Full, Empty
 from pathlib import Path
 import numpy as np
 
 from src.core.data_pipeline import TrendData, AudioEvent, VideoMetadata
+from src.utils.video.frame_ring import (
+    FrameBufferPool, FrameSpillRing, surface_pixel_format, copy_surface_pixels
+)
+from src.utils.video.simulation_log import SimulationLog
+from src.utils.video.encoder_profile import EncoderProfile, get_encoder_profile
 
 logger = logging.getLogger("TikSimPro")
 
+
+class RecordingPolicy(Enum):
+    """What record_frame does when the encoder queue is full"""
+    BLOCK = "block"   # Wait for the encoder - lossless, render runs at encoder speed
+    DROP = "drop"     # Drop the oldest queued frame and count it (breaks audio sync)
+    SPILL = "spill"   # Overflow frames into a memory-mapped ring file on disk
+
+
+def _render_segment_worker(snapshot: bytes, start_frame: int, end_frame: int,
+                           output_path: str, encoder_threads: int) -> Tuple[Optional[str], List[AudioEvent], Dict[str, Any]]:
+    """Process pool entry point: restore a simulation snapshot and render one segment"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    generator, random_state = pickle.loads(snapshot)
+    random.setstate(random_state)
+    generator.headless_mode = True
+    generator.encoder_threads = encoder_threads
+    generator.set_output_path(output_path)
+    return generator.render_segment(start_frame, end_frame)
+
+
+class ITwoPassGenerator(ABC):
+    """
+    Two-pass rendering hooks: a generator that implements them can run its
+    physics into a SimulationLog first (simulate) and draw the video from
+    the log afterwards (render_log). Mixed into an IVideoGenerator subclass.
+    """
+
+    @abstractmethod
+    def create_simulation_log(self) -> SimulationLog:
+        """Empty log with this generator's dtypes"""
+        pass
+
+    @abstractmethod
+    def record_log_frame(self, log: SimulationLog, frame: int) -> None:
+        """Store the state reached after simulate_frame into the log"""
+        pass
+
+    @abstractmethod
+    def restore_log_frame(self, log: SimulationLog, frame: int) -> None:
+        """Load the drawable state of a frame from the log"""
+        pass
+
+    @abstractmethod
+    def draw_frame(self, surface: pygame.Surface) -> bool:
+        """Draw the current state without advancing the simulation"""
+        pass
+
+
 class IVideoGenerator(ABC):
     """Interface for video generators with HIGH PERFORMANCE recording capabilities"""
+
+    # Runtime resources that are rebuilt rather than pickled into segment snapshots
+    TRANSIENT_ATTRIBUTES = (
+        "screen", "clock", "recording_surface", "font", "ffmpeg_process",
+        "frame_queue", "recording_thread", "frame_pool", "spill_ring",
+        "_memory_lock", "_scratch_surface", "simulation_log",
+    )
     
     def __init__(self, width: int = 1080, height: int = 1920, fps: int = 60, 
                  duration: float = 30.0, output_path: str = "output/video.mp4"):
@@ -51,6 +118,36 @@ class IVideoGenerator(ABC):
         self.fast_mode = True      # Skip frame rate limiting
         self.buffer_size = 60      # Much bigger buffer for smoother encoding
         self.use_numpy = True      # Fast array operations
+
+        # Frame transport to FFmpeg: "buffer" copies the surface pixels once into a
+        # pooled buffer in their native layout, "legacy" converts to RGB bytes
+        # (numpy or pygame.image.tostring depending on use_numpy)
+        self.frame_transport = "buffer"
+        self.frame_pool: Optional[FrameBufferPool] = None
+        self.input_pix_fmt = "rgb24"
+        self.frame_size = width * height * 3
+
+        # Segmented rendering: split the video across a process pool (1 = single process)
+        self.render_segments = 1
+        self.segment_workers: Optional[int] = None
+        self.encoder_threads = 0   # FFmpeg -threads (0 = all cores)
+        self._scratch_surface: Optional[pygame.Surface] = None
+
+        # Encoder settings - resolved from the per-host encoder profile unless set
+        self.encoder_profile: Optional[EncoderProfile] = None
+        self.use_gpu_encoder = False   # Hardware encoders are only benchmarked when allowed
+
+        # Two-pass mode: simulate everything into a SimulationLog, then draw it
+        self.two_pass = False
+        self.simulation_log: Optional[SimulationLog] = None
+
+        # Backpressure handling when the encoder falls behind
+        self.recording_policy = RecordingPolicy.BLOCK
+        self.spill_slots = 240     # Frames the spill ring can hold (SPILL policy)
+        self.spill_dir: Optional[str] = None
+        self.spill_ring: Optional[FrameSpillRing] = None
+        self._queued_in_memory = 0
+        self._memory_lock = threading.Lock()
         
         # Metadata and events
         self.audio_events = []
@@ -72,7 +169,11 @@ class IVideoGenerator(ABC):
             "frames_rendered": 0,
             "average_fps": 0,
             "render_time": 0,
-            "encoding_fps": 0
+            "encoding_fps": 0,
+            "frames_dropped": 0,
+            "frames_stalled": 0,
+            "frames_spilled": 0,
+            "stall_time": 0.0
         }
     
     def setup_pygame(self, display_scale: float = 0.3) -> bool:
@@ -117,8 +218,13 @@ class IVideoGenerator(ABC):
             logger.error(f"Failed to initialize pygame: {e}")
             return False
     
-    def setup_ffmpeg_recording(self, use_gpu: bool = True) -> bool:
-        """Setup HIGH PERFORMANCE FFmpeg recording"""
+    def setup_ffmpeg_recording(self, use_gpu: Optional[bool] = None) -> bool:
+        """
+        Setup HIGH PERFORMANCE FFmpeg recording
+
+        Args:
+            use_gpu: Allow hardware encoders (defaults to use_gpu_encoder)
+        """
         try:
             # Find FFmpeg
             ffmpeg_path = self._find_ffmpeg()
@@ -126,8 +232,8 @@ class IVideoGenerator(ABC):
                 logger.error("FFmpeg not found")
                 return False
             
-            # Get the BEST encoder available
-            encoder, preset, extra_args = self._get_best_encoder(False)  # Stable CPU encoder
+            # Fastest encoder settings meeting the quality target on this host
+            encoder, preset, extra_args = self._get_best_encoder(use_gpu)
             
             # Build OPTIMIZED FFmpeg command
             cmd = [
@@ -135,7 +241,7 @@ class IVideoGenerator(ABC):
                 
                 # Input settings - optimized for speed
                 '-f', 'rawvideo', '-vcodec', 'rawvideo',
-                '-pix_fmt', 'rgb24', '-s', f'{self.width}x{self.height}',
+                '-pix_fmt', self.input_pix_fmt, '-s', f'{self.width}x{self.height}',
                 '-r', str(self.fps), '-i', '-',
                 
                 # Output settings - optimized for speed
@@ -144,7 +250,7 @@ class IVideoGenerator(ABC):
                 '-pix_fmt', 'yuv420p',
                 
                 # Performance optimizations
-                '-threads', '0',  # Use all CPU cores
+                '-threads', str(self.encoder_threads),  # 0 = use all CPU cores
                 '-bf', '0',       # No B-frames for speed
                 '-g', str(self.fps),  # GOP size = fps
                 
@@ -167,7 +273,9 @@ class IVideoGenerator(ABC):
                 return False
             
             # Setup HIGH PERFORMANCE frame queue and thread
-            self.frame_queue = Queue(maxsize=self.buffer_size)
+            # SPILL bounds RAM itself and overflows to disk, so its queue only holds tokens
+            queue_size = 0 if self.recording_policy == RecordingPolicy.SPILL else self.buffer_size
+            self.frame_queue = Queue(maxsize=queue_size)
             self.recording_thread = threading.Thread(
                 target=self._high_performance_recording_worker, 
                 daemon=True,
@@ -187,55 +295,38 @@ class IVideoGenerator(ABC):
         import shutil
         return shutil.which('ffmpeg') or shutil.which('ffmpeg.exe')
     
-    def _get_best_encoder(self, use_gpu: bool = False) -> Tuple[str, str, List[str]]:
-        """Get BEST available encoder for maximum speed"""
-        try:
-            result = subprocess.run([self._find_ffmpeg(), '-encoders'], 
-                                  capture_output=True, text=True, timeout=5)
-            encoders = result.stdout
-            
-            if use_gpu:
-                # NVIDIA (best performance) - ULTRA FAST settings
-                if 'h264_nvenc' in encoders:
-                    return 'h264_nvenc', 'llhq', [
-                        '-b:v', '2000k',      # Even lower bitrate for stability
-                        '-maxrate', '3000k',  # Lower max bitrate
-                        '-bufsize', '4000k',  # Even smaller buffer
-                        '-rc', 'cbr',         # Constant bitrate
-                        '-rc-lookahead', '0', # No lookahead for speed
-                        '-2pass', '0',        # Disable 2-pass for speed
-                    ]
-                
-                # AMD - ULTRA FAST settings
-                elif 'h264_amf' in encoders:
-                    return 'h264_amf', 'speed', [
-                        '-b:v', '3000k',
-                        '-maxrate', '4000k',
-                        '-rc', 'cbr',
-                        '-quality', 'speed',
-                        '-usage', 'ultralowlatency',
-                    ]
-                
-                # Intel QuickSync - ULTRA FAST settings
-                elif 'h264_qsv' in encoders:
-                    return 'h264_qsv', 'veryfast', [
-                        '-b:v', '3000k',
-                        '-maxrate', '4000k',
-                        '-look_ahead', '0',
-                        '-low_power', '1',
-                    ]
-            
-            # Fallback to CPU with MAXIMUM speed settings
-            return 'libx264', 'superfast', [
-                '-crf', '18',           # Even lower quality for max speed
-                '-tune', 'zerolatency', # Zero latency
-                '-x264-params', 'ref=1:me=dia:subme=1:analyse=none:trellis=0:no-cabac:aq-mode=0:scenecut=0',
-            ]
-                
-        except Exception as e:
-            logger.warning(f"Encoder detection failed: {e}")
-            return 'libx264', 'ultrafast', ['-crf', '28']
-    
+    def _get_best_encoder(self, use_gpu: Optional[bool] = None) -> Tuple[str, str, List[str]]:
+        """Encoder, preset and extra options from the host's encoder profile"""
+        profile = self._resolve_encoder_profile(use_gpu)
+        return profile.encoder, profile.preset, list(profile.args)
+
+    def _resolve_encoder_profile(self, use_gpu: Optional[bool] = None) -> EncoderProfile:
+        """
+        Encoder profile for this generator: the one set explicitly, else the
+        per-host profile (read from the disk cache; benchmarked only when opted in).
+        """
+        if self.encoder_profile is None:
+            if use_gpu is None:
+                use_gpu = self.use_gpu_encoder
+            self.encoder_profile = get_encoder_profile(self._find_ffmpeg(), use_gpu)
+        return self.encoder_profile
+
+    def set_encoder_profile(self, profile=None, use_gpu: Optional[bool] = None) -> None:
+        """
+        Override the encoder settings.
+
+        Args:
+            profile: EncoderProfile or its dict form; None re-selects the host profile
+            use_gpu: Allow hardware encoders when selecting the host profile
+        """
+        if isinstance(profile, dict):
+            profile = EncoderProfile.from_dict(profile)
+        self.encoder_profile = profile
+        if use_gpu is not None:
+            self.use_gpu_encoder = use_gpu
+        if profile is not None:
+            logger.info(f"Encoder profile: {profile.describe()}")
+
     def _high_performance_recording_worker(self):
         """HIGH PERFORMANCE worker thread for FFmpeg frame feeding"""
         frames_written = 0
@@ -249,6 +340,12 @@ class IVideoGenerator(ABC):
                     if frame_data is None:
                         break
 
+                    spill_slot = None
+                    if isinstance(frame_data, int):
+                        # Spilled frame - payload lives in the ring file
+                        spill_slot = frame_data
+                        frame_data = self.spill_ring.read(spill_slot)
+
                     # Check if FFmpeg process is still alive
                     if self.ffmpeg_process is None or self.ffmpeg_process.poll() is not None:
                         logger.error("FFmpeg process died unexpectedly")
@@ -264,6 +361,14 @@ class IVideoGenerator(ABC):
                     self.ffmpeg_process.stdin.flush()  # Force flush each frame
                     frames_written += 1
 
+                    if spill_slot is not None:
+                        frame_data = None
+                        self.spill_ring.release(spill_slot)
+                    else:
+                        self._release_frame(frame_data)
+                        with self._memory_lock:
+                            self._queued_in_memory -= 1
+
                     # Update encoding FPS every 60 frames
                     if frames_written % 60 == 0:
                         elapsed = time.time() - start_time
@@ -292,6 +397,16 @@ class IVideoGenerator(ABC):
     
     def start_recording(self) -> bool:
         """Start HIGH PERFORMANCE recording"""
+        for key in ("frames_dropped", "frames_stalled", "frames_spilled"):
+            self.performance_stats[key] = 0
+        self.performance_stats["stall_time"] = 0.0
+        self._queued_in_memory = 0
+
+        self._setup_frame_transport()
+
+        if self.recording_policy == RecordingPolicy.SPILL:
+            self.spill_ring = FrameSpillRing(self.frame_size, self.spill_slots, self.spill_dir)
+
         if not self.setup_ffmpeg_recording():
             return False
         
@@ -301,6 +416,7 @@ class IVideoGenerator(ABC):
         
         logger.info(f"HIGH PERFORMANCE recording started: {self.total_frames} frames")
         logger.info(f"Target: {self.fps} FPS, Duration: {self.duration}s")
+        logger.info(f"Recording policy: {self.recording_policy.value}")
         return True
     
     def record_frame(self, surface: pygame.Surface) -> bool:
@@ -309,7 +425,18 @@ class IVideoGenerator(ABC):
             return False
         
         try:
-            if self.use_numpy:
+            stalled = False
+            if self.frame_pool is not None:
+                # Single copy of the surface pixels into a reusable buffer
+                frame_data = self.frame_pool.acquire(timeout=0)
+                if frame_data is None:
+                    stalled = True
+                    buffers = []
+                    if not self._wait_for_encoder(lambda timeout: buffers.append(self._acquire_frame(timeout))):
+                        return False
+                    frame_data = buffers[0]
+                copy_surface_pixels(surface, frame_data, self.input_pix_fmt)
+            elif self.use_numpy:
                 # ULTRA FAST numpy conversion
                 frame_array = pygame.surfarray.array3d(surface)
                 # Transpose for correct orientation (pygame uses (width, height, channels))
@@ -320,16 +447,8 @@ class IVideoGenerator(ABC):
                 # Standard pygame conversion (slower)
                 frame_data = pygame.image.tostring(surface, 'RGB')
             
-            # Add to queue NON-BLOCKING for maximum speed
-            try:
-                self.frame_queue.put_nowait(frame_data)
-            except Full:
-                # Queue full - FORCE space by dropping oldest frame
-                try:
-                    self.frame_queue.get_nowait()  # Drop oldest
-                    self.frame_queue.put_nowait(frame_data)  # Add new
-                except Empty:
-                    pass  # Queue became empty, just continue
+            if not self._enqueue_frame(frame_data, stalled):
+                return False
             
             self.current_frame += 1
             return True
@@ -338,6 +457,158 @@ class IVideoGenerator(ABC):
             logger.error(f"Frame recording failed: {e}")
             return False
     
+    def _setup_frame_transport(self) -> None:
+        """Pick the raw pixel format sent to FFmpeg and size the buffer pool"""
+        self.frame_pool = None
+        self.input_pix_fmt = "rgb24"
+        bytes_per_pixel = 3
+
+        if self.frame_transport == "buffer" and self.recording_surface is not None:
+            self.input_pix_fmt, bytes_per_pixel = surface_pixel_format(self.recording_surface)
+        self.frame_size = self.width * self.height * bytes_per_pixel
+
+        if self.frame_transport == "buffer":
+            # Queue + one frame being written + one being filled
+            self.frame_pool = FrameBufferPool(self.frame_size, self.buffer_size + 2)
+
+        logger.info(f"Frame transport: {self.frame_transport} ({self.input_pix_fmt}, "
+                    f"{self.frame_size / (1024*1024):.1f} MB/frame)")
+
+    def _acquire_frame(self, timeout: float) -> np.ndarray:
+        """Blocking pool acquire for _wait_for_encoder"""
+        buffer = self.frame_pool.acquire(timeout=timeout)
+        if buffer is None:
+            raise Full()
+        return buffer
+
+    def _release_frame(self, frame_data) -> None:
+        """Give a pooled buffer back once it is no longer queued"""
+        if self.frame_pool is not None and isinstance(frame_data, np.ndarray):
+            self.frame_pool.release(frame_data)
+
+    def _discard_queued(self, frame_data) -> None:
+        """Drop a frame taken off the queue without encoding it"""
+        if frame_data is None:
+            return
+        if isinstance(frame_data, int):
+            if self.spill_ring:
+                self.spill_ring.release(frame_data)
+        else:
+            self._release_frame(frame_data)
+            with self._memory_lock:
+                self._queued_in_memory -= 1
+        self.performance_stats["frames_dropped"] += 1
+
+    def _enqueue_frame(self, frame_data, stalled: bool = False) -> bool:
+        """
+        Hand a frame to the encoder thread according to the recording policy.
+        `stalled`: the frame already waited for a pool buffer (stall counted).
+        """
+        if self.recording_policy == RecordingPolicy.SPILL:
+            return self._enqueue_spill(frame_data, stalled)
+
+        with self._memory_lock:
+            self._queued_in_memory += 1
+
+        # Fast path - encoder is keeping up
+        try:
+            self.frame_queue.put_nowait(frame_data)
+            return True
+        except Full:
+            pass
+
+        if self.recording_policy == RecordingPolicy.DROP:
+            # Queue full - FORCE space by dropping oldest frame
+            try:
+                self._discard_queued(self.frame_queue.get_nowait())  # Drop oldest
+                self.frame_queue.put_nowait(frame_data)  # Add new
+            except (Empty, Full):
+                pass  # Worker raced us, just continue
+            return True
+
+        # BLOCK - wait for the encoder, never lose a frame
+        if not self._wait_for_encoder(lambda timeout: self.frame_queue.put(frame_data, timeout=timeout),
+                                      stalled):
+            with self._memory_lock:
+                self._queued_in_memory -= 1
+            self._release_frame(frame_data)
+            return False
+        return True
+
+    def _enqueue_spill(self, frame_data, stalled: bool = False) -> bool:
+        """SPILL policy: keep buffer_size frames in RAM, overflow into the ring file"""
+        with self._memory_lock:
+            in_memory = self._queued_in_memory < self.buffer_size
+            if in_memory:
+                self._queued_in_memory += 1
+
+        if in_memory:
+            # The queue itself is unbounded in SPILL mode, RAM use is capped by the counter
+            self.frame_queue.put_nowait(frame_data)
+            return True
+
+        slots = []
+
+        def spill(timeout: float):
+            slot = self.spill_ring.write(frame_data, timeout=timeout)
+            if slot is None:
+                raise Full()
+            slots.append(slot)
+
+        try:
+            spill(0)
+        except Full:
+            # Ring full as well - fall back to waiting on the encoder
+            if not self._wait_for_encoder(spill, stalled):
+                self._release_frame(frame_data)
+                return False
+        slot = slots[0]
+        self._release_frame(frame_data)
+
+        self.performance_stats["frames_spilled"] += 1
+        self.frame_queue.put_nowait(slot)
+        return True
+
+    def _wait_for_encoder(self, attempt: Callable[[float], Any], stalled: bool = False) -> bool:
+        """
+        Retry a blocking hand-off until it succeeds or the encoder thread dies.
+        The time spent waiting is accounted as a stall - counted once per
+        frame: `stalled` when the frame already waited earlier.
+        """
+        if not stalled:
+            self.performance_stats["frames_stalled"] += 1
+        stall_start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    attempt(0.5)
+                    return True
+                except Full:
+                    if self.recording_thread is None or not self.recording_thread.is_alive():
+                        logger.error("Encoder thread stopped while waiting for queue space")
+                        return False
+        finally:
+            self.performance_stats["stall_time"] += time.perf_counter() - stall_start
+
+    def set_recording_policy(self, policy, spill_slots: Optional[int] = None,
+                             spill_dir: Optional[str] = None) -> None:
+        """
+        Select how record_frame reacts when the encoder falls behind.
+
+        Args:
+            policy: RecordingPolicy or its string value ("block", "drop", "spill")
+            spill_slots: Capacity of the on-disk ring for the SPILL policy
+            spill_dir: Directory for the ring file (system temp by default)
+        """
+        if isinstance(policy, str):
+            policy = RecordingPolicy(policy)
+        self.recording_policy = policy
+        if spill_slots is not None:
+            self.spill_slots = spill_slots
+        if spill_dir is not None:
+            self.spill_dir = spill_dir
+        logger.info(f"Recording policy: {policy.value}")
+
     def stop_recording(self) -> bool:
         """Stop recording with proper cleanup"""
         if not self.recording:
@@ -346,17 +617,18 @@ class IVideoGenerator(ABC):
         self.recording = False
         logger.info("Stopping recording and finalizing video...")
 
-        # Signal recording thread to stop
+        # Signal recording thread to stop (lossless policies give the encoder time to drain)
+        stop_timeout = 5.0 if self.recording_policy == RecordingPolicy.DROP else 120.0
         try:
-            self.frame_queue.put(None, timeout=5.0)
+            self.frame_queue.put(None, timeout=stop_timeout)
         except Full:
             logger.warning("Queue full when trying to signal stop")
-            # Force clear and retry
+            # Force clear and retry - the dropped frames give their buffers back
             try:
                 while not self.frame_queue.empty():
-                    self.frame_queue.get_nowait()
+                    self._discard_queued(self.frame_queue.get_nowait())
                 self.frame_queue.put(None, timeout=1.0)
-            except:
+            except (Full, Empty):
                 pass
 
         # Wait for recording thread with reasonable timeout
@@ -365,6 +637,10 @@ class IVideoGenerator(ABC):
             if self.recording_thread.is_alive():
                 logger.warning("Recording thread did not finish in time")
 
+        if self.spill_ring:
+            self.spill_ring.close()
+            self.spill_ring = None
+
         # Wait for FFmpeg to finish
         if self.ffmpeg_process:
             try:
@@ -477,6 +753,9 @@ class IVideoGenerator(ABC):
         logger.info(f"  Frames rendered: {stats['frames_rendered']}")
         logger.info(f"  Average render FPS: {stats['average_fps']:.1f}")
         logger.info(f"  Encoding FPS: {stats['encoding_fps']:.1f}")
+        logger.info(f"  Recording policy: {self.recording_policy.value} | "
+                    f"dropped: {stats['frames_dropped']}, stalled: {stats['frames_stalled']} "
+                    f"({stats['stall_time']:.1f}s), spilled: {stats['frames_spilled']}")
         logger.info(f"  Total time: {stats['render_time']:.1f}s")
     
     # Abstract methods that subclasses must implement
@@ -499,6 +778,30 @@ class IVideoGenerator(ABC):
     def initialize_simulation(self) -> bool:
         """Initialize the simulation objects and state"""
         pass
+
+    def simulate_frame(self, dt: float) -> bool:
+        """
+        Advance the simulation by one frame without producing pixels.
+
+        Generators that keep physics apart from drawing override this; the
+        default renders into a throwaway surface.
+        """
+        if self._scratch_surface is None:
+            self._scratch_surface = pygame.Surface((self.width, self.height))
+        return self.render_frame(self._scratch_surface, self.current_frame, dt)
+
+    # Segment snapshots
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in self.TRANSIENT_ATTRIBUTES:
+            if name in state:
+                state[name] = None
+        state["recording"] = False
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._memory_lock = threading.Lock()
     
     # Default implementations
     def set_output_path(self, path: str) -> None:
@@ -516,8 +819,265 @@ class IVideoGenerator(ABC):
         self.use_numpy = use_numpy
         logger.info(f"Performance mode: headless={headless}, fast={fast}, numpy={use_numpy}")
     
+    def set_segmented_rendering(self, segments: int, workers: Optional[int] = None) -> None:
+        """
+        Render the video as independent segments in a process pool.
+
+        Args:
+            segments: Number of segments (1 disables segmented rendering)
+            workers: Pool size (defaults to min(segments, cpu_count))
+        """
+        self.render_segments = max(1, int(segments))
+        self.segment_workers = workers
+        logger.info(f"Segmented rendering: {self.render_segments} segments, workers={workers or 'auto'}")
+
+    def _segment_bounds(self) -> List[Tuple[int, int]]:
+        """Split [0, total_frames) into contiguous frame ranges"""
+        count = max(1, min(self.render_segments, self.total_frames))
+        edges = [round(i * self.total_frames / count) for i in range(count + 1)]
+        return [(edges[i], edges[i + 1]) for i in range(count) if edges[i] < edges[i + 1]]
+
+    def _capture_snapshot(self) -> bytes:
+        """Pickle the simulation state (without recorded events) and the RNG state"""
+        events = self.audio_events
+        self.audio_events = []
+        try:
+            return pickle.dumps((self, random.getstate()), protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            self.audio_events = events
+
+    def render_segment(self, start_frame: int, end_frame: int) -> Tuple[Optional[str], List[AudioEvent], Dict[str, Any]]:
+        """
+        Render frames [start_frame, end_frame) from the current state into output_path.
+
+        Returns:
+            (segment path or None, audio events of the segment, performance stats)
+        """
+        if not self.setup_pygame():
+            return None, [], self.performance_stats
+
+        self.total_frames = end_frame
+        if not self.start_recording():
+            return None, [], self.performance_stats
+        self.current_frame = start_frame
+
+        dt = 1.0 / self.fps
+        while not self.is_finished():
+            self.recording_surface.fill((0, 0, 0))
+            if not self.render_frame(self.recording_surface, self.current_frame, dt):
+                logger.error(f"Frame rendering failed at frame {self.current_frame}")
+                break
+            if not self.record_frame(self.recording_surface):
+                break
+
+        success = self.stop_recording()
+        self.update_performance_stats()
+        self.performance_stats["frames_rendered"] = self.current_frame - start_frame
+        complete = success or (os.path.exists(self.output_path) and os.path.getsize(self.output_path) > 0)
+        return (self.output_path if complete and self.current_frame >= end_frame else None,
+                self.audio_events, self.performance_stats)
+
+    def _concat_segments(self, segment_paths: List[str]) -> bool:
+        """Join encoded segments with the FFmpeg concat demuxer (stream copy)"""
+        list_path = f"{self.output_path}.segments.txt"
+        with open(list_path, "w") as f:
+            for path in segment_paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        try:
+            cmd = [self._find_ffmpeg(), '-y', '-f', 'concat', '-safe', '0',
+                   '-i', list_path, '-c', 'copy', self.output_path]
+            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+            if result.returncode != 0:
+                logger.error(f"FFmpeg concat failed: {result.stderr[-1000:]}")
+                return False
+            return True
+        finally:
+            os.remove(list_path)
+
+    def generate_segmented(self) -> Optional[str]:
+        """
+        Generate the video as segments rendered in parallel.
+
+        A physics-only pass snapshots the state at every segment boundary,
+        each worker process renders and encodes its segment from its
+        snapshot, then the segments are concatenated and the audio events
+        merged in timestamp order.
+        """
+        start_time = time.time()
+        try:
+            if not self.initialize_simulation():
+                return None
+
+            bounds = self._segment_bounds()
+            dt = 1.0 / self.fps
+
+            # Resolved here so every segment encodes identically (concat stream-copies them)
+            # and the workers never benchmark concurrently
+            self._resolve_encoder_profile()
+
+            # Physics-only pass up to the last boundary
+            snapshots = []
+            frame = 0
+            for segment_start, _ in bounds:
+                while frame < segment_start:
+                    self.current_frame = frame
+                    if not self.simulate_frame(dt):
+                        logger.error(f"Simulation failed at frame {frame}")
+                        return None
+                    frame += 1
+                self.current_frame = frame
+                snapshots.append(self._capture_snapshot())
+
+            workers = self.segment_workers or min(len(bounds), os.cpu_count() or 1)
+            encoder_threads = max(1, (os.cpu_count() or 1) // workers)
+            segment_dir = tempfile.mkdtemp(prefix="tiksim_segments_")
+            try:
+                ext = os.path.splitext(self.output_path)[1] or ".mp4"
+                segment_paths = [os.path.join(segment_dir, f"segment_{i:03d}{ext}") for i in range(len(bounds))]
+
+                logger.info(f"Rendering {len(bounds)} segments on {workers} workers "
+                            f"(state pass: {time.time() - start_time:.2f}s)")
+
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                    futures = [
+                        pool.submit(_render_segment_worker, snapshot, segment_start, segment_end,
+                                    path, encoder_threads)
+                        for snapshot, (segment_start, segment_end), path in zip(snapshots, bounds, segment_paths)
+                    ]
+                    results = [future.result() for future in futures]
+
+                events = []
+                for index, (path, segment_events, stats) in enumerate(results):
+                    if path is None:
+                        logger.error(f"Segment {index} failed")
+                        return None
+                    events.extend(segment_events)
+                    for key in ("frames_dropped", "frames_stalled", "frames_spilled", "stall_time"):
+                        self.performance_stats[key] += stats.get(key, 0)
+
+                if not self._concat_segments(segment_paths):
+                    return None
+            finally:
+                # Also when a worker raised: segments already rendered stay in the directory
+                shutil.rmtree(segment_dir, ignore_errors=True)
+
+            # Stable sort keeps per-segment order for simultaneous events
+            self.audio_events = sorted(events, key=lambda event: event.time)
+            self.current_frame = bounds[-1][1]
+
+            elapsed = time.time() - start_time
+            self.performance_stats["frames_rendered"] = self.current_frame
+            self.performance_stats["render_time"] = elapsed
+            self.performance_stats["average_fps"] = self.current_frame / elapsed if elapsed > 0 else 0
+            logger.info(f"Segmented render finished: {self.current_frame} frames in {elapsed:.1f}s "
+                        f"({self.performance_stats['average_fps']:.1f} FPS)")
+
+            if os.path.exists(self.output_path) and os.path.getsize(self.output_path) > 0:
+                return self.output_path
+            return None
+
+        except Exception as e:
+            logger.error(f"Segmented video generation failed: {e}")
+            return None
+
+    def simulate(self) -> Optional[SimulationLog]:
+        """
+        Physics-only pass: run the whole simulation and record every frame.
+
+        Audio events are available (get_audio_events) as soon as this returns,
+        before any pixel is drawn.
+        """
+        if not isinstance(self, ITwoPassGenerator):
+            logger.error(f"{self.__class__.__name__} does not support two-pass rendering")
+            return None
+        if not self.initialize_simulation():
+            return None
+
+        log = self.create_simulation_log()
+
+        start_time = time.time()
+        dt = 1.0 / self.fps
+        self.audio_events = []
+        for frame in range(self.total_frames):
+            self.current_frame = frame
+            if not self.simulate_frame(dt):
+                logger.error(f"Simulation failed at frame {frame}")
+                return None
+            self.record_log_frame(log, frame)
+        self.current_frame = self.total_frames
+
+        log.audio_events = list(self.audio_events)
+        log.finalize()
+        self.simulation_log = log
+        logger.info(f"Simulation pass: {self.total_frames} frames in {time.time() - start_time:.2f}s "
+                    f"({log.nbytes() / (1024*1024):.1f} MB log, {len(log.audio_events)} audio events)")
+        return log
+
+    def render_log(self, log: SimulationLog, start_frame: int = 0,
+                   end_frame: Optional[int] = None) -> Optional[str]:
+        """
+        Drawing pass: turn frames [start_frame, end_frame) of a log into video.
+        No physics runs here, so any frame range can be rendered independently.
+        """
+        if not isinstance(self, ITwoPassGenerator):
+            logger.error(f"{self.__class__.__name__} does not support two-pass rendering")
+            return None
+        end_frame = log.frame_count if end_frame is None else min(end_frame, log.frame_count)
+        try:
+            if not self.setup_pygame():
+                return None
+
+            self.total_frames = end_frame
+            if not self.start_recording():
+                return None
+            self.current_frame = start_frame
+
+            while not self.is_finished():
+                self.restore_log_frame(log, self.current_frame)
+                self.recording_surface.fill((0, 0, 0))
+                if not self.draw_frame(self.recording_surface):
+                    logger.error(f"Frame drawing failed at frame {self.current_frame}")
+                    break
+                if not self.record_frame(self.recording_surface):
+                    break
+                if not self.headless_mode:
+                    self.update_display()
+
+            self.stop_recording()
+            self.audio_events = [event for event in log.audio_events
+                                 if start_frame / self.fps <= event.time < end_frame / self.fps]
+            self.cleanup()
+
+            if os.path.exists(self.output_path) and os.path.getsize(self.output_path) > 0:
+                return self.output_path
+            return None
+
+        except Exception as e:
+            logger.error(f"Log rendering failed: {e}")
+            self.cleanup()
+            return None
+
+    def generate_two_pass(self) -> Optional[str]:
+        """Simulate the whole video first, then draw it from the log"""
+        if not isinstance(self, ITwoPassGenerator):
+            logger.warning(f"{self.__class__.__name__} does not support two-pass rendering, "
+                           f"falling back to single-pass")
+            self.two_pass = False
+            return self.generate()
+        log = self.simulate()
+        if log is None:
+            return None
+        return self.render_log(log)
+
     def generate(self) -> Optional[str]:
         """Generate the complete video with MAXIMUM PERFORMANCE"""
+        if self.render_segments > 1:
+            return self.generate_segmented()
+        if self.two_pass:
+            return self.generate_two_pass()
+
         try:
             logger.info("Starting HIGH PERFORMANCE video generation...")
             
@@ -11,15 +11,30 @@ import colorsys
 from typing import Dict, Any, Optional, Tuple, List
 import logging
 import os
+import numpy as np
 
-from src.video_generators.base_video_generator import IVideoGenerator
+from src.video_generators.base_video_generator import IVideoGenerator, ITwoPassGenerator
 from src.core.data_pipeline import TrendData, AudioEvent
-from src.utils.video.particles import SimpleParticle, ParticleSpawner
+from src.utils.video.particles import ParticlePool, ParticleSpawner
 from src.utils.video.background_manager import BackgroundManager, BackgroundMode
 from src.utils.video.engagement_texts import EngagementTextManager, VideoType
+from src.utils.video.simulation_log import SimulationLog
+from src.utils.video.text_cache import get_text_cache
 
 logger = logging.getLogger("TikSimPro")
 
+# Format du SimulationLog (rendu en deux passes)
+FRAME_DTYPE = np.dtype([
+    ("time", "f8"), ("container_hue", "f8"), ("bounce_count", "i4"),
+    ("ball_x", "f8"), ("ball_y", "f8"), ("ball_vx", "f8"), ("ball_vy", "f8"),
+    ("ball_size", "f8"), ("ball_hue", "f8"),
+    # Entrée ajoutée à trail_history pendant cette frame
+    ("trail_x", "f8"), ("trail_y", "f8"), ("trail_size", "f8"), ("trail_hue", "f8"),
+])
+PARTICLE_DTYPE = np.dtype([
+    ("x", "f8"), ("y", "f8"), ("size", "f8"), ("life", "f8"), ("max_life", "f8"), ("color", "i2", 3),
+])
+
 class Vector2D:
     def __init__(self, x, y):
         self.x = x
@@ -33,7 +48,8 @@ class Velocity:
 class CleanBounce:
     """Balle avec physique triangulaire intéressante"""
     
-    def __init__(self, pos: Vector2D, vel: Velocity, size: float = 15.0):
+    def __init__(self, pos: Vector2D, vel: Velocity, size: float = 15.0,
+                 hue: Optional[float] = None):
         
         self.pos = pos
         self.vel = vel
@@ -42,8 +58,8 @@ class CleanBounce:
         self.max_speed = 1800  # Vitesse max contrôlée
         self.max_size = 180
 
-        # Couleur simple
-        self.hue = random.uniform(0, 360)
+        # Couleur simple (tirée au hasard si absente)
+        self.hue = random.uniform(0, 360) if hue is None else hue
         self.hue_speed = 120
         
         # === PHYSIQUE ÉNERGIQUE MAIS CONTRÔLÉE ===
@@ -158,8 +174,14 @@ class CleanBounce:
             # Classic ball
             pygame.draw.circle(surface, color, pos, int(self.size))
 
-class GravityFallsSimulator(IVideoGenerator):
+class GravityFallsSimulator(IVideoGenerator, ITwoPassGenerator):
     """🎯 Simulateur propre avec historique des positions 🎯"""
+
+    TRANSIENT_ATTRIBUTES = IVideoGenerator.TRANSIENT_ATTRIBUTES + ("_trail_layer",)
+
+    # Couleur transparente du calque de trail : jamais produite par les cercles
+    # (noir pur ou couleur HSV à valeur 1.0, donc une composante à 255)
+    TRAIL_COLORKEY = (1, 1, 1)
     
     def __init__(self, width=1080, height=1920, fps=60, duration=30):
         super().__init__(width, height, fps, duration)
@@ -185,13 +207,19 @@ class GravityFallsSimulator(IVideoGenerator):
         self._physics_config = {}
 
         # Particle system
-        self.particles: List[SimpleParticle] = []
+        self.particles = ParticlePool()
         self.enable_particles = True
+        self.particle_multiplier = 1.0  # Multiplie le nombre de particules par collision
 
         # Trail history - store (x, y, size, hue) for each frame
         self.trail_history: List[Tuple[float, float, float, float]] = []
         self.trail_max_length = 0  # 0 = unlimited, stores all positions
 
+        # Calque persistant du trail : seuls les nouveaux points y sont dessinés
+        self._trail_layer: Optional[pygame.Surface] = None
+        self._trail_drawn = 0
+        self._restored_frame = -1
+
         # Background manager
         self.background_manager = BackgroundManager(width, height, BackgroundMode.ANIMATED_GRADIENT)
         self.background_manager.configure({"mode": BackgroundMode.ANIMATED_GRADIENT})
@@ -228,6 +256,12 @@ class GravityFallsSimulator(IVideoGenerator):
             # Configure particles
             if "enable_particles" in config:
                 self.enable_particles = config["enable_particles"]
+            if "particle_multiplier" in config:
+                self.particle_multiplier = max(0.0, float(config["particle_multiplier"]))
+
+            # Trail borné (0 = historique complet)
+            if "trail_max_length" in config:
+                self.trail_max_length = max(0, int(config["trail_max_length"]))
 
             if self._physics_config:
                 logger.info(f"GravityFalls configuré avec physique: {self._physics_config}")
@@ -250,6 +284,9 @@ class GravityFallsSimulator(IVideoGenerator):
         try:
             # Clear trail history for fresh start
             self.trail_history = []
+            self._reset_trail_layer()
+            self._restored_frame = -1
+            self.particles = ParticlePool(seed=random.getrandbits(32))
 
             # Position de départ naturelle
             center_x, center_y = self.container_center
@@ -279,6 +316,14 @@ class GravityFallsSimulator(IVideoGenerator):
             if "bounce_energy_boost" in self._physics_config:
                 self.ball.bounce_energy_boost = self._physics_config["bounce_energy_boost"]
 
+            # Choisir les textes dès maintenant pour que le dessin ne consomme pas le RNG
+            if self._intro_text is None:
+                if self.engagement_manager:
+                    self._intro_text = self.engagement_manager.get_intro_text()
+                    self.engagement_manager.get_climax_text()
+                else:
+                    self._intro_text = "BALL GETS BIGGER!"
+
             logger.info(f"Simulation initialisée - gravity={self.ball.gravity}, restitution={self.ball.restitution}")
             return True
 
@@ -289,6 +334,11 @@ class GravityFallsSimulator(IVideoGenerator):
     # overwrite to avoid cleaning screen in this case
     def generate(self) -> Optional[str]:
         """Generate the complete video with MAXIMUM PERFORMANCE"""
+        if self.render_segments > 1:
+            return self.generate_segmented()
+        if self.two_pass:
+            return self.generate_two_pass()
+
         try:
             logger.info("Starting HIGH PERFORMANCE video generation...")
             
@@ -365,95 +415,191 @@ class GravityFallsSimulator(IVideoGenerator):
     def render_frame(self, surface: pygame.Surface, frame_number: int, dt: float) -> bool:
         """Rendu avec historique des positions du bord"""
         try:
-            self.time_elapsed += dt
-
-            # 0. Render background (replaces black fill)
-            self.background_manager.render(surface, self.time_elapsed)
-
-            # Couleur actuelle du container
-            self.container_hue += 90 * (1/60)  # Changement lent
-            self.container_hue = self.container_hue % 360
-
-            r, g, b = colorsys.hsv_to_rgb(self.container_hue/360, 0.9, 0.8)
-            current_container_color = (int(r*255), int(g*255), int(b*255))
-
-            # 1. Store current ball position in trail history
-            if self.ball:
-                self.trail_history.append((
-                    self.ball.pos.x,
-                    self.ball.pos.y,
-                    self.ball.size,
-                    self.ball.hue
-                ))
-
-            # 2. Redraw entire trail history (persistent tracer)
-            for trail_x, trail_y, trail_size, trail_hue in self.trail_history[:-1]:  # All except current
-                # Get color for this trail point
-                tr, tg, tb = colorsys.hsv_to_rgb(trail_hue/360, 1.0, 1.0)
-                trail_color = (int(tr*255), int(tg*255), int(tb*255))
-                pos = (int(trail_x), int(trail_y))
-                # Draw border only (tracer effect)
-                pygame.draw.circle(surface, (0, 0, 0), pos, int(trail_size))
-                pygame.draw.circle(surface, trail_color, pos, int(trail_size), width=2)
-
-            # 3. Mettre à jour la balle
-            if self.ball:
-                collision = self.ball.update(dt, self.container_center, self.container_radius, self.container_hue)
-                if collision:
-                    self.bounce_count += 1
-                    self.add_audio_event("collision",
-                                       position=(self.ball.pos.x, self.ball.pos.y),
-                                       params={
-                                           "volume": 0.5,
-                                           "bounce_count": self.bounce_count,
-                                           "note_index": self.bounce_count  # For melody sync
-                                       })
-
-                    # Spawn particles on collision
-                    if self.enable_particles:
-                        # Calculate collision normal angle
-                        dx = self.ball.pos.x - self.container_center[0]
-                        dy = self.ball.pos.y - self.container_center[1]
-                        normal_angle = math.atan2(dy, dx)
-
-                        # Spawn particles with ball color
-                        new_particles = ParticleSpawner.spawn_collision_particles(
-                            self.ball.pos.x, self.ball.pos.y,
-                            normal_angle,
-                            self.ball.get_color(),
-                            count=random.randint(8, 15),
-                            speed_range=(150, 400),
-                            life_range=(0.3, 0.6)
-                        )
-                        self.particles.extend(new_particles)
-
-            # 4. Update and render particles
-            self.particles = [p for p in self.particles if p.update(dt)]
-            for particle in self.particles:
-                particle.render(surface)
-
-            # 5. Dessiner le container actuel
-            pygame.draw.circle(surface, current_container_color, self.container_center, int(self.container_radius), 10)
-
-            # 6. Dessiner la balle actuelle (par dessus le trail)
-            if self.ball:
-                self.ball.render(surface)
-
-            # 7. UI simple
-            self._render_ui(surface)
-
-            return True
+            self.simulate_frame(dt)
+            return self.draw_frame(surface)
 
         except Exception as e:
             logger.error(f"Erreur rendu frame {frame_number}: {e}")
             return False
+
+    def simulate_frame(self, dt: float) -> bool:
+        """Physique seule (balle, couleur, particules) - aucun dessin"""
+        self.time_elapsed += dt
+
+        # Couleur actuelle du container
+        self.container_hue += 90 * (1/60)  # Changement lent
+        self.container_hue = self.container_hue % 360
+
+        # 1. Store current ball position in trail history
+        if self.ball:
+            self.trail_history.append((
+                self.ball.pos.x,
+                self.ball.pos.y,
+                self.ball.size,
+                self.ball.hue
+            ))
+            # Mode borné : seuls les N derniers points (+ le courant) sont gardés
+            if self.trail_max_length and len(self.trail_history) > self.trail_max_length + 1:
+                del self.trail_history[0]
+
+        # 2. Mettre à jour la balle
+        if self.ball:
+            collision = self.ball.update(dt, self.container_center, self.container_radius, self.container_hue)
+            if collision:
+                self.bounce_count += 1
+                self.add_audio_event("collision",
+                                   position=(self.ball.pos.x, self.ball.pos.y),
+                                   params={
+                                       "volume": 0.5,
+                                       "bounce_count": self.bounce_count,
+                                       "note_index": self.bounce_count  # For melody sync
+                                   })
+
+                # Spawn particles on collision
+                if self.enable_particles:
+                    # Calculate collision normal angle
+                    dx = self.ball.pos.x - self.container_center[0]
+                    dy = self.ball.pos.y - self.container_center[1]
+                    normal_angle = math.atan2(dy, dx)
+
+                    # Spawn particles with ball color
+                    ParticleSpawner.spawn_collision_particles(
+                        self.particles,
+                        self.ball.pos.x, self.ball.pos.y,
+                        normal_angle,
+                        self.ball.get_color(),
+                        count=int(random.randint(8, 15) * self.particle_multiplier),
+                        speed_range=(150, 400),
+                        life_range=(0.3, 0.6)
+                    )
+
+        # 3. Update particles
+        self.particles.update(dt)
+        return True
+
+    def draw_frame(self, surface: pygame.Surface) -> bool:
+        """Dessine l'état courant de la simulation"""
+        # 0. Render background (replaces black fill)
+        self.background_manager.render(surface, self.time_elapsed)
+
+        r, g, b = colorsys.hsv_to_rgb(self.container_hue/360, 0.9, 0.8)
+        current_container_color = (int(r*255), int(g*255), int(b*255))
+
+        # 1. Trail history (persistent tracer)
+        self._render_trail(surface)
+
+        # 2. Render particles
+        self.particles.render(surface)
+
+        # 3. Dessiner le container actuel
+        pygame.draw.circle(surface, current_container_color, self.container_center, int(self.container_radius), 10)
+
+        # 4. Dessiner la balle actuelle (par dessus le trail)
+        if self.ball:
+            self.ball.render(surface)
+
+        # 5. UI simple
+        self._render_ui(surface)
+
+        return True
     
+    @staticmethod
+    def _draw_trail_point(surface: pygame.Surface, point: Tuple[float, float, float, float]):
+        """Dessine un point du trail (disque noir + bord couleur)"""
+        trail_x, trail_y, trail_size, trail_hue = point
+        tr, tg, tb = colorsys.hsv_to_rgb(trail_hue/360, 1.0, 1.0)
+        trail_color = (int(tr*255), int(tg*255), int(tb*255))
+        pos = (int(trail_x), int(trail_y))
+        # Draw border only (tracer effect)
+        pygame.draw.circle(surface, (0, 0, 0), pos, int(trail_size))
+        pygame.draw.circle(surface, trail_color, pos, int(trail_size), width=2)
+
+    def _reset_trail_layer(self):
+        """Force la reconstruction du calque au prochain rendu"""
+        self._trail_layer = None
+        self._trail_drawn = 0
+
+    def _render_trail(self, surface: pygame.Surface):
+        """
+        Dessine tous les points du trail sauf le courant, à coût constant par frame :
+        - historique complet : calque persistant, seuls les nouveaux points y sont ajoutés
+        - historique borné : les trail_max_length derniers points sont redessinés
+        """
+        if self.trail_max_length:
+            for point in self.trail_history[-(self.trail_max_length + 1):-1]:
+                self._draw_trail_point(surface, point)
+            return
+
+        pending = len(self.trail_history) - 1  # All except current
+        if (self._trail_layer is None or self._trail_layer.get_size() != surface.get_size()
+                or self._trail_drawn > pending):
+            self._trail_layer = pygame.Surface(surface.get_size())
+            self._trail_layer.fill(self.TRAIL_COLORKEY)
+            self._trail_layer.set_colorkey(self.TRAIL_COLORKEY)
+            self._trail_drawn = 0
+
+        for point in self.trail_history[self._trail_drawn:pending]:
+            self._draw_trail_point(self._trail_layer, point)
+        self._trail_drawn = max(self._trail_drawn, pending)
+
+        surface.blit(self._trail_layer, (0, 0))
+
+    def create_simulation_log(self) -> SimulationLog:
+        log = SimulationLog(self.fps, self.total_frames, FRAME_DTYPE)
+        log.add_channel("particles", PARTICLE_DTYPE)
+        log.meta = {"generator": self.__class__.__name__, "width": self.width, "height": self.height}
+        return log
+
+    def record_log_frame(self, log: SimulationLog, frame: int) -> None:
+        state = log.frames[frame]
+        state["time"] = self.time_elapsed
+        state["container_hue"] = self.container_hue
+        state["bounce_count"] = self.bounce_count
+        if self.ball:
+            state["ball_x"], state["ball_y"] = self.ball.pos.x, self.ball.pos.y
+            state["ball_vx"], state["ball_vy"] = self.ball.vel.vx, self.ball.vel.vy
+            state["ball_size"] = self.ball.size
+            state["ball_hue"] = self.ball.hue
+        if self.trail_history:
+            state["trail_x"], state["trail_y"], state["trail_size"], state["trail_hue"] = self.trail_history[-1]
+
+        if self.particles:
+            particles = log.new_records("particles", len(self.particles))
+            self.particles.export_records(particles)
+            log.set_records("particles", frame, particles)
+
+    def restore_log_frame(self, log: SimulationLog, frame: int) -> None:
+        state = log.frames[frame]
+        self.time_elapsed = float(state["time"])
+        self.container_hue = float(state["container_hue"])
+        self.bounce_count = int(state["bounce_count"])
+
+        if self.ball is None:
+            self.ball = CleanBounce(pos=Vector2D(0.0, 0.0), vel=Velocity(0.0, 0.0), hue=0.0)
+        self.ball.pos.x, self.ball.pos.y = float(state["ball_x"]), float(state["ball_y"])
+        self.ball.vel.vx, self.ball.vel.vy = float(state["ball_vx"]), float(state["ball_vy"])
+        self.ball.size = float(state["ball_size"])
+        self.ball.hue = float(state["ball_hue"])
+
+        # Trail : une entrée par frame, reconstruite si on ne rend pas dans l'ordre
+        first = max(0, frame - self.trail_max_length - 1) if self.trail_max_length else 0
+        if frame != self._restored_frame + 1 or len(self.trail_history) != frame - first:
+            trail = log.frames[first:frame]
+            self.trail_history = list(zip(trail["trail_x"].tolist(), trail["trail_y"].tolist(),
+                                          trail["trail_size"].tolist(), trail["trail_hue"].tolist()))
+            self._reset_trail_layer()
+        self.trail_history.append((float(state["trail_x"]), float(state["trail_y"]),
+                                   float(state["trail_size"]), float(state["trail_hue"])))
+        if self.trail_max_length and len(self.trail_history) > self.trail_max_length + 1:
+            del self.trail_history[0]
+        self._restored_frame = frame
+
+        self.particles.load_records(log.records("particles", frame))
+
     def _render_ui(self, surface: pygame.Surface):
         """UI avec textes d'engagement - TikTok safe zone"""
         try:
-            # Ensure pygame font is initialized
-            if not pygame.font.get_init():
-                pygame.font.init()
+            texts = get_text_cache()
 
             # TikTok safe zone: ~150px from top, ~200px from bottom
             safe_top = 180
@@ -461,8 +607,6 @@ class GravityFallsSimulator(IVideoGenerator):
 
             # Texte viral dynamique (intro - first 4 seconds)
             if self.time_elapsed < 4:
-                viral_font = pygame.font.Font(None, 38)
-
                 # Get intro text from engagement manager or use default
                 if self._intro_text is None:
                     if self.engagement_manager:
@@ -470,51 +614,20 @@ class GravityFallsSimulator(IVideoGenerator):
                     else:
                         self._intro_text = "BALL GETS BIGGER!"
 
-                viral_text = self._intro_text
-                viral_surface = viral_font.render(viral_text, True, (255, 255, 0))
-                viral_rect = viral_surface.get_rect(center=(self.width//2, safe_top))
-
-                # Outline
-                viral_outline = viral_font.render(viral_text, True, (0, 0, 0))
-                for dx, dy in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-                    surface.blit(viral_outline, (viral_rect.x + dx, viral_rect.y + dy))
-
-                surface.blit(viral_surface, viral_rect)
+                texts.blit_centered(surface, self._intro_text, 38, (255, 255, 0), (self.width//2, safe_top))
 
             # Compteur de rebonds - below intro text
-            font = pygame.font.Font(None, 56)
-            text = str(self.bounce_count)
-
-            # Outline
-            text_outline = font.render(text, True, (0, 0, 0))
-            text_rect = text_outline.get_rect(center=(self.width//2, safe_top + 50))
-
-            for dx, dy in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-                surface.blit(text_outline, (text_rect.x + dx, text_rect.y + dy))
-
-            # Texte principal
-            text_main = font.render(text, True, (255, 255, 255))
-            surface.blit(text_main, text_rect)
+            texts.blit_centered(surface, str(self.bounce_count), 56, (255, 255, 255), (self.width//2, safe_top + 50))
 
             # Alerte dynamique quand grosse (climax) - in bottom safe zone
             if self.ball and self.ball.size > 80:
-                warning_font = pygame.font.Font(None, 44)
-
                 # Get climax text from engagement manager
                 if self.engagement_manager:
                     warning_text = self.engagement_manager.get_climax_text() or "TOO BIG!"
                 else:
                     warning_text = "TOO BIG!"
 
-                warning_surface = warning_font.render(warning_text, True, (255, 100, 100))
-                warning_rect = warning_surface.get_rect(center=(self.width//2, safe_bottom))
-
-                # Outline
-                warning_outline = warning_font.render(warning_text, True, (0, 0, 0))
-                for dx, dy in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-                    surface.blit(warning_outline, (warning_rect.x + dx, warning_rect.y + dy))
-
-                surface.blit(warning_surface, warning_rect)
+                texts.blit_centered(surface, warning_text, 44, (255, 100, 100), (self.width//2, safe_bottom))
 
         except Exception as e:
             logger.debug(f"Erreur UI: {e}")
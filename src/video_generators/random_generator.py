@@ -68,6 +68,21 @@ class RandomVideoGenerator(IVideoGenerator):
             if "generators" in config:
                 self.available_generators = config["generators"]
 
+            # Politique d'enregistrement quand l'encodeur prend du retard
+            if "recording_policy" in config:
+                self.set_recording_policy(config["recording_policy"],
+                                          config.get("spill_slots"),
+                                          config.get("spill_dir"))
+
+            # Rendu segmenté en parallèle
+            if "render_segments" in config:
+                self.set_segmented_rendering(config["render_segments"],
+                                             config.get("segment_workers"))
+
+            # Simulation complète puis rendu depuis le log
+            if "two_pass" in config:
+                self.two_pass = bool(config["two_pass"])
+
             # Configuration par générateur
             for gen_name in self.available_generators:
                 if gen_name in config:
@@ -165,6 +180,14 @@ class RandomVideoGenerator(IVideoGenerator):
             # Configurer avec les paramètres aléatoires résolus
             self.selected_generator.configure(self.selected_params)
             self.selected_generator.set_output_path(self.output_path)
+            self.selected_generator.set_recording_policy(
+                self.recording_policy, self.spill_slots, self.spill_dir
+            )
+            self.selected_generator.two_pass = self.two_pass
+            if self.render_segments > 1:
+                self.selected_generator.set_segmented_rendering(
+                    self.render_segments, self.segment_workers
+                )
 
             return True
 
@@ -0,0 +1,86 @@
+"""
+Regression tests - ArcEscapeSimulator anti-aliasing modes
+
+Frames of one seeded simulation log are drawn in every mode: dirty_ssaa
+must leave everything outside the scene box as the 1x background and UI,
+and match full-screen ssaa inside it.
+"""
+
+import logging
+import os
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.video_generators.arc_escape_simulator import AntialiasMode, ArcEscapeSimulator
+
+SIZE = (540, 960)
+FRAMES = (5, 60, 110)
+
+
+@pytest.fixture(scope="module")
+def simulation():
+    logging.disable(logging.WARNING)
+    random.seed(4)
+    sim = ArcEscapeSimulator(width=SIZE[0], height=SIZE[1], fps=30, duration=4)
+    sim.configure({"layer_count": 3})   # Small scene: the dirty box leaves a margin
+    return sim, sim.simulate()
+
+
+def draw(simulation, mode, scale, frame):
+    sim, log = simulation
+    assert sim.set_antialiasing(mode, scale)
+    sim.restore_log_frame(log, frame)
+    surface = pygame.Surface(SIZE)
+    sim.draw_frame(surface)
+    return pygame.surfarray.array3d(surface).astype(np.float64)
+
+
+def scene_mask(simulation, frame):
+    """True inside the dirty box of a frame (array3d is indexed x, y)"""
+    sim, log = simulation
+    sim.restore_log_frame(log, frame)
+    box = sim._scene_bounds().clip(pygame.Rect((0, 0), SIZE))
+    mask = np.zeros(SIZE, dtype=bool)
+    mask[box.left:box.right, box.top:box.bottom] = True
+    assert 0 < mask.sum() < mask.size
+    return mask
+
+
+class TestAntialiasing:
+    @pytest.mark.parametrize("frame", FRAMES)
+    def test_dirty_box(self, simulation, frame):
+        mask = scene_mask(simulation, frame)
+        dirty = draw(simulation, AntialiasMode.DIRTY_SSAA, 2, frame)
+        full = draw(simulation, AntialiasMode.SSAA, 2, frame)
+        plain = draw(simulation, AntialiasMode.GFXDRAW, 1, frame)
+        # Outside the box: the same 1x background and UI as without supersampling
+        assert np.array_equal(dirty[~mask], plain[~mask])
+        # Inside: the scene as full-screen supersampling draws it
+        assert np.mean(np.abs(dirty[mask] - full[mask])) < 0.1
+
+    def test_gfxdraw_close_to_ssaa(self, simulation):
+        for frame in FRAMES:
+            mask = scene_mask(simulation, frame)
+            plain = draw(simulation, AntialiasMode.GFXDRAW, 1, frame)
+            full = draw(simulation, AntialiasMode.SSAA, 2, frame)
+            assert np.mean(np.abs(plain[mask] - full[mask])) < 5.0
+
+    def test_set_antialiasing(self, simulation):
+        sim, _ = simulation
+        assert sim.set_antialiasing("dirty_ssaa", 4)
+        assert (sim.antialiasing, sim.render_scale) == (AntialiasMode.DIRTY_SSAA, 4)
+        assert sim.background_manager.width == SIZE[0]   # Background stays 1x
+        assert sim.set_antialiasing(AntialiasMode.SSAA)
+        assert sim.render_scale == 4 and sim.background_manager.width == 4 * SIZE[0]
+        assert sim.set_antialiasing("gfxdraw")
+        assert sim.render_scale == 1
+
+        assert not sim.set_antialiasing("msaa")
+        assert sim.antialiasing == AntialiasMode.GFXDRAW
+        sim.configure({"antialiasing": "ssaa", "supersampling": 2})
+        assert (sim.antialiasing, sim.render_scale) == (AntialiasMode.SSAA, 2)
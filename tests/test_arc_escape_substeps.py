@@ -0,0 +1,79 @@
+"""
+Regression tests - ArcEscapeSimulator physics substeps
+
+With physics_substeps = 0 (auto) the ball moves at most half its radius per
+substep, so a bounce snaps it back against the wall by about that much
+instead of up to a whole frame of motion. physics_substeps = 1 keeps the
+previous single update per frame.
+"""
+
+import logging
+import math
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.video_generators.arc_escape_simulator import ArcEscapeSimulator, ArcLayer
+
+FPS = 60
+FRAMES = 900
+
+
+def make_simulator(substeps, seed=1):
+    logging.disable(logging.WARNING)
+    random.seed(seed)
+    sim = ArcEscapeSimulator(width=720, height=1280, fps=FPS, duration=FRAMES / FPS)
+    sim.configure({"physics_substeps": substeps})
+    sim.initialize_simulation()
+    return sim
+
+
+def bounce_snaps(sim, monkeypatch):
+    """Distance from the checked position back to the wall, for every bounce of a run"""
+    snaps = []
+    check = ArcLayer.check_collision
+
+    def recording_check(layer, ball_pos, ball_radius):
+        result = check(layer, ball_pos, ball_radius)
+        if result[0]:
+            wall = layer.radius - layer.thickness / 2 - ball_radius - 2
+            snaps.append(math.hypot(*ball_pos) - wall)
+        return result
+
+    monkeypatch.setattr(ArcLayer, "check_collision", recording_check)
+    for _ in range(FRAMES):
+        sim.simulate_frame(1.0 / FPS)
+    return snaps
+
+
+class TestArcEscapeSubsteps:
+    def test_substep_count(self):
+        sim = make_simulator(0)
+        # 1400 px/s at 60 fps = 23.3 px per frame, ball radius 14: steps of at most 7 px
+        assert sim._physics_substeps(1.0 / FPS) == 4
+        sim.configure({"physics_substeps": 2})
+        assert sim._physics_substeps(1.0 / FPS) == 2
+
+    def test_single_step_unchanged(self):
+        # physics_substeps = 1 is the previous update, one call per frame
+        # Run one after the other: bounces and effects draw from the global RNG
+        sim = make_simulator(1)
+        for _ in range(300):
+            sim.simulate_frame(1.0 / FPS)
+        reference = make_simulator(1)
+        for _ in range(300):
+            reference.time_elapsed += 1.0 / FPS
+            reference._update_physics(1.0 / FPS)
+            reference._update_effects(1.0 / FPS)
+        assert sim.ball_pos == reference.ball_pos
+        assert sim.ball_vel == reference.ball_vel
+        assert sim.current_layer_index == reference.current_layer_index
+
+    def test_bounce_snap(self, monkeypatch):
+        single = bounce_snaps(make_simulator(1), monkeypatch)
+        auto = bounce_snaps(make_simulator(0), monkeypatch)
+        ball = ArcEscapeSimulator().config["ball_size"]
+        assert single and auto
+        assert max(single) > ball
+        assert max(auto) < ball / 2 + 1
@@ -0,0 +1,187 @@
+"""
+Regression tests - streamed audio
+
+stream() must produce the track generate() writes as WAV (within one
+16-bit step), and the combiners must hand every block to the muxer:
+piped to FFmpeg's standard input, or through a temporary WAV file for
+combiners without a streaming path. FFmpeg itself is replaced by a
+recording stand-in.
+"""
+
+import logging
+import os
+import random
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio_generators.base_audio_generator import AudioStream
+from src.audio_generators.custom_sound_generator import CustomMidiAudioGenerator
+from src.audio_generators.satisfying_audio_generator import SatisfyingAudioGenerator
+from src.audio_generators.simple_midi_audio_generator import SimpleMidiAudioGenerator
+from src.core.data_pipeline import AudioEvent
+from src.media_combiners import media_combiner
+from src.media_combiners.base_media_combiner import IMediaCombiner
+from src.media_combiners.media_combiner import FFmpegMediaCombiner
+
+SECONDS = 4.0
+MAX_STEP = 1   # 16-bit steps between the streamed and the WAV track
+
+
+def make_generator(kind, output):
+    logging.disable(logging.WARNING)
+    rng = random.Random(5)
+    if kind == "satisfying":
+        generator = SatisfyingAudioGenerator()
+        generator.melody_player._load_default_melody()
+    elif kind == "simple_midi":
+        generator = SimpleMidiAudioGenerator()
+        generator.melody_notes = generator.midi_extractor.get_default_melody()
+        generator.sound_types = ["gentle_pluck"]
+    else:
+        generator = CustomMidiAudioGenerator()
+        generator.melody_notes = generator.midi_extractor.get_default_melody()
+        generator.current_preset = "Piano Doux Ultra"
+    generator.output_path = output
+    generator.duration = SECONDS
+    generator.add_events([AudioEvent("collision", rng.uniform(0, SECONDS - 0.5),
+                                     params={"volume": rng.choice((0.4, 0.6, 0.8))})
+                          for _ in range(60)])
+    return generator
+
+
+def read_wav(path):
+    with wave.open(path) as f:
+        return f.getframerate(), f.getnchannels(), np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+
+
+def seeded(run):
+    # Same random choices (sound type, detune) and noise for both paths
+    random.seed(1)
+    np.random.seed(1)
+    return run()
+
+
+def make_stream(samples, block=1000, sample_rate=44100):
+    pcm = np.asarray(samples, dtype=np.int16).tobytes()
+    return AudioStream(sample_rate, 1, (pcm[i:i + 2 * block] for i in range(0, len(pcm), 2 * block)))
+
+
+class FakeFFmpeg:
+    """subprocess.Popen stand-in: collects stdin and writes it to the output path on exit"""
+
+    def __init__(self, returncode=0, accepted=None):
+        self.returncode, self.accepted = returncode, accepted
+        self.cmd, self.received = None, bytearray()
+
+    def __call__(self, cmd, stdin=None, stdout=None, stderr=None):
+        self.cmd, self.stderr = cmd, stderr
+        self.stdin = self
+        return self
+
+    def write(self, block):
+        if self.accepted is not None and len(self.received) >= self.accepted:
+            raise BrokenPipeError()
+        self.received += block
+
+    def close(self):
+        pass
+
+    def kill(self):
+        self.returncode = -9
+
+    def wait(self):
+        if self.returncode == 0:
+            with open(self.cmd[-1], "wb") as f:
+                f.write(self.received)
+        else:
+            self.stderr.write(b"encoder error")
+        return self.returncode
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"video")
+    return str(path)
+
+
+@pytest.fixture
+def combiner(monkeypatch):
+    monkeypatch.setattr(FFmpegMediaCombiner, "_find_ffmpeg", lambda self: "ffmpeg")
+    return FFmpegMediaCombiner()
+
+
+class TestStream:
+    @pytest.mark.parametrize("kind", ["satisfying", "simple_midi", "custom"])
+    def test_matches_wav(self, tmp_path, kind):
+        output = str(tmp_path / "track.wav")
+        assert seeded(make_generator(kind, output).generate) == output
+        sample_rate, channels, expected = read_wav(output)
+
+        stream = seeded(make_generator(kind, output).stream)
+        assert (stream.sample_rate, stream.channels) == (sample_rate, channels)
+        result = np.frombuffer(b"".join(stream.blocks), dtype=np.int16)
+        assert len(result) == len(expected)
+        assert np.max(np.abs(result.astype(np.int32) - expected)) <= MAX_STEP
+
+
+class TestCombineStream:
+    def test_piped_to_ffmpeg(self, combiner, video, tmp_path, monkeypatch):
+        ffmpeg = FakeFFmpeg()
+        monkeypatch.setattr(media_combiner.subprocess, "Popen", ffmpeg)
+        samples = np.arange(-5000, 5000, 3)
+        output = str(tmp_path / "out" / "final.mp4")
+        assert combiner.combine_stream(video, make_stream(samples, sample_rate=48000), output) == output
+        assert bytes(ffmpeg.received) == samples.astype(np.int16).tobytes()
+        assert ffmpeg.cmd[ffmpeg.cmd.index("-f") + 1] == "s16le"
+        assert ffmpeg.cmd[ffmpeg.cmd.index("-ar") + 1] == "48000"
+        assert ffmpeg.cmd[ffmpeg.cmd.index("-ac") + 1] == "1"
+
+    def test_ffmpeg_stops_reading(self, combiner, video, tmp_path, monkeypatch):
+        # -shortest: FFmpeg may close its input early, the exit code decides
+        ffmpeg = FakeFFmpeg(accepted=4000)
+        monkeypatch.setattr(media_combiner.subprocess, "Popen", ffmpeg)
+        output = str(tmp_path / "final.mp4")
+        assert combiner.combine_stream(video, make_stream(np.zeros(10000)), output) == output
+
+        monkeypatch.setattr(media_combiner.subprocess, "Popen", FakeFFmpeg(returncode=1))
+        assert combiner.combine_stream(video, make_stream(np.zeros(100)), str(tmp_path / "failed.mp4")) is None
+
+    def test_missing_inputs(self, combiner, video, tmp_path, monkeypatch):
+        monkeypatch.setattr(media_combiner.subprocess, "Popen",
+                            lambda *args, **kwargs: pytest.fail("FFmpeg was run"))
+        assert combiner.combine_stream(str(tmp_path / "missing.mp4"), make_stream([1]), "out.mp4") is None
+        combiner.ffmpeg_path = None
+        assert combiner.combine_stream(video, make_stream([1]), "out.mp4") is None
+
+
+class TestWavFallback:
+    class WavCombiner(IMediaCombiner):
+        """Combiner with only a file-based combine()"""
+
+        def __init__(self, fail=False):
+            self.fail, self.audio = fail, None
+
+        def combine(self, video_path, audio_path, output_path):
+            self.audio_path = audio_path
+            self.audio = read_wav(audio_path)
+            if self.fail:
+                raise RuntimeError("mux failed")
+            return output_path
+
+    def test_written_as_wav(self, video):
+        combiner = self.WavCombiner()
+        samples = np.arange(-3000, 3000, 7)
+        assert combiner.combine_stream(video, make_stream(samples, sample_rate=22050), "out.mp4") == "out.mp4"
+        sample_rate, channels, received = combiner.audio
+        assert (sample_rate, channels) == (22050, 1)
+        assert np.array_equal(received, samples)
+        assert not os.path.exists(combiner.audio_path)
+
+    def test_temporary_file_removed_on_error(self, video):
+        combiner = self.WavCombiner(fail=True)
+        with pytest.raises(RuntimeError):
+            combiner.combine_stream(video, make_stream(np.zeros(10)), "out.mp4")
+        assert not os.path.exists(combiner.audio_path)
@@ -0,0 +1,82 @@
+"""
+Regression tests - BackgroundManager gradients
+
+The cached gradient columns are compared against the previous drawing
+(one pygame.draw.rect per band of 4 rows), and a full animation cycle is
+checked to be served from the cache the second time round.
+"""
+
+import colorsys
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.video.background_manager import BackgroundManager, BackgroundMode
+
+WIDTH, HEIGHT = 36, 200
+
+
+def legacy_gradient(surface, top, bottom, step):
+    """Previous renderer: one rect per band, coloured by the band's first row"""
+    for y in range(0, HEIGHT, step):
+        t = y / HEIGHT
+        color = tuple(int(top[c] * (1 - t) + bottom[c] * t) for c in range(3))
+        pygame.draw.rect(surface, color, (0, y, WIDTH, step))
+
+
+def legacy_animated(surface, manager, time_elapsed):
+    hue = (manager.current_hue + manager.animation_speed * time_elapsed) % 360
+    top = colorsys.hsv_to_rgb(hue / 360, manager.saturation, manager.value)
+    bottom = colorsys.hsv_to_rgb(((hue + 30) % 360) / 360, manager.saturation * 0.8, manager.value * 0.6)
+    legacy_gradient(surface, tuple(int(c * 255) for c in top), tuple(int(c * 255) for c in bottom), 4)
+
+
+def animated_manager(**config):
+    manager = BackgroundManager(WIDTH, HEIGHT)
+    manager.configure({"mode": "animated_gradient", "start_hue": 17.0, **config})
+    return manager
+
+
+@pytest.fixture(params=[32, 24, 16])
+def depth(request):
+    return request.param
+
+
+class TestBackgroundManager:
+    def test_static_gradient(self, depth):
+        manager = BackgroundManager(WIDTH, HEIGHT)
+        manager.configure({"mode": BackgroundMode.STATIC_GRADIENT,
+                           "gradient_top": (30, 90, 160), "gradient_bottom": (200, 20, 10)})
+        surface, expected = pygame.Surface((WIDTH, HEIGHT), 0, depth), pygame.Surface((WIDTH, HEIGHT), 0, depth)
+        manager.render(surface)
+        legacy_gradient(expected, (30, 90, 160), (200, 20, 10), 1)
+        assert np.array_equal(pygame.surfarray.array3d(surface), pygame.surfarray.array3d(expected))
+
+    def test_animated_matches_legacy(self):
+        manager = animated_manager()
+        assert manager.hue_quantum == 0
+        surface, expected = pygame.Surface((WIDTH, HEIGHT)), pygame.Surface((WIDTH, HEIGHT))
+        for frame in range(0, 400, 7):
+            manager.render(surface, frame / 30)
+            legacy_animated(expected, manager, frame / 30)
+            assert np.array_equal(pygame.surfarray.array3d(surface), pygame.surfarray.array3d(expected))
+
+    @pytest.mark.parametrize("hue_quantum", [0.0, 1.0, 0.5])
+    def test_cycle_fits_cache(self, hue_quantum):
+        manager = animated_manager(hue_quantum=hue_quantum)
+        surface = pygame.Surface((WIDTH, HEIGHT))
+        cycle = 360 / manager.animation_speed
+        times = np.arange(0, cycle, 1 / 60)
+        for t in times:
+            manager.render(surface, t)
+        misses = manager.cache_misses
+        assert misses > manager.cache_size
+
+        # Second cycle: every column is still cached
+        for t in times + cycle:
+            manager.render(surface, t)
+        assert manager.cache_misses == misses
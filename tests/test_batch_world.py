@@ -0,0 +1,117 @@
+"""
+Regression tests - BatchWorld
+
+Bodies moving in and out of the world keep their state, the body moved
+into a freed row is rebound to it, and forces + integration on the arrays
+match the per-body step of a PhysicsEngine without batch_world.
+"""
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.physics_engine.core.engine import EngineConfig, PhysicsEngine
+from src.utils.physics_engine.core.vector import Vector2D
+from src.utils.physics_engine.core.world import BatchWorld
+from src.utils.physics_engine.physics.body import Circle, Ring
+
+TOLERANCE = 1e-9
+
+
+def make_body(k):
+    body = Circle(Vector2D(10.0 * k, 20.0 * k), 5.0 + k, mass=1.0 + k)
+    body.velocity = Vector2D(k, -k)
+    body.restitution = 0.1 * k
+    body.drag_coefficient = 0.01 * k
+    return body
+
+
+def state(body):
+    return (body.position.tuple(), body.velocity.tuple(), body.mass, body.radius,
+            body.restitution, body.drag_coefficient)
+
+
+def make_engine(count, batch, seed):
+    engine = PhysicsEngine(EngineConfig(batch_world=batch, max_velocity=1500.0))
+    rng = random.Random(seed)
+    for _ in range(count):
+        body = Circle(Vector2D(rng.uniform(0, 1080), rng.uniform(0, 1920)),
+                      rng.uniform(4, 20), mass=rng.uniform(0.5, 3.0))
+        body.velocity = Vector2D(rng.uniform(-1200, 1200), rng.uniform(-1200, 1200))
+        body.drag_coefficient = rng.uniform(0.0, 0.002)
+        engine.add_body(body)
+    return engine
+
+
+class TestBatchWorld:
+    def test_add_remove_keeps_state(self):
+        world = BatchWorld(capacity=2)   # Grows while adding
+        bodies = [make_body(k) for k in range(5)]
+        expected = [state(body) for body in bodies]
+        for body in bodies:
+            world.add(body)
+        assert len(world) == 5 and all(body in world for body in bodies)
+        assert [state(body) for body in bodies] == expected
+
+        for body in bodies[::2]:
+            world.remove(body)
+        assert len(world) == 2
+        assert [state(body) for body in bodies] == expected
+        assert all(body._world is None for body in bodies[::2])
+
+    def test_remove_rebinds_last_row(self):
+        world = BatchWorld()
+        first, middle, last = make_body(1), make_body(2), make_body(3)
+        for body in (first, middle, last):
+            world.add(body)
+        held = middle.position
+        world.remove(middle)
+
+        # The last body takes the freed row and follows it
+        assert last._row == 1 and world.bodies == [first, last]
+        last.position = Vector2D(7.0, 8.0)
+        last.mass = 4.0
+        assert tuple(world.position[1]) == (7.0, 8.0) and world.mass[1] == 4.0
+        # The removed body is detached from the arrays
+        middle.position = Vector2D(-1.0, -1.0)
+        assert tuple(world.position[1]) == (7.0, 8.0)
+        # A view held across the removal reads the row, now the last body's
+        assert held.tuple() == (7.0, 8.0)
+
+    def test_accepts(self):
+        static = Circle(Vector2D(0, 0), 5)
+        static.static = True
+        assert BatchWorld.accepts(make_body(1))
+        assert not BatchWorld.accepts(static)
+        assert not BatchWorld.accepts(Ring(Vector2D(0, 0), 100, 110))
+
+    def test_pending_forces(self):
+        body = make_body(2)
+        body.add_force(Vector2D(3.0, 4.0))
+        world = BatchWorld()
+        world.add(body)
+        body.add_force(Vector2D(1.0, 1.0))
+        assert tuple(world.force[0]) == (4.0, 5.0)
+        world.remove(body)
+        assert sum(f.x for f in body.forces) == 4.0 and sum(f.y for f in body.forces) == 5.0
+
+
+class TestWorldParity:
+    @pytest.mark.parametrize("seed", [0, 7])
+    def test_matches_per_body_step(self, seed):
+        legacy, batch = make_engine(500, False, seed), make_engine(500, True, seed)
+        push = Vector2D(150.0, -300.0)
+        for engine in (legacy, batch):
+            for _ in range(60):
+                for body in engine.bodies[::10]:
+                    body.add_force(push)
+                engine._apply_forces(engine.dt)
+                engine._integrate(engine.dt)
+        for attribute in ("position", "velocity"):
+            expected = np.array([getattr(body, attribute).tuple() for body in legacy.bodies])
+            result = np.array([getattr(body, attribute).tuple() for body in batch.bodies])
+            assert np.max(np.abs(result - expected)) <= TOLERANCE * np.max(np.abs(expected))
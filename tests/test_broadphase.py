@@ -0,0 +1,123 @@
+"""
+Regression tests - PhysicsEngine broadphases
+
+The grid, sweep-and-prune and quadtree broadphases are compared against
+an all-pairs box test, and a collision detection pass of PhysicsEngine
+with each of them against the all-pairs loop ("none"), on fixed-seed
+scenes of circles and wall segments.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from src.utils.physics_engine.collision.broadphase import (
+    BROADPHASES, GridBroadphase, QuadTreeBroadphase, SweepAndPruneBroadphase, make_broadphase
+)
+from src.utils.physics_engine.core.engine import EngineConfig, PhysicsEngine
+from src.utils.physics_engine.core.vector import Vector2D
+from src.utils.physics_engine.physics.body import Circle, Segment
+
+WIDTH, HEIGHT = 1080, 1920
+TOLERANCE = 1e-9
+
+
+def all_pairs(bounds, static):
+    """Overlapping boxes (i < j, not both static), in double-loop order"""
+    pairs = []
+    for i in range(len(bounds)):
+        for j in range(i + 1, len(bounds)):
+            a, b = bounds[i], bounds[j]
+            if static[i] and static[j]:
+                continue
+            if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                pairs.append((i, j))
+    return pairs
+
+
+def make_boxes(count, seed=2):
+    """Boxes of mixed sizes, some crossing the world edges, the last ones static"""
+    rng = np.random.default_rng(seed)
+    low = rng.uniform(-50, (WIDTH, HEIGHT), (count, 2))
+    size = rng.uniform(5, 80, (count, 2))
+    size[::17] *= 6   # A few large boxes spanning several cells
+    static = np.zeros(count, dtype=bool)
+    static[-count // 10:] = True
+    return np.hstack([low, low + size]), static
+
+
+BROADPHASE_IDS = ["grid", "grid-40", "sap", "sap-x", "quadtree"]
+
+
+def broadphases():
+    return [GridBroadphase(), GridBroadphase(cell_size=40.0), SweepAndPruneBroadphase(),
+            SweepAndPruneBroadphase(axis=0), QuadTreeBroadphase(WIDTH, HEIGHT)]
+
+
+def make_engine(count, broadphase, coverage=0.3, seed=5):
+    engine = PhysicsEngine(EngineConfig(width=WIDTH, height=HEIGHT, batch_world=True,
+                                        broadphase=broadphase))
+    rng = random.Random(seed)
+    radius = math.sqrt(coverage * WIDTH * HEIGHT / (count * math.pi))
+    for _ in range(count):
+        body = Circle(Vector2D(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)),
+                      radius * rng.uniform(0.5, 1.2))
+        body.velocity = Vector2D(rng.uniform(-500, 500), rng.uniform(-500, 500))
+        engine.add_body(body)
+    corners = [Vector2D(0, 0), Vector2D(WIDTH, 0), Vector2D(WIDTH, HEIGHT), Vector2D(0, HEIGHT)]
+    for start, end in zip(corners, corners[1:] + corners[:1]):
+        engine.add_body(Segment(start, end))
+    return engine
+
+
+def detect(engine):
+    """Collisions of one detection pass, as (i, j, normal, penetration)"""
+    engine._detect_collisions()
+    index = {id(body): i for i, body in enumerate(engine.bodies)}
+    return [(index[id(a)], index[id(b)], (info['normal'].x, info['normal'].y), info['penetration'])
+            for a, b, info in engine.collision_pairs]
+
+
+class TestBroadphasePairs:
+    @pytest.mark.parametrize("broadphase", broadphases(), ids=BROADPHASE_IDS)
+    def test_matches_all_pairs(self, broadphase):
+        bounds, static = make_boxes(400)
+        expected = all_pairs(bounds, static)
+        first, second = broadphase.pairs(bounds, static)
+        assert list(zip(first.tolist(), second.tolist())) == expected
+        assert broadphase.candidates >= len(expected)
+
+    @pytest.mark.parametrize("broadphase", broadphases(), ids=BROADPHASE_IDS)
+    def test_small_scenes(self, broadphase):
+        for count in (0, 1):
+            bounds, static = np.zeros((count, 4)), np.zeros(count, dtype=bool)
+            assert len(broadphase.pairs(bounds, static)[0]) == 0
+        # Two static boxes never pair, touching edges do
+        bounds = np.array([[0, 0, 10, 10], [10, 0, 20, 10], [5, 5, 15, 15]], dtype=float)
+        first, second = broadphase.pairs(bounds, np.array([True, True, False]))
+        assert list(zip(first.tolist(), second.tolist())) == [(0, 2), (1, 2)]
+
+    def test_make_broadphase(self):
+        assert make_broadphase("none", WIDTH, HEIGHT) is None
+        assert [make_broadphase(name, WIDTH, HEIGHT).name for name in BROADPHASES[1:]] == list(BROADPHASES[1:])
+        assert make_broadphase("grid", WIDTH, HEIGHT, cell_size=25.0).cell_size == 25.0
+        with pytest.raises(ValueError):
+            make_broadphase("bvh", WIDTH, HEIGHT)
+
+
+class TestEngineBroadphase:
+    @pytest.mark.parametrize("count", [10, 150])
+    def test_same_collisions(self, count):
+        expected = detect(make_engine(count, "none"))
+        assert expected
+        for name in BROADPHASES[1:]:
+            engine = make_engine(count, name)
+            found = detect(engine)
+            assert [pair[:2] for pair in found] == [pair[:2] for pair in expected], name
+            for (*_, normal, penetration), (*_, ref_normal, ref_penetration) in zip(found, expected):
+                assert np.allclose(normal, ref_normal, atol=TOLERANCE)
+                assert abs(penetration - ref_penetration) <= TOLERANCE
+            # Fewer narrowphase checks than every pair
+            assert engine.performance_stats['pair_checks'] < len(engine.bodies) * (len(engine.bodies) - 1) // 2
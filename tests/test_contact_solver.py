@@ -0,0 +1,171 @@
+"""
+Regression tests - sequential-impulse contact solver
+
+ContactSolver is checked on its own (restitution threshold, warm-start
+cache) and through PhysicsEngine (a pile settling in a bowl, a ball
+bouncing off a ring, which contacts fire the collision callbacks).
+"""
+
+import math
+import os
+import random
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.physics_engine.collision.solver import ContactSolver
+from src.utils.physics_engine.core.engine import EngineConfig, PhysicsEngine
+from src.utils.physics_engine.core.vector import Vector2D
+from src.utils.physics_engine.physics.body import Circle, Ring
+
+DT = 1.0 / 60
+TOLERANCE = 1e-6
+
+
+def make_ball(velocity=(0.0, 0.0), restitution=0.5):
+    ball = Circle(Vector2D(0, 0), 10)
+    ball.velocity = Vector2D(*velocity)
+    ball.restitution = restitution
+    ball.friction = 0.0
+    return ball
+
+
+def make_wall(restitution=0.5):
+    wall = Ring(Vector2D(0, 0), 100, 110)
+    wall.restitution = restitution
+    return wall
+
+
+def settle_bowl(options, balls=40, seconds=4.0):
+    """RMS speed and max penetration of a pile of balls after settling in a closed ring"""
+    engine = PhysicsEngine(EngineConfig(width=400, height=400, batch_world=True,
+                                        broadphase="grid", **options))
+    centre = Vector2D(200, 200)
+    engine.add_body(Ring(centre, 150, 170))
+    rng = random.Random(1)
+    for i in range(balls):
+        engine.add_body(Circle(centre + Vector2D((i % 8 - 4) * 22 + rng.uniform(-1, 1),
+                                                 (i // 8 - 2) * 22), 10))
+    for _ in range(int(seconds / DT)):
+        engine.step(DT)
+    velocity = engine.world.velocity
+    penetration = max(info['penetration'] for _, _, info in engine.collision_pairs)
+    distance = np.hypot(*(engine.world.position - (200, 200)).T)
+    return float(np.sqrt(np.mean(np.sum(velocity ** 2, axis=1)))), penetration, float(distance.max())
+
+
+class TestContactSolver:
+    def test_restitution(self):
+        ball, wall = make_ball((600.0, 0.0)), make_wall()
+        impulses = ContactSolver().solve([(ball, wall, Vector2D(1, 0), 0.0)], DT)
+        assert abs(ball.velocity.x + 300.0) <= TOLERANCE
+        assert abs(impulses[0] - 900.0) <= TOLERANCE
+
+    def test_restitution_threshold(self):
+        # Slower than the threshold: the contact only stops the ball
+        ball, wall = make_ball((30.0, 0.0)), make_wall()
+        ContactSolver(restitution_threshold=50.0).solve([(ball, wall, Vector2D(1, 0), 0.0)], DT)
+        assert abs(ball.velocity.x) <= TOLERANCE
+
+    def test_separating_contact(self):
+        ball, wall = make_ball((-100.0, 0.0)), make_wall()
+        impulses = ContactSolver().solve([(ball, wall, Vector2D(1, 0), 0.2)], DT)
+        assert impulses == [0.0]
+        assert ball.velocity.x == -100.0
+
+    @pytest.mark.parametrize("angle, reapplied", [(10.0, True), (30.0, False)])
+    def test_warm_start_rotation(self, angle, reapplied):
+        ball, wall = make_ball((200.0, 0.0), restitution=0.0), make_wall(restitution=0.0)
+        solver = ContactSolver(warm_start_max_angle=15.0)
+        jn = solver.solve([(ball, wall, Vector2D(1, 0), 0.0)], DT)[0]
+        assert jn > 0 and abs(ball.velocity.x) <= TOLERANCE
+
+        # No iterations: the velocity only changes by the warm-start impulse
+        solver.velocity_iterations = 0
+        ball.velocity = Vector2D(0, 0)
+        normal = Vector2D(math.cos(math.radians(angle)), math.sin(math.radians(angle)))
+        solver.solve([(ball, wall, normal, 0.0)], DT)
+        if reapplied:
+            expected = normal * (-jn * solver.warm_start_factor / ball.mass)
+            assert abs(ball.velocity.x - expected.x) <= TOLERANCE
+            assert abs(ball.velocity.y - expected.y) <= TOLERANCE
+        else:
+            assert ball.velocity.x == 0.0 and ball.velocity.y == 0.0
+
+    def test_warm_start_factor(self):
+        assert ContactSolver(position_correction="baumgarte").warm_start_factor == 0.8
+        assert ContactSolver(position_correction="split").warm_start_factor == 1.0
+        with pytest.raises(ValueError):
+            ContactSolver(position_correction="unknown")
+
+
+class TestEngineSolver:
+    @pytest.mark.parametrize("correction, max_speed", [("baumgarte", 15.0), ("split", 0.5)])
+    def test_resting_pile(self, correction, max_speed):
+        speed, penetration, distance = settle_bowl(
+            {"solver_iterations": 8, "position_correction": correction})
+        assert speed < max_speed
+        assert penetration < 3.0
+        assert distance < 150.0   # Nobody pushed through the bowl
+
+    def test_pile_calmer_than_single_pass(self):
+        single_speed, single_penetration, _ = settle_bowl({})
+        speed, penetration, _ = settle_bowl({"solver_iterations": 8})
+        assert speed < single_speed / 2
+        assert penetration < single_penetration / 2
+
+    def test_ring_bounce(self):
+        engine = PhysicsEngine(EngineConfig(width=400, height=400, gravity=Vector2D(0, 0),
+                                            friction=0.0, solver_iterations=8))
+        ring = Ring(Vector2D(200, 200), 100, 110)
+        ring.restitution = 0.5
+        ball = Circle(Vector2D(200, 200), 10)
+        ball.restitution = 0.5
+        ball.drag_coefficient = 0.0
+        ball.velocity = Vector2D(600, 0)
+        engine.add_body(ring)
+        engine.add_body(ball)
+        impulses = []
+        engine.add_collision_callback(lambda a, b, info: impulses.append(info['impulse']))
+
+        for _ in range(20):
+            engine.step(DT)
+        assert abs(ball.velocity.x + 300.0) <= TOLERANCE
+        assert abs(ball.velocity.y) <= TOLERANCE
+        assert len(impulses) == 1 and impulses[0] > 0
+
+    def test_callbacks_only_with_impulse(self):
+        # Overlapping (within the slop) but separating: no callback with the solver,
+        # while the single pass also skips it
+        for options in ({"solver_iterations": 8}, {}):
+            engine = PhysicsEngine(EngineConfig(width=400, height=400, gravity=Vector2D(0, 0),
+                                                friction=0.0, **options))
+            ring = Ring(Vector2D(200, 200), 100, 110)
+            ball = Circle(Vector2D(290.2, 200), 10)
+            ball.drag_coefficient = 0.0
+            ball.velocity = Vector2D(-60, 0)
+            engine.add_body(ring)
+            engine.add_body(ball)
+            calls = []
+            engine.add_collision_callback(lambda a, b, info: calls.append(info))
+            engine.step(1e-4)
+            assert len(engine.collision_pairs) == 1
+            assert calls == []
+
+    def test_resting_contact_callbacks(self):
+        # Touching within the slop, at rest: the single pass reports it every step,
+        # the solver applies no impulse and reports nothing
+        calls = {}
+        for name, options in (("solver", {"solver_iterations": 8}), ("single pass", {})):
+            engine = PhysicsEngine(EngineConfig(width=400, height=400, gravity=Vector2D(0, 0),
+                                                friction=0.0, **options))
+            ball = Circle(Vector2D(290.2, 200), 10)
+            engine.add_body(Ring(Vector2D(200, 200), 100, 110))
+            engine.add_body(ball)
+            calls[name] = []
+            engine.add_collision_callback(lambda a, b, info, found=calls[name]: found.append(info))
+            engine.step(1e-4)
+        assert calls["solver"] == []
+        assert len(calls["single pass"]) == 1
@@ -0,0 +1,140 @@
+"""
+Regression tests - vectorised DSP core
+
+The closed-form recursions (one_pole, iir_filter and the
+AdvancedSoundGenerator filters built on them) are compared against
+per-sample reference loops, and the delay lines and FFT convolution
+against their direct counterparts.
+"""
+
+import numpy as np
+import pytest
+
+from src.audio_generators import dsp
+from src.audio_generators.simple_midi_audio_generator import AdvancedSoundGenerator
+
+SAMPLE_RATE = 44100
+TOLERANCE = 1e-9   # Relative to the peak of the reference output
+
+
+def reference_recursion(drive, coef, initial=0.0):
+    """y[i] = coef * y[i-1] + drive[i], one sample at a time"""
+    y = np.zeros(len(drive), dtype=np.result_type(drive, coef, initial, np.float64))
+    state = initial
+    for i, value in enumerate(drive):
+        state = coef * state + value
+        y[i] = state
+    return y
+
+
+def reference_iir(b, a, x):
+    """Direct-form difference equation, one sample at a time"""
+    b, a = np.asarray(b, dtype=np.float64) / a[0], np.asarray(a, dtype=np.float64) / a[0]
+    y = np.zeros(len(x))
+    for i in range(len(x)):
+        acc = sum(b[k] * x[i - k] for k in range(len(b)) if i >= k)
+        acc -= sum(a[k] * y[i - k] for k in range(1, len(a)) if i >= k)
+        y[i] = acc
+    return y
+
+
+def assert_close(result, expected):
+    assert result.shape == expected.shape
+    scale = max(1.0, float(np.max(np.abs(expected))))
+    assert np.max(np.abs(result - expected)) <= TOLERANCE * scale
+
+
+@pytest.fixture
+def signal():
+    # Longer than dsp.BLOCK_SIZE: the state is carried across rows
+    return np.random.default_rng(0).normal(0, 1, 5 * dsp.BLOCK_SIZE + 123)
+
+
+class TestOnePole:
+    @pytest.mark.parametrize("coef", [0.3, 0.9, 0.999, -0.7, 1e-3])
+    def test_real(self, signal, coef):
+        assert_close(dsp.one_pole(signal, coef), reference_recursion(signal, coef))
+
+    def test_initial_state(self, signal):
+        assert_close(dsp.one_pole(signal, 0.95, initial=4.0), reference_recursion(signal, 0.95, 4.0))
+
+    def test_complex(self, signal):
+        coef = 0.97 * np.exp(0.2j)
+        result = dsp.one_pole(signal, coef)
+        assert result.dtype == np.complex128
+        assert_close(result, reference_recursion(signal, coef))
+
+    def test_edge_cases(self):
+        assert len(dsp.one_pole(np.zeros(0), 0.5)) == 0
+        x = np.arange(5.0)
+        assert np.array_equal(dsp.one_pole(x, 0), x)
+
+
+class TestIirFilter:
+    @pytest.mark.parametrize("b, a", [
+        ([1.0], [1.0, -0.5]),                          # One real pole
+        ([1.0], [1.0, -1.2, 0.5]),                     # Complex conjugate pair
+        ([0.2, 0.4, 0.2], [1.0, -0.6, 0.08]),          # Biquad, two real poles
+        ([1.0, -1.0], [2.0, -1.6, 0.64]),              # Repeated pole, a[0] != 1
+        ([0.5, 0.25], [1.0]),                          # FIR only
+    ])
+    def test_matches_difference_equation(self, b, a):
+        x = np.random.default_rng(1).normal(0, 1, 3000)
+        assert_close(dsp.iir_filter(b, a, x), reference_iir(b, a, x))
+
+
+class TestFilters:
+    @pytest.mark.parametrize("resonance", [0.0, 0.7])
+    def test_lowpass(self, signal, resonance):
+        alpha = np.exp(-2 * np.pi * 800 / SAMPLE_RATE)
+        expected = np.zeros_like(signal)
+        expected[0] = signal[0] * (1 - alpha)
+        for i in range(1, len(signal)):
+            expected[i] = alpha * expected[i - 1] + (1 - alpha) * signal[i]
+        if resonance == 0:
+            assert_close(dsp.one_pole_lowpass(signal, alpha), expected)
+        # Previous resonance feedback, from the 3rd sample on
+        for i in range(2, len(signal)):
+            expected[i] += resonance * 0.3 * (expected[i - 1] - expected[i - 2])
+        generator = AdvancedSoundGenerator(SAMPLE_RATE)
+        assert_close(generator.apply_lowpass_filter(signal, 800, resonance), expected)
+
+    def test_highpass(self, signal):
+        alpha = np.exp(-2 * np.pi * 200 / SAMPLE_RATE)
+        expected = np.zeros_like(signal)
+        expected[0] = signal[0]
+        for i in range(1, len(signal)):
+            expected[i] = alpha * (expected[i - 1] + signal[i] - signal[i - 1])
+        assert_close(dsp.one_pole_highpass(signal, alpha), expected)
+        assert_close(AdvancedSoundGenerator(SAMPLE_RATE).apply_highpass_filter(signal, 200), expected)
+
+
+class TestDelays:
+    def test_fractional_delay(self, signal):
+        delay = 300 * np.sin(np.linspace(0, 20, len(signal)))
+        expected = signal.copy()
+        for i in range(len(signal)):
+            position = i - delay[i]
+            if 0 <= position < len(signal) - 1:
+                floor_idx = int(position)
+                frac = position - floor_idx
+                expected[i] = signal[floor_idx] * (1 - frac) + signal[floor_idx + 1] * frac
+        assert_close(dsp.fractional_delay(signal, delay), expected)
+
+    def test_tapped_delay(self, signal):
+        delays, gains = [10, 250, len(signal) + 5], [0.5, -0.25, 1.0]
+        expected = signal.copy()
+        for delay, gain in zip(delays, gains):
+            for i in range(delay, len(signal)):
+                expected[i] += signal[i - delay] * gain
+        assert_close(dsp.tapped_delay(signal, delays, gains), expected)
+        assert dsp.tapped_delay(signal.astype(np.float32), delays, gains).dtype == np.float32
+
+    @pytest.mark.parametrize("mode", ["full", "same"])
+    def test_fft_convolve(self, mode):
+        rng = np.random.default_rng(2)
+        x, h = rng.normal(0, 1, 1001), rng.normal(0, 1, 77)
+        assert_close(dsp.fft_convolve(x, h, mode), np.convolve(x, h, mode))
+        assert_close(dsp.fft_convolve(h, x, mode), np.convolve(h, x, mode))
+        with pytest.raises(ValueError):
+            dsp.fft_convolve(x, h, "valid")
@@ -0,0 +1,107 @@
+"""
+Regression tests - encoder profile selection
+
+Parsing of FFmpeg output, the candidate list and selection rule, and the
+per-host cache: a stored profile is read back without running FFmpeg, and
+without one nothing is benchmarked unless asked for.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from src.utils.video import encoder_profile
+from src.utils.video.encoder_profile import (
+    EncoderProfile, EncoderProfiler, build_candidates, get_encoder_profile, legacy_profile,
+    parse_encoders, parse_ssim
+)
+
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC (codec h264)
+ V....D libx265              libx265 H.265 / HEVC (codec hevc)
+ V....D h264_nvenc           NVIDIA NVENC H.264 encoder (codec h264)
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+
+@pytest.fixture
+def no_ffmpeg_runs(monkeypatch):
+    """Fail on any FFmpeg call"""
+    def run(*args, **kwargs):
+        pytest.fail(f"FFmpeg was run: {args[0]}")
+    monkeypatch.setattr(subprocess, "run", run)
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    # Any existing file stands in for the FFmpeg binary in the host key
+    return EncoderProfiler(ffmpeg_path=sys.executable, cache_path=str(tmp_path / "profiles.json"))
+
+
+class TestParsing:
+    def test_parse_encoders(self):
+        assert parse_encoders(ENCODERS_OUTPUT) == {"libx264", "libx265", "h264_nvenc"}
+
+    def test_parse_ssim(self):
+        line = "[Parsed_ssim_0 @ 0x5] SSIM Y:0.991 (20.4) U:0.995 V:0.994 All:0.992513 (21.25)"
+        assert parse_ssim(line) == 0.992513
+        assert parse_ssim("no summary") is None
+
+
+class TestCandidates:
+    def test_software_candidates(self):
+        candidates = build_candidates({"libx264", "libx265", "h264_nvenc"})
+        # 4 x264 presets x 3 tunes + the legacy settings, 3 x265 presets x 3 tunes
+        assert len(candidates) == 4 * 3 + 1 + 3 * 3
+        assert not any(c.encoder == "h264_nvenc" for c in candidates)
+        assert all("-tag:v" in c.args for c in candidates if c.encoder == "libx265")
+
+    def test_gpu_only_when_listed(self):
+        assert build_candidates({"libx264", "h264_nvenc"}, use_gpu=True)[0].encoder == "h264_nvenc"
+        assert not any(c.encoder == "h264_amf" for c in build_candidates({"libx264"}, use_gpu=True))
+        assert build_candidates(set()) == []
+
+    def test_select(self, profiler):
+        measured = [EncoderProfile("libx264", "ultrafast", encode_fps=900, ssim=0.97),
+                    EncoderProfile("libx264", "superfast", encode_fps=600, ssim=0.985),
+                    EncoderProfile("libx264", "veryfast", encode_fps=400, ssim=0.99)]
+        assert profiler.select(measured).preset == "superfast"
+        # Nobody reaches the target: the best quality wins
+        profiler.min_ssim = 0.995
+        assert profiler.select(measured).preset == "veryfast"
+        assert profiler.select([]) is None
+
+
+class TestCache:
+    def test_no_benchmark_without_opt_in(self, profiler, no_ffmpeg_runs):
+        assert profiler.get_profile(benchmark=False) == legacy_profile()
+
+    def test_stored_profile_reused(self, profiler, no_ffmpeg_runs):
+        stored = EncoderProfile("libx264", "veryfast", ["-crf", "18"], 512.0, 0.991)
+        profiler.store(stored)
+        again = EncoderProfiler(ffmpeg_path=sys.executable, cache_path=profiler.cache_path)
+        assert again.get_profile(benchmark=False) == stored
+        # Per GPU setting
+        assert again.get_profile(use_gpu=True, benchmark=False) == legacy_profile()
+
+    def test_benchmark_on_miss(self, profiler, monkeypatch):
+        measured = [EncoderProfile("libx264", "faster", ["-crf", "18"], 300.0, 0.99)]
+        monkeypatch.setattr(profiler, "benchmark", lambda use_gpu=False: measured)
+        assert profiler.get_profile() == measured[0]
+        monkeypatch.setattr(profiler, "benchmark", lambda use_gpu=False: pytest.fail("benchmarked twice"))
+        assert profiler.get_profile() == measured[0]
+
+    @pytest.mark.parametrize("value, expected", [("", False), ("1", True), ("0", False)])
+    def test_process_profile_opt_in(self, monkeypatch, value, expected):
+        calls = []
+        monkeypatch.setattr(encoder_profile, "_profiles", {})
+        monkeypatch.setattr(EncoderProfiler, "get_profile",
+                            lambda self, use_gpu, refresh, benchmark: calls.append(benchmark) or legacy_profile())
+        monkeypatch.setenv("TIKSIMPRO_ENCODER_BENCHMARK", value)
+        get_encoder_profile(sys.executable)
+        get_encoder_profile(sys.executable)
+        assert calls == [expected]   # Resolved once per process
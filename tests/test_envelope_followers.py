@@ -0,0 +1,216 @@
+"""
+Regression tests - vectorised envelope followers and master effects
+
+follow_envelope, peak_envelope, Compressor.process and Limiter.process are
+compared against the per-sample loops they replaced, on fixed-seed signals
+long enough to span several chunks of the block solver.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.audio_generators.viral_audio.effects import Compressor, Limiter
+from src.audio_generators.viral_audio.effects.envelope import (
+    CHUNK_SIZE, follow_envelope, peak_envelope
+)
+
+SAMPLE_RATE = 44100
+TOLERANCE = 2e-6
+
+
+def reference_envelope(abs_signal, attack_coef, release_coef, initial):
+    """Per-sample attack/release envelope follower"""
+    envelope = np.empty(len(abs_signal))
+    previous = float(initial)
+    for i, x in enumerate(abs_signal.tolist()):
+        coef = attack_coef if x > previous else release_coef
+        previous = envelope[i] = coef * previous + (1 - coef) * x
+    return envelope
+
+
+def reference_peak(abs_signal, release_coef):
+    """Per-sample instant-attack peak hold"""
+    peak = np.empty(len(abs_signal))
+    previous = 0.0
+    for i, x in enumerate(abs_signal.tolist()):
+        previous = peak[i] = x if x > previous else previous * release_coef
+    return peak
+
+
+def reference_compress(comp, signal):
+    """Compressor.process as a per-sample loop"""
+    signal = np.asarray(signal, dtype=np.float64)
+    abs_signal = np.abs(signal)
+    attack_coef = np.exp(-1.0 / (comp.attack_ms * comp.sample_rate / 1000))
+    release_coef = np.exp(-1.0 / (comp.release_ms * comp.sample_rate / 1000))
+    envelope = reference_envelope(abs_signal, attack_coef, release_coef, abs_signal[0])
+    threshold_lin = 10 ** (comp.threshold_db / 20)
+    gain = np.ones_like(signal)
+    above_threshold = envelope > threshold_lin
+    over_db = 20 * np.log10(envelope[above_threshold] / threshold_lin + 1e-10)
+    gain[above_threshold] = 10 ** (-(over_db - over_db / comp.ratio) / 20)
+    makeup_gain = min(1.0 / (10 ** (comp.threshold_db / 20 / comp.ratio)), 2.0)
+    return signal * gain * makeup_gain
+
+
+def reference_limit(limiter, signal):
+    """Limiter.process as a per-sample loop"""
+    signal = np.asarray(signal, dtype=np.float64)
+    ceiling_lin = 10 ** (limiter.ceiling_db / 20)
+    release_coef = np.exp(-1.0 / (limiter.release_ms * limiter.sample_rate / 1000))
+    peak = reference_peak(np.abs(signal), release_coef)
+    gain = np.where(peak > ceiling_lin, ceiling_lin / np.maximum(peak, 1e-30), 1.0)
+    return np.clip(signal * gain, -ceiling_lin, ceiling_lin)
+
+
+def make_signal(seconds, peak, seed, dtype=np.float32):
+    """Decaying tonal hits and noise bursts over a quiet noise floor"""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = rng.standard_normal(total) * 0.01
+    hit = int(0.3 * SAMPLE_RATE)
+    t = np.arange(hit) / SAMPLE_RATE
+    for start in rng.integers(0, total - hit, int(seconds * 12)):
+        tone = np.sin(2 * np.pi * rng.uniform(80, 1200) * t) * np.exp(-t * rng.uniform(6, 20))
+        noise = rng.standard_normal(hit) * np.exp(-t * 60) * 0.3
+        audio[start:start + hit] += rng.uniform(0.1, 1.0) * (tone + noise)
+    return (audio * (peak / np.max(np.abs(audio)))).astype(dtype)
+
+
+def make_sawtooth(seconds):
+    """Above the limiter ceiling, decaying slower than the peak releases: a reset every few samples"""
+    return np.tile(np.linspace(2, 0.9, 4410), int(seconds * 10)).astype(np.float32)
+
+
+def assert_close(actual, expected):
+    assert actual.shape == expected.shape
+    assert np.max(np.abs(actual - expected), initial=0.0) <= TOLERANCE
+
+
+@pytest.fixture(params=[0, 7, 42])
+def seed(request):
+    return request.param
+
+
+class TestFollowEnvelope:
+    @pytest.mark.parametrize("attack_ms, release_ms", [(5.0, 50.0), (0.1, 0.5), (20.0, 1000.0)])
+    def test_matches_reference(self, seed, attack_ms, release_ms):
+        abs_signal = np.abs(make_signal(1.5, 0.9, seed)).astype(np.float64)
+        assert len(abs_signal) > 3 * CHUNK_SIZE
+        attack = np.exp(-1.0 / (attack_ms * SAMPLE_RATE / 1000))
+        release = np.exp(-1.0 / (release_ms * SAMPLE_RATE / 1000))
+        expected = reference_envelope(abs_signal, attack, release, abs_signal[0])
+        assert_close(follow_envelope(abs_signal, attack, release, abs_signal[0]), expected)
+
+    def test_initial_state(self, seed):
+        abs_signal = np.abs(make_signal(0.5, 0.5, seed)).astype(np.float64)
+        expected = reference_envelope(abs_signal, 0.9, 0.999, 0.8)
+        assert_close(follow_envelope(abs_signal, 0.9, 0.999, 0.8), expected)
+
+    def test_out_buffer(self, seed):
+        abs_signal = np.abs(make_signal(1.0, 0.9, seed))
+        expected = reference_envelope(abs_signal, 0.99, 0.9995, abs_signal[0])
+
+        out = np.empty_like(abs_signal)
+        result = follow_envelope(abs_signal, 0.99, 0.9995, abs_signal[0], out=out)
+        assert result is out
+        assert_close(out, expected)
+
+        # In place: every chunk is read before it is written
+        result = follow_envelope(abs_signal, 0.99, 0.9995, abs_signal[0], out=abs_signal)
+        assert result is abs_signal
+        assert_close(abs_signal, expected)
+
+    def test_edge_cases(self):
+        assert len(follow_envelope(np.zeros(0), 0.9, 0.99, 0.0)) == 0
+        assert_close(follow_envelope(np.zeros(5000), 0.9, 0.99, 0.0), np.zeros(5000))
+        assert_close(follow_envelope(np.array([0.7]), 0.9, 0.99, 0.2),
+                     reference_envelope(np.array([0.7]), 0.9, 0.99, 0.2))
+
+
+class TestPeakEnvelope:
+    @pytest.mark.parametrize("release_ms", [1.0, 100.0, 2000.0])
+    def test_matches_reference(self, seed, release_ms):
+        abs_signal = np.abs(make_signal(1.5, 1.4, seed)).astype(np.float64)
+        release = np.exp(-1.0 / (release_ms * SAMPLE_RATE / 1000))
+        assert_close(peak_envelope(abs_signal, release), reference_peak(abs_signal, release))
+
+    def test_edge_cases(self):
+        assert len(peak_envelope(np.zeros(0), 0.99)) == 0
+        assert_close(peak_envelope(np.zeros(5000), 0.99), np.zeros(5000))
+        assert_close(peak_envelope(np.array([0.3]), 0.99), np.array([0.3]))
+
+    def test_sawtooth(self):
+        abs_signal = make_sawtooth(5).astype(np.float64)
+        limiter = Limiter(SAMPLE_RATE)
+        release = np.exp(-1.0 / (limiter.release_ms * SAMPLE_RATE / 1000))
+        assert_close(peak_envelope(abs_signal, release), reference_peak(abs_signal, release))
+
+    def test_sawtooth_timing(self):
+        # Worst case of the reset correction: no slower than the per-sample loop
+        abs_signal = make_sawtooth(20).astype(np.float64)
+        release = np.exp(-1.0 / (50.0 * SAMPLE_RATE / 1000))
+
+        started = time.perf_counter()
+        reference_peak(abs_signal, release)
+        reference_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        peak_envelope(abs_signal, release)
+        assert time.perf_counter() - started < max(2 * reference_time, 0.5)
+
+
+class TestCompressor:
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_matches_reference(self, seed, dtype):
+        signal = make_signal(1.5, 0.9, seed, dtype)
+        comp = Compressor(SAMPLE_RATE)
+        result = comp.process(signal)
+        assert result.dtype == dtype
+        assert_close(result.astype(np.float64), reference_compress(comp, signal))
+
+    def test_below_threshold(self, seed):
+        signal = make_signal(0.5, 0.1, seed)
+        comp = Compressor(SAMPLE_RATE)
+        assert_close(comp.process(signal).astype(np.float64), reference_compress(comp, signal))
+
+    def test_out_buffer(self, seed):
+        signal = make_signal(1.0, 0.9, seed)
+        comp = Compressor(SAMPLE_RATE)
+        expected = reference_compress(comp, signal)
+
+        out = np.empty_like(signal)
+        assert comp.process(signal, out=out) is out
+        assert_close(out.astype(np.float64), expected)
+
+        assert comp.process(signal, out=signal) is signal
+        assert_close(signal.astype(np.float64), expected)
+
+
+class TestLimiter:
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_matches_reference(self, seed, dtype):
+        signal = make_signal(1.5, 1.6, seed, dtype)
+        limiter = Limiter(SAMPLE_RATE)
+        result = limiter.process(signal)
+        assert result.dtype == dtype
+        assert_close(result.astype(np.float64), reference_limit(limiter, signal))
+
+    def test_sawtooth(self):
+        signal = make_sawtooth(5)
+        limiter = Limiter(SAMPLE_RATE)
+        assert_close(limiter.process(signal).astype(np.float64), reference_limit(limiter, signal))
+
+    def test_out_buffer(self, seed):
+        signal = make_signal(1.0, 1.6, seed)
+        limiter = Limiter(SAMPLE_RATE)
+        expected = reference_limit(limiter, signal)
+
+        out = np.empty_like(signal)
+        assert limiter.process(signal, out=out) is out
+        assert_close(out.astype(np.float64), expected)
+
+        assert limiter.process(signal, out=signal) is signal
+        assert_close(signal.astype(np.float64), expected)
@@ -0,0 +1,112 @@
+"""
+Regression tests - EventMixer
+
+render() and render_blocks() are compared against the generators' previous
+per-event loop (slice add into the buffer, auto volume measured on the
+buffer under every new note), on fixed-seed note placements.
+"""
+
+import numpy as np
+import pytest
+
+from src.audio_generators.event_mixer import ENVELOPE_HOP, EventMixer
+
+SAMPLE_RATE = 44100
+SECONDS = 10.0
+TOLERANCE = 1e-6
+LEVEL_TOLERANCE = 0.02   # Relative RMS difference allowed with ducking
+
+
+def reference_mix(length, placements, duck_amount):
+    """Per-event loop of the note generators (placements in time order)"""
+    audio = np.zeros(length, dtype=np.float32)
+    for waveform, start, gain in placements:
+        end = min(start + len(waveform), length)
+        if duck_amount > 0:
+            gain *= 1.0 / (1.0 + np.mean(np.abs(audio[start:end])) * duck_amount)
+        audio[start:end] += waveform[:end - start] * gain
+    return audio
+
+
+def make_notes(count, seed):
+    """Decaying plucks of a few pitches and lengths"""
+    rng = np.random.default_rng(seed)
+    notes = []
+    for _ in range(count):
+        t = np.arange(int(rng.uniform(0.2, 0.8) * SAMPLE_RATE)) / SAMPLE_RATE
+        note = np.sin(2 * np.pi * rng.uniform(200, 900) * t) * np.exp(-t * rng.uniform(3, 9))
+        notes.append((0.8 * note).astype(np.float32))
+    return notes
+
+
+def make_placements(events, seed):
+    """(waveform, start, gain) in time order - the same array reused for every event of a note"""
+    rng = np.random.default_rng(seed)
+    notes = make_notes(12, seed)
+    starts = np.sort(rng.integers(0, int(SECONDS * SAMPLE_RATE), events))
+    return [(notes[rng.integers(len(notes))], int(start), float(rng.choice((0.4, 0.6, 0.8))))
+            for start in starts]
+
+
+def mixer_for(placements):
+    mixer = EventMixer(int(SECONDS * SAMPLE_RATE))
+    for waveform, start, gain in placements:
+        assert mixer.add(waveform, start, gain)
+    return mixer
+
+
+def rms(signal):
+    return float(np.sqrt(np.mean(np.square(signal, dtype=np.float64))))
+
+
+@pytest.fixture(params=[0, 7])
+def seed(request):
+    return request.param
+
+
+class TestEventMixer:
+    @pytest.mark.parametrize("events", [30, 300])
+    def test_matches_reference(self, seed, events):
+        placements = make_placements(events, seed)
+        expected = reference_mix(int(SECONDS * SAMPLE_RATE), placements, 0.0)
+        result = mixer_for(placements).render()
+        assert np.max(np.abs(result - expected)) <= TOLERANCE
+
+    @pytest.mark.parametrize("events", [100, 300, 1000])
+    def test_ducked_level(self, seed, events):
+        placements = make_placements(events, seed)
+        expected = reference_mix(int(SECONDS * SAMPLE_RATE), placements, 2.0)
+        result = mixer_for(placements).render(duck_amount=2.0)
+        assert abs(rms(result) / rms(expected) - 1) <= LEVEL_TOLERANCE
+
+    def test_ducking_of_isolated_notes(self):
+        # Nothing plays before or under a note (a frame of the envelope apart): no reduction
+        note = make_notes(1, 3)[0]
+        spacing = len(note) + ENVELOPE_HOP
+        mixer = EventMixer(4 * spacing)
+        for k in range(3):
+            mixer.add(note, k * spacing, 0.5)
+        assert np.max(np.abs(mixer.render(duck_amount=2.0) - mixer.render())) <= TOLERANCE
+
+    @pytest.mark.parametrize("duck_amount", [0.0, 2.0])
+    def test_render_blocks(self, seed, duck_amount):
+        placements = make_placements(200, seed)
+        mixer = mixer_for(placements)
+        expected = mixer.render(duck_amount=duck_amount)
+        blocks = np.concatenate([block.copy() for block in mixer.render_blocks(10000, duck_amount)])
+        assert np.max(np.abs(blocks - expected)) <= TOLERANCE
+
+    def test_out_of_timeline(self):
+        note = make_notes(1, 1)[0]
+        mixer = EventMixer(len(note) + 100)
+        assert not mixer.add(note, -1)
+        assert not mixer.add(note, len(note) + 100)
+        assert not mixer.add(note[:0], 0)
+        assert mixer.add(note, 200)
+        assert len(mixer) == 1
+
+        out = np.ones(len(note) + 100, dtype=np.float32)
+        assert mixer.render(out=out) is out
+        expected = np.ones(len(note) + 100, dtype=np.float32)
+        expected[200:] += note[:len(note) - 100]
+        assert np.max(np.abs(out - expected)) <= TOLERANCE
@@ -0,0 +1,118 @@
+"""
+Regression tests - fixed-timestep scheduler and continuous collision detection
+
+Time-of-impact roots of ContinuousCollisionDetector on hand-computed
+cases, and a fast ball that tunnels through a thin ring with a plain
+step() but is kept inside by advance() with CCD or substeps.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.physics_engine.collision.detector import ContinuousCollisionDetector
+from src.utils.physics_engine.collision.narrowphase import RingArrays
+from src.utils.physics_engine.core.engine import EngineConfig, PhysicsEngine
+from src.utils.physics_engine.core.vector import Vector2D
+from src.utils.physics_engine.physics.body import Circle, Ring
+
+TOLERANCE = 1e-9
+
+
+def ring_arrays(inner=100.0, outer=110.0, gap_start=0.0, gap_angle=0.0):
+    return RingArrays(center=np.zeros((1, 2)), inner=np.array([inner]), outer=np.array([outer]),
+                      gap_start=np.array([gap_start % 360]), gap_angle=np.array([gap_angle]))
+
+
+def ring_toi(start, motion, radius=10.0, **ring):
+    toi, side = ContinuousCollisionDetector().circle_ring_toi(
+        np.array([start], dtype=float), np.array([motion], dtype=float), np.array([radius]),
+        ring_arrays(**ring))
+    return float(toi[0, 0]), int(side[0, 0])
+
+
+class TestCircleCircleToi:
+    @pytest.mark.parametrize("start_b, motion_a, motion_b, expected", [
+        ((100.0, 0.0), (100.0, 0.0), (0.0, 0.0), 0.8),      # Head-on, B at rest
+        ((100.0, 0.0), (40.0, 0.0), (-40.0, 0.0), 1.0),     # Both moving, contact at the end of the step
+        ((100.0, 0.0), (50.0, 0.0), (0.0, 0.0), np.inf),    # Stops short
+        ((100.0, 30.0), (200.0, 0.0), (0.0, 0.0), np.inf),  # Passes by
+        ((100.0, 0.0), (-50.0, 0.0), (0.0, 0.0), np.inf),   # Moving apart
+        ((15.0, 0.0), (50.0, 0.0), (0.0, 0.0), np.inf),     # Already overlapping
+    ])
+    def test_roots(self, start_b, motion_a, motion_b, expected):
+        toi = ContinuousCollisionDetector().circle_circle_toi(
+            np.zeros(2), np.array(motion_a), np.array(start_b), np.array(motion_b), np.array(20.0))
+        assert toi == pytest.approx(expected, abs=TOLERANCE)
+
+
+class TestCircleRingToi:
+    def test_inner_exit(self):
+        # From the centre: the ball reaches the inner edge (100) once moved 90 px of 200
+        toi, side = ring_toi((0, 0), (200, 0))
+        assert toi == pytest.approx(0.45, abs=TOLERANCE) and side == 1
+
+    def test_outer_entry(self):
+        # From outside: the ball reaches the outer edge (110) once moved 180 px of 200
+        toi, side = ring_toi((300, 0), (-200, 0))
+        assert toi == pytest.approx(0.9, abs=TOLERANCE) and side == 2
+
+    @pytest.mark.parametrize("start, motion, expected", [
+        ((92, 0), (20, 0), (0.0, 1)),       # Against the inner edge, moving into it
+        ((118, 0), (-20, 0), (0.0, 2)),     # Against the outer edge, moving into it
+        ((92, 0), (-20, 0), (np.inf, 0)),   # Against the inner edge, moving away
+    ])
+    def test_against_wall(self, start, motion, expected):
+        toi, side = ring_toi(start, motion)
+        assert (toi, side) == expected
+
+    def test_no_contact(self):
+        assert ring_toi((0, 0), (50, 0)) == (np.inf, 0)      # Stays in the hole
+        assert ring_toi((300, 0), (0, 100)) == (np.inf, 0)   # Stays outside
+
+    def test_gap_pass_through(self):
+        # Gap of 40° centred on the +x axis: crossing there is not a contact
+        assert ring_toi((0, 0), (200, 0), gap_start=-20, gap_angle=40) == (np.inf, 0)
+        toi, side = ring_toi((0, 0), (0, 200), gap_start=-20, gap_angle=40)
+        assert toi == pytest.approx(0.45, abs=TOLERANCE) and side == 1
+
+
+def fire_ball(options, use_advance, frames=120):
+    """Largest distance from the centre reached by a 5 px ball fired at ~1800 px/s inside an 8 px ring"""
+    engine = PhysicsEngine(EngineConfig(width=400, height=400, gravity=Vector2D(0, 0),
+                                        friction=0.0, **options))
+    centre = Vector2D(200, 200)
+    engine.add_body(Ring(centre, 100, 108))
+    ball = Circle(centre, 5)
+    ball.drag_coefficient = 0.0
+    ball.velocity = Vector2D(1800, 300)
+    engine.add_body(ball)
+    reach = 0.0
+    for _ in range(frames):
+        if use_advance:
+            engine.advance()
+        else:
+            engine.step(1.0 / 60)
+        reach = max(reach, (ball.position - centre).magnitude)
+    return reach
+
+
+class TestTunnelling:
+    def test_step_tunnels(self):
+        # 30 px per step against an 8 px wall: the ball jumps over it
+        assert fire_ball({}, use_advance=False) > 108
+
+    @pytest.mark.parametrize("options", [{"ccd": True}, {"substeps": 4},
+                                         {"ccd": True, "solver_iterations": 8}])
+    def test_advance_keeps_ball_inside(self, options):
+        assert fire_ball(options, use_advance=True) <= 95.0 + 1e-6
+
+    def test_advance_steps(self):
+        engine = PhysicsEngine(EngineConfig(width=400, height=400, substeps=3))
+        assert engine.advance() == 3
+        engine.time_scale = 0.5
+        steps = [engine.advance() for _ in range(4)]
+        assert sum(steps) == 6
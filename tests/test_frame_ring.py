@@ -0,0 +1,117 @@
+"""
+Regression tests - frame handoff buffers
+
+copy_surface_pixels is compared against the previous conversion
+(array3d + transpose + tobytes) on surfaces of several layouts, and the
+FrameBufferPool / FrameSpillRing bookkeeping is checked.
+"""
+
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.video.frame_ring import (
+    FrameBufferPool, FrameSpillRing, copy_surface_pixels, surface_pixel_format
+)
+
+WIDTH, HEIGHT = 37, 21   # Odd width: rows may be padded
+
+
+def make_surface(depth, alpha=False):
+    surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA if alpha else 0, depth)
+    rng = np.random.default_rng(depth)
+    for _ in range(40):
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        x, y = (int(v) for v in rng.integers(0, (WIDTH, HEIGHT)))
+        pygame.draw.circle(surface, color, (x, y), int(rng.integers(2, 9)))
+    return surface
+
+
+def legacy_rgb(surface):
+    """
+    Previous conversion of a frame to RGB bytes. 16-bit surfaces are
+    compared with the pygame.image.tostring path: array3d widens 5/6-bit
+    channels differently.
+    """
+    if surface.get_bytesize() == 2:
+        width, height = surface.get_size()
+        return np.frombuffer(pygame.image.tostring(surface, "RGB"), dtype=np.uint8).reshape(height, width, 3)
+    return np.transpose(pygame.surfarray.array3d(surface), (1, 0, 2)).astype(np.uint8)
+
+
+def to_rgb(buffer, pix_fmt):
+    """RGB pixels (H, W, 3) of a raw frame in `pix_fmt`"""
+    layout = {"rgb24": "rgb", "bgr24": "bgr"}.get(pix_fmt, pix_fmt)
+    pixels = buffer.reshape(HEIGHT, WIDTH, len(layout))
+    return pixels[:, :, [layout.index(channel) for channel in "rgb"]]
+
+
+@pytest.fixture(params=[(32, False), (32, True), (24, False), (16, False)],
+                ids=["32", "32-alpha", "24", "16"])
+def surface(request):
+    return make_surface(*request.param)
+
+
+class TestCopySurfacePixels:
+    def test_matches_legacy(self, surface):
+        pix_fmt, bytes_per_pixel = surface_pixel_format(surface)
+        if surface.get_bytesize() == 2:
+            assert (pix_fmt, bytes_per_pixel) == ("rgb24", 3)   # Converted by pygame
+        out = np.empty(WIDTH * HEIGHT * bytes_per_pixel, dtype=np.uint8)
+        copy_surface_pixels(surface, out, pix_fmt)
+        assert np.array_equal(to_rgb(out, pix_fmt), legacy_rgb(surface))
+
+    def test_subsurface(self):
+        # A subsurface's rows are strided by its parent's pitch
+        parent = make_surface(32)
+        child = parent.subsurface((3, 2, WIDTH - 5, HEIGHT - 4))
+        pix_fmt, bytes_per_pixel = surface_pixel_format(child)
+        out = np.empty((WIDTH - 5) * (HEIGHT - 4) * bytes_per_pixel, dtype=np.uint8)
+        copy_surface_pixels(child, out, pix_fmt)
+        pixels = out.reshape(HEIGHT - 4, WIDTH - 5, bytes_per_pixel)[:, :, [pix_fmt.index(c) for c in "rgb"]]
+        assert np.array_equal(pixels, legacy_rgb(child))
+
+    def test_requested_format(self, surface):
+        # Another pix_fmt than the surface's own goes through pygame's conversion
+        out = np.empty(WIDTH * HEIGHT * 3, dtype=np.uint8)
+        copy_surface_pixels(surface, out, "rgb24")
+        assert np.array_equal(to_rgb(out, "rgb24"), legacy_rgb(surface))
+
+
+class TestFrameBufferPool:
+    def test_lazy_allocation_and_reuse(self):
+        pool = FrameBufferPool(16, 2)
+        first, second = pool.acquire(timeout=0), pool.acquire(timeout=0)
+        assert pool.allocated == 2 and first is not second and first.size == 16
+        assert pool.acquire(timeout=0) is None
+        assert pool.acquire(timeout=0.01) is None
+        pool.release(first)
+        assert pool.available() == 1
+        assert pool.acquire(timeout=0) is first
+        assert pool.allocated == 2
+
+
+class TestFrameSpillRing:
+    def test_fifo(self, tmp_path):
+        ring = FrameSpillRing(4, slots=3, directory=str(tmp_path))
+        frames = [bytes([k] * 4) for k in range(5)]
+        slots = [ring.write(frame, timeout=0) for frame in frames[:3]]
+        assert slots == [0, 1, 2] and len(ring) == 3
+        assert ring.write(frames[3], timeout=0) is None   # Full
+
+        # Only the oldest slot can be released
+        ring.release(1)
+        assert len(ring) == 3
+        assert bytes(ring.read(0)) == frames[0]
+        ring.release(0)
+        assert ring.write(frames[3], timeout=0) == 0      # Wraps around
+        assert [bytes(ring.read(slot)) for slot in (1, 2, 0)] == frames[1:4]
+
+        path = ring.path
+        ring.close()
+        assert not os.path.exists(path)
+        assert ring.write(frames[4], timeout=0) is None
@@ -0,0 +1,184 @@
+"""
+Regression tests - compiled MIDI cache
+
+MidiCache keys compiled melodies by the hash of the file contents: the
+same contents are compiled once whatever the path, and artefacts are read
+back without compiling. The tempo-map conversion is compared against a
+tick-by-tick walk, and the melody-track rule (last track with notes)
+against the previous last-track extraction, on generated and bundled
+files when mido is installed.
+"""
+
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from src.audio_generators import midi_cache
+from src.audio_generators.midi_cache import (
+    CompiledMidi, MidiCache, MIDI_FREQUENCIES, ticks_to_seconds
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOLERANCE = 1e-9   # Seconds
+
+
+def reference_seconds(ticks, tempo_ticks, tempos, ticks_per_beat):
+    """Walk the ticks one by one, switching tempo at each change"""
+    changes = dict(sorted(zip(tempo_ticks.tolist(), tempos.tolist()), key=lambda c: c[0]))
+    tempo, elapsed, times = 500000, 0.0, {}
+    for tick in range(int(ticks.max()) + 1):
+        tempo = changes.get(tick, tempo)
+        times[tick] = elapsed
+        elapsed += tempo / 1e6 / ticks_per_beat
+    return np.array([times[tick] for tick in ticks.tolist()])
+
+
+def make_compiled(notes, tracks, tempos=(500000,)):
+    return CompiledMidi(
+        notes=np.array(notes, dtype=np.uint8), velocities=np.full(len(notes), 90, dtype=np.uint8),
+        tracks=np.array(tracks, dtype=np.int16), onsets=np.arange(len(notes), dtype=np.float64) / 2,
+        tempo_ticks=np.zeros(len(tempos), dtype=np.int64), tempos=np.array(tempos, dtype=np.int64),
+        ticks_per_beat=480, melody_track=max(tracks) if tracks else -1)
+
+
+@pytest.fixture
+def compiles(monkeypatch):
+    """compile_midi replaced by a recorder: one note per byte of the file, all on track 1"""
+    calls = []
+
+    def compile_midi(data):
+        calls.append(data)
+        return make_compiled([60 + b % 12 for b in data], [1] * len(data))
+
+    monkeypatch.setattr(midi_cache, "compile_midi", compile_midi)
+    return calls
+
+
+class TestCompiledMidi:
+    def test_melody(self):
+        compiled = make_compiled([60, 64, 69, 72], [1, 2, 2, 1], tempos=(400000, 600000))
+        assert compiled.melody_notes() == pytest.approx([MIDI_FREQUENCIES[64], 440.0])
+        assert len(compiled.all_notes()) == 4
+        assert compiled.bpm == 150.0
+        assert np.array_equal(compiled.melody_onsets(), [0.5, 1.0])
+
+    def test_artefact_round_trip(self, tmp_path):
+        compiled = make_compiled([60, 62], [0, 3])
+        path = str(tmp_path / "melody.npz")
+        compiled.save(path)
+        loaded = CompiledMidi.load(path)
+        assert (loaded.ticks_per_beat, loaded.melody_track) == (480, 3)
+        for name in ("notes", "velocities", "tracks", "onsets", "tempo_ticks", "tempos"):
+            assert np.array_equal(getattr(loaded, name), getattr(compiled, name)), name
+            assert getattr(loaded, name).dtype == getattr(compiled, name).dtype
+
+    def test_ticks_to_seconds(self):
+        ticks = np.array([0, 10, 479, 480, 500, 1900, 2000, 2001, 3500])
+        # Unsorted map (a later track may hold an earlier change)
+        tempo_ticks = np.array([480, 2000, 1000])
+        tempos = np.array([300000, 900000, 450000])
+        result = ticks_to_seconds(ticks, tempo_ticks, tempos, 480)
+        assert np.max(np.abs(result - reference_seconds(ticks, tempo_ticks, tempos, 480))) < TOLERANCE
+        # Without tempo changes: 120 BPM
+        assert ticks_to_seconds(ticks, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                                480)[-1] == pytest.approx(3500 / 960)
+
+
+class TestMidiCache:
+    def test_compiled_once_per_contents(self, tmp_path, compiles):
+        first, copy = tmp_path / "a.mid", tmp_path / "b.mid"
+        first.write_bytes(b"melody")
+        copy.write_bytes(b"melody")
+        cache = MidiCache(cache_dir=str(tmp_path / "cache"))
+        compiled = cache.load(str(first))
+        assert cache.load(str(first)) is compiled
+        assert cache.load(str(copy)) is compiled    # Same hash, other path
+        assert len(compiles) == 1
+
+        # New contents: compiled again
+        first.write_bytes(b"another melody")
+        assert len(cache.load(str(first)).notes) == len(b"another melody")
+        assert len(compiles) == 2
+
+    def test_artefacts_reused(self, tmp_path, compiles):
+        path = tmp_path / "a.mid"
+        path.write_bytes(b"melody")
+        MidiCache(cache_dir=str(tmp_path / "cache")).load(str(path))
+        assert len(glob.glob(str(tmp_path / "cache" / "*.npz"))) == 1
+        compiled = MidiCache(cache_dir=str(tmp_path / "cache")).load(str(path))
+        assert len(compiles) == 1
+        assert compiled.melody_notes() == [MIDI_FREQUENCIES[60 + b % 12] for b in b"melody"]
+
+    def test_memory_lru(self, tmp_path, compiles):
+        cache = MidiCache(cache_dir=str(tmp_path / "cache"), max_entries=2)
+        paths = []
+        for name in "abc":
+            paths.append(tmp_path / f"{name}.mid")
+            paths[-1].write_bytes(name.encode())
+            cache.load(str(paths[-1]))
+        assert len(cache._compiled) == 2
+        # Evicted from memory, read back from its artefact
+        cache.load(str(paths[0]))
+        assert len(compiles) == 3
+
+    def test_compile_folder(self, tmp_path, monkeypatch, compiles):
+        (tmp_path / "a.mid").write_bytes(b"a")
+        (tmp_path / "notes.txt").write_bytes(b"b")
+        (tmp_path / "broken.midi").write_bytes(b"")
+        real_compile = midi_cache.compile_midi
+        monkeypatch.setattr(midi_cache, "compile_midi",
+                            lambda data: real_compile(data) if data else (_ for _ in ()).throw(ValueError()))
+        results = MidiCache(cache_dir=str(tmp_path / "cache")).compile_folder(str(tmp_path))
+        assert sorted(os.path.basename(p) for p in results) == ["a.mid", "broken.midi"]
+        assert results[str(tmp_path / "broken.midi")] is None
+
+
+class TestMelodyTrack:
+    @pytest.fixture
+    def mido(self):
+        return pytest.importorskip("mido")
+
+    @staticmethod
+    def legacy_notes(mido, path):
+        """Previous extraction: note_on messages of the last track"""
+        midi = mido.MidiFile(path)
+        return [440.0 * (2 ** ((msg.note - 69) / 12)) for msg in midi.tracks[-1]
+                if msg.type == 'note_on' and msg.velocity > 0]
+
+    def test_generated_file(self, tmp_path, mido):
+        midi = mido.MidiFile(ticks_per_beat=480)
+        conductor = mido.MidiTrack([mido.MetaMessage('set_tempo', tempo=400000, time=0)])
+        melody = mido.MidiTrack()
+        for note in (72, 74, 76):
+            melody += [mido.Message('note_on', note=note, velocity=100, time=0),
+                       mido.Message('note_on', note=note, velocity=0, time=480)]
+        bass = mido.MidiTrack([mido.Message('note_on', note=36, velocity=80, time=0),
+                               mido.Message('note_off', note=36, velocity=0, time=960)])
+        midi.tracks += [conductor, bass, melody, mido.MidiTrack()]   # Ends with an empty track
+        path = str(tmp_path / "song.mid")
+        midi.save(path)
+
+        compiled = midi_cache.compile_midi(open(path, "rb").read())
+        assert compiled.melody_track == 2
+        assert compiled.melody_notes() == pytest.approx([MIDI_FREQUENCIES[n] for n in (72, 74, 76)])
+        assert compiled.bpm == 150.0
+        assert np.allclose(compiled.melody_onsets(), [0.0, 0.4, 0.8])
+
+    @pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(ROOT, "music", "*.mid"))),
+                             ids=os.path.basename)
+    def test_bundled_files(self, tmp_path, mido, path):
+        try:
+            legacy = self.legacy_notes(mido, path)
+        except Exception:
+            # Unreadable by mido: still an error, not an empty melody
+            with pytest.raises(Exception):
+                MidiCache(cache_dir=str(tmp_path)).load(path)
+            return
+        compiled = MidiCache(cache_dir=str(tmp_path)).load(path)
+        if legacy:
+            # Same melody as before whenever the last track had one
+            assert compiled.melody_notes() == pytest.approx(legacy)
+        else:
+            assert compiled.melody_track < len(mido.MidiFile(path).tracks) - 1
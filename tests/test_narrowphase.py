@@ -0,0 +1,98 @@
+"""
+Regression tests - vectorised narrowphase
+
+circle_circle_contacts and circle_ring_contacts are compared against the
+per-object tests (PhysicsEngine._check_collision, Ring.collision_with_circle)
+on fixed-seed scenes, and the ring side is checked on rings thinner than
+the balls touching them.
+"""
+
+import numpy as np
+import pytest
+
+from src.utils.physics_engine.collision.narrowphase import (
+    RingArrays, circle_circle_contacts, circle_ring_contacts
+)
+from src.utils.physics_engine.core.vector import Vector2D
+from src.utils.physics_engine.physics.body import Ring
+
+TOLERANCE = 1e-9
+
+
+def ring_contacts(ring, positions, radii):
+    """circle_ring_contacts of circles against a single ring"""
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    return circle_ring_contacts(positions, np.asarray(radii, dtype=float),
+                                RingArrays.from_bodies([ring]), np.zeros(len(positions), dtype=np.int64))
+
+
+class TestCircleCircle:
+    def test_matches_per_object(self):
+        rng = np.random.default_rng(3)
+        position_a, position_b = rng.uniform(0, 100, (2, 500, 2))
+        radius_a, radius_b = rng.uniform(2, 15, (2, 500))
+        hit, normal, penetration, contact_point = circle_circle_contacts(
+            position_a, radius_a, position_b, radius_b)
+
+        distance = np.hypot(*(position_b - position_a).T)
+        assert np.array_equal(hit, distance < radius_a + radius_b)
+        assert np.max(np.abs(penetration - (radius_a + radius_b - distance)[hit]), initial=0) <= TOLERANCE
+        expected_normal = (position_b - position_a)[hit] / distance[hit][:, None]
+        assert np.max(np.abs(normal - expected_normal), initial=0) <= TOLERANCE
+        assert np.max(np.abs(contact_point - (position_a[hit] + expected_normal * radius_a[hit][:, None])),
+                      initial=0) <= TOLERANCE
+
+
+class TestCircleRing:
+    def test_matches_per_object(self):
+        rng = np.random.default_rng(11)
+        ring = Ring(Vector2D(50, 60), 80, 95, gap_angle=40, gap_start=100)
+        ring.rotation = 30
+        angle = rng.uniform(0, 2 * np.pi, 2000)
+        distance = rng.uniform(50, 130, 2000)
+        positions = np.column_stack((50 + distance * np.cos(angle), 60 + distance * np.sin(angle)))
+        radii = rng.uniform(3, 20, 2000)
+
+        hit, side, normal, penetration, contact_point = ring_contacts(ring, positions, radii)
+        k = 0
+        for position, radius, touched in zip(positions, radii, hit):
+            info = ring.collision_with_circle(Vector2D(*position), radius)
+            assert bool(info) == touched
+            if touched:
+                assert info['type'] == ("inner" if side[k] == 1 else "outer")
+                assert abs(info['penetration'] - penetration[k]) <= TOLERANCE
+                assert abs(info['normal'].x - normal[k, 0]) <= TOLERANCE
+                assert abs(info['normal'].y - normal[k, 1]) <= TOLERANCE
+                assert abs(info['contact_point'].x - contact_point[k, 0]) <= TOLERANCE
+                k += 1
+
+    @pytest.mark.parametrize("distance, side, penetration", [
+        (98.0, 1, 8.0),    # Inside the hole, against the inner edge
+        (106.0, 2, 8.0),   # Just outside: overlaps the inner edge too, but touches the outer one
+        (101.0, 1, 11.0),  # In the wall, inner half
+        (103.0, 2, 11.0),  # In the wall, outer half
+    ])
+    def test_thin_ring_side(self, distance, side, penetration):
+        # Wall (4 px) thinner than the ball diameter (20 px)
+        ring = Ring(Vector2D(0, 0), 100, 104)
+        position = (distance * np.cos(0.3), distance * np.sin(0.3))
+        direction = np.array([np.cos(0.3), np.sin(0.3)])
+
+        hit, sides, normal, depth, _ = ring_contacts(ring, [position], [10.0])
+        assert hit[0] and sides[0] == side
+        assert abs(depth[0] - penetration) <= TOLERANCE
+        # Normal from the circle to the ring: outward against the inner edge, inward against the outer one
+        assert np.max(np.abs(normal[0] - (direction if side == 1 else -direction))) <= TOLERANCE
+
+        info = ring.collision_with_circle(Vector2D(*position), 10.0)
+        assert info['type'] == ("inner" if side == 1 else "outer")
+        assert abs(info['penetration'] - penetration) <= TOLERANCE
+
+    def test_gap_and_clear(self):
+        ring = Ring(Vector2D(0, 0), 100, 104, gap_angle=30, gap_start=-15)
+        positions = [(106.0, 0.0),    # In the gap
+                     (0.0, 50.0),     # Well inside
+                     (0.0, 130.0)]    # Well outside
+        hit, *_ = ring_contacts(ring, positions, [10.0, 10.0, 10.0])
+        assert not hit.any()
+        assert not any(ring.collision_with_circle(Vector2D(*p), 10.0) for p in positions)
@@ -0,0 +1,101 @@
+"""
+Regression tests - synthesised-note cache
+
+NoteCache eviction is bounded by bytes, and a note cached at the reference
+volume, scaled by the returned gain, must sound as the note rendered
+directly at the event volume (normalisation of loud presets included).
+"""
+
+import numpy as np
+import pytest
+
+from src.audio_generators.note_cache import NoteCache
+from src.audio_generators.satisfying_audio_generator import (
+    SATISFYING_PRESETS, SatisfyingSoundEngine, SoundType
+)
+from src.audio_generators.simple_midi_audio_generator import AdvancedSoundGenerator
+
+TOLERANCE = 1e-5   # Relative to the note peak: cached waveforms are float32
+
+
+def note(samples, value=1.0):
+    return np.full(samples, value, dtype=np.float32)
+
+
+def assert_close(result, expected):
+    assert result.shape == expected.shape
+    assert np.max(np.abs(result - expected)) <= TOLERANCE * max(1e-12, float(np.max(np.abs(expected))))
+
+
+class TestNoteCache:
+    def test_eviction_by_bytes(self):
+        cache = NoteCache(max_bytes=3 * 400)
+        for key in "abc":
+            cache.put(key, note(100))      # 400 bytes each
+        assert cache.nbytes == 1200 and len(cache) == 3
+        cache.get("a")                     # "b" is now the oldest
+        cache.put("d", note(150))          # 600 bytes: two notes have to go
+        assert "b" not in cache and "c" not in cache and "a" in cache and "d" in cache
+        assert cache.nbytes == 1000 and cache.evictions == 2
+
+        # Replacing a key does not count it twice
+        cache.put("a", note(50))
+        assert cache.nbytes == 800
+        # Larger than the whole cap: returned but not kept
+        assert len(cache.put("e", note(1000))) == 1000
+        assert "e" not in cache and cache.nbytes == 800
+
+    def test_read_only(self):
+        cache = NoteCache()
+        source = note(10)
+        stored = cache.put("a", source)
+        assert stored is not source and not stored.flags.writeable
+        with pytest.raises(ValueError):
+            stored[0] = 0
+
+    def test_get_or_render(self):
+        cache = NoteCache()
+        renders = []
+        render = lambda: renders.append(1) or note(10)
+        first = cache.get_or_render("a", render)
+        assert cache.get_or_render("a", render) is first
+        assert len(renders) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+    def test_peak_dropped_with_note(self):
+        cache = NoteCache(max_bytes=400)
+        waveform = cache.put("a", note(100, -0.5))
+        assert cache.peak("a", waveform) == 0.5
+        cache.put("b", note(100))
+        assert "a" not in cache and "a" not in cache._peaks
+
+    def test_persisted(self, tmp_path):
+        cache = NoteCache(cache_dir=str(tmp_path))
+        cache.get_or_render(("k", 1), lambda: note(20, 0.25))
+        again = NoteCache(cache_dir=str(tmp_path))
+        waveform = again.get_or_render(("k", 1), lambda: pytest.fail("rendered again"))
+        assert again.disk_hits == 1 and np.array_equal(waveform, note(20, 0.25))
+        again.clear()
+        assert len(again) == 0 and again.nbytes == 0
+
+
+class TestReferenceVolume:
+    @pytest.mark.parametrize("sound_type", ["satisfying_bounce", "gentle_pluck", "crystal_ting"])
+    @pytest.mark.parametrize("volume", [0.05, 0.4, 0.8, 3.0])   # 3.0 is normalised to a 0.95 peak
+    def test_preset_gain(self, sound_type, volume):
+        generator = AdvancedSoundGenerator(note_cache=NoteCache())
+        np.random.seed(3)
+        sound, gain = generator.cached_preset_sound(sound_type, 440.0, 0.3, volume)
+        np.random.seed(3)
+        expected = getattr(generator, sound_type)(440.0, 0.3, volume)
+        assert_close(sound * gain, expected)
+        # The same waveform serves every volume
+        assert generator.cached_preset_sound(sound_type, 440.0, 0.3, volume / 2)[0] is sound
+
+    @pytest.mark.parametrize("volume", [0.3, 0.7])
+    def test_satisfying_gain(self, volume):
+        engine = SatisfyingSoundEngine(note_cache=NoteCache())
+        preset = SATISFYING_PRESETS[SoundType.BOUNCE_POP]
+        np.random.seed(4)
+        sound, gain = engine.cached_sound(preset, 330.0, 0.2, volume)
+        np.random.seed(4)
+        assert_close(sound * gain, engine.generate_sound(preset, 330.0, 0.2, volume))
@@ -0,0 +1,128 @@
+"""
+Regression tests - ParticlePool
+
+A seeded schedule of collision and passage bursts is replayed into the
+previous one-object-per-particle implementation and into ParticlePool:
+both must keep the same particles and draw the same pixels. Growth,
+bounds, log records and seeded bursts are checked as well.
+"""
+
+import math
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.video.particles import ParticlePool, ParticleSpawner
+from src.video_generators.arc_escape_simulator import PARTICLE_DTYPE
+
+FPS = 60
+FRAMES = 240
+SIZE = (400, 400)
+CENTER = (200, 200)
+COLOR = (200, 120, 60)
+
+
+class LegacyParticle:
+    """Previous behaviour: one Python object per particle"""
+
+    def __init__(self, x, y, vx, vy, color, size, life):
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.color, self.size, self.life, self.max_life = color, size, life, life
+        self.gravity = 800
+
+    def update(self, dt):
+        self.life -= dt
+        self.vy += self.gravity * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.size = max(0.5, self.size * (1 - dt * 2))
+        return self.life > 0
+
+    def render(self, surface, center, scale):
+        fade = self.life / self.max_life
+        col = (int(self.color[0] * fade), int(self.color[1] * fade), int(self.color[2] * fade))
+        px = int((center[0] + self.x) * scale)
+        py = int((center[1] + self.y) * scale)
+        pygame.draw.circle(surface, col, (px, py), int(max(1, self.size * scale)))
+
+
+def make_bursts(multiplier, seed=7):
+    """Spawn schedule: a collision burst every 0.25s and a passage burst every 2s"""
+    rng = np.random.default_rng(seed)
+    bursts = {}
+    for frame in range(FRAMES):
+        spawned = []
+        if frame % (FPS // 4) == 0:
+            n = int(rng.integers(8, 16) * multiplier)
+            angle = rng.uniform(-0.8, 0.8, n) + math.pi / 2
+            spawned.append((angle, rng.uniform(150, 400, n), rng.uniform(2, 5, n), rng.uniform(0.3, 0.6, n)))
+        if frame % (FPS * 2) == 0:
+            n = int(rng.integers(20, 36) * multiplier)
+            spawned.append((rng.uniform(0, math.pi * 2, n), rng.uniform(200, 600, n),
+                            rng.uniform(3, 7, n), rng.uniform(0.5, 1.0, n)))
+        if spawned:
+            bursts[frame] = [(np.cos(a) * s, np.sin(a) * s, size, life) for a, s, size, life in spawned]
+    return bursts
+
+
+class TestParticlePool:
+    @pytest.mark.parametrize("multiplier", [1, 10])
+    def test_matches_legacy(self, multiplier):
+        bursts = make_bursts(multiplier)
+        pool = ParticlePool(capacity=8, shrink_rate=2.0)   # Small: grows along the way
+        legacy = []
+        pool_surface, legacy_surface = pygame.Surface(SIZE), pygame.Surface(SIZE)
+        for frame in range(FRAMES):
+            for vx, vy, size, life in bursts.get(frame, []):
+                pool.spawn(0.0, 0.0, vx, vy, np.array(COLOR), size, life)
+                legacy.extend(LegacyParticle(0.0, 0.0, float(vx[i]), float(vy[i]), COLOR,
+                                             float(size[i]), float(life[i])) for i in range(len(vx)))
+            pool.update(1.0 / FPS)
+            legacy = [p for p in legacy if p.update(1.0 / FPS)]
+            assert len(pool) == len(legacy)
+            if frame % 20 == 0:
+                pool_surface.fill((0, 0, 0))
+                legacy_surface.fill((0, 0, 0))
+                pool.render(pool_surface, CENTER)
+                for p in legacy:
+                    p.render(legacy_surface, CENTER, 1)
+                assert np.array_equal(pygame.surfarray.array3d(pool_surface),
+                                      pygame.surfarray.array3d(legacy_surface)), frame
+        assert np.array_equal(pool.x, [p.x for p in legacy])
+        assert np.array_equal(pool.size, [p.size for p in legacy])
+
+    def test_bounds(self):
+        pool = ParticlePool()
+        assert pool.bounds() is None
+        pool.spawn([0.0, 10.0], [5.0, -5.0], 0.0, 0.0, COLOR, [1.0, 2.0], 1.0)
+        assert pool.bounds() == (-1.0, -7.0, 12.0, 6.0)
+
+    def test_records_round_trip(self):
+        pool = ParticlePool(seed=1)
+        ParticleSpawner.spawn_collision_particles(pool, 10.0, 20.0, 0.5, COLOR)
+        pool.update(0.1)
+        records = np.zeros(len(pool), dtype=PARTICLE_DTYPE)
+        pool.export_records(records)
+
+        restored = ParticlePool()
+        restored.load_records(records)
+        for name in ("x", "y", "size", "life", "max_life", "color"):
+            assert np.array_equal(getattr(restored, name), getattr(pool, name)), name
+        first, second = pygame.Surface(SIZE), pygame.Surface(SIZE)
+        pool.render(first, CENTER)
+        restored.render(second, CENTER)
+        assert np.array_equal(pygame.surfarray.array3d(first), pygame.surfarray.array3d(second))
+
+    def test_seeded_bursts(self):
+        pools = [ParticlePool(seed=5), ParticlePool(seed=5)]
+        for pool in pools:
+            assert ParticleSpawner.spawn_celebration_particles(pool, 0.0, 0.0, COLOR, count=30) == 30
+        assert np.array_equal(pools[0].vx, pools[1].vx)
+        assert np.array_equal(pools[0].color, pools[1].color)
+        # Jittered colours stay within the channel range
+        assert pools[0].color.min() >= 0 and pools[0].color.max() <= 255
+        assert pools[0].spawn_burst(0.0, 0.0, 0, (0, 1), (1, 2), (1, 2), (1, 2), COLOR) == 0
@@ -0,0 +1,115 @@
+"""
+Regression tests - recording policies of IVideoGenerator.record_frame
+
+No FFmpeg process or encoder thread: frames pile up in the queue, which is
+what the policies react to. Each frame is a flat grey level so the queued
+and spilled payloads can be told apart.
+"""
+
+import logging
+import os
+from queue import Queue
+
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.video.frame_ring import FrameSpillRing
+from src.video_generators.arc_escape_simulator import ArcEscapeSimulator
+from src.video_generators.base_video_generator import RecordingPolicy
+
+BUFFER_SIZE = 2
+SPILL_SLOTS = 4
+
+
+class ShortWaitQueue(Queue):
+    """Blocking puts give up at once - nothing drains the queue here"""
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout and 0.01)
+
+
+def make_generator(policy, spill_dir):
+    logging.disable(logging.WARNING)
+    generator = ArcEscapeSimulator(width=8, height=4, fps=30, duration=1)
+    generator.set_recording_policy(policy, SPILL_SLOTS, spill_dir)
+    generator.buffer_size = BUFFER_SIZE
+    generator.recording_surface = pygame.Surface((8, 4))
+    generator._setup_frame_transport()
+    if policy == RecordingPolicy.SPILL:
+        generator.spill_ring = FrameSpillRing(generator.frame_size, SPILL_SLOTS, spill_dir)
+        generator.frame_queue = ShortWaitQueue()
+    else:
+        generator.frame_queue = ShortWaitQueue(maxsize=BUFFER_SIZE)
+    generator.recording = True
+    return generator
+
+
+def record(generator, level):
+    generator.recording_surface.fill((level, level, level))
+    return generator.record_frame(generator.recording_surface)
+
+
+def queued_levels(generator):
+    """Grey level of every queued frame, read from its buffer or spill slot"""
+    levels = []
+    for frame_data in list(generator.frame_queue.queue):
+        if isinstance(frame_data, int):
+            frame_data = generator.spill_ring.read(frame_data)
+        levels.append(frame_data[0])
+    return levels
+
+
+@pytest.fixture
+def spill_dir(tmp_path):
+    return str(tmp_path)
+
+
+class TestRecordingPolicy:
+    def test_drop_keeps_newest(self, spill_dir):
+        generator = make_generator(RecordingPolicy.DROP, spill_dir)
+        assert all(record(generator, level) for level in range(10, 70, 10))
+        assert queued_levels(generator) == [50, 60]
+        assert generator.performance_stats["frames_dropped"] == 4
+        assert generator.performance_stats["frames_stalled"] == 0
+        # Dropped frames gave their buffers back
+        assert generator.frame_pool.allocated - generator.frame_pool.available() == BUFFER_SIZE
+        assert generator._queued_in_memory == BUFFER_SIZE
+
+    def test_block_without_encoder(self, spill_dir):
+        generator = make_generator(RecordingPolicy.BLOCK, spill_dir)
+        assert record(generator, 10) and record(generator, 20)
+        # Queue full and no encoder thread: the frame is refused, not dropped
+        assert not record(generator, 30)
+        assert queued_levels(generator) == [10, 20]
+        assert generator.performance_stats["frames_stalled"] == 1
+        assert generator.performance_stats["frames_dropped"] == 0
+        assert generator.frame_pool.allocated - generator.frame_pool.available() == BUFFER_SIZE
+        assert generator._queued_in_memory == BUFFER_SIZE
+
+    def test_spill_overflows_to_ring(self, spill_dir):
+        generator = make_generator(RecordingPolicy.SPILL, spill_dir)
+        levels = list(range(10, 70, 10))
+        assert all(record(generator, level) for level in levels)
+        queued = list(generator.frame_queue.queue)
+        assert not any(isinstance(frame, int) for frame in queued[:BUFFER_SIZE])
+        assert queued[BUFFER_SIZE:] == list(range(SPILL_SLOTS))
+        assert queued_levels(generator) == levels
+        assert generator.performance_stats["frames_spilled"] == SPILL_SLOTS
+
+        # Ring full as well: the frame is refused
+        assert not record(generator, 70)
+        assert len(generator.spill_ring) == SPILL_SLOTS
+        generator.spill_ring.close()
+
+    def test_stop_releases_drained_frames(self, spill_dir):
+        generator = make_generator(RecordingPolicy.DROP, spill_dir)
+        for level in (10, 20):
+            record(generator, level)
+        generator.stop_recording()
+        # The stop signal found the queue full: the drained frames went back to the pool
+        assert list(generator.frame_queue.queue) == [None]
+        assert generator.frame_pool.available() == generator.frame_pool.allocated
+        assert generator._queued_in_memory == 0
+        assert generator.performance_stats["frames_dropped"] == BUFFER_SIZE
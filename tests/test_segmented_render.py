@@ -0,0 +1,127 @@
+"""
+Regression tests - segmented rendering
+
+generate_segmented runs here with the segment workers called inline
+instead of in a process pool, and without FFmpeg: the workers write
+placeholder segment files, and concatenation is replaced. The segment
+directory must be gone afterwards whether the segments succeed, report a
+failure, or raise.
+"""
+
+import logging
+import os
+import pickle
+import tempfile
+from concurrent.futures import Future
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.core.data_pipeline import AudioEvent
+from src.utils.video.encoder_profile import legacy_profile
+from src.video_generators import base_video_generator
+from src.video_generators.arc_escape_simulator import ArcEscapeSimulator
+
+FPS = 30
+SEGMENTS = 3
+
+
+class InlineExecutor:
+    """ProcessPoolExecutor stand-in running each task at submit time"""
+
+    def __init__(self, max_workers=None, mp_context=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def make_worker(outcome):
+    """Segment worker writing a placeholder file, then behaving as `outcome(index)` says"""
+    def worker(snapshot, start_frame, end_frame, output_path, encoder_threads):
+        generator, _ = pickle.loads(snapshot)
+        assert generator.current_frame == start_frame
+        with open(output_path, "wb") as f:
+            f.write(b"segment")
+        index = start_frame * SEGMENTS // generator.total_frames
+        if outcome(index) == "raise":
+            raise RuntimeError("worker crashed")
+        if outcome(index) == "fail":
+            return None, [], {}
+        event = AudioEvent(event_type="segment", time=start_frame / FPS, params={"index": index})
+        return output_path, [event], {"frames_dropped": 1}
+    return worker
+
+
+@pytest.fixture
+def segment_dirs(tmp_path, monkeypatch):
+    """Segment directories created by generate_segmented"""
+    created = []
+    mkdtemp = tempfile.mkdtemp
+
+    def recording_mkdtemp(prefix=None):
+        created.append(mkdtemp(prefix=prefix, dir=str(tmp_path)))
+        return created[-1]
+
+    monkeypatch.setattr(base_video_generator.tempfile, "mkdtemp", recording_mkdtemp)
+    monkeypatch.setattr(base_video_generator, "ProcessPoolExecutor", InlineExecutor)
+    return created
+
+
+def make_generator(tmp_path, monkeypatch, outcome):
+    logging.disable(logging.WARNING)
+    monkeypatch.setattr(base_video_generator, "_render_segment_worker", make_worker(outcome))
+    generator = ArcEscapeSimulator(width=90, height=160, fps=FPS, duration=3)
+    generator.set_output_path(str(tmp_path / "video.mp4"))
+    generator.render_segments = SEGMENTS
+    generator.encoder_profile = legacy_profile()
+    return generator
+
+
+class TestSegmentedRender:
+    def test_segments_joined(self, tmp_path, monkeypatch, segment_dirs):
+        generator = make_generator(tmp_path, monkeypatch, lambda index: "ok")
+        joined = []
+
+        def concat(self, paths):
+            joined.extend(os.path.exists(path) for path in paths)
+            with open(generator.output_path, "wb") as f:
+                f.write(b"video")
+            return True
+
+        # Patched on the class: the generator itself is pickled into the snapshots
+        monkeypatch.setattr(ArcEscapeSimulator, "_concat_segments", concat)
+        assert generator.generate_segmented() == generator.output_path
+        assert joined == [True] * SEGMENTS
+        assert [event.params["index"] for event in generator.audio_events] == [0, 1, 2]
+        assert generator.performance_stats["frames_dropped"] == SEGMENTS
+        assert len(segment_dirs) == 1 and not os.path.exists(segment_dirs[0])
+
+    @pytest.mark.parametrize("outcome", ["fail", "raise"])
+    def test_failed_segment_cleaned_up(self, tmp_path, monkeypatch, segment_dirs, outcome):
+        generator = make_generator(tmp_path, monkeypatch,
+                                   lambda index: outcome if index == 1 else "ok")
+        monkeypatch.setattr(ArcEscapeSimulator, "_concat_segments",
+                            lambda self, paths: pytest.fail("concatenated after a failed segment"))
+        assert generator.generate_segmented() is None
+        assert len(segment_dirs) == 1 and not os.path.exists(segment_dirs[0])
+
+    def test_segment_bounds(self, tmp_path, monkeypatch):
+        generator = make_generator(tmp_path, monkeypatch, lambda index: "ok")
+        assert generator._segment_bounds() == [(0, 30), (30, 60), (60, 90)]
+        generator.render_segments = 4
+        bounds = generator._segment_bounds()
+        assert bounds[0][0] == 0 and bounds[-1][1] == 90
+        assert all(end == start for (_, end), (start, _) in zip(bounds, bounds[1:]))
@@ -0,0 +1,126 @@
+"""
+Regression tests - SoundBank
+
+Index and PCM store of a temporary folder of WAV files: decoded samples
+against decode_wav, manifest reads per query, re-indexing of modified
+files, files that fail to decode, and pruning of deleted files.
+"""
+
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio_generators.viral_audio import sound_bank
+from src.audio_generators.viral_audio.sound_bank import SoundBank, decode_wav
+
+SAMPLE_RATE = 22050
+
+
+def write_wav(path, seconds, rate=SAMPLE_RATE, channels=1, frequency=440.0):
+    t = np.arange(int(seconds * rate)) / rate
+    tone = (0.5 * np.sin(2 * np.pi * frequency * t) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(tone, channels).tobytes())
+
+
+def touch_folder(folder):
+    """Move the folder's modification time on, whatever the filesystem resolution"""
+    mtime_ns = os.stat(folder).st_mtime_ns + 1_000_000_000
+    os.utime(folder, ns=(mtime_ns, mtime_ns))
+
+
+def pcm_files(bank_dir):
+    return sorted(name for name in os.listdir(bank_dir) if name.endswith(".npy"))
+
+
+@pytest.fixture
+def sounds(tmp_path):
+    folder = tmp_path / "sounds"
+    folder.mkdir()
+    write_wav(folder / "a.wav", 0.2)
+    write_wav(folder / "b.wav", 0.5, rate=44100, channels=2, frequency=220.0)
+    write_wav(folder / "c.wav", 1.0)
+    (folder / "notes.txt").write_text("not a sound")
+    return str(folder)
+
+
+@pytest.fixture
+def bank_dir(tmp_path):
+    return str(tmp_path / "bank")
+
+
+class TestSoundBank:
+    def test_index_and_load(self, sounds, bank_dir):
+        bank = SoundBank(SAMPLE_RATE, bank_dir)
+        found = bank.query([sounds], min_duration=0.3)
+        assert [os.path.basename(s.path) for s in found] == ["b.wav", "c.wav"]
+        assert found[0].source_rate == 44100 and found[0].channels == 2
+        assert found[0].duration == pytest.approx(0.5)
+        assert len(pcm_files(bank_dir)) == 3
+
+        path = os.path.join(sounds, "b.wav")
+        samples = bank.load(path)
+        assert isinstance(samples, np.ndarray) and not samples.flags.writeable
+        assert np.array_equal(samples, decode_wav(path, SAMPLE_RATE)[0])
+        assert bank.load(path) is samples
+
+    def test_later_run_reads_manifest(self, sounds, bank_dir, monkeypatch):
+        SoundBank(SAMPLE_RATE, bank_dir).query([sounds])
+        monkeypatch.setattr(sound_bank, "decode_wav", lambda *args: pytest.fail("decoded again"))
+        bank = SoundBank(SAMPLE_RATE, bank_dir)
+        assert len(bank.query([sounds])) == 3
+        assert bank.load(os.path.join(sounds, "a.wav")) is not None
+
+    def test_manifest_read_once_per_query(self, sounds, bank_dir, monkeypatch):
+        bank = SoundBank(SAMPLE_RATE, bank_dir)
+        reads = []
+        read_manifest = bank._read_manifest
+        monkeypatch.setattr(bank, "_read_manifest", lambda: reads.append(1) or read_manifest())
+        bank.query([sounds])
+        assert len(reads) == 2   # One lookup for the new files, one merge in flush
+
+    def test_modified_file_reindexed(self, sounds, bank_dir):
+        bank = SoundBank(SAMPLE_RATE, bank_dir)
+        bank.query([sounds])
+        path = os.path.join(sounds, "a.wav")
+        write_wav(path, 0.7)
+        mtime_ns = os.stat(path).st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        assert bank.info(path).duration == pytest.approx(0.7, abs=1 / SAMPLE_RATE)
+        assert len(pcm_files(bank_dir)) == 3   # The previous PCM was deleted
+        assert len(bank.load(path)) == int(0.7 * SAMPLE_RATE)
+
+    def test_undecodable_file_skipped(self, sounds, bank_dir, monkeypatch):
+        path = os.path.join(sounds, "broken.wav")
+        with open(path, "wb") as f:
+            f.write(b"RIFF....")
+        touch_folder(sounds)
+        bank = SoundBank(SAMPLE_RATE, bank_dir)
+        assert len(bank.query([sounds])) == 3
+        monkeypatch.setattr(sound_bank, "decode_wav", lambda *args: pytest.fail("retried"))
+        assert bank.info(path) is None
+
+    def test_deleted_files_pruned(self, sounds, bank_dir):
+        bank = SoundBank(SAMPLE_RATE, bank_dir)
+        bank.query([sounds])
+        os.remove(os.path.join(sounds, "c.wav"))
+        touch_folder(sounds)
+
+        assert [os.path.basename(s.path) for s in bank.query([sounds])] == ["a.wav", "b.wav"]
+        assert len(pcm_files(bank_dir)) == 2
+        # Also gone from the manifest seen by later runs
+        later = SoundBank(SAMPLE_RATE, bank_dir)
+        assert sorted(os.path.basename(p) for p in later._read_manifest()) == ["a.wav", "b.wav"]
+
+    def test_deleted_between_runs_pruned(self, sounds, bank_dir):
+        SoundBank(SAMPLE_RATE, bank_dir).query([sounds])
+        os.remove(os.path.join(sounds, "a.wav"))
+        bank = SoundBank(SAMPLE_RATE, bank_dir)
+        assert len(bank.query([sounds])) == 2
+        assert len(pcm_files(bank_dir)) == 2
+        assert len(bank._read_manifest()) == 2
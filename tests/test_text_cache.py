@@ -0,0 +1,103 @@
+"""
+Regression tests - overlay text cache
+
+Texts drawn through TextCache are compared against the previous per-frame
+drawing (4 outline copies then the text, blitted straight onto the frame),
+and the LRU and font pool bookkeeping is checked.
+"""
+
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.utils.video.text_cache import TextCache
+
+SIZE = (320, 120)
+CENTER = (160, 60)
+BACKGROUND = (20, 60, 120)
+TOLERANCE = 0.1   # Mean absolute channel difference
+MAX_ERROR = 2     # Rounding on the anti-aliased edges
+
+
+@pytest.fixture(autouse=True, scope="module")
+def fonts():
+    pygame.font.init()
+    yield
+
+
+def legacy_text(surface, text, size, color, center, outline=2):
+    """Previous drawing of an outlined overlay text"""
+    font = pygame.font.Font(None, size)
+    text_surface = font.render(text, True, color)
+    text_rect = text_surface.get_rect(center=center)
+    outline_surface = font.render(text, True, (0, 0, 0))
+    for dx, dy in [(-outline, -outline), (-outline, outline), (outline, -outline), (outline, outline)]:
+        surface.blit(outline_surface, (text_rect.x + dx, text_rect.y + dy))
+    surface.blit(text_surface, text_rect)
+
+
+def frame(draw):
+    surface = pygame.Surface(SIZE)
+    surface.fill(BACKGROUND)
+    draw(surface)
+    return pygame.surfarray.array3d(surface).astype(np.float64)
+
+
+class TestRendering:
+    @pytest.mark.parametrize("text, size, color", [("Can the ball escape?", 38, (255, 255, 0)),
+                                                   ("12/40", 56, (255, 255, 255))])
+    def test_matches_legacy(self, text, size, color):
+        cache = TextCache()
+        expected = frame(lambda s: legacy_text(s, text, size, color, CENTER))
+        cached = frame(lambda s: cache.blit_centered(s, text, size, color, CENTER))
+        assert np.mean(np.abs(cached - expected)) < TOLERANCE
+        assert np.max(np.abs(cached - expected)) <= MAX_ERROR
+        # Fully covered glyph pixels keep the text colour exactly
+        assert np.any(np.all(cached == color, axis=-1))
+
+    def test_outline_margin(self):
+        cache = TextCache()
+        plain = cache.render("42", 40, (255, 255, 255), outline_color=None)
+        outlined = cache.render("42", 40, (255, 255, 255), outline=3)
+        assert outlined.get_size() == (plain.get_width() + 6, plain.get_height() + 6)
+        assert cache.render("42", 40, (255, 255, 255), outline=0).get_size() == plain.get_size()
+
+    def test_blit_centered_rect(self):
+        cache = TextCache()
+        target = pygame.Surface(SIZE)
+        rect = cache.blit_centered(target, "Layer 3", 48, (255, 255, 255), CENTER)
+        assert rect.center == CENTER
+        assert rect.size == cache.render("Layer 3", 48, (255, 255, 255)).get_size()
+
+
+class TestBookkeeping:
+    def test_hits_and_misses(self):
+        cache = TextCache()
+        first = cache.render("3/10", 56, (255, 255, 255))
+        assert cache.render("3/10", 56, (255, 255, 255)) is first
+        assert cache.render("3/10", 56, (255, 255, 0)) is not first   # Colour is part of the key
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_lru_eviction(self):
+        cache = TextCache(max_entries=2)
+        a = cache.render("a", 30, (255, 255, 255))
+        cache.render("b", 30, (255, 255, 255))
+        assert cache.render("a", 30, (255, 255, 255)) is a   # "b" is now the oldest
+        cache.render("c", 30, (255, 255, 255))
+        assert len(cache._surfaces) == 2
+        assert cache.render("a", 30, (255, 255, 255)) is a
+        misses = cache.misses
+        cache.render("b", 30, (255, 255, 255))
+        assert cache.misses == misses + 1
+
+    def test_font_pool(self):
+        cache = TextCache()
+        assert cache.font(40) is cache.font(40)
+        assert cache.font(40) is not cache.font(41)
+        cache.render("x", 40, (255, 255, 255))
+        cache.clear()
+        assert not cache._surfaces and not cache._fonts
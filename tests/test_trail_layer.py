@@ -0,0 +1,75 @@
+"""
+Regression tests - GravityFallsSimulator trail layer
+
+The incremental trail layer is compared against the previous full redraw
+of trail_history, frame by frame, over a seeded simulation.
+"""
+
+import logging
+import os
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.video_generators.gravity_falls_simulator import GravityFallsSimulator
+
+FPS = 30
+SIZE = (270, 480)
+BACKGROUND = (20, 30, 60)
+
+
+def legacy_trail(surface, trail_history):
+    """Previous behaviour: every stored point but the current one redrawn each frame"""
+    for point in trail_history[:-1]:
+        GravityFallsSimulator._draw_trail_point(surface, point)
+
+
+def make_simulator(trail_max_length=0, seed=3):
+    logging.disable(logging.WARNING)
+    random.seed(seed)
+    sim = GravityFallsSimulator(width=SIZE[0], height=SIZE[1], fps=FPS, duration=6)
+    sim.configure({"trail_max_length": trail_max_length})
+    sim.initialize_simulation()
+    return sim
+
+
+def trail_pixels(draw, sim):
+    surface = pygame.Surface(SIZE)
+    surface.fill(BACKGROUND)
+    draw(surface)
+    return pygame.surfarray.array3d(surface)
+
+
+class TestTrailLayer:
+    @pytest.mark.parametrize("trail_max_length", [0, 20])
+    def test_matches_full_redraw(self, trail_max_length):
+        sim = make_simulator(trail_max_length)
+        for frame in range(sim.total_frames):
+            sim.current_frame = frame
+            sim.simulate_frame(1.0 / FPS)
+            if frame % 15 == 0 or frame == sim.total_frames - 1:
+                expected = trail_pixels(lambda s: legacy_trail(s, sim.trail_history), sim)
+                assert np.array_equal(trail_pixels(sim._render_trail, sim), expected), frame
+        assert len(sim.trail_history) == (trail_max_length + 1 if trail_max_length else sim.total_frames)
+
+    def test_history_reset(self):
+        sim = make_simulator()
+        for frame in range(60):
+            sim.simulate_frame(1.0 / FPS)
+            sim._render_trail(pygame.Surface(SIZE))
+        # Fewer points than already drawn (e.g. a restart): the layer is rebuilt
+        del sim.trail_history[10:]
+        expected = trail_pixels(lambda s: legacy_trail(s, sim.trail_history), sim)
+        assert np.array_equal(trail_pixels(sim._render_trail, sim), expected)
+
+    def test_resize(self):
+        sim = make_simulator()
+        for frame in range(30):
+            sim.simulate_frame(1.0 / FPS)
+            sim._render_trail(pygame.Surface((100, 100)))
+        expected = trail_pixels(lambda s: legacy_trail(s, sim.trail_history), sim)
+        assert np.array_equal(trail_pixels(sim._render_trail, sim), expected)
@@ -0,0 +1,172 @@
+"""
+Regression tests - batched viral collision layers
+
+A seeded collision soundtrack is rendered, one layer at a time, with the
+previous per-event path (every layer generated per collision, a tail
+reverb per collision with a per-sample damping loop) and with the batched
+layers and the tail bus, before the master effects. The air layer is
+noise, so only its level is compared.
+"""
+
+import logging
+import random
+
+import numpy as np
+import pytest
+
+from src.audio_generators.viral_audio.layers import TailLayer
+from src.audio_generators.viral_audio.layers.tail import REVERB_BLOCK_SIZE
+from src.audio_generators.viral_audio.viral_sound_engine import ViralSoundEngine
+from src.core.data_pipeline import AudioEvent
+
+SAMPLE_RATE = 44100
+SECONDS = 4.0
+TOLERANCE = 1e-5         # Relative to the peak of the layer
+LEVEL_TOLERANCE = 0.05   # Relative RMS difference of the air layer
+
+
+class LegacyTailLayer(TailLayer):
+    """Previous reverb: each tap damped separately, per-sample damping loop"""
+
+    def apply_reverb(self, signal, out=None):
+        samples = len(signal)
+        reverb = np.zeros(samples)
+        for delay_ms, decay in zip([23, 37, 53, 79, 97, 127], [0.7, 0.5, 0.35, 0.25, 0.18, 0.12]):
+            delay_samples = int(int(delay_ms * self.sample_rate / 1000) * self.room_size * 2)
+            if delay_samples < samples:
+                delayed = np.zeros(samples)
+                delayed[delay_samples:] = signal[:samples - delay_samples]
+                reverb += self._apply_damping(delayed) * decay
+        if out is not None:
+            out += reverb
+            return out
+        return reverb
+
+    def _apply_damping(self, signal):
+        damped = np.zeros_like(signal)
+        damped[0] = signal[0]
+        alpha = self.damping
+        for i in range(1, len(signal)):
+            damped[i] = alpha * signal[i] + (1 - alpha) * damped[i - 1]
+        return damped
+
+
+class SoloEngine(ViralSoundEngine):
+    """Keeps the buffer before the master effects, writes nothing"""
+
+    solo = None   # Only this layer in the mix
+
+    def _get_mix_ratios(self):
+        ratios = super()._get_mix_ratios()
+        return {name: (ratio if name == self.solo else 0.0) for name, ratio in ratios.items()}
+
+    def _apply_master_effects(self):
+        pass
+
+    def _normalize_and_save(self):
+        pass
+
+
+class LegacyEngine(SoloEngine):
+    """Previous per-event collision path"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.layers['tail'] = LegacyTailLayer(self.sample_rate)
+
+    def _process_collision_standard(self, event):
+        velocity = event.params.get('velocity_magnitude', 800.0)
+        bounce_count = event.params.get('bounce_count', 1)
+        ball_size = event.params.get('ball_size', 30.0)
+        audio_params = self.humanizer.humanize(self.velocity_mapper.map(velocity))
+        self.progressive_builder.update(bounce_count)
+        active_layers = self.progressive_builder.get_active_layers()
+        harmonic_richness = self.progressive_builder.get_harmonic_richness()
+        base_freq = max(80, min(500, 200.0 * (30.0 / max(ball_size, 10.0))))
+        sound_duration = 0.15 + (audio_params['intensity'] * 0.15)
+
+        layer_signals = {}
+        for layer_name in active_layers:
+            if layer_name in self.layers:
+                signal = self.layers[layer_name].generate(
+                    frequency=base_freq, duration=sound_duration,
+                    intensity=audio_params['intensity'], richness=harmonic_richness)
+                layer_signals[layer_name] = signal * self.progressive_builder.get_layer_volume(layer_name)
+
+        if not layer_signals:
+            return
+        max_len = max(len(s) for s in layer_signals.values())
+        mixed = np.zeros(max_len, dtype=np.float32)
+        mix_ratios = self._get_mix_ratios()
+        for layer_name, signal in layer_signals.items():
+            mixed += np.pad(signal, (0, max_len - len(signal))) * mix_ratios.get(layer_name, 0.5)
+
+        start_sample = int(event.time * self.sample_rate)
+        end_sample = min(start_sample + len(mixed), len(self.audio_data))
+        if start_sample < len(self.audio_data):
+            self.audio_data[start_sample:end_sample] += mixed[:end_sample - start_sample] * audio_params['volume']
+
+
+def make_events(count=60, seed=3):
+    rng = random.Random(seed)
+    times = sorted(rng.uniform(0, SECONDS) for _ in range(count))
+    return [AudioEvent("collision", t, params={"velocity_magnitude": rng.uniform(200, 2500),
+                                               "bounce_count": i + 1,
+                                               "ball_size": rng.uniform(10, 60)})
+            for i, t in enumerate(times)]
+
+
+def render(engine_class, layer):
+    logging.disable(logging.WARNING)
+    engine = engine_class(SAMPLE_RATE, mode='maximum_punch')
+    engine.solo = layer
+    engine.set_duration(SECONDS)
+    engine.add_events(make_events())
+    # Same timbre and humanisation draws in both paths
+    random.seed(0)
+    np.random.seed(0)
+    engine.generate()
+    return engine.audio_data.astype(np.float64)
+
+
+class TestBatchedLayers:
+    @pytest.mark.parametrize("layer", ["sub", "body", "presence", "tail"])
+    def test_matches_per_event(self, layer):
+        expected = render(LegacyEngine, layer)
+        result = render(SoloEngine, layer)
+        peak = np.max(np.abs(expected))
+        assert peak > 0
+        assert np.max(np.abs(result - expected)) <= TOLERANCE * peak
+
+    def test_air_level(self):
+        expected = render(LegacyEngine, "air")
+        result = render(SoloEngine, "air")
+        level = np.sqrt(np.mean(expected ** 2))
+        assert level > 0
+        assert abs(np.sqrt(np.mean(result ** 2)) - level) <= LEVEL_TOLERANCE * level
+
+
+class TestTailBus:
+    @pytest.fixture
+    def signal(self):
+        # Spans several reverb blocks
+        return np.random.default_rng(1).normal(0, 1, 3 * REVERB_BLOCK_SIZE + 77)
+
+    def test_reverb_matches_legacy(self, signal):
+        expected = LegacyTailLayer(SAMPLE_RATE).apply_reverb(signal)
+        result = TailLayer(SAMPLE_RATE).apply_reverb(signal)
+        assert np.max(np.abs(result - expected)) <= TOLERANCE * np.max(np.abs(expected))
+
+    def test_reverb_of_sum(self, signal):
+        # What makes the bus valid: the reverb of a mix is the sum of the reverbs
+        tail = TailLayer(SAMPLE_RATE)
+        other = np.roll(signal, 1000) * 0.5
+        total = tail.apply_reverb(signal + other)
+        assert np.allclose(total, tail.apply_reverb(signal) + tail.apply_reverb(other), atol=1e-12)
+
+    def test_added_into_out(self, signal):
+        tail = TailLayer(SAMPLE_RATE)
+        out = np.ones(len(signal))
+        assert tail.apply_reverb(signal, out=out) is out
+        assert np.allclose(out - 1, tail.apply_reverb(signal))
+        assert len(tail.apply_reverb(signal[:10])) == 10   # Shorter than every tap
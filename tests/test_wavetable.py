@@ -0,0 +1,76 @@
+"""
+Regression tests - wavetable oscillators
+
+WavetableBank.render is compared against the direct sum of the partials'
+band-limited Fourier series, including partial sets whose shared table
+would span more fundamental periods than the largest table can hold.
+"""
+
+import numpy as np
+import pytest
+
+from src.audio_generators.wavetable import (
+    MAX_TABLE_SIZE, OCTAVE_BASE, Partial, WavetableBank, _octave, waveform_series
+)
+
+SAMPLE_RATE = 44100
+SAMPLES = 20000
+
+
+def direct_sum(partials, frequency, samples):
+    """Harmonics below Nyquist at the top of the fundamental's octave, summed one by one"""
+    t = np.arange(samples) / SAMPLE_RATE
+    top = OCTAVE_BASE * 2.0 ** (_octave(frequency) + 1)
+    out = np.zeros(samples)
+    for partial in partials:
+        count = int(SAMPLE_RATE / 2 / (top * partial.ratio))
+        if count < 1:
+            continue
+        harmonics, coefs = waveform_series(partial.waveform, count)
+        for harmonic, coef in zip(harmonics, coefs):
+            cycles = harmonic * (partial.ratio * frequency * t + partial.phase)
+            out += partial.amplitude * np.real(coef * np.exp(2j * np.pi * cycles))
+    return out
+
+
+SUBHARMONIC_SINES = [Partial(1.0), Partial(1 / 16), Partial(1 / 15), Partial(1 / 13),
+                     Partial(1 / 11), Partial(1 / 7)]
+
+
+@pytest.mark.parametrize("frequency", [110.0, 440.0, 1760.0])
+def test_subharmonic_sines(frequency):
+    # lcm(16, 15, 13, 11, 7) periods of the fundamental cannot share one table
+    expected = direct_sum(SUBHARMONIC_SINES, frequency, SAMPLES)
+    result = WavetableBank(SAMPLE_RATE).render(SUBHARMONIC_SINES, frequency, SAMPLES)
+    assert result.dtype == np.float32
+    assert np.max(np.abs(result - expected)) < 2e-3
+
+
+@pytest.mark.parametrize("frequency", [55.0, 110.0])
+def test_rich_waveforms_with_subharmonics(frequency):
+    partials = [Partial(1.0, "square"), Partial(1 / 3, "sawtooth", 0.5),
+                Partial(1 / 5, "square", 0.3), Partial(1 / 7, "triangle"),
+                Partial(1 / 9, "sawtooth", 0.2, 0.25)]
+    expected = direct_sum(partials, frequency, SAMPLES)
+    result = WavetableBank(SAMPLE_RATE).render(partials, frequency, SAMPLES)
+    # Up to INTERPOLATION_ERROR on each of the hundreds of harmonics
+    assert np.max(np.abs(result - expected)) < 0.05
+    assert np.sqrt(np.mean((result - expected) ** 2)) < 0.01
+
+
+def test_split_keeps_tables_within_bounds():
+    bank = WavetableBank(SAMPLE_RATE)
+    spectrum = bank._spectrum(tuple(SUBHARMONIC_SINES))
+    fitting, rest = spectrum.split(_octave(440.0))
+    assert fitting and rest
+    assert Partial(1.0) in fitting
+    assert sorted(fitting + rest) == sorted(SUBHARMONIC_SINES)
+    assert len(bank._spectrum(fitting).table(_octave(440.0))) - 2 <= MAX_TABLE_SIZE
+
+
+def test_harmonic_partials_share_one_table():
+    partials = [Partial(1.0, "sawtooth"), Partial(2.0, "square", 0.4), Partial(1.5, "sine", 0.2, 0.25)]
+    bank = WavetableBank(SAMPLE_RATE)
+    assert bank._spectrum(tuple(partials)).split(_octave(110.0)) == (tuple(partials), ())
+    expected = direct_sum(partials, 110.0, SAMPLES)
+    assert np.max(np.abs(bank.render(partials, 110.0, SAMPLES) - expected)) < 5e-3